@@ -0,0 +1,43 @@
+"""add_chat_history_recent_indexes
+
+Revision ID: chat_hist_recent_idx
+Revises: add_metadata_col
+Create Date: 2025-12-20 12:00:00.000000
+
+Composite indexes matching MemoryManager.get_recent_history:
+- channel_id + character_name + timestamp DESC (group context)
+- user_id + character_name + timestamp DESC (DM context)
+so ORDER BY timestamp DESC LIMIT n reads the newest rows straight from the
+index instead of sorting every matching row.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'chat_hist_recent_idx'
+down_revision: Union[str, None] = 'add_metadata_col'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_v2_chat_history_channel_char_ts',
+        'v2_chat_history',
+        ['channel_id', 'character_name', sa.text('timestamp DESC')],
+        unique=False
+    )
+    op.create_index(
+        'idx_v2_chat_history_user_char_ts',
+        'v2_chat_history',
+        ['user_id', 'character_name', sa.text('timestamp DESC')],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_v2_chat_history_user_char_ts', table_name='v2_chat_history')
+    op.drop_index('idx_v2_chat_history_channel_char_ts', table_name='v2_chat_history')
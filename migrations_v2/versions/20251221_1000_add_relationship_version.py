@@ -0,0 +1,32 @@
+"""add_relationship_version
+
+Revision ID: rel_snapshot_version
+Revises: chat_hist_recent_idx
+Create Date: 2025-12-21 10:00:00.000000
+
+Monotonic version on v2_user_relationships. Every write that changes the
+cached relationship snapshot bumps it, so TrustManager can update the Redis
+snapshot in place and never let an older read overwrite a newer write.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'rel_snapshot_version'
+down_revision: Union[str, None] = 'chat_hist_recent_idx'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'v2_user_relationships',
+        sa.Column('version', sa.BigInteger(), server_default='0', nullable=False)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('v2_user_relationships', 'version')
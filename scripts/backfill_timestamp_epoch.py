@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Backfill 'timestamp_epoch' on existing Qdrant memory points.
+
+Background:
+Time-range queries in MemoryManager (search_memories with time_range,
+get_summaries_since, get_high_meaningfulness_memories, search_by_type with
+hours, get_recent_memories) and SharedArtifactManager.get_gossip_for_bot
+filter and order on the integer payload field 'timestamp_epoch'. Points
+written before that field existed only carry the ISO 'timestamp' (or shared
+artifacts' 'created_at') string, so Qdrant's Range filter and order_by skip them.
+
+This script:
+1. Ensures the collection's payload indexes (timestamp_epoch plus keyword fields) exist
+2. Scrolls every point that has no 'timestamp_epoch'
+3. Derives it from 'timestamp' (or 'created_at') and sets it in batches
+
+Safe to re-run: only points still missing the field are touched.
+
+Usage:
+    python scripts/backfill_timestamp_epoch.py --dry-run                   # Preview changes
+    python scripts/backfill_timestamp_epoch.py                             # All memory collections + shared artifacts
+    python scripts/backfill_timestamp_epoch.py whisperengine_memory_elena  # Specific collections
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from loguru import logger
+from qdrant_client.models import (
+    Filter, IsEmptyCondition, PayloadField, SetPayload, SetPayloadOperation
+)
+from src_v2.core.database import db_manager
+from src_v2.memory.manager import PAYLOAD_INDEXES
+from src_v2.memory.shared_artifacts import SHARED_PAYLOAD_INDEXES, SharedArtifactManager
+from src_v2.utils.time_utils import to_epoch_seconds
+
+logger.remove()
+logger.add(sys.stderr, level="INFO")
+
+BATCH_SIZE = 256
+
+
+async def backfill_collection(collection_name: str, dry_run: bool = False) -> dict:
+    """
+    Backfill 'timestamp_epoch' on one collection.
+
+    Returns:
+        dict with stats: scanned, updated, skipped, errors
+    """
+    stats = {"scanned": 0, "updated": 0, "skipped": 0, "errors": 0}
+    client = db_manager.qdrant_client
+
+    if not dry_run:
+        indexes = SHARED_PAYLOAD_INDEXES if collection_name == SharedArtifactManager.COLLECTION_NAME else PAYLOAD_INDEXES
+        for field_name, schema in indexes.items():
+            try:
+                await client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=field_name,
+                    field_schema=schema
+                )
+            except Exception as e:
+                logger.warning(f"[{collection_name}] Could not create index on '{field_name}': {e}")
+
+    missing_filter = Filter(must=[IsEmptyCondition(is_empty=PayloadField(key="timestamp_epoch"))])
+    offset = None
+
+    while True:
+        points, offset = await client.scroll(
+            collection_name=collection_name,
+            scroll_filter=missing_filter,
+            limit=BATCH_SIZE,
+            offset=offset,
+            with_payload=["timestamp", "created_at"],
+            with_vectors=False
+        )
+        if not points:
+            break
+
+        operations = []
+        for point in points:
+            stats["scanned"] += 1
+            payload = point.payload or {}
+            epoch = to_epoch_seconds(payload.get("timestamp") or payload.get("created_at"))
+            if epoch is None:
+                stats["skipped"] += 1
+                continue
+            operations.append(SetPayloadOperation(
+                set_payload=SetPayload(payload={"timestamp_epoch": epoch}, points=[point.id])
+            ))
+
+        if operations and not dry_run:
+            try:
+                await client.batch_update_points(
+                    collection_name=collection_name,
+                    update_operations=operations,
+                    wait=True
+                )
+                stats["updated"] += len(operations)
+            except Exception as e:
+                logger.error(f"[{collection_name}] Batch update failed: {e}")
+                stats["errors"] += len(operations)
+        elif dry_run:
+            stats["updated"] += len(operations)
+
+        if stats["scanned"] % (BATCH_SIZE * 10) == 0:
+            logger.info(f"[{collection_name}] Scanned {stats['scanned']} points...")
+
+        if offset is None:
+            break
+
+    logger.info(
+        f"[{collection_name}] {'Would update' if dry_run else 'Updated'} {stats['updated']}, "
+        f"skipped {stats['skipped']} (no parseable timestamp), errors {stats['errors']}"
+    )
+    return stats
+
+
+async def backfill_timestamp_epoch(collections: Optional[List[str]] = None, dry_run: bool = False) -> dict:
+    """
+    Backfill 'timestamp_epoch' on the given collections
+    (default: all whisperengine_memory_* collections and the shared artifacts collection).
+
+    Returns:
+        dict with aggregate stats
+    """
+    totals = {"collections": 0, "scanned": 0, "updated": 0, "skipped": 0, "errors": 0}
+
+    await db_manager.connect_qdrant()
+
+    if not db_manager.qdrant_client:
+        logger.error("Failed to connect to Qdrant")
+        return totals
+
+    try:
+        if not collections:
+            response = await db_manager.qdrant_client.get_collections()
+            collections = sorted(
+                c.name for c in response.collections
+                if c.name.startswith("whisperengine_memory") or c.name == SharedArtifactManager.COLLECTION_NAME
+            )
+
+        for collection_name in collections:
+            try:
+                stats = await backfill_collection(collection_name, dry_run=dry_run)
+            except Exception as e:
+                logger.error(f"[{collection_name}] Backfill failed: {e}")
+                totals["errors"] += 1
+                continue
+            totals["collections"] += 1
+            for key in ("scanned", "updated", "skipped", "errors"):
+                totals[key] += stats[key]
+
+    finally:
+        await db_manager.qdrant_client.close()
+
+    return totals
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Backfill numeric timestamp_epoch on Qdrant memory points")
+    parser.add_argument("collections", nargs="*", help="Collections to backfill (default: all whisperengine_memory_* and shared artifacts)")
+    parser.add_argument("--dry-run", action="store_true", help="Preview changes without applying")
+    args = parser.parse_args()
+
+    logger.info("Starting timestamp_epoch backfill...")
+    if args.dry_run:
+        logger.info("[DRY RUN MODE - No changes will be made]")
+
+    totals = await backfill_timestamp_epoch(collections=args.collections, dry_run=args.dry_run)
+
+    logger.info(f"\nBackfill Summary:")
+    logger.info(f"  Collections: {totals['collections']}")
+    logger.info(f"  Scanned: {totals['scanned']}")
+    logger.info(f"  {'Would update' if args.dry_run else 'Updated'}: {totals['updated']}")
+    logger.info(f"  Skipped: {totals['skipped']}")
+    logger.info(f"  Errors: {totals['errors']}")
+
+    if args.dry_run:
+        logger.info("\nTo apply changes, run without --dry-run flag")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
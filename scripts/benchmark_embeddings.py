@@ -1,8 +1,15 @@
+import argparse
+import asyncio
+import sys
 import time
+from pathlib import Path
 import numpy as np
 from fastembed import TextEmbedding
 from typing import List, Any
 
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
 def cosine_similarity(a: Any, b: Any) -> float:
     return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
 
@@ -57,7 +64,77 @@ def benchmark_model(model_name: str, sentences: List[str]) -> dict:
         "separation_delta": delta
     }
 
+async def _run_callers(embed_one, texts: List[str], callers: int) -> float:
+    """Runs `texts` through `embed_one` from `callers` concurrent tasks; returns elapsed seconds."""
+    queue: asyncio.Queue = asyncio.Queue()
+    for text in texts:
+        queue.put_nowait(text)
+
+    async def caller():
+        while not queue.empty():
+            await embed_one(queue.get_nowait())
+
+    start = time.perf_counter()
+    await asyncio.gather(*(caller() for _ in range(callers)))
+    return time.perf_counter() - start
+
+
+async def benchmark_concurrency(model_name: str, callers: int, total: int) -> None:
+    """
+    Compares the old per-call executor path against EmbeddingService's
+    micro-batcher (cold cache) and LRU cache (warm, repeated queries).
+    """
+    from src_v2.memory.embeddings import EmbeddingService
+
+    print(f"\n--- Concurrency benchmark: {model_name}, {callers} callers, {total} queries ---")
+    service = EmbeddingService(model_name=model_name)
+    model, lock = service._model_entry
+    service.embed_documents(["warmup"])
+
+    unique_texts = [f"Message {i}: how was your day at the observatory?" for i in range(total)]
+    loop = asyncio.get_running_loop()
+
+    def legacy_embed(text: str) -> List[float]:
+        with lock:
+            return list(model.embed([text]))[0].tolist()
+
+    async def legacy_one(text: str):
+        return await loop.run_in_executor(None, legacy_embed, text)
+
+    baseline = await _run_callers(legacy_one, unique_texts, callers)
+
+    service.clear_cache()
+    service.reset_stats()
+    batched = await _run_callers(service.embed_query_async, unique_texts, callers)
+    batch_stats = service.get_stats()
+
+    # Chat traffic repeats itself: re-run a small working set through the warm cache
+    service.reset_stats()
+    repeated_texts = [unique_texts[i % 50] for i in range(total)]
+    cached = await _run_callers(service.embed_query_async, repeated_texts, callers)
+    cache_stats = service.get_stats()
+
+    print(f"{'Path':<28} | {'Time (s)':>9} | {'Queries/s':>10}")
+    print("-" * 54)
+    for label, elapsed in (("per-call executor (old)", baseline), ("micro-batched, cold cache", batched), ("micro-batched, warm cache", cached)):
+        print(f"{label:<28} | {elapsed:>9.3f} | {total / elapsed:>10.1f}")
+    print(f"\nBatching: {batch_stats['batches']} model calls, avg batch {batch_stats['avg_batch_size']}, max {batch_stats['max_batch_size']}")
+    print(f"Cache: hit rate {cache_stats['hit_rate']:.1%} on repeated queries")
+    print(f"Speedup (cold): {baseline / batched:.1f}x, (warm): {baseline / cached:.1f}x")
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Embedding model benchmarks")
+    parser.add_argument("--concurrency", action="store_true", help="Benchmark EmbeddingService throughput under concurrent callers")
+    parser.add_argument("--callers", type=int, default=50, help="Concurrent callers for --concurrency")
+    parser.add_argument("--queries", type=int, default=1000, help="Total queries for --concurrency")
+    parser.add_argument("--model", default="sentence-transformers/all-MiniLM-L6-v2")
+    args = parser.parse_args()
+
+    if args.concurrency:
+        asyncio.run(benchmark_concurrency(args.model, args.callers, args.queries))
+        return
+
     sentences = [
         "The quick brown fox jumps over the lazy dog.",
         "Artificial intelligence is transforming the world.",
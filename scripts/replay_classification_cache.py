@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Replay exported chat history through the classification cache and report hit
+rates and router calls saved.
+
+Messages come from v2_chat_history (default) or a JSON export (a list of
+objects with "content" and optionally "role"/"user_id"/"channel_id"). Both
+user and bot turns are replayed so each user message is keyed with the same
+recent history the live classifier receives; only user messages are looked
+up. No router LLM is called: every miss counts as one router call and stores
+a placeholder decision, which is what the cache would hold after the real call.
+
+Usage:
+    python scripts/replay_classification_cache.py --bot elena --limit 5000
+    python scripts/replay_classification_cache.py --bot elena --file data_exports/chat.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import defaultdict, deque
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src_v2.agents.classification_cache import ClassificationCache
+from src_v2.core.database import db_manager
+from src_v2.memory.embeddings import EmbeddingService
+
+
+async def load_messages(bot: str, limit: int, path: str | None) -> list[dict]:
+    if path:
+        with open(path) as f:
+            return [m for m in json.load(f) if m.get("content")][:limit]
+
+    await db_manager.connect_postgres()
+    async with db_manager.postgres_pool.acquire() as conn:
+        rows = await conn.fetch("""
+            SELECT user_id, channel_id, role, content FROM (
+                SELECT user_id, channel_id, role, content, timestamp FROM v2_chat_history
+                WHERE character_name = $1 AND content <> ''
+                ORDER BY timestamp DESC LIMIT $2
+            ) recent ORDER BY timestamp
+        """, bot, limit)
+    return [dict(row) for row in rows]
+
+
+async def replay(bot: str, limit: int, path: str | None) -> None:
+    messages = await load_messages(bot, limit, path)
+    if not messages:
+        print("No messages to replay.")
+        return
+
+    await db_manager.connect_redis()
+    cache = ClassificationCache()
+    embeddings = EmbeddingService()
+    # Separate namespace so the replay never serves (or pollutes) live decisions
+    namespace = f"replay-{bot}-{int(time.time())}"
+    # The classifier sees the conversation's last 4 messages, user and bot
+    recent: dict[tuple, deque] = defaultdict(lambda: deque(maxlen=4))
+    lookups = skipped = 0
+
+    for message in messages:
+        text = message["content"]
+        user_id = message.get("user_id")
+        history = recent[(user_id, message.get("channel_id"))]
+        if message.get("role", "human") not in ("human", "user"):
+            history.append(AIMessage(content=text))
+            continue
+
+        lookups += 1
+        signature = cache.signature_for(text, user_id, list(history))
+        history.append(HumanMessage(content=text))
+        if signature is None:
+            skipped += 1
+            continue
+
+        vector = await embeddings.embed_query_async(text)
+        if await cache.get(namespace, text, signature, vector) is None:
+            await cache.put(namespace, text, signature, {"complexity": "SIMPLE", "intents": [], "query": None}, vector)
+
+    stats = cache.get_stats()
+    print(f"\n=== Classification cache replay: {bot} ({lookups} user messages) ===")
+    print(f"Not cacheable:       {skipped}")
+    print(f"Cacheable lookups:   {lookups - skipped}")
+    print(f"Exact hits:          {stats['exact_hits']}")
+    print(f"Semantic hits:       {stats['semantic_hits']}")
+    print(f"Hit rate:            {stats['hit_rate']:.1%} of cacheable, "
+          f"{stats['router_calls_saved'] / max(lookups, 1):.1%} of all user messages")
+    print(f"Router calls saved:  {stats['router_calls_saved']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bot", required=True, help="Character name (cache namespace and history filter)")
+    parser.add_argument("--limit", type=int, default=5000, help="Most recent messages to replay")
+    parser.add_argument("--file", help="JSON export to replay instead of v2_chat_history")
+    args = parser.parse_args()
+    asyncio.run(replay(args.bot, args.limit, args.file))
+
+
+if __name__ == "__main__":
+    main()
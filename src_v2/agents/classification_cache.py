@@ -0,0 +1,226 @@
+from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass
+import hashlib
+import time
+
+import numpy as np
+from langchain_core.messages import BaseMessage, HumanMessage
+
+from src_v2.config.settings import settings
+from src_v2.core.cache import cache_manager
+from src_v2.knowledge.document_context import history_has_document_context
+
+
+# Intents that describe the conversation rather than the message itself
+HISTORY_DEPENDENT_INTENTS = frozenset({"image_refine", "behavior_looping"})
+
+
+def normalize_text(text: str) -> str:
+    """Lowercased, whitespace-collapsed text with trailing punctuation stripped."""
+    return " ".join(text.lower().split()).rstrip("!?.~ ")
+
+
+@dataclass
+class ClassificationCacheStats:
+    """Counters for both cache layers (per process)."""
+    exact_hits: int = 0
+    semantic_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.exact_hits + self.semantic_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return (self.exact_hits + self.semantic_hits) / self.lookups if self.lookups else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_rate": round(self.hit_rate, 4),
+            # Lookups run before the trace search, so every hit skips it and the router LLM call
+            "router_calls_saved": self.exact_hits + self.semantic_hits,
+        }
+
+
+class _SemanticIndex:
+    """
+    Bounded in-process store of (unit vector, context signature, result) for
+    one bot. Lookups are a single matrix-vector product over live entries.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._vectors: List[np.ndarray] = []
+        self._entries: List[Tuple[str, Dict[str, Any], float]] = []  # (signature, result, expires_at)
+        self._matrix: Optional[np.ndarray] = None
+
+    def _prune(self, now: float) -> None:
+        live = [i for i, (_, _, expires_at) in enumerate(self._entries) if expires_at > now]
+        if len(live) != len(self._entries):
+            self._vectors = [self._vectors[i] for i in live]
+            self._entries = [self._entries[i] for i in live]
+            self._matrix = None
+
+    def add(self, vector: np.ndarray, signature: str, result: Dict[str, Any], expires_at: float) -> None:
+        self._prune(time.time())
+        self._vectors.append(vector)
+        self._entries.append((signature, result, expires_at))
+        if len(self._entries) > self.max_entries:
+            # Oldest entries go first
+            overflow = len(self._entries) - self.max_entries
+            self._vectors = self._vectors[overflow:]
+            self._entries = self._entries[overflow:]
+        self._matrix = None
+
+    def nearest(self, vector: np.ndarray, signature: str, threshold: float) -> Optional[Tuple[Dict[str, Any], float]]:
+        now = time.time()
+        self._prune(now)
+        if not self._entries:
+            return None
+        if self._matrix is None:
+            self._matrix = np.vstack(self._vectors)
+
+        scores = self._matrix @ vector
+        for i in np.argsort(scores)[::-1]:
+            if scores[i] < threshold:
+                break
+            entry_signature, result, _ = self._entries[i]
+            if entry_signature == signature:
+                return result, float(scores[i])
+        return None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ClassificationCache:
+    """
+    Two-layer cache of ComplexityClassifier decisions, namespaced per bot.
+
+    1. Exact: Redis, keyed by the normalized text and a coarse context
+       signature (user, whether there is recent history, date), so every
+       process of a bot shares it.
+    2. Semantic: in-process nearest neighbour over the query embedding the
+       caller already computed. Only decisions without query extraction are
+       reused this way, since extracted names and dates belong to the
+       original wording.
+
+    Decisions carrying a HISTORY_DEPENDENT_INTENTS intent are never stored.
+
+    Both layers expire after CLASSIFICATION_CACHE_TTL_SECONDS.
+    """
+
+    def __init__(self):
+        self._indexes: Dict[str, _SemanticIndex] = {}
+        self.stats = ClassificationCacheStats()
+
+    @staticmethod
+    def context_signature(user_id: Optional[str], has_history: bool) -> str:
+        """
+        Coarse conversation state that changes how a message is classified:
+        the user, whether there is recent history, and the date (relative
+        time ranges are resolved against today).
+        """
+        history = "h" if has_history else "n"
+        return f"{user_id or '-'}:{history}:{time.strftime('%Y%m%d')}"
+
+    def signature_for(self, text: str, user_id: Optional[str], recent_history: List[BaseMessage]) -> Optional[str]:
+        """
+        Context signature for a message given the recent history the router
+        sees, or None if the message should bypass the cache. The classifier
+        and the replay script both key through here.
+        """
+        recent_user_messages = [str(m.content) for m in recent_history if isinstance(m, HumanMessage)]
+        if not self.cacheable(text, recent_user_messages, history_has_document_context(recent_history)):
+            return None
+        return self.context_signature(user_id, bool(recent_history))
+
+    @staticmethod
+    def _key(bot_name: str, signature: str, text: str) -> str:
+        digest = hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+        return f"classification:{bot_name}:{signature}:{digest}"
+
+    @staticmethod
+    def cacheable(text: str, recent_user_messages: Optional[List[str]] = None, has_documents: bool = False) -> bool:
+        """
+        Short messages, except document follow-ups (they depend on the uploaded
+        content) and repeats of a recent user message (repetition is what
+        looping detection looks for, so the router must see it).
+        """
+        if not settings.ENABLE_CLASSIFICATION_CACHE or has_documents:
+            return False
+        if not 0 < len(text.strip()) <= settings.CLASSIFICATION_CACHE_MAX_CHARS:
+            return False
+        normalized = normalize_text(text)
+        return not any(normalize_text(m) == normalized for m in recent_user_messages or [])
+
+    @staticmethod
+    def _unit(query_vector: List[float]) -> Optional[np.ndarray]:
+        vector = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    async def get(
+        self,
+        bot_name: str,
+        text: str,
+        signature: str,
+        query_vector: Optional[List[float]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Returns a cached decision (with a 'cache' field naming the layer) or None."""
+        cached = await cache_manager.get_json(self._key(bot_name, signature, text))
+        if cached is not None:
+            self.stats.exact_hits += 1
+            return {**cached, "cache": "exact"}
+
+        index = self._indexes.get(bot_name)
+        if index is not None and query_vector is not None:
+            vector = self._unit(query_vector)
+            match = index.nearest(vector, signature, settings.CLASSIFICATION_CACHE_SIMILARITY) if vector is not None else None
+            if match is not None:
+                self.stats.semantic_hits += 1
+                result, score = match
+                return {**result, "cache": "semantic", "cache_similarity": round(score, 4)}
+
+        self.stats.misses += 1
+        return None
+
+    async def put(
+        self,
+        bot_name: str,
+        text: str,
+        signature: str,
+        result: Dict[str, Any],
+        query_vector: Optional[List[float]] = None,
+    ) -> None:
+        if HISTORY_DEPENDENT_INTENTS.intersection(result.get("intents") or []):
+            return
+        ttl = settings.CLASSIFICATION_CACHE_TTL_SECONDS
+        self.stats.stores += 1
+        await cache_manager.set_json(self._key(bot_name, signature, text), result, ttl=ttl)
+
+        if query_vector is None or result.get("query"):
+            return
+        vector = self._unit(query_vector)
+        if vector is None:
+            return
+        index = self._indexes.get(bot_name)
+        if index is None:
+            index = self._indexes[bot_name] = _SemanticIndex(settings.CLASSIFICATION_CACHE_MAX_ENTRIES)
+        index.add(vector, signature, result, time.time() + ttl)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats.as_dict(), "semantic_entries": {bot: len(i) for bot, i in self._indexes.items()}}
+
+    def clear(self) -> None:
+        self._indexes.clear()
+        self.stats = ClassificationCacheStats()
+
+
+classification_cache = ClassificationCache()
@@ -7,6 +7,7 @@ from pydantic import BaseModel, Field
 from influxdb_client.client.write.point import Point
 
 from src_v2.agents.llm_factory import create_llm
+from src_v2.agents.classification_cache import classification_cache
 from src_v2.memory.manager import memory_manager
 from src_v2.knowledge.document_context import history_has_document_context
 from src_v2.config.settings import settings
@@ -63,7 +64,8 @@ def _record_classification_metric(
     used_trace: bool = False,
     trace_similarity: float = 0.0,
     has_documents: bool = False,
-    has_images: bool = False
+    has_images: bool = False,
+    cache_layer: Optional[str] = None
 ) -> None:
     """
     Records a classification decision to InfluxDB for observability.
@@ -72,6 +74,7 @@ def _record_classification_metric(
     - Classification distribution (how often each complexity level is used)
     - Intent detection patterns
     - Adaptive Depth effectiveness (trace reuse rate)
+    - Classification cache effectiveness (hits per layer)
     - Latency tracking
     """
     if not db_manager.influxdb_write_api:
@@ -85,6 +88,7 @@ def _record_classification_metric(
             .tag("has_documents", str(has_documents).lower()) \
             .tag("has_images", str(has_images).lower()) \
             .tag("used_trace", str(used_trace).lower()) \
+            .tag("cache", cache_layer or "none") \
             .field("message_length", message_length) \
             .field("history_length", history_length) \
             .field("classification_time_ms", classification_time_ms) \
@@ -116,11 +120,14 @@ class ComplexityClassifier:
         # Use 'router' mode for potentially faster/cheaper model, 0.0 temp for consistency
         self.llm = create_llm(temperature=0.0, mode="router")
 
-    async def classify(self, text: str, chat_history: Optional[List[BaseMessage]] = None, user_id: Optional[str] = None, bot_name: Optional[str] = None) -> Dict[str, Any]:
+    async def classify(self, text: str, chat_history: Optional[List[BaseMessage]] = None, user_id: Optional[str] = None, bot_name: Optional[str] = None, query_vector: Optional[List[float]] = None) -> Dict[str, Any]:
         """
         Classifies the input text as SIMPLE, COMPLEX (with granularity), or MANIPULATION.
         Also detects specific intents like 'voice' or 'image'.
         
+        query_vector, if given, is the embedding of `text` and is reused for the
+        reasoning-trace lookup instead of embedding the text again.
+        
         Returns a dictionary with 'complexity' and 'intents'.
         """
         start_time = time.time()
@@ -153,10 +160,39 @@ class ComplexityClassifier:
             except Exception as e:
                 logger.warning(f"Failed to check image session for refinement: {e}")
         
-        # 0b. Check for historical reasoning traces (Adaptive Depth)
+        # Limit history to last 4 messages (approx 2 turns) to keep context reasonable and fast
+        recent_history = chat_history[-4:] if chat_history else []
+        
+        # Check if recent history involves documents/files - boost complexity for follow-ups
+        history_has_documents = history_has_document_context(recent_history)
+        
+        # 0b. Reuse a cached decision for the same (or a near-identical) message from
+        # the same user. Checked before the trace search; trace-derived decisions are
+        # never stored, so a trace still wins whenever the router would have run.
+        cache_signature = classification_cache.signature_for(text, user_id, recent_history) if bot_name else None
+        if cache_signature:
+            try:
+                cached = await classification_cache.get(bot_name, text, cache_signature, query_vector)
+                if cached:
+                    _record_classification_metric(
+                        bot_name=bot_name,
+                        predicted=cached["complexity"],
+                        intents=cached.get("intents", []),
+                        message_length=message_length,
+                        history_length=history_length,
+                        classification_time_ms=(time.time() - start_time) * 1000,
+                        user_id=user_id,
+                        has_documents=history_has_documents,
+                        cache_layer=cached["cache"]
+                    )
+                    return cached
+            except Exception as e:
+                logger.warning(f"Failed to check classification cache: {e}")
+        
+        # 0c. Check for historical reasoning traces (Adaptive Depth)
         if user_id and bot_name:
             try:
-                traces = await memory_manager.search_reasoning_traces(text, user_id, limit=1, collection_name=f"whisperengine_memory_{bot_name}")
+                traces = await memory_manager.search_reasoning_traces(text, user_id, limit=1, collection_name=f"whisperengine_memory_{bot_name}", query_vector=query_vector)
                 if traces and traces[0]['score'] > 0.85: # High similarity threshold
                     trace = traces[0]
                     metadata = trace.get('metadata', {})
@@ -182,12 +218,6 @@ class ComplexityClassifier:
             except Exception as e:
                 logger.warning(f"Failed to check reasoning traces: {e}")
         
-        # Limit history to last 4 messages (approx 2 turns) to keep context reasonable and fast
-        recent_history = chat_history[-4:] if chat_history else []
-        
-        # Check if recent history involves documents/files - boost complexity for follow-ups
-        history_has_documents = history_has_document_context(recent_history)
-        
         history_text = ""
         for msg in recent_history:
             content = str(msg.content)
@@ -372,11 +402,17 @@ Return a JSON object with "complexity", "intents" (list of strings), and optiona
             if result.query:
                 logger.info(f"Query extraction: search_terms={result.query.search_terms}, time_range={result.query.time_range}, entity_names={result.query.entity_names}, memory_type={result.query.memory_type}")
             
-            return {
+            classification = {
                 "complexity": result.complexity,
                 "intents": result.intents,
                 "query": result.query.model_dump() if result.query else None
             }
+            if cache_signature:
+                try:
+                    await classification_cache.put(bot_name, text, cache_signature, classification, query_vector)
+                except Exception as e:
+                    logger.warning(f"Failed to cache classification: {e}")
+            return classification
             
         except Exception as e:
             logger.error(f"Classification failed: {e}")
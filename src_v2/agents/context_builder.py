@@ -313,14 +313,12 @@ Only attribute the message to {user_name} if it starts with "[{user_name}]:" or
         Uses GraphWalker to explore connections without LLM calls.
         """
         try:
-            # 1. Identify Entities
-            user_entities = await knowledge_manager.get_user_entities(user_id)
-            if not user_entities:
+            # 1. Identify Entities (one Aho-Corasick pass over the message)
+            matcher = await knowledge_manager.get_entity_matcher(user_id)
+            if not len(matcher):
                 return ""
                 
-            message_lower = user_message.lower()
-            # Simple string matching (can be improved with fuzzy matching later)
-            matches = [e for e in user_entities if e.lower() in message_lower]
+            matches = matcher.find(user_message)
             
             if not matches:
                 return ""
@@ -346,14 +344,17 @@ Only attribute the message to {user_name} if it starts with "[{user_name}]:" or
             context_lines = []
             seen_facts = set()
             
+            # Seeds aren't returned as walked nodes; their id is the entity name
+            names_by_id = {name: name for name in matches}
+            names_by_id.update({n.id: n.name for n in result.nodes})
+            
             for edge in result.edges:
-                # Find source and target nodes
-                source = next((n for n in result.nodes if n.id == edge.source_id), None)
-                target = next((n for n in result.nodes if n.id == edge.target_id), None)
+                source_name = names_by_id.get(edge.source_id)
+                target_name = names_by_id.get(edge.target_id)
                 
-                if source and target:
+                if source_name and target_name:
                     # Format: "Luna LIKES ocean"
-                    fact = f"{source.name} {edge.edge_type} {target.name}"
+                    fact = f"{source_name} {edge.edge_type} {target_name}"
                     if fact not in seen_facts:
                         context_lines.append(f"- {fact}")
                         seen_facts.add(fact)
@@ -1,10 +1,66 @@
 from typing import Optional, Any
+import httpx
 from langchain_openai import ChatOpenAI
 from langchain_core.language_models import BaseChatModel
 from loguru import logger
 
 from src_v2.config.settings import settings
 
+try:
+    import h2  # noqa: F401 - enables httpx HTTP/2 support
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+OPENAI_DEFAULT_BASE_URL = "https://api.openai.com/v1"
+
+# Chat models are immutable once built, so identical configurations share one
+# instance, and every model talking to the same endpoint shares one connection pool.
+_llm_cache: dict[tuple, ChatOpenAI] = {}
+_http_clients: dict[str, httpx.AsyncClient] = {}
+
+
+def _get_http_client(base_url: str) -> httpx.AsyncClient:
+    """Returns the pooled keep-alive client for an endpoint (HTTP/2 for https when h2 is installed)."""
+    client = _http_clients.get(base_url)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=HAS_HTTP2 and base_url.startswith("https://"),
+            limits=httpx.Limits(
+                max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+                keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_SECONDS,
+            ),
+        )
+        _http_clients[base_url] = client
+    return client
+
+
+def _cached_chat_model(provider: str, mode: str, kwargs: dict[str, Any]) -> ChatOpenAI:
+    """Returns the shared ChatOpenAI for this configuration, building it on first use."""
+    key = (
+        provider, mode, kwargs["model"], kwargs["temperature"], kwargs.get("base_url"),
+        kwargs.get("max_tokens"), kwargs["request_timeout"], repr(kwargs.get("model_kwargs")),
+    )
+    llm = _llm_cache.get(key)
+    if llm is None:
+        reasoning_config = kwargs.get("model_kwargs")
+        logger.info(f"Initializing LLM ({mode}): {provider} ({kwargs['model']}) Temp: {kwargs['temperature']}" +
+                    (f" Reasoning: {reasoning_config}" if reasoning_config else ""))
+        http_client = _get_http_client(kwargs.get("base_url") or OPENAI_DEFAULT_BASE_URL)
+        llm = ChatOpenAI(**kwargs, http_async_client=http_client)
+        _llm_cache[key] = llm
+    return llm
+
+
+async def close_llm_clients() -> None:
+    """Closes the pooled HTTP clients (call on shutdown)."""
+    clients = list(_http_clients.values())
+    _http_clients.clear()
+    _llm_cache.clear()
+    for client in clients:
+        await client.aclose()
+
 
 def _build_reasoning_config(
     enabled: bool,
@@ -66,6 +122,9 @@ def create_llm(
     Creates a LangChain Chat Model based on the configuration.
     Supports: openai, openrouter, ollama, lmstudio
     
+    Models are cached per configuration and share one pooled HTTP client per
+    base URL, so calling this on every turn does not open new connections.
+    
     All providers support tool/function calling via OpenAI-compatible endpoints.
     
     LOCAL PROVIDERS:
@@ -158,9 +217,6 @@ def create_llm(
         exclude=_reasoning_exclude
     )
 
-    logger.info(f"Initializing LLM ({mode}): {provider} ({_model}) Temp: {temp}" + 
-                (f" Reasoning: {reasoning_config}" if reasoning_config else ""))
-
     # Determine timeout: local models get longer timeout (they're slower)
     is_local = provider in ["lmstudio", "ollama"]
     timeout = request_timeout or (180 if is_local else 60)
@@ -178,7 +234,7 @@ def create_llm(
             kwargs["max_tokens"] = max_tokens
         if reasoning_config:
             kwargs["model_kwargs"] = reasoning_config
-        return ChatOpenAI(**kwargs)
+        return _cached_chat_model(provider, mode, kwargs)
     
     elif provider == "openrouter":
         # OpenRouter is OpenAI-compatible
@@ -199,7 +255,7 @@ def create_llm(
             kwargs["max_tokens"] = max_tokens
         if reasoning_config:
             kwargs["model_kwargs"] = reasoning_config
-        return ChatOpenAI(**kwargs)
+        return _cached_chat_model(provider, mode, kwargs)
         
     elif provider == "lmstudio":
         # LM Studio is OpenAI-compatible with native tool support
@@ -214,7 +270,7 @@ def create_llm(
         if max_tokens:
             kwargs["max_tokens"] = max_tokens
         # Note: Local models typically don't support reasoning mode
-        return ChatOpenAI(**kwargs)
+        return _cached_chat_model(provider, mode, kwargs)
     
     elif provider == "ollama":
         # Ollama via OpenAI-compatible endpoint with native tool support
@@ -231,7 +287,7 @@ def create_llm(
         }
         if max_tokens:
             kwargs["max_tokens"] = max_tokens
-        return ChatOpenAI(**kwargs)
+        return _cached_chat_model(provider, mode, kwargs)
     
     else:
         raise ValueError(f"Unsupported LLM provider: {provider}. Supported: openai, openrouter, ollama, lmstudio")
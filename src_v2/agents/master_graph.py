@@ -39,6 +39,7 @@ class SuperGraphState(TypedDict):
     
     # Internal Processing
     classification: Optional[Dict[str, Any]] # {complexity: str, intents: List[str]}
+    query_vector: Optional[List[float]] # Embedding of user_input, computed once per turn
     context: Optional[Dict[str, Any]] # {memories, facts, trust, goals, evolution, diary, dream, knowledge, known_bots, stigmergy}
     system_prompt: Optional[str]
     
@@ -145,6 +146,9 @@ class MasterGraphAgent:
         else:
             search_query = user_input
         
+        # Reuse the turn's embedding when searching with the raw input
+        query_vector = state.get("query_vector") if search_query == user_input else None
+        
         # Extract time range filter if present
         time_range = query_extraction.get("time_range") if query_extraction else None
         
@@ -160,12 +164,14 @@ class MasterGraphAgent:
             memories = prefetched_memories
         else:
             # Use extracted search_query instead of raw user_input
+            # User and broadcast lookups share one embedding and one Qdrant batch query
             collection_name = f"whisperengine_memory_{character.name}" if character.name else None
-            tasks["user_memories"] = memory_manager.search_memories(
-                search_query, user_id, limit=5, collection_name=collection_name, time_range=time_range
-            )
-            tasks["broadcast_memories"] = memory_manager.search_memories(
-                search_query, "__broadcast__", limit=2, collection_name=collection_name, time_range=time_range
+            tasks["memories"] = memory_manager.search_memories_batch(
+                search_query,
+                [(user_id, 5), ("__broadcast__", 2)],
+                collection_name=collection_name,
+                time_range=time_range,
+                query_vector=query_vector
             )
 
         # 2. Evolution (Trust, Mood, Feedback)
@@ -231,15 +237,15 @@ class MasterGraphAgent:
             result = results[i]
             if isinstance(result, Exception):
                 logger.error(f"Context fetch failed for {key}: {result}")
-                if key in ["user_memories", "broadcast_memories"]:
+                if key == "memories":
                     pass # memories will be empty
                 else:
                     context_results[key] = "" # Default to empty string
             else:
-                if key == "user_memories":
-                    user_memories.extend(result)
-                elif key == "broadcast_memories":
-                    broadcast_memories.extend(result)
+                if key == "memories":
+                    user_results, broadcast_results = result
+                    user_memories.extend(user_results)
+                    broadcast_memories.extend(broadcast_results)
                 else:
                     context_results[key] = result
 
@@ -273,13 +279,22 @@ class MasterGraphAgent:
 
     async def classifier_node(self, state: SuperGraphState):
         """Determines complexity and intent."""
+        # Embed the input once; the trace lookup here and the memory searches in
+        # context_node reuse it through the graph state
+        query_vector = None
+        try:
+            query_vector = await memory_manager.embedding_service.embed_query_async(state["user_input"])
+        except Exception as e:
+            logger.warning(f"Failed to embed user input for this turn: {e}")
+        
         result = await self.classifier.classify(
             text=state["user_input"],
             chat_history=state["chat_history"],
             user_id=state["user_id"],
-            bot_name=state["character"].name
+            bot_name=state["character"].name,
+            query_vector=query_vector
         )
-        return {"classification": result}
+        return {"classification": result, "query_vector": query_vector}
 
     async def prompt_builder_node(self, state: SuperGraphState):
         """Constructs the system prompt using gathered context."""
@@ -489,12 +489,15 @@ async def save_reflection_output(
             
             await conn.execute("""
                 UPDATE v2_user_relationships
-                SET insights = $1, updated_at = NOW()
+                SET insights = $1, version = version + 1, updated_at = NOW()
                 WHERE user_id = $2 AND character_name = $3
             """, json.dumps(existing_insights), user_id, character_name)
             
             logger.info(f"Updated insights for user {user_id}: {len(output.insights)} new insights")
             
+            from src_v2.evolution.trust import trust_manager
+            await trust_manager.refresh_relationship(user_id, character_name)
+            
             # 2. Save inferred goals
             if output.inferred_goals:
                 expires_at = datetime.now() + timedelta(days=14)
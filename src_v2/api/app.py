@@ -17,6 +17,7 @@ from src_v2.api.routes import router
 from src_v2.api.internal_routes import router as internal_router
 from src_v2.config.settings import settings
 from src_v2.core.database import db_manager
+from src_v2.core.cache import cache_manager
 from src_v2.memory.manager import memory_manager
 from src_v2.knowledge.manager import knowledge_manager
 from src_v2.core.character import character_manager
@@ -27,6 +28,7 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Initializing API resources (Worker Mode)...")
     await db_manager.connect_all()
+    await cache_manager.start_invalidation_listener()
     await memory_manager.initialize()
     await knowledge_manager.initialize()
     await universe_manager.initialize()
@@ -40,6 +42,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down API resources...")
+    await cache_manager.stop_invalidation_listener()
     await db_manager.disconnect_all()
 
 
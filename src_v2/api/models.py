@@ -76,6 +76,39 @@ class ChatResponse(BaseModel):
     )
 
 
+class ChatStreamMetadata(BaseModel):
+    """Payload of the final `metadata` event of the streaming chat endpoint."""
+
+    success: bool = Field(
+        ...,
+        description="Whether the response was generated completely."
+    )
+    timestamp: datetime = Field(
+        ...,
+        description="ISO 8601 timestamp of the end of the stream."
+    )
+    bot_name: str = Field(
+        ...,
+        description="Name of the character that responded."
+    )
+    processing_time_ms: float = Field(
+        ...,
+        description="Time from request to the end of generation in milliseconds."
+    )
+    first_token_ms: Optional[float] = Field(
+        default=None,
+        description="Time from request to the first token event in milliseconds."
+    )
+    response_length: int = Field(
+        ...,
+        description="Length of the streamed response in characters."
+    )
+    memory_stored: bool = Field(
+        default=True,
+        description="Whether the interaction will be stored in memory. Storage happens after the stream closes."
+    )
+
+
 class HealthResponse(BaseModel):
     """Response model for the health check endpoint."""
     
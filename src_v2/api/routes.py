@@ -5,8 +5,10 @@ This module defines the REST API endpoints for interacting with WhisperEngine ch
 """
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from src_v2.api.models import (
-    ChatRequest, ChatResponse, HealthResponse,
+    ChatRequest, ChatResponse, ChatStreamMetadata, HealthResponse,
     DiagnosticsResponse, UserStateRequest, UserStateResponse,
     ConversationRequest, ConversationResponse, ConversationTurn,
     ClearUserDataRequest, ClearUserDataResponse,
@@ -22,9 +24,12 @@ from src_v2.evolution.trust import trust_manager
 from src_v2.knowledge.manager import knowledge_manager
 from src_v2.knowledge.walker import GraphWalker
 from src_v2.universe.context_builder import universe_context_builder
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Tuple
 import time
 import asyncio
+import json
 from loguru import logger
 
 router = APIRouter(tags=["chat"])
@@ -32,6 +37,157 @@ agent_engine = AgentEngine()
 _start_time = time.time()  # Track uptime
 
 
+def _load_character() -> Tuple[str, Any]:
+    """Returns (bot_name, character) for this bot instance, or raises a 500."""
+    bot_name = settings.DISCORD_BOT_NAME
+    if not bot_name:
+        raise HTTPException(status_code=500, detail="Bot name not configured")
+        
+    character = character_manager.get_character(bot_name)
+    if not character:
+        raise HTTPException(status_code=500, detail=f"Character {bot_name} not found")
+    return bot_name, character
+
+
+async def _prepare_chat_context(request: ChatRequest, bot_name: str) -> Tuple[str, List[Any], Dict[str, Any], str]:
+    """
+    Resolves the session and fetches conversation context in parallel (matching
+    the Discord handler).
+    
+    Returns:
+        (session_id, chat_history, context_variables, user_name)
+    """
+    # 0. Session Management (Match Discord behavior)
+    session_id = await session_manager.get_active_session(request.user_id, bot_name)
+    if not session_id:
+        session_id = await session_manager.create_session(request.user_id, bot_name)
+
+    # 1. Parallel Context Fetching (Match Discord behavior)
+    # Define async getters for parallel execution
+
+    async def get_memories():
+        try:
+            mems = await memory_manager.search_memories(request.message, request.user_id)
+            if mems:
+                # Simple formatting for Fast Mode fallback
+                fmt = "\\n".join([f"- {m.get('content', '')}" for m in mems])
+                return mems, fmt
+            return [], "No relevant memories found."
+        except Exception as e:
+            logger.error(f"API memory search failed: {e}")
+            return [], ""
+
+    async def get_history():
+        try:
+            # API is always 1:1 - don't use channel_id which would share history across API users
+            return await memory_manager.get_recent_history(request.user_id, bot_name, channel_id=None)
+        except Exception as e:
+            logger.error(f"API history fetch failed: {e}")
+            return []
+
+    async def get_knowledge():
+        try:
+            facts = await knowledge_manager.get_user_knowledge(request.user_id)
+            if "name" not in facts.lower():
+                # Try to get name from context or default
+                user_name = request.context.get("user_name", request.user_id) if request.context else request.user_id
+                facts += f"\\n- User's Name: {user_name}"
+            return facts
+        except Exception as e:
+            logger.error(f"API knowledge fetch failed: {e}")
+            return ""
+
+    async def get_summaries():
+        try:
+            sums = await memory_manager.search_summaries(request.message, request.user_id, limit=3)
+            if sums:
+                return "\\n".join([f"- {s['content']} (Meaningfulness: {s['meaningfulness']}, {s.get('relative_time', 'unknown time')})" for s in sums])
+            return ""
+        except Exception as e:
+            logger.error(f"API summaries fetch failed: {e}")
+            return ""
+
+    async def get_universe_context():
+        try:
+            # API users are "remote" or in a virtual location
+            return await universe_context_builder.build_context(request.user_id, "api_guild", "api_chat", bot_name)
+        except Exception as e:
+            logger.error(f"API universe context fetch failed: {e}")
+            return "Location: Unknown (API)"
+
+    async def get_user_nickname():
+        try:
+            trust_data = await trust_manager.get_relationship_level(request.user_id, bot_name)
+            preferences = trust_data.get('preferences', {})
+            return preferences.get('nickname') 
+        except Exception as e:
+            logger.debug(f"API nickname fetch failed: {e}")
+            return None
+
+    # Execute all fetches in parallel
+    (memories, formatted_memories), chat_history, knowledge_facts, past_summaries, universe_context, preferred_nickname = await asyncio.gather(
+        get_memories(),
+        get_history(),
+        get_knowledge(),
+        get_summaries(),
+        get_universe_context(),
+        get_user_nickname()
+    )
+
+    user_name = preferred_nickname or (request.context.get("user_name", request.user_id) if request.context else request.user_id)
+
+    # 2. Build context variables
+    context = request.context or {}
+    context.update({
+        "prefetched_memories": memories,
+        "prefetched_knowledge": knowledge_facts,
+        "memory_context": formatted_memories, # For Fast Mode
+        "knowledge_context": knowledge_facts,  # For Fast Mode
+        "past_summaries": past_summaries,
+        "universe_context": universe_context,
+        "user_name": user_name # Ensure nickname is used
+    })
+    return session_id, chat_history, context, user_name
+
+
+async def _save_user_message(request: ChatRequest, bot_name: str, user_name: str, session_id: str) -> None:
+    try:
+        await memory_manager.add_message(
+            user_id=request.user_id,
+            character_name=bot_name,
+            role='human',
+            content=request.message,
+            user_name=user_name,
+            channel_id="api_chat", # Virtual channel for API
+            message_id=f"api_{int(time.time()*1000)}", # Virtual message ID
+            session_id=session_id,
+            author_id=request.user_id,
+            author_name=user_name,
+            author_is_bot=False
+        )
+    except Exception as e:
+        logger.error(f"Failed to save API message to memory: {e}")
+
+
+async def _save_ai_response(request: ChatRequest, bot_name: str, response_text: str, session_id: str) -> None:
+    try:
+        await memory_manager.add_message(
+            user_id=request.user_id,
+            character_name=bot_name,
+            role='ai',
+            content=response_text,
+            user_name=bot_name,
+            channel_id="api_chat",
+            message_id=f"api_resp_{int(time.time()*1000)}",
+            session_id=session_id,
+            author_id=bot_name, # Bot ID would be better but name works for now
+            author_name=bot_name,
+            author_is_bot=True
+        )
+    except Exception as e:
+        logger.error(f"Failed to save API response to memory: {e}")
+
+
 @router.post(
     "/api/chat",
     response_model=ChatResponse,
@@ -66,129 +222,20 @@ async def chat_endpoint(request: ChatRequest) -> ChatResponse:
     start_time = time.time()
     
     # Load character
-    bot_name = settings.DISCORD_BOT_NAME
-    if not bot_name:
-        raise HTTPException(status_code=500, detail="Bot name not configured")
-        
-    character = character_manager.get_character(bot_name)
-    if not character:
-        raise HTTPException(status_code=500, detail=f"Character {bot_name} not found")
+    bot_name, character = _load_character()
 
     try:
-        # 0. Session Management (Match Discord behavior)
-        session_id = await session_manager.get_active_session(request.user_id, bot_name)
-        if not session_id:
-            session_id = await session_manager.create_session(request.user_id, bot_name)
-
-        # 1. Parallel Context Fetching (Match Discord behavior)
-        # Define async getters for parallel execution
-        
-        async def get_memories():
-            try:
-                mems = await memory_manager.search_memories(request.message, request.user_id)
-                if mems:
-                    # Simple formatting for Fast Mode fallback
-                    fmt = "\\n".join([f"- {m.get('content', '')}" for m in mems])
-                    return mems, fmt
-                return [], "No relevant memories found."
-            except Exception as e:
-                logger.error(f"API memory search failed: {e}")
-                return [], ""
-
-        async def get_history():
-            try:
-                # API is always 1:1 - don't use channel_id which would share history across API users
-                return await memory_manager.get_recent_history(request.user_id, bot_name, channel_id=None)
-            except Exception as e:
-                logger.error(f"API history fetch failed: {e}")
-                return []
-
-        async def get_knowledge():
-            try:
-                facts = await knowledge_manager.get_user_knowledge(request.user_id)
-                if "name" not in facts.lower():
-                    # Try to get name from context or default
-                    user_name = request.context.get("user_name", request.user_id) if request.context else request.user_id
-                    facts += f"\\n- User's Name: {user_name}"
-                return facts
-            except Exception as e:
-                logger.error(f"API knowledge fetch failed: {e}")
-                return ""
-
-        async def get_summaries():
-            try:
-                sums = await memory_manager.search_summaries(request.message, request.user_id, limit=3)
-                if sums:
-                    return "\\n".join([f"- {s['content']} (Meaningfulness: {s['meaningfulness']}, {s.get('relative_time', 'unknown time')})" for s in sums])
-                return ""
-            except Exception as e:
-                logger.error(f"API summaries fetch failed: {e}")
-                return ""
-
-        async def get_universe_context():
-            try:
-                # API users are "remote" or in a virtual location
-                return await universe_context_builder.build_context(request.user_id, "api_guild", "api_chat", bot_name)
-            except Exception as e:
-                logger.error(f"API universe context fetch failed: {e}")
-                return "Location: Unknown (API)"
-
-        async def get_user_nickname():
-            try:
-                trust_data = await trust_manager.get_relationship_level(request.user_id, bot_name)
-                preferences = trust_data.get('preferences', {})
-                return preferences.get('nickname') 
-            except Exception as e:
-                logger.debug(f"API nickname fetch failed: {e}")
-                return None
-
-        # Execute all fetches in parallel
-        (memories, formatted_memories), chat_history, knowledge_facts, past_summaries, universe_context, preferred_nickname = await asyncio.gather(
-            get_memories(),
-            get_history(),
-            get_knowledge(),
-            get_summaries(),
-            get_universe_context(),
-            get_user_nickname()
-        )
+        # 1. Session and parallel context fetching (Match Discord behavior)
+        session_id, chat_history, context, user_name = await _prepare_chat_context(request, bot_name)
 
         # 2. Save User Message (Match Discord behavior)
-        user_name = preferred_nickname or (request.context.get("user_name", request.user_id) if request.context else request.user_id)
-        
-        try:
-            await memory_manager.add_message(
-                user_id=request.user_id,
-                character_name=bot_name,
-                role='human',
-                content=request.message,
-                user_name=user_name,
-                channel_id="api_chat", # Virtual channel for API
-                message_id=f"api_{int(time.time()*1000)}", # Virtual message ID
-                session_id=session_id,
-                author_id=request.user_id,
-                author_name=user_name,
-                author_is_bot=False
-            )
-        except Exception as e:
-            logger.error(f"Failed to save API message to memory: {e}")
-
-        # 3. Update context variables
-        context = request.context or {}
-        context.update({
-            "prefetched_memories": memories,
-            "prefetched_knowledge": knowledge_facts,
-            "memory_context": formatted_memories, # For Fast Mode
-            "knowledge_context": knowledge_facts,  # For Fast Mode
-            "past_summaries": past_summaries,
-            "universe_context": universe_context,
-            "user_name": user_name # Ensure nickname is used
-        })
+        await _save_user_message(request, bot_name, user_name, session_id)
 
         # Determine mode override
         force_fast = request.force_mode == "fast"
         force_reflective = request.force_mode == "reflective"
         
-        # 4. Generate response with metadata
+        # 3. Generate response with metadata
         result = await agent_engine.generate_response(
             character=character,
             user_message=request.message,
@@ -203,23 +250,8 @@ async def chat_endpoint(request: ChatRequest) -> ChatResponse:
         # Extract response text
         response_text = result.response if hasattr(result, "response") else str(result)
         
-        # 5. Save AI Response (Match Discord behavior)
-        try:
-            await memory_manager.add_message(
-                user_id=request.user_id,
-                character_name=bot_name,
-                role='ai',
-                content=response_text,
-                user_name=bot_name,
-                channel_id="api_chat",
-                message_id=f"api_resp_{int(time.time()*1000)}",
-                session_id=session_id,
-                author_id=bot_name, # Bot ID would be better but name works for now
-                author_name=bot_name,
-                author_is_bot=True
-            )
-        except Exception as e:
-            logger.error(f"Failed to save API response to memory: {e}")
+        # 4. Save AI Response (Match Discord behavior)
+        await _save_ai_response(request, bot_name, response_text, session_id)
 
         processing_time = (time.time() - start_time) * 1000
         
@@ -240,6 +272,161 @@ async def chat_endpoint(request: ChatRequest) -> ChatResponse:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Formats one server-sent event; data is JSON so newlines in text stay within one data line."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@dataclass
+class _StreamedTurn:
+    """What a streaming request produced, read by the post-stream memory write."""
+    chunks: List[str] = field(default_factory=list)
+    completed: bool = False
+
+    @property
+    def text(self) -> str:
+        return "".join(self.chunks)
+
+
+async def _persist_streamed_turn(
+    request: ChatRequest,
+    bot_name: str,
+    user_name: str,
+    session_id: str,
+    turn: _StreamedTurn
+) -> None:
+    """Stores the exchange once the stream has closed (runs as a response background task)."""
+    await _save_user_message(request, bot_name, user_name, session_id)
+    # A response cut short by an error or a disconnect is not remembered
+    if turn.completed and turn.text:
+        await _save_ai_response(request, bot_name, turn.text, session_id)
+
+
+async def _stream_chat_events(
+    request: ChatRequest,
+    bot_name: str,
+    character: Any,
+    chat_history: List[Any],
+    context: Dict[str, Any],
+    turn: _StreamedTurn,
+    start_time: float
+) -> AsyncIterator[str]:
+    """
+    Runs generate_response_stream and yields its output as SSE events.
+
+    Status updates the engine reports through its callback (reasoning steps,
+    tool use) and text chunks share one queue, so both reach the client as
+    soon as they are produced.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def on_status(text: str) -> None:
+        await queue.put(("status", text))
+
+    async def produce() -> None:
+        try:
+            async for chunk in agent_engine.generate_response_stream(
+                character=character,
+                user_message=request.message,
+                chat_history=chat_history,
+                context_variables=context,
+                user_id=request.user_id,
+                callback=on_status,
+                force_reflective=request.force_mode == "reflective",
+                force_fast=request.force_mode == "fast"
+            ):
+                await queue.put(("token", chunk))
+            await queue.put(("done", None))
+        except Exception as e:
+            logger.exception("Error streaming chat response")
+            await queue.put(("error", str(e)))
+
+    producer = asyncio.create_task(produce())
+    first_token_ms = None
+    try:
+        while True:
+            kind, text = await queue.get()
+            if kind == "done":
+                break
+            if kind == "error":
+                yield _sse_event("error", {"detail": text})
+                return
+            if kind == "token":
+                if not text:
+                    continue
+                if first_token_ms is None:
+                    first_token_ms = (time.time() - start_time) * 1000
+                turn.chunks.append(text)
+            yield _sse_event(kind, {"text": text})
+
+        turn.completed = True
+        metadata = ChatStreamMetadata(
+            success=True,
+            timestamp=datetime.now(),
+            bot_name=bot_name,
+            processing_time_ms=(time.time() - start_time) * 1000,
+            first_token_ms=first_token_ms,
+            response_length=len(turn.text),
+            memory_stored=bool(turn.text)
+        )
+        yield _sse_event("metadata", metadata.model_dump(mode="json"))
+    finally:
+        # Client disconnected or the stream ended: stop generating
+        producer.cancel()
+
+
+@router.post(
+    "/api/chat/stream",
+    summary="Send a message and stream the character's response",
+    description="""
+    Same as `/api/chat`, but the response is streamed as server-sent events
+    (`text/event-stream`) while it is generated:
+
+    - `status`: progress updates (reasoning steps, tool usage), `{"text": ...}`
+    - `token`: a chunk of the response text, `{"text": ...}`
+    - `metadata`: sent once after the last token (see `ChatStreamMetadata`)
+    - `error`: generation failed, `{"detail": ...}`; no metadata follows
+
+    The message and the response are stored in memory after the stream closes.
+    """,
+    responses={
+        200: {"description": "Event stream of the character's response", "content": {"text/event-stream": {}}},
+        500: {"description": "Server error (character not found, context fetch failed, etc.)"}
+    }
+)
+async def chat_stream_endpoint(request: ChatRequest) -> StreamingResponse:
+    """
+    Process a chat message and stream the AI character response as SSE.
+
+    Args:
+        request: The chat request containing user_id, message, and optional context.
+
+    Returns:
+        StreamingResponse of server-sent events; memory is persisted in a
+        background task once the stream has closed.
+
+    Raises:
+        HTTPException: If the bot is not configured, the character is not found,
+            or context fetching fails before the stream starts.
+    """
+    start_time = time.time()
+    bot_name, character = _load_character()
+
+    try:
+        session_id, chat_history, context, user_name = await _prepare_chat_context(request, bot_name)
+    except Exception as e:
+        logger.exception("Error preparing streaming chat request")
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+    turn = _StreamedTurn()
+    return StreamingResponse(
+        _stream_chat_events(request, bot_name, character, chat_history, context, turn, start_time),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(_persist_streamed_turn, request, bot_name, user_name, session_id, turn)
+    )
+
+
 @router.get(
     "/health",
     response_model=HealthResponse,
@@ -478,9 +665,10 @@ async def clear_user_data(request: ClearUserDataRequest) -> ClearUserDataRespons
             async with db_manager.postgres_pool.acquire() as conn:
                 await conn.execute("""
                     UPDATE v2_user_relationships 
-                    SET trust_score = 0, unlocked_traits = '[]'::jsonb
+                    SET trust_score = 0, unlocked_traits = '[]'::jsonb, version = version + 1
                     WHERE user_id = $1 AND character_name = $2
                 """, user_id, bot_name)
+            await trust_manager.refresh_relationship(user_id, bot_name)
             trust_reset = True
         except Exception as e:
             logger.error(f"Failed to reset trust: {e}")
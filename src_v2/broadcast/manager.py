@@ -34,6 +34,11 @@ class PostType(str, Enum):
     REACTION = "reaction"
 
 
+# Sorted set of broadcast records (JSON members scored by post time)
+RECENT_BROADCASTS_KEY = "broadcasts:recent"
+RECENT_BROADCASTS_TTL = 86400
+
+
 # Emoji prefixes for different post types
 POST_PREFIXES = {
     PostType.DIARY: "📓",
@@ -435,31 +440,25 @@ class BroadcastManager:
     ) -> None:
         """Store broadcast record in Redis for cross-bot discovery."""
         try:
+            now = datetime.now(timezone.utc)
             broadcast_data = {
                 "message_id": str(message.id),
                 "channel_id": str(message.channel.id),
                 "character_name": character_name,
                 "post_type": post_type.value,
                 "content": content,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": now.isoformat(),
                 "provenance": provenance or []
             }
             
-            # Store with 24h TTL
-            key = f"broadcast:{character_name}:{message.id}"
-            await self._cache.set_json(key, broadcast_data, ttl=86400)
-            
-            # Also add to a sorted set for chronological retrieval
-            await self._cache.zadd(
-                "broadcasts:recent",
-                {key: datetime.now(timezone.utc).timestamp()}
-            )
-            
-            # Trim old entries
-            await self._cache.zremrangebyscore(
-                "broadcasts:recent",
-                "-inf",
-                (datetime.now(timezone.utc) - timedelta(hours=24)).timestamp()
+            # The record itself is the sorted-set member, so readers need no
+            # per-post lookups. Add, trim entries older than 24h and refresh the
+            # set's TTL in one round-trip.
+            await self._cache.zadd_bounded(
+                RECENT_BROADCASTS_KEY,
+                {json.dumps(broadcast_data): now.timestamp()},
+                min_score=(now - timedelta(seconds=RECENT_BROADCASTS_TTL)).timestamp(),
+                ttl=RECENT_BROADCASTS_TTL
             )
             
         except Exception as e:
@@ -474,6 +473,9 @@ class BroadcastManager:
         """
         Get recent broadcasts for cross-bot discovery.
         
+        Costs one Redis round-trip (two while pre-inline key members from
+        older deployments are still within the 24h window), whatever the limit.
+        
         Args:
             exclude_character: Exclude posts from this character
             hours: Look back this many hours
@@ -483,57 +485,49 @@ class BroadcastManager:
             List of BroadcastPost objects, newest first
         """
         try:
-            # Get recent broadcast keys
             cutoff = (datetime.now(timezone.utc) - timedelta(hours=hours)).timestamp()
-            keys = await self._cache.zrangebyscore(
-                "broadcasts:recent",
+            members = await self._cache.zrevrangebyscore(
+                RECENT_BROADCASTS_KEY,
+                "+inf",
                 cutoff,
-                "+inf"
+                limit=limit
             )
             
+            records: List[Optional[Dict[str, Any]]] = []
+            legacy_keys: List[str] = []
+            for member in members:
+                if member.startswith("{"):
+                    records.append(json.loads(member))
+                    continue
+                # Older deployments stored `broadcast:{character}:{id}` keys as
+                # members (sometimes already prefixed) with the body under that key
+                if member.startswith(settings.REDIS_KEY_PREFIX):
+                    member = member[len(settings.REDIS_KEY_PREFIX):]
+                legacy_keys.append(member)
+                records.append(None)
+            
+            if legacy_keys:
+                legacy_records = iter(await self._cache.get_json_many(legacy_keys))
+                records = [r if r is not None else next(legacy_records) for r in records]
+            
             posts = []
-            for key in keys[-limit:]:  # Take most recent
-                # Key stored in zset might be prefixed or not depending on how it was stored
-                # But CacheManager handles prefixing for us.
-                # Wait, the key stored IN the zset is the full key (e.g. "whisperengine:broadcast:...")?
-                # In _store_broadcast, we stored `key` which was `f"broadcast:{character_name}:{message.id}"`
-                # passed to `set_json`. `set_json` prefixes it.
-                # But we passed `key` to `zadd` as the member.
-                # So the member in zset is "broadcast:..." (unprefixed).
-                # So we can just pass it to `get_json`.
-                
-                # However, if the old code stored it with `_redis_key`, it stored the PREFIXED key in the zset.
-                # Old code: `key = _redis_key(...)` -> `zadd(..., {key: ...})`.
-                # So the zset contains "whisperengine:broadcast:...".
-                # If we pass "whisperengine:broadcast:..." to `self._cache.get_json`, it will double prefix!
-                # "whisperengine:whisperengine:broadcast:..."
-                
-                # We need to handle this migration or just strip prefix.
-                # Since this is a refactor, we should assume keys might be mixed or we just strip prefix.
+            for broadcast in records:
+                if not broadcast:
+                    continue
                 
-                # Let's strip the prefix if present before passing to get_json
-                clean_key = key
-                if key.startswith(settings.REDIS_KEY_PREFIX):
-                    clean_key = key[len(settings.REDIS_KEY_PREFIX):]
+                # Skip if from excluded character
+                if exclude_character and broadcast["character_name"] == exclude_character:
+                    continue
                 
-                data = await self._cache.get_json(clean_key)
-                if data:
-                    # data is already a dict from get_json
-                    broadcast = data
-                    
-                    # Skip if from excluded character
-                    if exclude_character and broadcast["character_name"] == exclude_character:
-                        continue
-                    
-                    posts.append(BroadcastPost(
-                        message_id=broadcast["message_id"],
-                        channel_id=broadcast["channel_id"],
-                        character_name=broadcast["character_name"],
-                        post_type=PostType(broadcast["post_type"]),
-                        content=broadcast["content"],
-                        timestamp=datetime.fromisoformat(broadcast["timestamp"]),
-                        provenance=broadcast.get("provenance")
-                    ))
+                posts.append(BroadcastPost(
+                    message_id=broadcast["message_id"],
+                    channel_id=broadcast["channel_id"],
+                    character_name=broadcast["character_name"],
+                    post_type=PostType(broadcast["post_type"]),
+                    content=broadcast["content"],
+                    timestamp=datetime.fromisoformat(broadcast["timestamp"]),
+                    provenance=broadcast.get("provenance")
+                ))
             
             # Sort newest first
             posts.sort(key=lambda p: p.timestamp, reverse=True)
@@ -70,6 +70,17 @@ class Settings(BaseSettings):
     ROUTER_LLM_BASE_URL: Optional[str] = None
     ROUTER_LLM_MODEL_NAME: Optional[str] = None
     
+    # --- LLM HTTP Connection Pool (shared per base URL) ---
+    LLM_HTTP_MAX_CONNECTIONS: int = 50
+    LLM_HTTP_KEEPALIVE_SECONDS: float = 60.0  # Idle keep-alive connections are closed after this
+    
+    # --- Complexity Classification Cache (per bot) ---
+    ENABLE_CLASSIFICATION_CACHE: bool = True
+    CLASSIFICATION_CACHE_TTL_SECONDS: int = 1800
+    CLASSIFICATION_CACHE_SIMILARITY: float = 0.95  # Min cosine similarity for a semantic (nearest-neighbour) hit
+    CLASSIFICATION_CACHE_MAX_ENTRIES: int = 2000  # Semantic entries kept in memory per bot
+    CLASSIFICATION_CACHE_MAX_CHARS: int = 280  # Longer messages are rarely repeated and always classified fresh
+    
     # --- Worker Configuration ---
     # For local LLMs (lmstudio, ollama) with single GPU, set to 1 to prevent OOM
     # For cloud LLMs, higher values (3-5) allow parallel job processing
@@ -108,11 +119,46 @@ class Settings(BaseSettings):
     INFLUXDB_TOKEN: SecretStr = Field(default=SecretStr("my-super-secret-auth-token"))
     INFLUXDB_ORG: str = Field(default="whisperengine")
     INFLUXDB_BUCKET: str = Field(default="metrics")
+    METRICS_BUFFER_MAX_POINTS: int = Field(default=10000, description="Points held in the metrics ring buffer before the oldest are dropped")
+    METRICS_FLUSH_BATCH_SIZE: int = Field(default=500, description="Flush to InfluxDB as soon as this many points are buffered (and cap each request at this size)")
+    METRICS_FLUSH_INTERVAL_SECONDS: float = Field(default=1.0, description="Max time a metrics point waits in the buffer before a flush")
     
     # Redis (Caching)
     REDIS_URL: str = Field(default="redis://localhost:6379/0")
     REDIS_KEY_PREFIX: str = Field(default="whisper:", description="Prefix for all Redis keys to avoid collisions")
-    
+
+    # --- Cache (in-process L1 in front of Redis) ---
+    CACHE_L1_MAX_ENTRIES: int = Field(default=4096, description="Max entries in the in-process L1 cache (0 disables L1 and invalidation pub/sub)")
+    CACHE_L1_TTL_SECONDS: float = Field(default=30.0, description="Upper bound on how long an L1 entry is served without re-reading Redis")
+
+    # --- Embeddings ---
+    EMBEDDING_CACHE_SIZE: int = Field(default=2048, description="Max query embeddings kept in the in-process LRU cache (0 disables)")
+    EMBEDDING_BATCH_WINDOW_MS: float = Field(default=5.0, description="How long the micro-batcher waits to collect concurrent queries")
+    EMBEDDING_BATCH_MAX_SIZE: int = Field(default=32, description="Flush the micro-batch early once this many queries are pending (1 disables batching)")
+    EMBEDDING_BACKEND: Literal["thread", "process"] = Field(default="thread", description="Where FastEmbed inference runs: 'thread' (in-process executor) or 'process' (worker process pool)")
+    EMBEDDING_PROCESS_WORKERS: int = Field(default=2, description="Worker processes for the 'process' embedding backend, each with its own model")
+    EMBEDDING_PROCESS_THREADS: Optional[int] = Field(default=1, description="ONNX threads per embedding worker process (None lets ONNX use every core)")
+    EMBEDDING_PROCESS_TIMEOUT_SECONDS: float = Field(default=30.0, description="Max wait for one embedding call on the worker pool")
+
+    # --- Memory Ingestion (write-behind) ---
+    ENABLE_MEMORY_WRITE_BEHIND: bool = Field(default=True, description="Commit chat rows to Postgres inline and drain vector/graph writes in the background")
+    MEMORY_INGEST_QUEUE_MAX: int = Field(default=1000, description="Pending vector/graph writes before add_message applies backpressure")
+    MEMORY_INGEST_CONCURRENCY: int = Field(default=4, description="Background consumers draining the ingestion queue")
+    MEMORY_INGEST_MAX_ATTEMPTS: int = Field(default=5, description="Attempts per ingestion job before it is dead-lettered")
+    MEMORY_INGEST_LEASE_SECONDS: int = Field(default=60, description="Heartbeat age after which another process may replay an ingestion journal")
+
+    # --- Conversation Sessions ---
+    SESSION_ACTIVITY_PERSIST_SECONDS: int = Field(default=60, description="Coalesce session updated_at writes: persist activity at most once per interval (0 writes every message)")
+
+    # --- Relationship Snapshots ---
+    RELATIONSHIP_CACHE_TTL_SECONDS: int = Field(default=3600, description="TTL of the versioned per-(user, character) relationship snapshot in Redis")
+    RELATIONSHIP_PREWARM_INTERVAL_SECONDS: int = Field(default=60, description="Minimum seconds between bulk relationship pre-warms for the same channel (0 disables pre-warming)")
+
+    # --- Recent History Window ---
+    ENABLE_HISTORY_WINDOW_CACHE: bool = Field(default=True, description="Serve get_recent_history from per-channel/per-user Redis windows kept current by add_message")
+    HISTORY_WINDOW_SIZE: int = Field(default=50, description="Recent turns kept per window; larger history requests go to Postgres")
+    HISTORY_WINDOW_TTL_SECONDS: int = Field(default=3600, description="Idle lifetime of a history window before it is reseeded from Postgres")
+
     # --- API ---
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
@@ -155,16 +201,23 @@ class Settings(BaseSettings):
     ENABLE_GOAL_STRATEGIST: bool = True
     GOAL_STRATEGIST_LOCAL_HOUR: int = 23  # Local hour (in character's timezone) when goal strategist runs (11 PM)
     ENABLE_UNIVERSE_EVENTS: bool = True
+    UNIVERSE_OBSERVATION_FLUSH_SECONDS: float = 5.0  # How long observed messages are aggregated before one graph write
+    UNIVERSE_OBSERVATION_MAX_KEYS: int = 5000  # Buffered counter keys that force an early flush (bounds memory)
     ENABLE_SENSITIVITY_CHECK: bool = False  # LLM-based sensitivity check for universe events
     ENABLE_TRACE_LEARNING: bool = True  # Phase B5: Learn from reasoning traces
     
     # --- Phase E16: Feedback Loop Stability ---
     ENABLE_DRIFT_OBSERVATION: bool = False  # Weekly personality drift observation (observability, not correction)
+    ENABLE_FEEDBACK_RECONCILIATION: bool = True  # Hourly rebuild of rolling reaction aggregates from InfluxDB
 
     # --- Quotas ---
     DAILY_IMAGE_QUOTA: int = Field(default=5, description="Max images a user can generate per day")
     DAILY_AUDIO_QUOTA: int = Field(default=10, description="Max audio clips a user can generate per day")
     QUOTA_WHITELIST: str = Field(default="", description="Comma-separated list of Discord user IDs exempt from quotas")
+    QUOTA_FLUSH_INTERVAL_SECONDS: float = Field(default=5.0, description="Delay before Redis quota counters are written back to v2_user_daily_usage")
+
+    # --- Privacy ---
+    PRIVACY_CACHE_TTL_SECONDS: int = Field(default=300, description="TTL of cached user privacy settings (invalidated on update)")
 
     # --- Bot Identity ---
     DISCORD_BOT_NAME: Optional[str] = Field(
@@ -180,6 +233,12 @@ class Settings(BaseSettings):
         validation_alias=AliasChoices("ELEVENLABS_VOICE_ID", "ELEVENLABS_DEFAULT_VOICE_ID")
     )
     ELEVENLABS_MODEL_ID: str = "eleven_monolingual_v1"
+    TTS_CACHE_DIR: str = "data/tts_cache"  # On-disk cache of synthesized phrases
+    TTS_CACHE_MAX_BYTES: int = 256 * 1024 * 1024  # LRU-evicted beyond this; 0 disables the cache
+    TTS_CACHE_MAX_TEXT_CHARS: int = 200  # Only phrases up to this length are cached
+    VOICE_PREBUFFER_FRAMES: int = 10  # 20 ms frames decoded before voice playback starts
+    VOICE_FEED_QUEUE_CHUNKS: int = 64  # Encoded chunks buffered between the TTS stream and FFmpeg
+    VOICE_FRAME_TIMEOUT_SECONDS: float = 10.0  # Playback ends if no frame arrives within this
 
     # --- Vision ---
     LLM_SUPPORTS_VISION: bool = False
@@ -1,10 +1,77 @@
+import asyncio
+import fnmatch
 import json
-from typing import Optional, Any, Dict
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional, Any, Awaitable, Callable, Dict, Iterable, List, Tuple
 from datetime import datetime
 from loguru import logger
+from redis.exceptions import WatchError
 from src_v2.core.database import db_manager
 from src_v2.config.settings import settings
 
+SCAN_COUNT = 500  # Keys per SCAN step / DEL batch
+
+
+class _L1Cache:
+    """
+    Bounded in-process TTL/LRU map in front of Redis.
+
+    Stores the raw string Redis would return (keyed by the full, prefixed key),
+    so callers always get a freshly decoded object and can't mutate a shared one.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        if not self.enabled:
+            return
+        ttl = min(ttl, self.ttl) if ttl else self.ttl
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    def discard_matching(self, pattern: str) -> None:
+        for key in [k for k in self._data if fnmatch.fnmatchcase(k, pattern)]:
+            del self._data[key]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
 
 class CacheManager:
     """
@@ -16,11 +83,19 @@ class CacheManager:
     - JSON serialization for complex data types
     
     CURRENT STATUS (v2.5):
-    - String operations: get, set, get_json, set_json, delete, delete_pattern
+    - String operations: get, set, get_json, set_json, delete, delete_pattern (SCAN-based)
+    - Batched/versioned JSON: get_json_many, set_json_many (optional NX), set_json_versioned (CAS)
+    - L1 tier: get/get_json(l1=True), get_or_load (TTL/LRU in-process cache + single-flight loads)
+    - Tag invalidation: set/set_json(tags=[...]), invalidate_tags
+    - Cross-process L1 invalidation: start_invalidation_listener (Redis pub/sub),
+      published only for keys a peer may hold in L1 (see register_l1_prefix)
     - List operations: lpush, rpush, lpop, rpop, ltrim, lrange, llen
+    - Capped windows: push_window, get_window, load_window, delete_window (recent-item lists)
     - Sorted Set operations: zadd, zrangebyscore, zremrangebyscore
-    - Hash operations: hincrby, hgetall
-    - Key operations: keys, expire
+    - Counters: incr (atomic, optional EXPIREAT)
+    - Hash operations: hincrby, hgetall, hset, hdel
+    - Pipelined hash operations: hincrby_many, hgetall_many, hset_mapping
+    - Key operations: keys, scan, expire
     - Attention system: set_attention, get_attention, clear_attention
     - TTL operations: setex, set_nx (locking)
     """
@@ -29,6 +104,12 @@ class CacheManager:
         self.default_ttl = 300  # 5 minutes
         self.attention_ttl = 1800  # 30 minutes for attention keys
         self._prefix = settings.REDIS_KEY_PREFIX
+        self._l1 = _L1Cache(settings.CACHE_L1_MAX_ENTRIES, settings.CACHE_L1_TTL_SECONDS)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._instance_id = uuid.uuid4().hex
+        self._listener_task: Optional[asyncio.Task] = None
+        self._l1_prefixes: Tuple[str, ...] = ()
+        self.singleflight_joins = 0
 
     def _key(self, key: str) -> str:
         """Apply namespace prefix to key if not already prefixed."""
@@ -36,31 +117,89 @@ class CacheManager:
             return key
         return f"{self._prefix}{key}"
 
+    def register_l1_prefix(self, *prefixes: str) -> None:
+        """
+        Declares key prefixes that are read through L1 but may also be written
+        without l1=True or tags (e.g. a plain delete), so those writes still
+        notify peers. Writes with l1=True or tags always do.
+        """
+        self._l1_prefixes = tuple(sorted(set(self._l1_prefixes) | {self._key(p) for p in prefixes}))
+
+    def _l1_keys(self, full_keys: List[str], l1: bool = False, tags: Optional[List[str]] = None) -> List[str]:
+        """The subset of full_keys a peer may hold in L1, i.e. the ones worth an invalidation."""
+        if l1 or tags:
+            return full_keys
+        return [key for key in full_keys if key.startswith(self._l1_prefixes)]
+
+    def _tag_key(self, tag: str) -> str:
+        return self._key(f"tag:{tag}")
+
+    @property
+    def _invalidation_channel(self) -> str:
+        return self._key("cache:invalidate")
+
     @property
     def redis(self):
         return db_manager.redis_client
 
-    async def get(self, key: str) -> Optional[str]:
+    async def get(self, key: str, l1: bool = False) -> Optional[str]:
+        """
+        Reads a string value. With l1=True the in-process tier is consulted first
+        and populated on a Redis hit (bounded by CACHE_L1_TTL_SECONDS).
+        """
+        full_key = self._key(key)
+        if l1:
+            cached = self._l1.get(full_key)
+            if cached is not None:
+                return cached
         if not self.redis:
             return None
         try:
-            return await self.redis.get(self._key(key))
+            value = await self.redis.get(full_key)
         except Exception as e:
             logger.warning(f"Redis get failed for {key}: {e}")
             return None
+        if l1 and value is not None:
+            self._l1.set(full_key, value)
+        return value
 
-    async def set(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
+    async def set(
+        self,
+        key: str,
+        value: str,
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+        l1: bool = False
+    ) -> bool:
+        """
+        Writes a string value. Tags register the key in `tag:{tag}` sets for
+        invalidate_tags(); peers drop their L1 copy via pub/sub in the same round-trip.
+        """
+        full_key = self._key(key)
+        ttl = ttl or self.default_ttl
+        self._l1.discard([full_key])
         if not self.redis:
             return False
         try:
-            await self.redis.set(self._key(key), value, ex=ttl or self.default_ttl)
-            return True
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.set(full_key, value, ex=ttl)
+            for tag in tags or ():
+                tag_key = self._tag_key(tag)
+                pipe.sadd(tag_key, full_key)
+                # Tag sets outlive their newest member, never the other way round
+                pipe.expire(tag_key, ttl, gt=True)
+                pipe.expire(tag_key, ttl, nx=True)
+            self._queue_invalidation(pipe, keys=self._l1_keys([full_key], l1, tags))
+            await pipe.execute()
         except Exception as e:
             logger.warning(f"Redis set failed for {key}: {e}")
             return False
+        if l1:
+            self._l1.set(full_key, value, ttl)
+        return True
 
-    async def get_json(self, key: str) -> Optional[Any]:
-        data = await self.get(key)
+    async def get_json(self, key: str, l1: bool = False) -> Optional[Any]:
+        data = await self.get(key, l1=l1)
         if data:
             try:
                 return json.loads(data)
@@ -68,38 +207,322 @@ class CacheManager:
                 return None
         return None
 
-    async def set_json(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+    async def get_json_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """Reads several JSON values (in order) with one MGET; missing or undecodable keys are None."""
+        if not self.redis or not keys:
+            return [None for _ in keys]
+        try:
+            raw_values = await self.redis.mget([self._key(key) for key in keys])
+        except Exception as e:
+            logger.warning(f"Redis get_json_many failed for {len(keys)} keys: {e}")
+            return [None for _ in keys]
+        values = []
+        for raw in raw_values:
+            try:
+                values.append(json.loads(raw) if raw else None)
+            except json.JSONDecodeError:
+                values.append(None)
+        return values
+
+    async def set_json(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+        l1: bool = False
+    ) -> bool:
         try:
             json_str = json.dumps(value)
-            return await self.set(key, json_str, ttl)
+            return await self.set(key, json_str, ttl, tags=tags, l1=l1)
         except Exception as e:
             logger.warning(f"Redis set_json failed for {key}: {e}")
             return False
 
+    async def set_json_many(self, values: Dict[str, Any], ttl: Optional[int] = None, nx: bool = False) -> int:
+        """
+        Writes several JSON values in one round-trip and returns how many were
+        stored. With nx=True keys that already exist are left untouched.
+        """
+        if not self.redis or not values:
+            return 0
+        ttl = ttl or self.default_ttl
+        full_keys = [self._key(key) for key in values]
+        self._l1.discard(full_keys)
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for full_key, value in zip(full_keys, values.values()):
+                pipe.set(full_key, json.dumps(value), ex=ttl, nx=nx)
+            self._queue_invalidation(pipe, keys=self._l1_keys(full_keys))
+            results = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Redis set_json_many failed for {len(values)} keys: {e}")
+            return 0
+        return sum(1 for result in results[:len(full_keys)] if result)
+
+    async def set_json_versioned(
+        self,
+        key: str,
+        value: Dict[str, Any],
+        ttl: Optional[int] = None,
+        version_field: str = "version",
+        retries: int = 3
+    ) -> bool:
+        """
+        Writes a JSON object unless Redis already holds one whose
+        `version_field` is equal or higher (compare-and-set under WATCH).
+
+        Lets writers update a cached snapshot in place: a slower writer or a
+        loader holding an older row can never replace a newer snapshot.
+        Returns True if the value was stored.
+        """
+        full_key = self._key(key)
+        self._l1.discard([full_key])
+        if not self.redis:
+            return False
+        version = value[version_field]
+        data = json.dumps(value)
+        ttl = ttl or self.default_ttl
+
+        for _ in range(retries):
+            pipe = self.redis.pipeline(transaction=True)
+            try:
+                await pipe.watch(full_key)
+                current = await pipe.get(full_key)
+                current_version = None
+                if current:
+                    try:
+                        current_version = json.loads(current).get(version_field)
+                    except (json.JSONDecodeError, AttributeError):
+                        pass
+                if current_version is not None and current_version >= version:
+                    return False
+                pipe.multi()
+                pipe.set(full_key, data, ex=ttl)
+                self._queue_invalidation(pipe, keys=self._l1_keys([full_key]))
+                await pipe.execute()
+                return True
+            except WatchError:
+                continue
+            except Exception as e:
+                logger.warning(f"Redis set_json_versioned failed for {key}: {e}")
+                return False
+            finally:
+                await pipe.reset()
+
+        logger.debug(f"Gave up versioned write to {key} after {retries} conflicts")
+        return False
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None
+    ) -> Any:
+        """
+        Returns the JSON value for key from L1, then Redis, then `loader()`.
+
+        Concurrent misses on the same key share one loader call (single-flight);
+        a None result is returned but not cached. Loader exceptions propagate
+        to every waiter.
+        """
+        full_key = self._key(key)
+        cached = self._l1.get(full_key)
+        if cached is not None:
+            return json.loads(cached)
+
+        task = self._inflight.get(full_key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, loader, ttl, tags))
+            self._inflight[full_key] = task
+            task.add_done_callback(lambda t: self._inflight.pop(full_key, None))
+        else:
+            self.singleflight_joins += 1
+        # Shielded so one cancelled waiter doesn't cancel the load for the rest
+        return await asyncio.shield(task)
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: Optional[int], tags: Optional[List[str]]) -> Any:
+        full_key = self._key(key)
+        raw = await self.get(key)
+        if raw is not None:
+            try:
+                value = json.loads(raw)
+                self._l1.set(full_key, raw, ttl)
+                return value
+            except json.JSONDecodeError:
+                pass
+
+        value = await loader()
+        if value is not None:
+            await self.set_json(key, value, ttl, tags=tags, l1=True)
+        return value
+
     async def delete(self, key: str) -> bool:
+        full_key = self._key(key)
+        self._l1.discard([full_key])
         if not self.redis:
             return False
         try:
-            await self.redis.delete(self._key(key))
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.delete(full_key)
+            self._queue_invalidation(pipe, keys=self._l1_keys([full_key]))
+            await pipe.execute()
             return True
         except Exception as e:
             logger.warning(f"Redis delete failed for {key}: {e}")
             return False
 
+    async def scan(self, pattern: str, count: int = SCAN_COUNT) -> List[str]:
+        """Incrementally collects keys matching pattern (prefix added) without blocking Redis like KEYS."""
+        if not self.redis:
+            return []
+        try:
+            return [key async for key in self.redis.scan_iter(match=self._key(pattern), count=count)]
+        except Exception as e:
+            logger.warning(f"Redis scan failed for {pattern}: {e}")
+            return []
+
     async def delete_pattern(self, pattern: str) -> int:
-        """Deletes all keys matching a pattern. Use with caution."""
+        """
+        Deletes all keys matching a pattern using incremental SCAN + batched DEL.
+        Prefer tags (set(..., tags=[...]) + invalidate_tags) for known key groups.
+        """
+        prefixed_pattern = self._key(pattern)
+        self._l1.discard_matching(prefixed_pattern)
         if not self.redis:
             return 0
         try:
-            prefixed_pattern = self._key(pattern)
-            keys = await self.redis.keys(prefixed_pattern)
-            if keys:
-                await self.redis.delete(*keys)
-            return len(keys)
+            deleted = 0
+            batch: List[str] = []
+            async for key in self.redis.scan_iter(match=prefixed_pattern, count=SCAN_COUNT):
+                batch.append(key)
+                if len(batch) >= SCAN_COUNT:
+                    deleted += await self.redis.delete(*batch)
+                    batch = []
+            if batch:
+                deleted += await self.redis.delete(*batch)
+            await self._publish_invalidation(patterns=[prefixed_pattern])
+            return deleted
         except Exception as e:
             logger.warning(f"Redis delete_pattern failed for {pattern}: {e}")
             return 0
 
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Deletes every key registered under the given tags (and the tag sets). Returns keys deleted."""
+        if not tags or not self.redis:
+            return 0
+        try:
+            tag_keys = [self._tag_key(tag) for tag in tags]
+            pipe = self.redis.pipeline(transaction=False)
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            members = set()
+            for result in await pipe.execute():
+                members.update(result or ())
+
+            self._l1.discard(members)
+            pipe = self.redis.pipeline(transaction=False)
+            if members:
+                pipe.delete(*members)
+            pipe.delete(*tag_keys)
+            if members:
+                self._queue_invalidation(pipe, keys=sorted(members))
+            results = await pipe.execute()
+            return results[0] if members else 0
+        except Exception as e:
+            logger.warning(f"Redis invalidate_tags failed for {tags}: {e}")
+            return 0
+
+    # ========== L1 INVALIDATION (pub/sub) ==========
+
+    def _queue_invalidation(self, pipe, keys: Optional[List[str]] = None, patterns: Optional[List[str]] = None) -> None:
+        """Adds an invalidation PUBLISH to a pipeline so peers drop stale L1 entries (nothing to drop, no PUBLISH)."""
+        if not self._l1.enabled or not (keys or patterns):
+            return
+        pipe.publish(self._invalidation_channel, self._invalidation_message(keys, patterns))
+
+    async def _publish_invalidation(self, keys: Optional[List[str]] = None, patterns: Optional[List[str]] = None) -> None:
+        if not self._l1.enabled or not self.redis:
+            return
+        await self.redis.publish(self._invalidation_channel, self._invalidation_message(keys, patterns))
+
+    def _invalidation_message(self, keys: Optional[List[str]], patterns: Optional[List[str]]) -> str:
+        return json.dumps({"origin": self._instance_id, "keys": keys or [], "patterns": patterns or []})
+
+    def _apply_invalidation(self, data: Any) -> None:
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning(f"Ignoring malformed cache invalidation message: {data!r}")
+            return
+        if message.get("origin") == self._instance_id:
+            return
+        self._l1.discard(message.get("keys", []))
+        for pattern in message.get("patterns", []):
+            self._l1.discard_matching(pattern)
+
+    async def start_invalidation_listener(self) -> bool:
+        """
+        Subscribes to the invalidation channel so writes in other processes evict
+        this process's L1 entries. Without it, cross-process staleness is bounded
+        by CACHE_L1_TTL_SECONDS.
+        """
+        if self._listener_task and not self._listener_task.done():
+            return True
+        if not self.redis or not self._l1.enabled:
+            return False
+        try:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            await pubsub.subscribe(self._invalidation_channel)
+        except Exception as e:
+            logger.warning(f"Failed to subscribe to cache invalidation channel: {e}")
+            return False
+        self._listener_task = asyncio.create_task(self._listen(pubsub))
+        logger.info("Cache L1 invalidation listener started")
+        return True
+
+    async def stop_invalidation_listener(self) -> None:
+        if self._listener_task:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+
+    async def _listen(self, pubsub) -> None:
+        try:
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message and message.get("type") == "message":
+                    self._apply_invalidation(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Missed messages can't be replayed; start over with an empty L1
+            logger.warning(f"Cache invalidation listener stopped: {e}")
+            self._l1.clear()
+        finally:
+            try:
+                await pubsub.unsubscribe()
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+    def clear_l1(self) -> None:
+        self._l1.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "l1_entries": len(self._l1),
+            "l1_hits": self._l1.hits,
+            "l1_misses": self._l1.misses,
+            "l1_evictions": self._l1.evictions,
+            "singleflight_joins": self.singleflight_joins,
+            "listener_running": bool(self._listener_task and not self._listener_task.done()),
+        }
+
     async def lpush(self, key: str, *values: str) -> int:
         if not self.redis:
             return 0
@@ -156,10 +579,15 @@ class CacheManager:
             return None
 
     async def setex(self, key: str, seconds: int, value: str) -> bool:
+        full_key = self._key(key)
+        self._l1.discard([full_key])
         if not self.redis:
             return False
         try:
-            await self.redis.setex(self._key(key), seconds, value)
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.setex(full_key, seconds, value)
+            self._queue_invalidation(pipe, keys=self._l1_keys([full_key]))
+            await pipe.execute()
             return True
         except Exception as e:
             logger.warning(f"Redis setex failed for {key}: {e}")
@@ -177,6 +605,16 @@ class CacheManager:
             logger.warning(f"Redis set_nx failed for {key}: {e}")
             return False
 
+    async def getdel(self, key: str) -> Optional[str]:
+        """Reads and deletes a string value atomically (only one caller gets it)."""
+        if not self.redis:
+            return None
+        try:
+            return await self.redis.getdel(self._key(key))
+        except Exception as e:
+            logger.warning(f"Redis getdel failed for {key}: {e}")
+            return None
+
     async def zadd(self, key: str, mapping: Dict[str, float]) -> int:
         if not self.redis:
             return 0
@@ -204,21 +642,77 @@ class CacheManager:
             logger.warning(f"Redis zremrangebyscore failed for {key}: {e}")
             return 0
 
+    async def zadd_bounded(
+        self,
+        key: str,
+        mapping: Dict[str, float],
+        min_score: float | str,
+        ttl: Optional[int] = None
+    ) -> bool:
+        """
+        Adds members, drops those scored below min_score and refreshes the TTL
+        in one MULTI/EXEC round-trip.
+        """
+        if not self.redis or not mapping:
+            return False
+        full_key = self._key(key)
+        try:
+            pipe = self.redis.pipeline(transaction=True)
+            pipe.zadd(full_key, mapping)
+            pipe.zremrangebyscore(full_key, "-inf", f"({min_score}")
+            if ttl:
+                pipe.expire(full_key, ttl)
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.warning(f"Redis zadd_bounded failed for {key}: {e}")
+            return False
+
+    async def zrevrangebyscore(
+        self,
+        key: str,
+        max_score: float | str,
+        min_score: float | str,
+        limit: Optional[int] = None
+    ) -> list:
+        """Members scored in [min_score, max_score], highest first, at most `limit` of them."""
+        if not self.redis:
+            return []
+        try:
+            if limit is None:
+                return await self.redis.zrevrangebyscore(self._key(key), max_score, min_score)
+            return await self.redis.zrevrangebyscore(self._key(key), max_score, min_score, start=0, num=limit)
+        except Exception as e:
+            logger.warning(f"Redis zrevrangebyscore failed for {key}: {e}")
+            return []
+
     async def keys(self, pattern: str) -> list:
         """
         Find keys matching pattern.
         Note: pattern should NOT include the global prefix, it will be added.
-        Returns list of keys (without prefix? No, Redis returns full keys).
+        Returns full (prefixed) keys. Uses incremental SCAN rather than KEYS.
+        """
+        return await self.scan(pattern)
+
+    async def incr(self, key: str, amount: int = 1, expire_at: Optional[int] = None) -> Optional[int]:
+        """
+        Atomically adds `amount` and returns the new value, or None if Redis is
+        unavailable. With expire_at (unix seconds) the key expires at that time.
         """
         if not self.redis:
-            return []
+            return None
         try:
-            # We prefix the pattern
-            full_pattern = self._key(pattern)
-            return await self.redis.keys(full_pattern)
+            full_key = self._key(key)
+            if expire_at is None:
+                return await self.redis.incrby(full_key, amount)
+            pipe = self.redis.pipeline(transaction=True)
+            pipe.incrby(full_key, amount)
+            pipe.expireat(full_key, expire_at)
+            value, _ = await pipe.execute()
+            return value
         except Exception as e:
-            logger.warning(f"Redis keys failed for {pattern}: {e}")
-            return []
+            logger.warning(f"Redis incr failed for {key}: {e}")
+            return None
 
     async def hincrby(self, key: str, field: str, amount: int = 1) -> int:
         if not self.redis:
@@ -238,6 +732,74 @@ class CacheManager:
             logger.warning(f"Redis hgetall failed for {key}: {e}")
             return {}
 
+    async def hset(self, key: str, field: str, value: str) -> bool:
+        if not self.redis:
+            return False
+        try:
+            await self.redis.hset(self._key(key), field, value)
+            return True
+        except Exception as e:
+            logger.warning(f"Redis hset failed for {key}: {e}")
+            return False
+
+    async def hdel(self, key: str, *fields: str) -> int:
+        if not self.redis:
+            return 0
+        try:
+            return await self.redis.hdel(self._key(key), *fields)
+        except Exception as e:
+            logger.warning(f"Redis hdel failed for {key}: {e}")
+            return 0
+
+    async def hincrby_many(self, key: str, amounts: Dict[str, int], ttl: Optional[int] = None) -> bool:
+        """Increments several hash fields (and refreshes the TTL) in one round-trip."""
+        if not self.redis or not amounts:
+            return False
+        try:
+            full_key = self._key(key)
+            pipe = self.redis.pipeline(transaction=False)
+            for field, amount in amounts.items():
+                pipe.hincrby(full_key, field, amount)
+            if ttl:
+                pipe.expire(full_key, ttl)
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.warning(f"Redis hincrby_many failed for {key}: {e}")
+            return False
+
+    async def hgetall_many(self, keys: list) -> list:
+        """Returns HGETALL for each key (in order) in one round-trip."""
+        if not self.redis or not keys:
+            return [{} for _ in keys]
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key in keys:
+                pipe.hgetall(self._key(key))
+            return await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Redis hgetall_many failed for {len(keys)} keys: {e}")
+            return [{} for _ in keys]
+
+    async def hset_mapping(self, key: str, mapping: Dict[str, Any], ttl: Optional[int] = None, replace: bool = False) -> bool:
+        """Sets several hash fields at once; with replace=True the existing hash is dropped first."""
+        if not self.redis:
+            return False
+        try:
+            full_key = self._key(key)
+            pipe = self.redis.pipeline(transaction=True)
+            if replace:
+                pipe.delete(full_key)
+            if mapping:
+                pipe.hset(full_key, mapping=mapping)
+                if ttl:
+                    pipe.expire(full_key, ttl)
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.warning(f"Redis hset_mapping failed for {key}: {e}")
+            return False
+
     async def expire(self, key: str, seconds: int) -> bool:
         if not self.redis:
             return False
@@ -256,6 +818,116 @@ class CacheManager:
             logger.warning(f"Redis llen failed for {key}: {e}")
             return 0
 
+    # ========== CAPPED WINDOWS (newest-first recent-item lists) ==========
+    #
+    # A window is a capped list plus a `{key}:complete` marker. The marker is
+    # only set by load_window() after seeding from the source of truth, so a
+    # window that was merely pushed to (e.g. after a restart or eviction) is
+    # never served as if it held the full recent history.
+
+    def _window_marker(self, key: str) -> str:
+        return self._key(f"{key}:complete")
+
+    async def push_window(self, key: str, value: str, max_len: int, ttl: int) -> bool:
+        """
+        Prepends value, trims the window to max_len and refreshes its TTL in one round-trip.
+
+        A copy of value already in the window is removed first: a load_window()
+        seed that read the source of truth after the write (but before this push)
+        already contains it.
+        """
+        if not self.redis:
+            return False
+        full_key = self._key(key)
+        marker = self._window_marker(key)
+        try:
+            pipe = self.redis.pipeline(transaction=True)
+            pipe.lrem(full_key, 0, value)
+            pipe.lpush(full_key, value)
+            pipe.ltrim(full_key, 0, max_len - 1)
+            pipe.expire(full_key, ttl)
+            pipe.expire(marker, ttl)
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.warning(f"Redis push_window failed for {key}: {e}")
+            # A window that missed a write must not be served as complete
+            try:
+                await self.redis.delete(marker)
+            except Exception:
+                pass
+            return False
+
+    async def get_window(self, key: str, count: int) -> Optional[List[str]]:
+        """
+        Returns up to `count` newest-first items, or None if the window has not
+        been seeded (or has expired) and the caller must read the source of truth.
+        """
+        if not self.redis:
+            return None
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.exists(self._window_marker(key))
+            pipe.lrange(self._key(key), 0, count - 1)
+            complete, values = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Redis get_window failed for {key}: {e}")
+            return None
+        return values if complete else None
+
+    async def load_window(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[List[str]]],
+        max_len: int,
+        ttl: int
+    ) -> List[str]:
+        """
+        Runs `loader()` (newest-first items from the source of truth) and seeds
+        the window with the result.
+
+        The window is WATCHed across the load: if push_window() lands in the
+        meantime the seed is skipped rather than overwriting the newer item.
+        Loader exceptions propagate.
+        """
+        if not self.redis:
+            return await loader()
+        full_key = self._key(key)
+        pipe = self.redis.pipeline(transaction=True)
+        try:
+            try:
+                await pipe.watch(full_key)
+            except Exception as e:
+                logger.warning(f"Redis watch failed for {key}: {e}")
+                return await loader()
+
+            values = await loader()
+            try:
+                pipe.multi()
+                pipe.delete(full_key)
+                if values:
+                    pipe.rpush(full_key, *values[:max_len])
+                    pipe.expire(full_key, ttl)
+                pipe.set(self._window_marker(key), "1", ex=ttl)
+                await pipe.execute()
+            except WatchError:
+                logger.debug(f"Window {key} changed while loading; not seeding")
+            except Exception as e:
+                logger.warning(f"Redis load_window failed for {key}: {e}")
+            return values
+        finally:
+            await pipe.reset()
+
+    async def delete_window(self, key: str) -> bool:
+        if not self.redis:
+            return False
+        try:
+            await self.redis.delete(self._key(key), self._window_marker(key))
+            return True
+        except Exception as e:
+            logger.warning(f"Redis delete_window failed for {key}: {e}")
+            return False
+
     # ========== ATTENTION KEYS (Phase B9: Emergent Behavior) ==========
     
     async def set_attention(self, character_name: str, focus_type: str, focus_target: str, metadata: Optional[Dict] = None) -> bool:
@@ -292,8 +964,7 @@ class CacheManager:
             return {}
         
         try:
-            pattern = f"attention:{character_name}:*"
-            keys = await self.redis.keys(pattern)
+            keys = await self.scan(f"attention:{character_name}:*")
             
             result = {}
             for key in keys:
@@ -316,13 +987,12 @@ class CacheManager:
             return {}
         
         try:
-            pattern = "attention:*:*"
-            keys = await self.redis.keys(pattern)
+            keys = await self.scan("attention:*:*")
             
             result: Dict[str, Dict] = {}
             for key in keys:
                 key_str = key.decode() if isinstance(key, bytes) else key
-                parts = key_str.split(":")
+                parts = key_str[len(self._prefix):].split(":")
                 if len(parts) >= 3:
                     char_name = parts[1]
                     focus_type = parts[2]
@@ -5,11 +5,11 @@ from neo4j import AsyncGraphDatabase, AsyncDriver
 import asyncpg
 import redis.asyncio as redis
 from influxdb_client import InfluxDBClient
-from influxdb_client.client.write_api import WriteOptions
 from loguru import logger
 from functools import wraps
 
 from src_v2.config.settings import settings
+from src_v2.core.metrics import MetricsSink, metrics_sink
 
 def retry_db_operation(max_retries: int = 3, delay: int = 1):
     """
@@ -71,7 +71,8 @@ class DatabaseManager:
         self.qdrant_client: Optional[AsyncQdrantClient] = None
         self.neo4j_driver: Optional[AsyncDriver] = None
         self.influxdb_client: Optional[InfluxDBClient] = None
-        self.influxdb_write_api = None
+        # Non-blocking sink with the WriteApi.write(bucket=, org=, record=) signature
+        self.influxdb_write_api: Optional[MetricsSink] = None
         self.redis_client: Optional[redis.Redis] = None
 
     async def _connect_with_retry(self, name: str, connect_func, max_retries: int = 30, delay: int = 2):
@@ -158,18 +159,6 @@ class DatabaseManager:
                 token=settings.INFLUXDB_TOKEN.get_secret_value() if settings.INFLUXDB_TOKEN else None,
                 org=settings.INFLUXDB_ORG
             )
-            # Create write API with batching for performance
-            # batch_size=10: Write to DB after 10 points
-            # flush_interval=1000: Or write every 1 second, whichever comes first
-            self.influxdb_write_api = self.influxdb_client.write_api(write_options=WriteOptions(
-                batch_size=10,
-                flush_interval=1000,
-                jitter_interval=0,
-                retry_interval=5000,
-                max_retries=3,
-                max_retry_delay=15000,
-                exponential_base=2
-            ))
             
             # Verify connection (run ping in thread pool to avoid blocking)
             loop = asyncio.get_event_loop()
@@ -179,6 +168,14 @@ class DatabaseManager:
                 self.influxdb_client = None
                 self.influxdb_write_api = None
             else:
+                # Writes go through the buffered sink so a slow InfluxDB never blocks the caller
+                metrics_sink.configure(
+                    url=settings.INFLUXDB_URL,
+                    token=settings.INFLUXDB_TOKEN.get_secret_value() if settings.INFLUXDB_TOKEN else None,
+                    org=settings.INFLUXDB_ORG
+                )
+                metrics_sink.start()
+                self.influxdb_write_api = metrics_sink
                 logger.info("Connected to InfluxDB.")
         except Exception as e:
             logger.warning(f"Failed to connect to InfluxDB: {e}. Metrics will not be recorded.")
@@ -204,6 +201,9 @@ class DatabaseManager:
             await self.qdrant_client.close()
         if self.redis_client:
             await self.redis_client.close()
+        if self.influxdb_write_api:
+            await self.influxdb_write_api.stop()
+            self.influxdb_write_api = None
         if self.influxdb_client:
             self.influxdb_client.close()
         logger.info("Disconnected from databases.")
@@ -0,0 +1,210 @@
+"""
+Non-blocking metrics sink for InfluxDB.
+
+Hot paths (message handling, memory writes, agent metrics) call
+`db_manager.influxdb_write_api.write(bucket=..., org=..., record=point)`.
+That attribute now points at the process-wide `metrics_sink`, whose write()
+only serializes the point to line protocol and appends it to a bounded ring
+buffer. A background task posts the buffer to InfluxDB's /api/v2/write
+endpoint in batches, on a timer or as soon as a full batch is waiting.
+
+When the buffer is full the oldest points are dropped, so a slow or
+unreachable InfluxDB server never adds latency to a message or grows memory.
+"""
+
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+from loguru import logger
+import asyncio
+import threading
+
+import httpx
+
+from src_v2.config.settings import settings
+
+
+class MetricsSink:
+    """
+    Bounded, batching line-protocol writer.
+
+    write() is thread-safe and never blocks or raises. Points are flushed by
+    a task on the loop that called start(); points written before start() are
+    kept (up to `max_points`) and sent once it runs.
+    """
+
+    def __init__(
+        self,
+        max_points: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval_s: Optional[float] = None,
+        timeout_s: float = 5.0,
+    ):
+        self.max_points = max_points if max_points is not None else settings.METRICS_BUFFER_MAX_POINTS
+        self.batch_size = batch_size if batch_size is not None else settings.METRICS_FLUSH_BATCH_SIZE
+        self.flush_interval_s = flush_interval_s if flush_interval_s is not None else settings.METRICS_FLUSH_INTERVAL_SECONDS
+        self.timeout_s = timeout_s
+
+        self.url: Optional[str] = None
+        self.token: Optional[str] = None
+        self.default_org: Optional[str] = None
+
+        # (bucket, org, line)
+        self._buffer: Deque[Tuple[str, Optional[str], str]] = deque(maxlen=self.max_points)
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._failing = False
+
+        self.stats = {"written": 0, "flushed": 0, "dropped": 0, "failed": 0, "batches": 0}
+
+    def configure(self, url: str, token: Optional[str], org: Optional[str]) -> None:
+        self.url = url.rstrip("/")
+        self.token = token
+        self.default_org = org
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    @staticmethod
+    def _to_lines(record: Any) -> List[str]:
+        if record is None:
+            return []
+        if isinstance(record, bytes):
+            record = record.decode("utf-8")
+        if isinstance(record, str):
+            return [line for line in record.splitlines() if line.strip()]
+        if hasattr(record, "to_line_protocol"):
+            line = record.to_line_protocol()
+            return [line] if line else []
+        if isinstance(record, Iterable):
+            return [line for item in record for line in MetricsSink._to_lines(item)]
+        raise TypeError(f"Unsupported metrics record type: {type(record)}")
+
+    def write(self, bucket: str, org: Optional[str] = None, record: Any = None, **kwargs) -> None:
+        """Drop-in for influxdb_client's WriteApi.write(bucket=, org=, record=)."""
+        try:
+            lines = self._to_lines(record)
+        except Exception as e:
+            logger.warning(f"Dropping unserializable metrics record: {e}")
+            return
+        if not lines:
+            return
+
+        with self._lock:
+            overflow = max(0, len(self._buffer) + len(lines) - self.max_points)
+            for line in lines:
+                self._buffer.append((bucket, org, line))
+            self.stats["written"] += len(lines)
+            self.stats["dropped"] += overflow
+            ready = len(self._buffer) >= self.batch_size
+
+        if ready:
+            self._wake()
+
+    def _wake(self) -> None:
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None or loop.is_closed():
+            return
+        if threading.get_ident() == self._loop_thread:
+            wakeup.set()
+        else:
+            try:
+                loop.call_soon_threadsafe(wakeup.set)
+            except RuntimeError:
+                pass  # Loop shut down between the check and the call
+
+    def start(self) -> None:
+        """Starts the flush task on the running loop (no-op if already running there)."""
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._loop is loop:
+            return
+        self._loop = loop
+        self._loop_thread = threading.get_ident()
+        self._wakeup = asyncio.Event()
+        self._client = httpx.AsyncClient(timeout=self.timeout_s)
+        self._task = loop.create_task(self._run())
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def stop(self) -> None:
+        """Stops the flush task and sends whatever is still buffered."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self._client is not None:
+            await self.flush()
+            await self._client.aclose()
+            self._client = None
+        self._loop = None
+        self._wakeup = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_s)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def _take_batch(self) -> List[Tuple[str, Optional[str], str]]:
+        with self._lock:
+            count = min(self.batch_size, len(self._buffer))
+            return [self._buffer.popleft() for _ in range(count)]
+
+    async def flush(self) -> None:
+        """Posts the buffer to InfluxDB in batches of at most `batch_size` points."""
+        if self._client is None or not self.url:
+            return
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return
+
+            groups: Dict[Tuple[str, Optional[str]], List[str]] = {}
+            for bucket, org, line in batch:
+                groups.setdefault((bucket, org or self.default_org), []).append(line)
+
+            for (bucket, org), lines in groups.items():
+                await self._post(bucket, org, lines)
+
+    async def _post(self, bucket: str, org: Optional[str], lines: List[str]) -> None:
+        headers = {"Content-Type": "text/plain; charset=utf-8"}
+        if self.token:
+            headers["Authorization"] = f"Token {self.token}"
+        params = {"bucket": bucket, "precision": "ns"}
+        if org:
+            params["org"] = org
+
+        try:
+            response = await self._client.post(
+                f"{self.url}/api/v2/write", params=params, headers=headers, content="\n".join(lines)
+            )
+            response.raise_for_status()
+        except Exception as e:
+            self.stats["failed"] += len(lines)
+            if not self._failing:
+                logger.warning(f"Metrics flush to InfluxDB failed, dropping {len(lines)} points: {e}")
+            self._failing = True
+            return
+
+        if self._failing:
+            logger.info("Metrics flush to InfluxDB recovered")
+        self._failing = False
+        self.stats["flushed"] += len(lines)
+        self.stats["batches"] += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, "pending": self.pending}
+
+
+# Global metrics sink instance
+metrics_sink = MetricsSink()
@@ -1,8 +1,29 @@
-from datetime import date
-from typing import Set
+"""
+Daily image/audio quotas.
+
+Counters live in Redis (`quota:{type}:{user_id}:{YYYY-MM-DD}`, keyed by the
+user's local date) and only change through atomic INCR, so concurrent
+requests can neither both take the last unit nor lose an increment. Each
+counter expires at the user's next local midnight.
+
+Counts are written back to v2_user_daily_usage in the background. Postgres is
+only read to seed a counter Redis doesn't have (first use of the day, or after
+a restart), and is the (non-atomic) fallback when Redis is unavailable.
+"""
+
+import asyncio
+from datetime import date, datetime, time, timedelta, tzinfo
+from typing import Dict, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
 from loguru import logger
+from src_v2.core.cache import cache_manager
 from src_v2.core.database import db_manager, retry_db_operation
 from src_v2.config.settings import settings
+from src_v2.intelligence.timezone import timezone_manager
+from src_v2.utils.time_utils import get_configured_timezone
+
+QUOTA_TYPES = ("image", "audio")
+TIMEZONE_CACHE_TTL = 3600
 
 
 def _parse_whitelist() -> Set[str]:
@@ -24,100 +45,294 @@ class QuotaManager:
         self._whitelist: Set[str] = _parse_whitelist()
         if self._whitelist:
             logger.info(f"Quota whitelist loaded: {len(self._whitelist)} users exempt")
-    
+        # (user_id, day) -> last counter values seen, waiting to be written to Postgres
+        self._pending: Dict[Tuple[str, date], Dict[str, int]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
     def is_whitelisted(self, user_id: str) -> bool:
         """Check if a user is exempt from quotas."""
         return str(user_id) in self._whitelist
 
-    @retry_db_operation()
-    async def check_quota(self, user_id: str, quota_type: str) -> bool:
+    @staticmethod
+    def _limit(quota_type: str) -> int:
+        return settings.DAILY_IMAGE_QUOTA if quota_type == 'image' else settings.DAILY_AUDIO_QUOTA
+
+    @staticmethod
+    def _counter_key(user_id: str, quota_type: str, day: date) -> str:
+        return f"quota:{quota_type}:{user_id}:{day.isoformat()}"
+
+    async def _user_zone(self, user_id: str, character_name: Optional[str]) -> tzinfo:
+        """The user's timezone (as known to this character), else the configured one."""
+        if character_name:
+            async def load():
+                time_settings = await timezone_manager.get_user_time_settings(user_id, character_name)
+                return {"timezone": time_settings.timezone}
+
+            cached = await cache_manager.get_or_load(
+                f"quota:tz:{character_name}:{user_id}", load, ttl=TIMEZONE_CACHE_TTL
+            )
+            if cached and cached.get("timezone"):
+                try:
+                    return ZoneInfo(cached["timezone"])
+                except Exception:
+                    logger.debug(f"Ignoring invalid timezone {cached['timezone']!r} for {user_id}")
+        return get_configured_timezone()
+
+    async def _user_day(self, user_id: str, character_name: Optional[str]) -> Tuple[date, int]:
+        """Returns the user's local date and the unix time of their next local midnight."""
+        zone = await self._user_zone(user_id, character_name)
+        day = datetime.now(zone).date()
+        midnight = datetime.combine(day + timedelta(days=1), time.min, tzinfo=zone)
+        return day, int(midnight.timestamp())
+
+    async def _counter(self, user_id: str, quota_type: str, day: date, expire_at: int) -> Optional[int]:
+        """
+        Today's count from Redis, seeding both counters from Postgres if this one
+        doesn't exist yet. None if Redis is unavailable.
+        """
+        if not cache_manager.redis:
+            return None
+        key = self._counter_key(user_id, quota_type, day)
+        raw = await cache_manager.get(key)
+        if raw is None:
+            # NX: another process may already have seeded (and incremented) it
+            persisted = await self._get_usage_db(user_id, day)
+            ttl = max(1, expire_at - int(datetime.now().timestamp()))
+            for seed_type in QUOTA_TYPES:
+                await cache_manager.set_nx(self._counter_key(user_id, seed_type, day), str(persisted[seed_type]), ttl)
+            raw = await cache_manager.get(key)
+            if raw is None:
+                return None
+        return int(raw)
+
+    async def reserve(self, user_id: str, quota_type: str, character_name: Optional[str] = None) -> bool:
+        """
+        Atomically takes one unit of today's quota ('image' or 'audio').
+        Returns False, taking nothing, if the user is at their limit.
+        Call release() if the work the unit was reserved for fails.
+        Whitelisted users always return True.
+        """
+        if self.is_whitelisted(user_id):
+            return True
+        user_id = str(user_id)
+        limit = self._limit(quota_type)
+        day, expire_at = await self._user_day(user_id, character_name)
+
+        current = await self._counter(user_id, quota_type, day, expire_at)
+        value = None
+        if current is not None:
+            if current >= limit:
+                logger.info(f"User {user_id} hit {quota_type} quota ({current}/{limit})")
+                return False
+            value = await cache_manager.incr(self._counter_key(user_id, quota_type, day), 1, expire_at)
+        if value is None:
+            # Redis unavailable: check-then-increment in Postgres (not atomic)
+            if not await self._check_quota_db(user_id, quota_type, day):
+                return False
+            await self._increment_usage_db(user_id, quota_type, day)
+            return True
+
+        if value > limit:
+            # Lost the race for the last unit; each INCR result is unique, so exactly `limit` callers win
+            await cache_manager.incr(self._counter_key(user_id, quota_type, day), -1, expire_at)
+            logger.info(f"User {user_id} hit {quota_type} quota ({limit}/{limit})")
+            return False
+
+        self._record(user_id, day, quota_type, value)
+        return True
+
+    async def release(self, user_id: str, quota_type: str, character_name: Optional[str] = None) -> None:
+        """Returns a unit taken by reserve() whose work failed."""
+        if self.is_whitelisted(user_id):
+            return
+        user_id = str(user_id)
+        day, expire_at = await self._user_day(user_id, character_name)
+        value = await cache_manager.incr(self._counter_key(user_id, quota_type, day), -1, expire_at)
+        if value is None:
+            await self._increment_usage_db(user_id, quota_type, day, amount=-1)
+            return
+        self._record(user_id, day, quota_type, max(0, value))
+
+    async def check_quota(self, user_id: str, quota_type: str, character_name: Optional[str] = None) -> bool:
         """
         Check if user has quota remaining for the given type ('image' or 'audio').
         Returns True if quota is available, False otherwise.
         Whitelisted users always return True.
+
+        Prefer reserve(): a check followed by increment_usage() is not atomic.
         """
         # Whitelist bypass
         if self.is_whitelisted(user_id):
             return True
-        
+        user_id = str(user_id)
+        day, expire_at = await self._user_day(user_id, character_name)
+
+        current = await self._counter(user_id, quota_type, day, expire_at)
+        if current is None:
+            return await self._check_quota_db(user_id, quota_type, day)
+
+        limit = self._limit(quota_type)
+        if current >= limit:
+            logger.info(f"User {user_id} hit {quota_type} quota ({current}/{limit})")
+            return False
+        return True
+
+    async def increment_usage(self, user_id: str, quota_type: str, character_name: Optional[str] = None) -> None:
+        """
+        Increment usage for the given type.
+        """
+        user_id = str(user_id)
+        day, expire_at = await self._user_day(user_id, character_name)
+
+        value = None
+        if await self._counter(user_id, quota_type, day, expire_at) is not None:
+            value = await cache_manager.incr(self._counter_key(user_id, quota_type, day), 1, expire_at)
+        if value is None:
+            await self._increment_usage_db(user_id, quota_type, day)
+            return
+        self._record(user_id, day, quota_type, value)
+        logger.info(f"Incremented {quota_type} usage for user {user_id}")
+
+    async def get_usage(self, user_id: str, quota_type: str, character_name: Optional[str] = None) -> int:
+        """
+        Get current usage count for the given type ('image' or 'audio').
+        Returns 0 if no usage record exists.
+        """
+        user_id = str(user_id)
+        day, expire_at = await self._user_day(user_id, character_name)
+
+        current = await self._counter(user_id, quota_type, day, expire_at)
+        if current is None:
+            return (await self._get_usage_db(user_id, day))[quota_type]
+        return current
+
+    # ========== WRITE-BACK TO POSTGRES ==========
+
+    def _record(self, user_id: str, day: date, quota_type: str, value: int) -> None:
+        self._pending.setdefault((user_id, day), {})[quota_type] = value
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(settings.QUOTA_FLUSH_INTERVAL_SECONDS)
+        # Cleared first so counters recorded during the flush schedule the next one
+        self._flush_task = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Writes pending counters to v2_user_daily_usage in one statement and
+        returns the number of rows written. Counts come from Redis at flush time
+        (so they include other processes' increments and releases) and replace
+        the stored values, since Redis is the authority. A count Redis no longer
+        has and this process never saw leaves the stored value alone.
+        """
+        if not self._pending or not db_manager.postgres_pool:
+            return 0
+        pending, self._pending = self._pending, {}
+        entries = list(pending.items())
+
+        keys = [self._counter_key(user_id, quota_type, day) for (user_id, day), _ in entries for quota_type in QUOTA_TYPES]
+        current = iter(await cache_manager.get_json_many(keys))
+        counts = {quota_type: [] for quota_type in QUOTA_TYPES}
+        for _, recorded in entries:
+            for quota_type in QUOTA_TYPES:
+                value = next(current)
+                counts[quota_type].append(int(value) if value is not None else recorded.get(quota_type))
+
+        try:
+            async with db_manager.postgres_pool.acquire() as conn:
+                # NULL counts are unknown: new rows start them at 0, existing rows keep theirs
+                await conn.execute("""
+                    WITH counts AS (
+                        SELECT * FROM unnest($1::text[], $2::date[], $3::int[], $4::int[])
+                            AS c(user_id, date, image_count, audio_count)
+                    )
+                    INSERT INTO v2_user_daily_usage (user_id, date, image_count, audio_count)
+                    SELECT user_id, date, COALESCE(image_count, 0), COALESCE(audio_count, 0) FROM counts
+                    ON CONFLICT (user_id, date)
+                    DO UPDATE SET
+                        image_count = COALESCE(
+                            (SELECT c.image_count FROM counts c
+                             WHERE c.user_id = EXCLUDED.user_id AND c.date = EXCLUDED.date),
+                            v2_user_daily_usage.image_count),
+                        audio_count = COALESCE(
+                            (SELECT c.audio_count FROM counts c
+                             WHERE c.user_id = EXCLUDED.user_id AND c.date = EXCLUDED.date),
+                            v2_user_daily_usage.audio_count),
+                        updated_at = NOW()
+                """, [user_id for (user_id, _), _ in entries], [day for (_, day), _ in entries],
+                    counts["image"], counts["audio"])
+        except Exception as e:
+            logger.warning(f"Failed to flush {len(entries)} quota counters: {e}")
+            # Retry with the next flush; values recorded since take precedence
+            for key, recorded in pending.items():
+                merged = self._pending.setdefault(key, {})
+                for quota_type, value in recorded.items():
+                    merged.setdefault(quota_type, value)
+            return 0
+        return len(entries)
+
+    async def stop(self) -> None:
+        """Cancels the scheduled flush and writes pending counters now."""
+        task, self._flush_task = self._flush_task, None
+        if task is not None and not task.done():
+            task.cancel()
+        await self.flush()
+
+    # ========== POSTGRES (seed + fallback when Redis is unavailable) ==========
+
+    @retry_db_operation()
+    async def _get_usage_db(self, user_id: str, day: date) -> Dict[str, int]:
         if not db_manager.postgres_pool:
-            logger.warning("Postgres not available, allowing quota check by default")
-            return True
+            return {quota_type: 0 for quota_type in QUOTA_TYPES}
 
-        today = date.today()
-        limit = settings.DAILY_IMAGE_QUOTA if quota_type == 'image' else settings.DAILY_AUDIO_QUOTA
-        
         query = """
-            SELECT image_count, audio_count 
-            FROM v2_user_daily_usage 
+            SELECT image_count, audio_count
+            FROM v2_user_daily_usage
             WHERE user_id = $1 AND date = $2
         """
-        
+
         async with db_manager.postgres_pool.acquire() as conn:
-            row = await conn.fetchrow(query, str(user_id), today)
-            
+            row = await conn.fetchrow(query, user_id, day)
+
             if not row:
-                return True # No usage yet today
-            
-            current_usage = row['image_count'] if quota_type == 'image' else row['audio_count']
-            
-            if current_usage >= limit:
-                logger.info(f"User {user_id} hit {quota_type} quota ({current_usage}/{limit})")
-                return False
-                
+                return {quota_type: 0 for quota_type in QUOTA_TYPES}
+            return {"image": row['image_count'], "audio": row['audio_count']}
+
+    async def _check_quota_db(self, user_id: str, quota_type: str, day: date) -> bool:
+        if not db_manager.postgres_pool:
+            logger.warning("Postgres not available, allowing quota check by default")
             return True
 
+        current_usage = (await self._get_usage_db(user_id, day))[quota_type]
+        limit = self._limit(quota_type)
+        if current_usage >= limit:
+            logger.info(f"User {user_id} hit {quota_type} quota ({current_usage}/{limit})")
+            return False
+        return True
+
     @retry_db_operation()
-    async def increment_usage(self, user_id: str, quota_type: str) -> None:
-        """
-        Increment usage for the given type.
-        """
+    async def _increment_usage_db(self, user_id: str, quota_type: str, day: date, amount: int = 1) -> None:
         if not db_manager.postgres_pool:
             return
 
-        today = date.today()
-        
         # Upsert query
         query = """
             INSERT INTO v2_user_daily_usage (user_id, date, image_count, audio_count)
-            VALUES ($1, $2, $3, $4)
-            ON CONFLICT (user_id, date) 
-            DO UPDATE SET 
-                image_count = v2_user_daily_usage.image_count + $3,
-                audio_count = v2_user_daily_usage.audio_count + $4,
+            VALUES ($1, $2, GREATEST($3, 0), GREATEST($4, 0))
+            ON CONFLICT (user_id, date)
+            DO UPDATE SET
+                image_count = GREATEST(v2_user_daily_usage.image_count + $3, 0),
+                audio_count = GREATEST(v2_user_daily_usage.audio_count + $4, 0),
                 updated_at = NOW()
         """
-        
-        img_inc = 1 if quota_type == 'image' else 0
-        audio_inc = 1 if quota_type == 'audio' else 0
-        
-        async with db_manager.postgres_pool.acquire() as conn:
-            await conn.execute(query, str(user_id), today, img_inc, audio_inc)
-            logger.info(f"Incremented {quota_type} usage for user {user_id}")
 
-    @retry_db_operation()
-    async def get_usage(self, user_id: str, quota_type: str) -> int:
-        """
-        Get current usage count for the given type ('image' or 'audio').
-        Returns 0 if no usage record exists.
-        """
-        if not db_manager.postgres_pool:
-            return 0
+        img_inc = amount if quota_type == 'image' else 0
+        audio_inc = amount if quota_type == 'audio' else 0
 
-        today = date.today()
-        
-        query = """
-            SELECT image_count, audio_count 
-            FROM v2_user_daily_usage 
-            WHERE user_id = $1 AND date = $2
-        """
-        
         async with db_manager.postgres_pool.acquire() as conn:
-            row = await conn.fetchrow(query, str(user_id), today)
-            
-            if not row:
-                return 0
-            
-            return row['image_count'] if quota_type == 'image' else row['audio_count']
+            await conn.execute(query, user_id, day, img_inc, audio_inc)
+            logger.info(f"Incremented {quota_type} usage for user {user_id}")
 
 quota_manager = QuotaManager()
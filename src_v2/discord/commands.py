@@ -643,6 +643,8 @@ class PrivacyCommands(app_commands.Group):
             
         except Exception as e:
             logger.error(f"Error updating privacy settings: {e}")
+            # The update may have landed before the failure; don't keep serving the old copy
+            await privacy_manager.invalidate(str(interaction.user.id))
             await interaction.followup.send("Failed to update privacy settings.", ephemeral=True)
 
 class UniverseCommands(app_commands.Group):
@@ -134,6 +134,8 @@ async def enqueue_post_conversation_tasks(
 class MessageHandler:
     def __init__(self, bot):
         self.bot = bot
+        # channel_id -> monotonic time of the last relationship pre-warm
+        self._relationship_prewarm_at: Dict[str, float] = {}
 
     def _should_enqueue_enrichment(self, message_count: int) -> bool:
         return (
@@ -162,6 +164,29 @@ class MessageHandler:
         except Exception as exc:  # pragma: no cover - background queue failures are non-blocking
             logger.debug(f"Could not enqueue graph enrichment for {session_id}: {exc}")
 
+    def _prewarm_channel_relationships(self, message: discord.Message) -> None:
+        """
+        Loads trust snapshots for everyone recently active in the channel in one
+        bulk query, so whoever the bot answers next is already cached.
+        Throttled per channel by RELATIONSHIP_PREWARM_INTERVAL_SECONDS.
+        """
+        interval = settings.RELATIONSHIP_PREWARM_INTERVAL_SECONDS
+        if interval <= 0:
+            return
+        channel_id = str(message.channel.id)
+        now = time.monotonic()
+        last = self._relationship_prewarm_at.get(channel_id)
+        if last is not None and now - last < interval:
+            return
+        self._relationship_prewarm_at[channel_id] = now
+
+        user_ids = {
+            str(m.author.id) for m in self.bot.cached_messages
+            if m.channel.id == message.channel.id and not m.author.bot
+        }
+        user_ids.add(str(message.author.id))
+        asyncio.create_task(trust_manager.prewarm_relationships(user_ids, self.bot.character_name))
+
     async def _handle_universe_observation(self, message: discord.Message) -> None:
         """Records presence and enqueues universe observation tasks."""
         if not message.guild:
@@ -178,6 +203,7 @@ class MessageHandler:
             
             # Fire and forget presence update (lightweight, keep in-process)
             asyncio.create_task(universe_manager.record_presence(str(message.author.id), str(message.guild.id)))
+            self._prewarm_channel_relationships(message)
             
             # Enqueue message observation to background worker (Phase 2: Learning to Listen)
             mentioned_ids = [str(m.id) for m in message.mentions]
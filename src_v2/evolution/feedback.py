@@ -3,20 +3,43 @@ Feedback Analysis System
 
 Analyzes user reactions (emoji) to bot messages and adjusts memory importance
 scores and personality traits accordingly.
+
+Mood and preference lookups run on every message, so they are served from
+rolling reaction aggregates kept in Redis and updated as reactions arrive
+(record_reaction). InfluxDB stays the system of record; reconcile_from_influx
+rebuilds the aggregates from it periodically, off the event loop.
 """
 
-from typing import Dict, Optional, List
-from datetime import datetime, timedelta
+import asyncio
+import time
+from typing import Dict, Optional, List, Tuple
+from datetime import datetime
 from loguru import logger
 from influxdb_client.client.write.point import Point
-from influxdb_client.client.flux_table import FluxTable
 from qdrant_client.models import Filter, FieldCondition, MatchValue
 
+from src_v2.core.cache import cache_manager
 from src_v2.core.database import db_manager
 from src_v2.config.settings import settings
 from src_v2.evolution.emoji_taxonomy import emoji_taxonomy
 
 
+# Rolling aggregates: Redis hashes bucketed by time, per scope ("user" / "bot").
+# granularity -> (bucket seconds, retention seconds)
+AGGREGATE_GRANULARITIES = {
+    "5m": (300, 2 * 3600),        # Serves the 1h mood window
+    "1d": (86400, 31 * 86400),    # Serves the 30d preference window
+}
+AGGREGATE_FIELDS = ("positive", "negative", "neutral", "long", "long_negative", "short", "short_positive")
+LONG_MESSAGE_CHARS = 500  # Bot messages longer than this count as "long" for verbosity analysis
+# Reconciliation leaves buckets ending this recently alone: their events may
+# still be buffered in the metrics sink or arrive while the query runs.
+RECONCILE_SETTLE_SECONDS = 60
+# How long the add time of a reaction is kept, so a removal can undo it in the
+# bucket it was counted in (the longest retention; older buckets are gone anyway)
+ACTIVE_REACTION_TTL = max(retention for _, retention in AGGREGATE_GRANULARITIES.values())
+
+
 class FeedbackAnalyzer:
     """
     Analyzes user feedback (reactions) to adjust memory importance and personality traits.
@@ -26,6 +49,213 @@ class FeedbackAnalyzer:
     
     def __init__(self):
         logger.info("FeedbackAnalyzer initialized")
+
+    # ========== ROLLING AGGREGATES ==========
+
+    @staticmethod
+    def _aggregate_key(scope: str, scope_id: str, granularity: str, bucket: int) -> str:
+        return f"feedback:agg:{scope}:{scope_id}:{granularity}:{bucket}"
+
+    @staticmethod
+    def _active_reaction_key(user_id: str, bot_name: str, message_id: str, reaction: str) -> str:
+        return f"feedback:active:{user_id}:{bot_name}:{message_id}:{reaction}"
+
+    @classmethod
+    def _window_keys(cls, scope: str, scope_id: str, granularity: str, seconds: int, now: Optional[float] = None) -> List[str]:
+        """Bucket keys covering the last `seconds` (capped at the granularity's retention)."""
+        bucket_seconds, retention = AGGREGATE_GRANULARITIES[granularity]
+        now = now if now is not None else time.time()
+        first = int(now - min(seconds, retention)) // bucket_seconds
+        last = int(now) // bucket_seconds
+        return [cls._aggregate_key(scope, scope_id, granularity, b) for b in range(first, last + 1)]
+
+    @staticmethod
+    def _reaction_deltas(reaction: str, message_length: int, sign: int = 1) -> Dict[str, int]:
+        """Counter increments for one reaction (sign=-1 for a removal)."""
+        deltas: Dict[str, int] = {}
+        is_positive = emoji_taxonomy.is_positive(reaction)
+        is_negative = emoji_taxonomy.is_negative(reaction)
+        if is_positive:
+            deltas["positive"] = sign
+        elif is_negative:
+            deltas["negative"] = sign
+        elif emoji_taxonomy.is_neutral(reaction):
+            deltas["neutral"] = sign
+
+        if (message_length or 0) > LONG_MESSAGE_CHARS:
+            deltas["long"] = sign
+            if is_negative:
+                deltas["long_negative"] = sign
+        else:
+            deltas["short"] = sign
+            if is_positive:
+                deltas["short_positive"] = sign
+        return deltas
+
+    async def record_reaction(
+        self,
+        user_id: str,
+        bot_name: str,
+        message_id: str,
+        reaction: str,
+        action: str = "add",
+        message_length: int = 0,
+        feedback_type: Optional[str] = None
+    ) -> None:
+        """
+        Records a reaction event: updates the rolling user/bot aggregates in Redis
+        and writes the raw event to InfluxDB (batched write API, non-blocking).
+        
+        A removal is taken out of the buckets its add was counted in, using the
+        add time remembered per reaction. If that is unknown (expired, or lost
+        with Redis), the aggregates are left for reconcile_from_influx.
+        
+        Call from the bot's reaction add/remove handlers.
+        """
+        now = time.time()
+        active_key = self._active_reaction_key(str(user_id), bot_name, str(message_id), reaction)
+        if action == "remove":
+            added_at = await cache_manager.getdel(active_key)
+            counted_at = float(added_at) if added_at is not None else None
+        else:
+            await cache_manager.set_nx(active_key, str(now), ACTIVE_REACTION_TTL)
+            counted_at = now
+
+        if counted_at is not None:
+            deltas = self._reaction_deltas(reaction, message_length, sign=-1 if action == "remove" else 1)
+            for scope, scope_id in (("user", str(user_id)), ("bot", bot_name)):
+                for granularity, (bucket_seconds, retention) in AGGREGATE_GRANULARITIES.items():
+                    bucket = int(counted_at) // bucket_seconds
+                    ttl = int((bucket + 1) * bucket_seconds + retention - now)
+                    if ttl <= 0:
+                        continue
+                    key = self._aggregate_key(scope, scope_id, granularity, bucket)
+                    await cache_manager.hincrby_many(key, deltas, ttl=ttl)
+
+        if db_manager.influxdb_write_api:
+            try:
+                point = Point("reaction_event") \
+                    .tag("bot_name", bot_name) \
+                    .tag("user_id", str(user_id)) \
+                    .tag("message_id", str(message_id)) \
+                    .tag("action", action) \
+                    .field("reaction", reaction) \
+                    .field("message_length", message_length or 0) \
+                    .time(datetime.utcnow())
+                if feedback_type:
+                    point = point.field("feedback_type", feedback_type)
+
+                db_manager.influxdb_write_api.write(
+                    bucket=settings.INFLUXDB_BUCKET,
+                    record=point
+                )
+                logger.debug(f"Recorded reaction_event {action}: {reaction} by {user_id}")
+            except Exception as e:
+                logger.error(f"Failed to write reaction to InfluxDB: {e}")
+
+    async def get_reaction_aggregate(self, scope: str, scope_id: str, seconds: int, granularity: str = "1d") -> Dict[str, int]:
+        """
+        Sums the rolling reaction counters for a user or bot over the last `seconds`.
+        
+        Args:
+            scope: "user" or "bot"
+            scope_id: User ID or bot name
+            seconds: Window length (1h windows should use granularity="5m")
+            granularity: Bucket size, "5m" or "1d"
+        """
+        keys = self._window_keys(scope, scope_id, granularity, seconds)
+        totals = dict.fromkeys(AGGREGATE_FIELDS, 0)
+        for bucket in await cache_manager.hgetall_many(keys):
+            for field, value in (bucket or {}).items():
+                if field in totals:
+                    totals[field] += int(value)
+        # A removal can land on a bucket that reconciliation rebuilt without its add
+        return {field: max(0, value) for field, value in totals.items()}
+
+    async def reconcile_from_influx(self, days: int = 30) -> Dict[str, int]:
+        """
+        Rebuilds the rolling aggregates from InfluxDB (the system of record).
+        
+        Fixes drift from removals and from Redis restarts. Only settled buckets are
+        rewritten: open buckets (and ones that closed within RECONCILE_SETTLE_SECONDS)
+        keep their live counters, since InfluxDB may not have those events yet.
+        The Flux query runs in an executor so the event loop is never blocked.
+        Intended for a periodic job.
+        
+        Returns:
+            Dict with the number of users/bots/buckets written
+        """
+        stats = {"users": 0, "bots": 0, "buckets": 0}
+        if not db_manager.influxdb_client:
+            return stats
+
+        days = min(days, AGGREGATE_GRANULARITIES["1d"][1] // 86400)
+        settled_before = time.time() - RECONCILE_SETTLE_SECONDS
+        flux_query = f'''
+        from(bucket: "{settings.INFLUXDB_BUCKET}")
+            |> range(start: -{days}d)
+            |> filter(fn: (r) => r["_measurement"] == "reaction_event")
+            |> pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")
+            |> group()
+            |> sort(columns: ["_time"])
+        '''
+        try:
+            query_api = db_manager.influxdb_client.query_api()
+            tables = await asyncio.to_thread(query_api.query, flux_query)
+        except Exception as e:
+            logger.error(f"Feedback reconciliation query failed: {e}")
+            return stats
+
+        # Replay add/remove events to find the reactions that are still active
+        active: Dict[Tuple[str, str, str, str], Tuple[float, int]] = {}
+        for table in tables:
+            for record in table.records:
+                values = record.values
+                reaction = values.get("reaction")
+                user_id = values.get("user_id")
+                bot_name = values.get("bot_name")
+                if not reaction or not user_id or not bot_name:
+                    continue
+                key = (str(user_id), str(bot_name), str(values.get("message_id")), reaction)
+                if values.get("action", "add") == "remove":
+                    active.pop(key, None)
+                else:
+                    event_time = record.get_time()
+                    active[key] = (
+                        event_time.timestamp() if event_time else time.time(),
+                        int(values.get("message_length") or 0)
+                    )
+
+        buckets: Dict[str, Dict[str, int]] = {}
+        scopes: Dict[Tuple[str, str], None] = {}
+        now = time.time()
+        for (user_id, bot_name, _, reaction), (ts, length) in active.items():
+            deltas = self._reaction_deltas(reaction, length)
+            for scope, scope_id in (("user", user_id), ("bot", bot_name)):
+                scopes[(scope, scope_id)] = None
+                for granularity, (bucket_seconds, retention) in AGGREGATE_GRANULARITIES.items():
+                    if now - ts > retention:
+                        continue
+                    counters = buckets.setdefault(
+                        self._aggregate_key(scope, scope_id, granularity, int(ts) // bucket_seconds), {}
+                    )
+                    for field, amount in deltas.items():
+                        counters[field] = counters.get(field, 0) + amount
+
+        # Overwrite every settled bucket in the window for each scope seen, clearing stale ones
+        for scope, scope_id in scopes:
+            stats["users" if scope == "user" else "bots"] += 1
+            for granularity, (bucket_seconds, retention) in AGGREGATE_GRANULARITIES.items():
+                last_settled = int(settled_before) // bucket_seconds - 1
+                for bucket in range(int(now - retention) // bucket_seconds, last_settled + 1):
+                    key = self._aggregate_key(scope, scope_id, granularity, bucket)
+                    await cache_manager.hset_mapping(
+                        key, buckets.get(key, {}), ttl=retention + bucket_seconds, replace=True
+                    )
+                    stats["buckets"] += 1
+
+        logger.info(f"Reconciled feedback aggregates from InfluxDB: {stats}")
+        return stats
     
     # Backward compatibility properties - delegate to taxonomy
     @property
@@ -65,7 +295,7 @@ class FeedbackAnalyzer:
                 |> sort(columns: ["_time"], desc: false)
             '''
             
-            tables = query_api.query(flux_query)
+            tables = await asyncio.to_thread(query_api.query, flux_query)
             
             # Reconstruct active reactions state by replaying events
             active_reactions = set()
@@ -211,89 +441,40 @@ class FeedbackAnalyzer:
         
         Returns insights like:
         - "User dislikes long messages" (if consistently reacts 👎 to responses >500 chars)
-        - "User loves empathetic responses" (if reacts ❤️ to emotion-heavy messages)
+        - "User appreciates concise communication" (if reacts positively to short responses)
+        
+        Served from the rolling daily aggregates (no InfluxDB query).
         
         Args:
             user_id: User to analyze
-            days: Number of days to look back
+            days: Number of days to look back (max 30)
             
         Returns:
             Dict with insights and metrics
         """
-        if not db_manager.influxdb_client:
-            return {"error": "InfluxDB not available"}
-            
         try:
-            query_api = db_manager.influxdb_client.query_api()
-            
-            # Query reaction events
-            flux_query = f'''
-            from(bucket: "{settings.INFLUXDB_BUCKET}")
-                |> range(start: -{days}d)
-                |> filter(fn: (r) => r["_measurement"] == "reaction_event")
-                |> filter(fn: (r) => r["user_id"] == "{user_id}")
-            '''
-            
-            tables = query_api.query(flux_query)
+            counts = await self.get_reaction_aggregate("user", str(user_id), days * 86400, granularity="1d")
             
-            reactions_by_message = {}
-            for table in tables:
-                for record in table.records:
-                    msg_id = record.values.get("message_id")
-                    reaction = record.values.get("reaction")
-                    msg_length = record.values.get("message_length", 0)
-                    
-                    if msg_id not in reactions_by_message:
-                        reactions_by_message[msg_id] = {
-                            "reactions": [],
-                            "length": msg_length
-                        }
-                    reactions_by_message[msg_id]["reactions"].append(reaction)
-            
-            # Analyze patterns
             insights = {
-                "total_reactions": sum(len(m["reactions"]) for m in reactions_by_message.values()),
+                "total_reactions": counts["positive"] + counts["negative"] + counts["neutral"],
                 "positive_ratio": 0.0,
                 "verbosity_preference": "unknown",
                 "recommendations": []
             }
             
-            if not reactions_by_message:
-                return insights
-            
             # Calculate positive ratio
-            all_reactions = []
-            for msg_data in reactions_by_message.values():
-                all_reactions.extend(msg_data["reactions"])
-            
-            positive_count = sum(1 for r in all_reactions if r in self.POSITIVE_REACTIONS)
-            negative_count = sum(1 for r in all_reactions if r in self.NEGATIVE_REACTIONS)
-            total = positive_count + negative_count
-            
+            total = counts["positive"] + counts["negative"]
             if total > 0:
-                insights["positive_ratio"] = positive_count / total
+                insights["positive_ratio"] = counts["positive"] / total
             
             # Analyze verbosity preference
-            long_messages = [m for m in reactions_by_message.values() if m["length"] > 500]
-            short_messages = [m for m in reactions_by_message.values() if m["length"] <= 500]
-            
-            if long_messages:
-                long_negative = sum(
-                    1 for m in long_messages 
-                    if any(r in self.NEGATIVE_REACTIONS for r in m["reactions"])
-                )
-                if long_negative / len(long_messages) > 0.6:
-                    insights["verbosity_preference"] = "concise"
-                    insights["recommendations"].append("User prefers shorter responses")  # type: ignore[union-attr]
+            if counts["long"] and counts["long_negative"] / counts["long"] > 0.6:
+                insights["verbosity_preference"] = "concise"
+                insights["recommendations"].append("User prefers shorter responses")  # type: ignore[union-attr]
             
-            if short_messages:
-                short_positive = sum(
-                    1 for m in short_messages 
-                    if any(r in self.POSITIVE_REACTIONS for r in m["reactions"])
-                )
-                if short_positive / len(short_messages) > 0.6:
-                    insights["verbosity_preference"] = "concise"
-                    insights["recommendations"].append("User appreciates concise communication")  # type: ignore[union-attr]
+            if counts["short"] and counts["short_positive"] / counts["short"] > 0.6:
+                insights["verbosity_preference"] = "concise"
+                insights["recommendations"].append("User appreciates concise communication")  # type: ignore[union-attr]
             
             return insights
             
@@ -313,31 +494,17 @@ class FeedbackAnalyzer:
         """
         Logs a reaction event to InfluxDB for later analysis.
         
-        This should be called from the bot's on_reaction_add event handler.
+        Kept for backward compatibility; delegates to record_reaction so the
+        rolling aggregates stay in sync.
         """
-        if not db_manager.influxdb_write_api:
-            return
-            
-        try:
-            point = Point("reaction_event") \
-                .tag("user_id", user_id) \
-                .tag("bot_name", bot_name) \
-                .tag("message_id", message_id) \
-                .tag("action", action) \
-                .tag("reaction", reaction) \
-                .field("message_length", message_length) \
-                .time(datetime.utcnow())
-            
-            db_manager.influxdb_write_api.write(
-                bucket=settings.INFLUXDB_BUCKET,
-                org=settings.INFLUXDB_ORG,
-                record=point
-            )
-            
-            logger.debug(f"Logged reaction {action} {reaction} to InfluxDB")
-            
-        except Exception as e:
-            logger.error(f"Failed to log reaction to InfluxDB: {e}")
+        await self.record_reaction(
+            user_id=user_id,
+            bot_name=bot_name,
+            message_id=message_id,
+            reaction=reaction,
+            action=action,
+            message_length=message_length
+        )
 
     async def get_current_mood(self, user_id: str) -> str:
         """
@@ -345,40 +512,14 @@ class FeedbackAnalyzer:
         
         This measures how the USER feels about the bot's responses, NOT the bot's mood.
         Used to suppress inappropriate traits (e.g., don't be playful if user is frustrated).
+        Served from the rolling 5-minute aggregates (no InfluxDB query).
         
         Returns: "Happy", "Neutral", "Annoyed (User has been reacting negatively)", "Excited (User is very engaged)"
         """
-        if not db_manager.influxdb_client:
-            return "Neutral"
-            
         try:
-            query_api = db_manager.influxdb_client.query_api()
-            
-            # Query recent reactions (last 1 hour)
-            flux_query = f'''
-            from(bucket: "{settings.INFLUXDB_BUCKET}")
-                |> range(start: -1h)
-                |> filter(fn: (r) => r["_measurement"] == "reaction_event")
-                |> filter(fn: (r) => r["user_id"] == "{user_id}")
-            '''
-            
-            tables = query_api.query(flux_query)
-            
-            reactions = []
-            for table in tables:
-                for record in table.records:
-                    # Only process records where the field is "reaction"
-                    if record.get_field() != "reaction":
-                        continue
-                    reaction = record.get_value()  # The emoji is in _value
-                    if reaction:
-                        reactions.append(reaction)
-            
-            if not reactions:
-                return "Neutral"
-            
-            positive_count = sum(1 for r in reactions if r in self.POSITIVE_REACTIONS)
-            negative_count = sum(1 for r in reactions if r in self.NEGATIVE_REACTIONS)
+            counts = await self.get_reaction_aggregate("user", str(user_id), 3600, granularity="5m")
+            positive_count = counts["positive"]
+            negative_count = counts["negative"]
             
             if negative_count > positive_count:
                 return "Annoyed (User has been reacting negatively)"
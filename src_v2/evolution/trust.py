@@ -5,7 +5,7 @@ Tracks the evolving relationship between user and character, including
 trust scores, relationship levels, and unlocked personality traits.
 """
 
-from typing import Dict, Optional, Any
+from typing import Dict, Iterable, Optional, Any
 from loguru import logger
 from influxdb_client import Point
 from datetime import datetime, timezone
@@ -16,14 +16,95 @@ from src_v2.core.cache import cache_manager
 import json
 
 
+# Relationship columns cached in the per-(user, character) snapshot. Derived
+# fields (level, stage label, traits, special-user override) are computed from
+# these at read time because they depend on the character's evolution config.
+SNAPSHOT_COLUMNS = "trust_score, insights, preferences, mood, mood_intensity, version"
+
+
+def _parse_json(value: Any, default: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except Exception:
+            return default
+    return default if value is None else value
+
+
 class TrustManager:
     """
     Manages relationship depth and trust scores between users and characters.
+
+    Reads are served from a versioned snapshot in Redis
+    (`relationship:{character}:{user}`). Writers bump `version` in Postgres and
+    store the returned row as the new snapshot, so a message that changes trust
+    doesn't cost the next message a cache miss. Loaders only fill absent keys
+    and writers only replace older versions, so a stale read never wins.
     """
     
     def __init__(self):
+        self.stats = {"hits": 0, "misses": 0, "db_queries": 0}
         logger.info("TrustManager initialized")
 
+    @staticmethod
+    def _snapshot_key(user_id: str, character_name: str) -> str:
+        return f"relationship:{character_name}:{user_id}"
+
+    @staticmethod
+    def _snapshot_from_row(row: Any) -> Dict[str, Any]:
+        mood = row.get('mood')
+        mood_intensity = row.get('mood_intensity')
+        return {
+            "trust_score": row['trust_score'] or 0,
+            "insights": _parse_json(row.get('insights'), []),
+            "preferences": _parse_json(row.get('preferences'), {}),
+            "mood": mood if mood is not None else "neutral",
+            "mood_intensity": mood_intensity if mood_intensity is not None else 0.5,
+            "version": row.get('version') or 0,
+        }
+
+    @staticmethod
+    def _relationship_from_snapshot(snapshot: Dict[str, Any], user_id: str, character_name: str) -> Dict:
+        evo_manager = get_evolution_manager(character_name)
+        special_user = evo_manager.get_special_user(user_id)
+        trust_override = evo_manager.get_trust_override(user_id)
+
+        # Use override for special users, otherwise use DB value
+        trust_score = trust_override if trust_override is not None else snapshot['trust_score']
+        stage = evo_manager.get_current_stage(trust_score)
+
+        # Get traits from config (dynamic) rather than DB (static)
+        active_traits = evo_manager.get_active_traits(trust_score)
+
+        # Determine level (integer 1-8 roughly mapping to stages)
+        # This is a bit arbitrary now that we have named stages, but useful for simple logic
+        level_int = 1
+        if trust_score >= 80: level_int = 5
+        elif trust_score >= 60: level_int = 4
+        elif trust_score >= 40: level_int = 3
+        elif trust_score >= 20: level_int = 2
+
+        return {
+            "trust_score": trust_score,
+            "level": level_int,
+            "level_label": stage['name'],
+            "unlocked_traits": [t['name'] for t in active_traits],
+            "insights": snapshot['insights'],
+            "preferences": snapshot['preferences'],
+            "mood": snapshot['mood'],
+            "mood_intensity": snapshot['mood_intensity'],
+            "is_special_user": trust_override is not None,
+            "special_user_name": special_user.get('name') if special_user else None
+        }
+
+    async def _store_snapshot(self, user_id: str, character_name: str, row: Any) -> None:
+        """Replaces the cached snapshot with a freshly written row (if it is newer)."""
+        await cache_manager.set_json_versioned(
+            self._snapshot_key(user_id, character_name),
+            self._snapshot_from_row(row),
+            ttl=settings.RELATIONSHIP_CACHE_TTL_SECONDS
+        )
+
     @require_db("postgres", default_return={"trust_score": 0, "level": 1, "level_label": "Stranger", "unlocked_traits": [], "preferences": {}})
     async def get_relationship_level(self, user_id: str, character_name: str) -> Dict:
         """
@@ -36,114 +117,105 @@ class TrustManager:
         the normal trust system. This is used for characters with predefined relationships
         (e.g., Becky/NotTaylor's bestie Silas always gets max trust).
         """
-        # Check for special user override FIRST
-        evo_manager = get_evolution_manager(character_name)
-        special_user = evo_manager.get_special_user(user_id)
-        trust_override = evo_manager.get_trust_override(user_id)
-        
-        cache_key = f"trust:{character_name}:{user_id}"
-        cached_data = await cache_manager.get_json(cache_key)
-        if cached_data:
-            # Apply trust override even to cached data
-            if trust_override is not None:
-                cached_data['trust_score'] = trust_override
-                cached_data['is_special_user'] = True
-                cached_data['special_user_name'] = special_user.get('name') if special_user else None
-                stage = evo_manager.get_current_stage(trust_override)
-                cached_data['level_label'] = stage['name']
-            return cached_data
+        cache_key = self._snapshot_key(user_id, character_name)
+        snapshot = await cache_manager.get_json(cache_key)
+        if snapshot:
+            self.stats["hits"] += 1
+            return self._relationship_from_snapshot(snapshot, user_id, character_name)
+        self.stats["misses"] += 1
 
         try:
             async with db_manager.postgres_pool.acquire() as conn:
-                # Check if relationship exists
-                row = await conn.fetchrow("""
-                    SELECT trust_score, unlocked_traits, insights, preferences, mood, mood_intensity
+                self.stats["db_queries"] += 1
+                row = await conn.fetchrow(f"""
+                    SELECT {SNAPSHOT_COLUMNS}
                     FROM v2_user_relationships
                     WHERE user_id = $1 AND character_name = $2
                 """, user_id, character_name)
                 
                 if not row:
                     # Create default relationship
+                    self.stats["db_queries"] += 1
                     await conn.execute("""
                         INSERT INTO v2_user_relationships (user_id, character_name, trust_score, unlocked_traits, insights, preferences)
                         VALUES ($1, $2, 0, '[]'::jsonb, '[]'::jsonb, '{}'::jsonb)
+                        ON CONFLICT (user_id, character_name) DO NOTHING
                     """, user_id, character_name)
-                    
-                    # Use override for special users, otherwise 0
-                    effective_trust = trust_override if trust_override is not None else 0
-                    stage = evo_manager.get_current_stage(effective_trust)
-                    
-                    result = {
-                        "trust_score": effective_trust, 
-                        "level": 5 if effective_trust >= 80 else 1, 
-                        "level_label": stage['name'], 
-                        "unlocked_traits": [], 
-                        "insights": [], 
-                        "preferences": {},
-                        "mood": "neutral",
-                        "mood_intensity": 0.5,
-                        "is_special_user": trust_override is not None,
-                        "special_user_name": special_user.get('name') if special_user else None
-                    }
-                    await cache_manager.set_json(cache_key, result)
-                    return result
-                
-                # Use override for special users, otherwise use DB value
-                trust_score = trust_override if trust_override is not None else row['trust_score']
-                
-                stage = evo_manager.get_current_stage(trust_score)
-                
-                # Get traits from config (dynamic) rather than DB (static)
-                # We can merge them if we want to support manual unlocks, but for now dynamic is better
-                active_traits = evo_manager.get_active_traits(trust_score)
-                trait_names = [t['name'] for t in active_traits]
-
-                insights = row['insights']
-                if isinstance(insights, str):
-                    try:
-                        insights = json.loads(insights)
-                    except Exception:
-                        insights = []
-                elif insights is None:
-                    insights = []
-                
-                preferences = row['preferences']
-                if isinstance(preferences, str):
-                    try:
-                        preferences = json.loads(preferences)
-                    except Exception:
-                        preferences = {}
-                elif preferences is None:
-                    preferences = {}
-                
-                # Determine level (integer 1-8 roughly mapping to stages)
-                # This is a bit arbitrary now that we have named stages, but useful for simple logic
-                level_int = 1
-                if trust_score >= 80: level_int = 5
-                elif trust_score >= 60: level_int = 4
-                elif trust_score >= 40: level_int = 3
-                elif trust_score >= 20: level_int = 2
-                        
-                result = {
-                    "trust_score": trust_score, 
-                    "level": level_int,
-                    "level_label": stage['name'],
-                    "unlocked_traits": trait_names,
-                    "insights": insights,
-                    "preferences": preferences,
-                    "mood": row.get('mood', 'neutral'),
-                    "mood_intensity": row.get('mood_intensity', 0.5),
-                    "is_special_user": trust_override is not None,
-                    "special_user_name": special_user.get('name') if special_user else None
-                }
-                
-                await cache_manager.set_json(cache_key, result)
-                return result
+                    row = {"trust_score": 0, "insights": [], "preferences": {}, "version": 0}
+
+            snapshot = self._snapshot_from_row(row)
+            # NX: a writer that stored a newer version meanwhile must win
+            await cache_manager.set_json_many(
+                {cache_key: snapshot}, ttl=settings.RELATIONSHIP_CACHE_TTL_SECONDS, nx=True
+            )
+            return self._relationship_from_snapshot(snapshot, user_id, character_name)
                 
         except Exception as e:
             logger.error(f"Failed to get relationship level: {e}")
             return {"trust_score": 0, "level": 1, "level_label": "Stranger", "unlocked_traits": [], "preferences": {}}
 
+    @require_db("postgres", default_return=0)
+    async def prewarm_relationships(self, user_ids: Iterable[str], character_name: str) -> int:
+        """
+        Loads missing snapshots for several users (e.g. everyone recently active
+        in a channel) with one MGET and at most one Postgres query.
+
+        Users without a relationship row are skipped; their row is created on
+        first access. Returns the number of snapshots written.
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        if not user_ids:
+            return 0
+
+        try:
+            keys = [self._snapshot_key(user_id, character_name) for user_id in user_ids]
+            cached = await cache_manager.get_json_many(keys)
+            missing = [user_id for user_id, snapshot in zip(user_ids, cached) if not snapshot]
+            if not missing:
+                return 0
+
+            async with db_manager.postgres_pool.acquire() as conn:
+                self.stats["db_queries"] += 1
+                rows = await conn.fetch(f"""
+                    SELECT user_id, {SNAPSHOT_COLUMNS}
+                    FROM v2_user_relationships
+                    WHERE user_id = ANY($1::text[]) AND character_name = $2
+                """, missing, character_name)
+
+            snapshots = {
+                self._snapshot_key(row['user_id'], character_name): self._snapshot_from_row(row)
+                for row in rows
+            }
+            return await cache_manager.set_json_many(
+                snapshots, ttl=settings.RELATIONSHIP_CACHE_TTL_SECONDS, nx=True
+            )
+        except Exception as e:
+            logger.warning(f"Failed to pre-warm relationships for {character_name}: {e}")
+            return 0
+
+    @require_db("postgres")
+    async def refresh_relationship(self, user_id: str, character_name: str) -> None:
+        """
+        Re-reads the relationship row into the snapshot. For code outside this
+        class that updates v2_user_relationships (and bumps `version`) directly.
+        """
+        try:
+            async with db_manager.postgres_pool.acquire() as conn:
+                self.stats["db_queries"] += 1
+                row = await conn.fetchrow(f"""
+                    SELECT {SNAPSHOT_COLUMNS}
+                    FROM v2_user_relationships
+                    WHERE user_id = $1 AND character_name = $2
+                """, user_id, character_name)
+            if row:
+                await self._store_snapshot(user_id, character_name, row)
+        except Exception as e:
+            logger.error(f"Failed to refresh relationship snapshot: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {**self.stats, "hit_ratio": self.stats["hits"] / lookups if lookups else 0.0}
+
     @require_db("postgres")
     async def update_preference(self, user_id: str, character_name: str, key: str, value: Any):
         """
@@ -158,17 +230,20 @@ class TrustManager:
                 # value needs to be a valid JSON value
                 json_value = json.dumps(value)
                 
-                await conn.execute("""
+                self.stats["db_queries"] += 1
+                row = await conn.fetchrow(f"""
                     UPDATE v2_user_relationships
-                    SET preferences = jsonb_set(COALESCE(preferences, '{}'::jsonb), $3::text[], $4::jsonb),
+                    SET preferences = jsonb_set(COALESCE(preferences, '{{}}'::jsonb), $3::text[], $4::jsonb),
+                        version = version + 1,
                         updated_at = NOW()
                     WHERE user_id = $1 AND character_name = $2
+                    RETURNING {SNAPSHOT_COLUMNS}
                 """, user_id, character_name, [key], json_value)
                 
                 logger.info(f"Updated preference '{key}' to '{value}' for {user_id}")
                 
-                # Invalidate cache
-                await cache_manager.delete(f"trust:{character_name}:{user_id}")
+            if row:
+                await self._store_snapshot(user_id, character_name, row)
         except Exception as e:
             logger.error(f"Failed to update preference: {e}")
 
@@ -179,17 +254,20 @@ class TrustManager:
         """
         try:
             async with db_manager.postgres_pool.acquire() as conn:
-                await conn.execute("""
+                self.stats["db_queries"] += 1
+                row = await conn.fetchrow(f"""
                     UPDATE v2_user_relationships
                     SET preferences = preferences - $3,
+                        version = version + 1,
                         updated_at = NOW()
                     WHERE user_id = $1 AND character_name = $2
+                    RETURNING {SNAPSHOT_COLUMNS}
                 """, user_id, character_name, key)
                 
                 logger.info(f"Deleted preference '{key}' for {user_id}")
                 
-                # Invalidate cache
-                await cache_manager.delete(f"trust:{character_name}:{user_id}")
+            if row:
+                await self._store_snapshot(user_id, character_name, row)
         except Exception as e:
             logger.error(f"Failed to delete preference: {e}")
 
@@ -200,15 +278,18 @@ class TrustManager:
         """
         try:
             async with db_manager.postgres_pool.acquire() as conn:
-                await conn.execute("""
+                self.stats["db_queries"] += 1
+                row = await conn.fetchrow(f"""
                     UPDATE v2_user_relationships
-                    SET preferences = '{}'::jsonb, unlocked_traits = '[]'::jsonb, insights = '[]'::jsonb
+                    SET preferences = '{{}}'::jsonb, unlocked_traits = '[]'::jsonb, insights = '[]'::jsonb,
+                        version = version + 1
                     WHERE user_id = $1 AND character_name = $2
+                    RETURNING {SNAPSHOT_COLUMNS}
                 """, user_id, character_name)
                 
-                # Invalidate cache
-                await cache_manager.delete(f"trust:{character_name}:{user_id}")
-                logger.info(f"Cleared preferences for {user_id}")
+            if row:
+                await self._store_snapshot(user_id, character_name, row)
+            logger.info(f"Cleared preferences for {user_id}")
         except Exception as e:
             logger.error(f"Failed to clear preferences: {e}")
 
@@ -218,18 +299,45 @@ class TrustManager:
         """
         try:
             async with db_manager.postgres_pool.acquire() as conn:
-                await conn.execute("""
+                self.stats["db_queries"] += 1
+                row = await conn.fetchrow(f"""
                     UPDATE v2_user_relationships
-                    SET trust_score = 0
+                    SET trust_score = 0, version = version + 1
                     WHERE user_id = $1 AND character_name = $2
+                    RETURNING {SNAPSHOT_COLUMNS}
                 """, user_id, character_name)
                 
-                # Invalidate cache
-                await cache_manager.delete(f"trust:{character_name}:{user_id}")
-                logger.info(f"Cleared trust for {user_id}")
+            if row:
+                await self._store_snapshot(user_id, character_name, row)
+            logger.info(f"Cleared trust for {user_id}")
         except Exception as e:
             logger.error(f"Failed to clear trust: {e}")
 
+    async def _apply_trust_delta(self, conn, user_id: str, character_name: str, delta: int):
+        """
+        Adds delta (clamped to -100..100) under a row lock and returns the old
+        score plus the new snapshot columns, or None if there is no row or the
+        score didn't change.
+        """
+        self.stats["db_queries"] += 1
+        return await conn.fetchrow("""
+            WITH old AS (
+                SELECT id, trust_score
+                FROM v2_user_relationships
+                WHERE user_id = $1 AND character_name = $2
+                FOR UPDATE
+            )
+            UPDATE v2_user_relationships r
+            SET trust_score = GREATEST(-100, LEAST(100, old.trust_score + $3)),
+                version = r.version + 1,
+                updated_at = NOW()
+            FROM old
+            WHERE r.id = old.id
+              AND GREATEST(-100, LEAST(100, old.trust_score + $3)) <> old.trust_score
+            RETURNING old.trust_score AS old_trust,
+                      r.trust_score, r.insights, r.preferences, r.mood, r.mood_intensity, r.version
+        """, user_id, character_name, delta)
+
     @require_db("postgres", default_return=None)
     async def update_trust(self, user_id: str, character_name: str, delta: int) -> Optional[str]:
         """
@@ -241,72 +349,60 @@ class TrustManager:
             character_name: Character name
             delta: Amount to change trust by (can be negative)
         """
+        if not delta:
+            return None
+
         try:
             async with db_manager.postgres_pool.acquire() as conn:
-                # Ensure relationship exists and get current score
-                row = await conn.fetchrow("""
-                    SELECT trust_score FROM v2_user_relationships
-                    WHERE user_id = $1 AND character_name = $2
-                """, user_id, character_name)
-                
-                if not row:
-                    # Should have been created by get_relationship_level, but just in case
+                row = await self._apply_trust_delta(conn, user_id, character_name, delta)
+                if row is None:
+                    # Either the score is already at the clamp limit or the row doesn't
+                    # exist yet. A cached snapshot proves the row exists.
+                    if await cache_manager.get_json(self._snapshot_key(user_id, character_name)):
+                        return None
                     await self.get_relationship_level(user_id, character_name)
-                    old_trust = 0
-                else:
-                    old_trust = row['trust_score']
-                
-                # Calculate new trust (clamp between -100 and 100)
-                # Note: Design changed to -100 to 100 range
-                new_trust = max(-100, min(100, old_trust + delta))
-                
-                if new_trust != old_trust:
+                    row = await self._apply_trust_delta(conn, user_id, character_name, delta)
+                    if row is None:
+                        return None
+
+                old_trust, new_trust = row['old_trust'], row['trust_score']
+                logger.info(f"Updated trust for {user_id} with {character_name}: {old_trust} -> {new_trust} (delta: {delta})")
+
+                # Check for milestones
+                evo_manager = get_evolution_manager(character_name)
+                milestone_msg = evo_manager.check_milestone(old_trust, new_trust)
+
+                if milestone_msg:
+                    # Update last_milestone_date
+                    self.stats["db_queries"] += 1
                     await conn.execute("""
                         UPDATE v2_user_relationships
-                        SET trust_score = $3,
-                            updated_at = NOW()
+                        SET last_milestone_date = NOW()
                         WHERE user_id = $1 AND character_name = $2
-                    """, user_id, character_name, new_trust)
-                    
-                    logger.info(f"Updated trust for {user_id} with {character_name}: {old_trust} -> {new_trust} (delta: {delta})")
-                    
-                    # Check for milestones
-                    evo_manager = get_evolution_manager(character_name)
-                    milestone_msg = evo_manager.check_milestone(old_trust, new_trust)
-                    
-                    if milestone_msg:
-                        # Update last_milestone_date
-                        await conn.execute("""
-                            UPDATE v2_user_relationships
-                            SET last_milestone_date = NOW()
-                            WHERE user_id = $1 AND character_name = $2
-                        """, user_id, character_name)
-                    
-                    # Invalidate cache
-                    await cache_manager.delete(f"trust:{character_name}:{user_id}")
-
-                    # Log to InfluxDB
-                    if db_manager.influxdb_write_api:
-                        try:
-                            point = Point("trust_update") \
-                                .tag("user_id", user_id) \
-                                .tag("bot_name", character_name) \
-                                .field("trust_score", new_trust) \
-                                .field("delta", delta) \
-                                .time(datetime.utcnow())
-                            
-                            db_manager.influxdb_write_api.write(
-                                bucket=settings.INFLUXDB_BUCKET,
-                                org=settings.INFLUXDB_ORG,
-                                record=point
-                            )
-                        except Exception as e:
-                            logger.error(f"Failed to log trust update to InfluxDB: {e}")
+                    """, user_id, character_name)
+
+            # Update the snapshot in place so the next read is still a hit
+            await self._store_snapshot(user_id, character_name, row)
+
+            # Log to InfluxDB
+            if db_manager.influxdb_write_api:
+                try:
+                    point = Point("trust_update") \
+                        .tag("user_id", user_id) \
+                        .tag("bot_name", character_name) \
+                        .field("trust_score", new_trust) \
+                        .field("delta", delta) \
+                        .time(datetime.utcnow())
                     
-                    if milestone_msg:
-                        return milestone_msg
-                        
-            return None
+                    db_manager.influxdb_write_api.write(
+                        bucket=settings.INFLUXDB_BUCKET,
+                        org=settings.INFLUXDB_ORG,
+                        record=point
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to log trust update to InfluxDB: {e}")
+
+            return milestone_msg
                 
         except Exception as e:
             logger.error(f"Failed to update trust: {e}")
@@ -323,6 +419,7 @@ class TrustManager:
         try:
             async with db_manager.postgres_pool.acquire() as conn:
                 # Append trait to unlocked_traits array
+                # (not part of the snapshot: reported traits come from the evolution config)
                 await conn.execute("""
                     UPDATE v2_user_relationships
                     SET unlocked_traits = unlocked_traits || $3::jsonb
@@ -331,9 +428,6 @@ class TrustManager:
                 """, user_id, character_name, f'["{trait}"]')
                 
                 logger.info(f"Unlocked trait '{trait}' for {user_id} with {character_name}")
-                
-                # Invalidate cache
-                await cache_manager.delete(f"trust:{character_name}:{user_id}")
         except Exception as e:
             logger.error(f"Failed to unlock trait: {e}")
 
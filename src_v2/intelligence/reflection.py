@@ -218,12 +218,15 @@ GOAL INFERENCE RULES:
                 # Update DB
                 await conn.execute("""
                     UPDATE v2_user_relationships
-                    SET insights = $1, updated_at = NOW()
+                    SET insights = $1, version = version + 1, updated_at = NOW()
                     WHERE user_id = $2 AND character_name = $3
                 """, json.dumps(existing_insights), user_id, character_name)
                 
                 logger.info(f"Updated insights for user {user_id}: {len(result.insights)} new insights.")
 
+            from src_v2.evolution.trust import trust_manager
+            await trust_manager.refresh_relationship(user_id, character_name)
+
         except Exception as e:
             logger.error(f"Failed to update user insights: {e}")
 
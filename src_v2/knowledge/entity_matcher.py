@@ -0,0 +1,140 @@
+"""
+Entity Matcher (Phase E30 support)
+
+Aho-Corasick automaton over a user's known entity names, used by ambient
+graph retrieval to find every entity mentioned in a message in a single
+pass over the text (O(len + matches) instead of one substring test per
+entity).
+
+Matching is case-insensitive and respects word boundaries, so "Art" does
+not fire inside "party".
+"""
+
+from collections import OrderedDict, deque
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class EntityMatcher:
+    """
+    Case-insensitive, word-bounded multi-pattern matcher.
+
+    Usage:
+        matcher = EntityMatcher({"Luna", "sister Maya"})
+        matcher.find("I walked Luna with my sister maya")  # ["Luna", "sister Maya"]
+    """
+
+    def __init__(self, entities: Iterable[str]):
+        self.entities: FrozenSet[str] = frozenset(e for e in entities if e and e.strip())
+
+        # Node 0 is the root. Each node has a goto table, a failure link and
+        # the indexes of patterns ending there (own + inherited via failure links).
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self._patterns: List[Tuple[str, str]] = []  # (original, lowered)
+
+        for entity in sorted(self.entities):
+            self._add(entity)
+        self._link()
+
+    def _add(self, entity: str) -> None:
+        lowered = entity.lower()
+        node = 0
+        for ch in lowered:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(len(self._patterns))
+        self._patterns.append((entity, lowered))
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def find(self, text: str) -> List[str]:
+        """
+        Returns the entities mentioned in text, in order of first appearance.
+        """
+        if not self._patterns or not text:
+            return []
+
+        lowered = text.lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Dict[str, None] = {}
+        node = 0
+
+        for end, ch in enumerate(lowered):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            for index in out[node]:
+                original, pattern = self._patterns[index]
+                if original in found:
+                    continue
+                start = end - len(pattern) + 1
+                if _is_word_char(pattern[0]) and start > 0 and _is_word_char(lowered[start - 1]):
+                    continue
+                if _is_word_char(pattern[-1]) and end + 1 < len(lowered) and _is_word_char(lowered[end + 1]):
+                    continue
+                found[original] = None
+
+        return list(found)
+
+
+class EntityMatcherCache:
+    """
+    Bounded per-user cache of EntityMatcher instances.
+
+    A cached matcher is reused only while the user's entity set is unchanged,
+    so a stale automaton is rebuilt even if an invalidation was missed.
+    """
+
+    def __init__(self, max_users: int = 256):
+        self.max_users = max_users
+        self._matchers: "OrderedDict[str, EntityMatcher]" = OrderedDict()
+
+    def get(self, user_id: str, entities: Iterable[str]) -> EntityMatcher:
+        entities = frozenset(e for e in entities if e and e.strip())
+        matcher: Optional[EntityMatcher] = self._matchers.get(user_id)
+        if matcher is not None and matcher.entities == entities:
+            self._matchers.move_to_end(user_id)
+            return matcher
+
+        matcher = EntityMatcher(entities)
+        self._matchers[user_id] = matcher
+        self._matchers.move_to_end(user_id)
+        while len(self._matchers) > self.max_users:
+            self._matchers.popitem(last=False)
+        return matcher
+
+    def invalidate(self, user_id: str) -> None:
+        self._matchers.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._matchers.clear()
+
+    def __len__(self) -> int:
+        return len(self._matchers)
@@ -12,12 +12,26 @@ from src_v2.config.settings import settings
 from src_v2.core.database import db_manager, retry_db_operation, require_db
 from src_v2.core.cache import cache_manager
 from src_v2.knowledge.extractor import FactExtractor, Fact
+from src_v2.knowledge.entity_matcher import EntityMatcher, EntityMatcherCache
 from src_v2.agents.llm_factory import create_llm
 from src_v2.universe.privacy import privacy_manager
 
+# Predicates that can only hold one value per subject (a new fact replaces the old one)
+SINGLE_VALUE_PREDICATES = {"LIVES_IN", "HAS_NAME", "IS_AGED", "HAS_GENDER"}
+
+# A new fact removes its antonyms for the same object
+ANTONYM_PAIRS = {
+    "LIKES": ["HATES", "DISLIKES"],
+    "LOVES": ["HATES", "DISLIKES"],
+    "HATES": ["LIKES", "LOVES"],
+    "DISLIKES": ["LIKES", "LOVES"]
+}
+
 class KnowledgeManager:
     def __init__(self):
         self.extractor = FactExtractor()
+        # Per-user Aho-Corasick automata over get_user_entities() (E30)
+        self._entity_matchers = EntityMatcherCache()
         # Use reflective LLM for Cypher generation (utility task, not character response)
         # CRITICAL: max_tokens=512 prevents runaway generation loops in local models (Qwen, etc.)
         # Cypher queries should never exceed ~300 tokens; 512 gives headroom for edge cases
@@ -140,7 +154,13 @@ RULES:
                 # Phase 2.5.1: Memory node constraint for Graph Unification
                 # Memory id (vector_id from Qdrant) must be unique
                 await session.run("CREATE CONSTRAINT memory_id_unique IF NOT EXISTS FOR (m:Memory) REQUIRE m.id IS UNIQUE")
-                
+
+                # GraphWalker resolves frontier ids through labelled lookups;
+                # the labels without a uniqueness constraint need their own indexes
+                await session.run("CREATE INDEX character_name_index IF NOT EXISTS FOR (c:Character) ON (c.name)")
+                await session.run("CREATE INDEX trait_name_index IF NOT EXISTS FOR (t:Trait) ON (t.name)")
+                await session.run("CREATE INDEX subject_id_index IF NOT EXISTS FOR (s:Subject) ON (s.id)")
+
                 # Register relationship types and properties to avoid warnings
                 # Create a dummy pattern and delete it immediately
                 await session.run("""
@@ -325,8 +345,8 @@ PRIVACY RESTRICTION ENABLED:
                 # We use execute_write for modifications
                 await session.run(cypher_query, user_id=user_id)
                 
-                # Invalidate common ground cache
-                await cache_manager.delete_pattern(f"knowledge:common_ground:*:{user_id}")
+                # Invalidate cached common ground / entity lists for this user
+                await self._invalidate_user_caches(user_id)
                 
                 return "Fact updated successfully."
 
@@ -350,6 +370,26 @@ PRIVACY RESTRICTION ENABLED:
         Creates a (:Memory) node in the graph linked to the user.
         This enables 'Vector-First Traversal' (Phase 2.5.1).
         
+        Single-node convenience wrapper around add_memory_nodes.
+        """
+        await self.add_memory_nodes([{
+            "user_id": user_id,
+            "vector_id": vector_id,
+            "content": content,
+            "timestamp": timestamp,
+            "source_type": source_type,
+            "bot_name": bot_name,
+            "author_id": author_id,
+            "author_is_bot": author_is_bot
+        }])
+
+    async def add_memory_nodes(self, nodes: List[Dict[str, Any]]):
+        """
+        Creates (:Memory) nodes linked to their users in a single UNWIND write.
+        
+        Each node dict takes the add_memory_node arguments: user_id, vector_id,
+        content, timestamp, source_type, bot_name, author_id, author_is_bot.
+        
         ADR-014: Now includes author_id and author_is_bot to properly
         attribute memories in multi-party conversations.
         
@@ -357,55 +397,59 @@ PRIVACY RESTRICTION ENABLED:
         content) to prevent UUID leakage in graph walks. Without this, GraphWalker
         would expose raw Qdrant point UUIDs in dream/diary interpretations.
         """
-        if not db_manager.neo4j_driver:
+        if not db_manager.neo4j_driver or not nodes:
             return
 
-        # Create human-readable name from content to prevent UUID leak in graph walks
-        # Use first 50 chars of content or a fallback label
-        memory_name = content[:50].strip() if content else "memory"
-        if len(content) > 50:
-            memory_name += "..."
+        rows = []
+        for node in nodes:
+            content = node.get("content") or ""
+            # Create human-readable name from content to prevent UUID leak in graph walks
+            # Use first 50 chars of content or a fallback label
+            memory_name = content[:50].strip() if content else "memory"
+            if len(content) > 50:
+                memory_name += "..."
+            rows.append({
+                "user_id": node["user_id"],
+                "vector_id": node["vector_id"],
+                "name": memory_name,
+                "content": content,
+                "timestamp": node.get("timestamp"),
+                "source_type": node.get("source_type"),
+                "bot_name": node.get("bot_name"),
+                "author_id": node.get("author_id"),
+                "author_is_bot": node.get("author_is_bot", False)
+            })
         
         query = """
-        MERGE (u:User {id: $user_id})
+        UNWIND $rows AS row
+        MERGE (u:User {id: row.user_id})
         ON CREATE SET u.is_bot = false
         CREATE (m:Memory {
-            id: $vector_id,
-            name: $name,
-            content: $content,
-            timestamp: $timestamp,
-            source_type: $source_type,
-            bot_name: $bot_name,
-            author_id: $author_id,
-            author_is_bot: $author_is_bot
+            id: row.vector_id,
+            name: row.name,
+            content: row.content,
+            timestamp: row.timestamp,
+            source_type: row.source_type,
+            bot_name: row.bot_name,
+            author_id: row.author_id,
+            author_is_bot: row.author_is_bot
         })
         MERGE (u)-[:HAS_MEMORY]->(m)
         
         // ADR-014: If author is different from user (bot response), link to author too
-        WITH m
-        WHERE $author_id IS NOT NULL AND $author_id <> $user_id
-        MERGE (a:User {id: $author_id})
-        ON CREATE SET a.is_bot = $author_is_bot
+        WITH m, row
+        WHERE row.author_id IS NOT NULL AND row.author_id <> row.user_id
+        MERGE (a:User {id: row.author_id})
+        ON CREATE SET a.is_bot = row.author_is_bot
         MERGE (a)-[:AUTHORED]->(m)
         """
         
         try:
             async with db_manager.neo4j_driver.session() as session:
-                await session.run(
-                    query, 
-                    user_id=user_id, 
-                    vector_id=vector_id,
-                    name=memory_name,
-                    content=content, 
-                    timestamp=timestamp, 
-                    source_type=source_type,
-                    bot_name=bot_name,
-                    author_id=author_id,
-                    author_is_bot=author_is_bot
-                )
-                logger.debug(f"Created graph memory node {vector_id}")
+                await session.run(query, rows=rows)
+                logger.debug(f"Created {len(rows)} graph memory node(s)")
         except Exception as e:
-            logger.error(f"Failed to create memory node: {e}")
+            logger.error(f"Failed to create memory nodes: {e}")
 
     async def get_memory_neighborhood(self, vector_ids: List[str], max_depth: int = 2) -> List[Dict[str, Any]]:
         """
@@ -478,6 +522,16 @@ PRIVACY RESTRICTION ENABLED:
             logger.error(f"Failed to get memory neighborhood: {e}")
             return []
 
+    @staticmethod
+    def _user_cache_tag(user_id: str) -> str:
+        """Cache tag grouping every per-user knowledge cache entry (invalidated when facts change)."""
+        return f"knowledge:user:{user_id}"
+
+    async def _invalidate_user_caches(self, user_id: str) -> None:
+        """Drops the user's tagged knowledge caches and their local entity matcher."""
+        self._entity_matchers.invalidate(user_id)
+        await cache_manager.invalidate_tags(self._user_cache_tag(user_id))
+
     async def find_common_ground(self, user_id: str, bot_name: str) -> str:
         """
         Finds shared facts or entities between the user and the bot.
@@ -486,7 +540,7 @@ PRIVACY RESTRICTION ENABLED:
         2. Shared categories (User -> Entity -> Category <- Entity <- Bot)
         """
         cache_key = f"knowledge:common_ground:{bot_name}:{user_id}"
-        cached_data = await cache_manager.get(cache_key)
+        cached_data = await cache_manager.get(cache_key, l1=True)
         if cached_data is not None:
             return cached_data
 
@@ -543,7 +597,7 @@ PRIVACY RESTRICTION ENABLED:
                         connections.append(f"- Shared Interest: {r['shared']} (You know this from your background, User has this trait)")
 
                 result_str = "\n".join(connections) if connections else ""
-                await cache_manager.set(cache_key, result_str)
+                await cache_manager.set(cache_key, result_str, tags=[self._user_cache_tag(user_id)], l1=True)
                 return result_str
         except Exception as e:
             logger.error(f"Common ground check failed: {e}")
@@ -641,8 +695,8 @@ PRIVACY RESTRICTION ENABLED:
         """
         cache_key = "system:known_bot_names"
         
-        # 1. Try Redis
-        cached_names = await cache_manager.get_json(cache_key)
+        # 1. Try L1 / Redis
+        cached_names = await cache_manager.get_json(cache_key, l1=True)
         if cached_names:
             return set(cached_names)
             
@@ -658,7 +712,7 @@ PRIVACY RESTRICTION ENABLED:
                         bot_names.add(p.name.lower())
             
             # Cache for 1 hour
-            await cache_manager.set_json(cache_key, list(bot_names), ttl=3600)
+            await cache_manager.set_json(cache_key, list(bot_names), ttl=3600, l1=True)
             
         except Exception as e:
             logger.warning(f"Failed to load dynamic bot names: {e}")
@@ -777,30 +831,36 @@ PRIVACY RESTRICTION ENABLED:
         
         logger.info(f"Saving {len(valid_facts)}/{len(facts)} facts for user {user_id} (source: {bot_name}, self_reflection={is_self_reflection})")
 
-        # 2. Store in Neo4j
+        # 2. Store in Neo4j (one transaction for the whole batch)
         async with db_manager.neo4j_driver.session() as session:
-            for fact in valid_facts:
-                await session.execute_write(self._merge_fact, user_id, fact, bot_name, is_self_reflection)
+            await session.execute_write(self._merge_facts, user_id, valid_facts, bot_name, is_self_reflection)
         
-        # Invalidate common ground cache for this user (across all bots)
-        await cache_manager.delete_pattern(f"knowledge:common_ground:*:{user_id}")
+        # Invalidate cached common ground (across all bots) and entity list for this user
+        await self._invalidate_user_caches(user_id)
 
     @staticmethod
-    async def _merge_fact(tx, user_id: str, fact: Fact, bot_name: str, is_self_reflection: bool = False):
+    def _overrides(later: Fact, earlier: Fact) -> bool:
+        """True if saving `later` would delete the relationship written for `earlier`."""
+        later_predicate = later.predicate.upper()
+        earlier_predicate = earlier.predicate.upper()
+        if later_predicate in SINGLE_VALUE_PREDICATES and earlier_predicate == later_predicate:
+            return True
+        return (
+            earlier_predicate in ANTONYM_PAIRS.get(later_predicate, [])
+            and earlier.object == later.object
+        )
+
+    @staticmethod
+    async def _merge_facts(tx, user_id: str, facts: List[Fact], bot_name: str, is_self_reflection: bool = False):
         """
-        Cypher query to merge the fact into the graph.
+        Cypher queries to merge a batch of facts into the graph.
         Handles single-value predicates and antonym conflicts.
-        """
-        SINGLE_VALUE_PREDICATES = {"LIVES_IN", "HAS_NAME", "IS_AGED", "HAS_GENDER"}
-        ANTONYM_PAIRS = {
-            "LIKES": ["HATES", "DISLIKES"],
-            "LOVES": ["HATES", "DISLIKES"],
-            "HATES": ["LIKES", "LOVES"],
-            "DISLIKES": ["LIKES", "LOVES"]
-        }
         
-        predicate = fact.predicate.upper()
-
+        Runs two UNWIND statements (deletes, then merges) regardless of batch size.
+        The result matches merging the facts one at a time in order: every fact's
+        deletes are applied, and a fact that a later fact in the batch would have
+        deleted is not written.
+        """
         # Determine Subject Node (User or Character)
         if is_self_reflection:
             # If self-reflection, the subject is the Character
@@ -813,37 +873,42 @@ PRIVACY RESTRICTION ENABLED:
             subject_match = "MATCH (s:User {id: $user_id})"
             subject_merge = "MERGE (s:User {id: $user_id})"
 
-        # 1. Handle Single Value Predicates (Global overwrite)
-        if predicate in SINGLE_VALUE_PREDICATES:
+        deletions = []
+        for fact in facts:
+            predicate = fact.predicate.upper()
+            # 1. Single Value Predicates (Global overwrite)
+            if predicate in SINGLE_VALUE_PREDICATES:
+                deletions.append({"predicates": [predicate], "object_name": None})
+            # 2. Antonyms (Specific object overwrite)
+            if predicate in ANTONYM_PAIRS:
+                deletions.append({"predicates": ANTONYM_PAIRS[predicate], "object_name": fact.object})
+
+        if deletions:
             delete_query = f"""
             {subject_match}
-            MATCH (s)-[r:FACT {{predicate: $predicate}}]->()
+            UNWIND $deletions AS d
+            MATCH (s)-[r:FACT]->(o)
+            WHERE r.predicate IN d.predicates
+              AND (d.object_name IS NULL OR (o:Entity AND o.name = d.object_name))
             DELETE r
             """
-            await tx.run(delete_query, user_id=user_id, bot_name=bot_name, predicate=predicate)
+            await tx.run(delete_query, user_id=user_id, bot_name=bot_name, deletions=deletions)
 
-        # 2. Handle Antonyms (Specific object overwrite)
-        if predicate in ANTONYM_PAIRS:
-            antonyms = ANTONYM_PAIRS[predicate]
-            delete_antonym_query = f"""
-            {subject_match}
-            MATCH (s)-[r:FACT]->(o:Entity {{name: $object_name}})
-            WHERE r.predicate IN $antonyms
-            DELETE r
-            """
-            await tx.run(delete_antonym_query, 
-                         user_id=user_id, 
-                         bot_name=bot_name,
-                         object_name=fact.object, 
-                         antonyms=antonyms)
+        rows = [
+            {"object_name": fact.object, "predicate": fact.predicate.upper(), "confidence": fact.confidence}
+            for i, fact in enumerate(facts)
+            if not any(KnowledgeManager._overrides(later, fact) for later in facts[i + 1:])
+        ]
 
-        # 3. Merge New Fact
+        # 3. Merge New Facts
         query_safe = f"""
         {subject_merge}
-        MERGE (o:Entity {{name: $object_name}})
-        MERGE (s)-[r:FACT {{predicate: $predicate}}]->(o)
+        WITH s
+        UNWIND $rows AS row
+        MERGE (o:Entity {{name: row.object_name}})
+        MERGE (s)-[r:FACT {{predicate: row.predicate}}]->(o)
         ON CREATE SET 
-            r.confidence = $confidence, 
+            r.confidence = row.confidence, 
             r.source_bot = $bot_name, 
             r.created_at = datetime(), 
             r.updated_at = datetime(),
@@ -851,15 +916,13 @@ PRIVACY RESTRICTION ENABLED:
         ON MATCH SET 
             r.updated_at = datetime(),
             r.mention_count = coalesce(r.mention_count, 1) + 1,
-            r.confidence = CASE WHEN $confidence > r.confidence THEN $confidence ELSE r.confidence END
+            r.confidence = CASE WHEN row.confidence > r.confidence THEN row.confidence ELSE r.confidence END
         """
         
         await tx.run(query_safe, 
                      user_id=user_id, 
                      bot_name=bot_name,
-                     object_name=fact.object, 
-                     predicate=predicate,
-                     confidence=fact.confidence)
+                     rows=rows)
 
     @require_db("neo4j", default_return=[])
     async def get_recent_observations_by(self, bot_name: str, limit: int = 10) -> List[Dict[str, Any]]:
@@ -1273,11 +1336,8 @@ PRIVACY RESTRICTION ENABLED:
         Example return: {"Luna", "Seattle", "marine biology", "sister Maya"}
         """
         cache_key = f"knowledge:user_entities:{user_id}"
-        cached_data = await cache_manager.get_json(cache_key)
-        if cached_data is not None:
-            return set(cached_data)  # Convert cached list to set
-        
-        try:
+
+        async def load_entities() -> List[str]:
             query = """
             MATCH (u:User {id: $user_id})-[:FACT]->(e:Entity)
             RETURN DISTINCT e.name as name
@@ -1287,18 +1347,32 @@ PRIVACY RESTRICTION ENABLED:
                 result = await session.run(query, user_id=user_id)
                 records = await result.data()
                 
-                entities = {r['name'] for r in records if r.get('name')}
-                
-                # Cache for 5 minutes (300 seconds) - use set_json for list serialization
-                await cache_manager.set_json(cache_key, list(entities), ttl=300)
-                
-                logger.debug(f"[E30] Loaded {len(entities)} entities for user {user_id[:8]}...")
-                return entities
+            entities = sorted({r['name'] for r in records if r.get('name')})
+            logger.debug(f"[E30] Loaded {len(entities)} entities for user {user_id[:8]}...")
+            return entities
+
+        try:
+            # L1 -> Redis -> Neo4j; concurrent misses for a user share one query.
+            # Cached for 5 minutes, dropped early when the user's facts change.
+            entities = await cache_manager.get_or_load(
+                cache_key, load_entities, ttl=300, tags=[self._user_cache_tag(user_id)]
+            )
+            return set(entities or [])
                 
         except Exception as e:
             logger.error(f"Failed to get user entities: {e}")
             return set()
 
+    async def get_entity_matcher(self, user_id: str) -> EntityMatcher:
+        """
+        Get an Aho-Corasick matcher over the user's entities (Phase E30).
+        
+        Built once per entity set and cached in-process; rebuilt when the
+        cached entity list changes (facts saved here or in another process).
+        """
+        entities = await self.get_user_entities(user_id)
+        return self._entity_matchers.get(user_id, entities)
+
     async def get_user_entity_count(self, user_id: str) -> int:
         """Get count of entities for a user (for instrumentation)."""
         entities = await self.get_user_entities(user_id)
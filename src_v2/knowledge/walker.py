@@ -18,9 +18,11 @@ Design Philosophy:
 See: docs/roadmaps/GRAPH_WALKER_AGENT.md
 """
 
+import asyncio
+import json
 import random
 from dataclasses import dataclass, field
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any, Set, Tuple
 from loguru import logger
 from langchain_core.messages import HumanMessage, SystemMessage
@@ -32,6 +34,61 @@ from src_v2.agents.llm_factory import create_llm
 from src_v2.evolution.trust import TrustManager
 from src_v2.knowledge.recommendations import recommendation_engine, SimilarUser
 
+# Frontier ids are resolved through labelled lookups so each one hits a
+# constraint/index (see KnowledgeManager.initialize and UniverseManager.initialize)
+# instead of scanning every node in the graph. Ids no labelled lookup resolves
+# (nodes of any other label) fall back to an unlabelled match, so they are
+# still expanded, just without an index.
+ID_KEYED_LABELS = ("User", "Memory", "Planet", "Channel", "Subject")
+NAME_KEYED_LABELS = ("Entity", "Topic", "Character", "Trait")
+
+
+def _build_expand_query() -> str:
+    lookups = [
+        f"WITH frontier_id MATCH (source:{label} {{id: frontier_id}}) RETURN source"
+        for label in ID_KEYED_LABELS
+    ] + [
+        f"WITH frontier_id MATCH (source:{label} {{name: frontier_id}}) RETURN source"
+        for label in NAME_KEYED_LABELS
+    ]
+    union = "\n                UNION\n                ".join(lookups)
+    return f"""
+        UNWIND $frontier AS frontier_id
+        CALL {{
+            WITH frontier_id
+            CALL {{
+                {union}
+            }}
+            RETURN collect(source) AS resolved
+        }}
+        CALL {{
+            WITH frontier_id, resolved
+            UNWIND resolved AS source
+            RETURN source
+            UNION
+            WITH frontier_id, resolved
+            WITH frontier_id WHERE size(resolved) = 0
+            MATCH (source) WHERE source.id = frontier_id OR source.name = frontier_id
+            RETURN source
+        }}
+        WITH DISTINCT source
+        MATCH (source)-[r]-(neighbor)
+        WHERE (neighbor.id IS NOT NULL AND NOT neighbor.id IN $visited)
+           OR (neighbor.name IS NOT NULL AND NOT neighbor.name IN $visited)
+        RETURN DISTINCT
+            COALESCE(source.id, source.name) as source_id,
+            labels(neighbor)[0] as neighbor_label,
+            COALESCE(neighbor.id, neighbor.name) as neighbor_id,
+            neighbor.name as neighbor_name,
+            type(r) as edge_type,
+            properties(r) as edge_props,
+            properties(neighbor) as neighbor_props
+        LIMIT $limit
+        """
+
+
+EXPAND_FRONTIER_QUERY = _build_expand_query()
+
 
 @dataclass
 class WalkedNode:
@@ -194,6 +251,21 @@ class GraphWalker:
                     
                     if not new_nodes:
                         break
+                    
+                    # Fetch trust trajectories for every new User node in one query (E26)
+                    if bot_name:
+                        pending = [
+                            node.id for node in new_nodes
+                            if node.label == "User" and f"{bot_name}:{node.id}" not in trust_trajectories
+                        ]
+                        if pending:
+                            fetched = await self.get_trust_trajectories(
+                                user_ids=pending,
+                                bot_name=bot_name,
+                                days=30
+                            )
+                            for pending_id in pending:
+                                trust_trajectories[f"{bot_name}:{pending_id}"] = fetched.get(pending_id, [])
                         
                     # Build node->edge lookup for temporal scoring
                     node_edge_map = {}
@@ -211,14 +283,7 @@ class GraphWalker:
                         # Get trust trajectory for User nodes
                         trust_traj = None
                         if node.label == "User" and bot_name:
-                            cache_key = f"{bot_name}:{node.id}"
-                            if cache_key not in trust_trajectories:
-                                trust_trajectories[cache_key] = await self.get_trust_trajectory(
-                                    user_id=node.id,
-                                    bot_name=bot_name,
-                                    days=30
-                                )
-                            trust_traj = trust_trajectories.get(cache_key)
+                            trust_traj = trust_trajectories.get(f"{bot_name}:{node.id}")
                         
                         # Base score from node properties
                         base_score = await self._score_node(
@@ -313,45 +378,18 @@ class GraphWalker:
         limit: int
     ) -> Tuple[List[WalkedNode], List[WalkedEdge]]:
         """
-        Expand from frontier nodes to their neighbors.
+        Expand the whole frontier to its neighbors in one query.
+        Frontier ids are matched through labelled lookups (ID_KEYED_LABELS by id,
+        NAME_KEYED_LABELS by name) so every hop is index-backed; only ids none of
+        them resolve fall back to an unlabelled match.
         Returns new nodes and edges.
         """
         if not frontier:
             return [], []
         
-        # Query for neighbors of all frontier nodes
-        # We look for nodes connected by any relationship type
-        # Using CALL subquery to handle UNION + LIMIT correctly
-        query = """
-        CALL {
-            UNWIND $frontier AS frontier_id
-            MATCH (source {id: frontier_id})-[r]-(neighbor)
-            WHERE (neighbor.id IS NOT NULL AND NOT neighbor.id IN $visited)
-               OR (neighbor.name IS NOT NULL AND NOT neighbor.name IN $visited)
-            RETURN source, r, neighbor
-            
-            UNION
-            
-            UNWIND $frontier AS frontier_id
-            MATCH (source {name: frontier_id})-[r]-(neighbor)
-            WHERE (neighbor.id IS NOT NULL AND NOT neighbor.id IN $visited)
-               OR (neighbor.name IS NOT NULL AND NOT neighbor.name IN $visited)
-            RETURN source, r, neighbor
-        }
-        RETURN DISTINCT
-            COALESCE(source.id, source.name) as source_id,
-            labels(neighbor)[0] as neighbor_label,
-            COALESCE(neighbor.id, neighbor.name) as neighbor_id,
-            neighbor.name as neighbor_name,
-            type(r) as edge_type,
-            properties(r) as edge_props,
-            properties(neighbor) as neighbor_props
-        LIMIT $limit
-        """
-        
         try:
             result = await session.run(
-                query,
+                EXPAND_FRONTIER_QUERY,
                 frontier=frontier,
                 visited=list(visited),
                 limit=limit
@@ -589,14 +627,37 @@ class GraphWalker:
         Returns:
             List of trust scores ordered chronologically (oldest first)
         """
-        if not db_manager.influxdb_client:
-            return []
+        trajectories = await self.get_trust_trajectories([user_id], bot_name, days)
+        return trajectories.get(user_id, [])
+    
+    async def get_trust_trajectories(
+        self,
+        user_ids: List[str],
+        bot_name: str,
+        days: int = 30
+    ) -> Dict[str, List[float]]:
+        """
+        Batch form of get_trust_trajectory().
         
-        # Check cache first
-        cache_key = f"trust_trajectory:{bot_name}:{user_id}:{days}"
-        cached = await cache_manager.get_json(cache_key)
-        if cached:
-            return cached
+        Cached trajectories are read with one MGET; the rest come from a single
+        Flux query filtered on the whole user set.
+        
+        Returns:
+            Mapping of user_id to chronological trust scores. Users without
+            history are omitted.
+        """
+        if not db_manager.influxdb_client or not user_ids:
+            return {}
+        
+        user_ids = list(dict.fromkeys(user_ids))
+        cache_keys = {uid: f"trust_trajectory:{bot_name}:{uid}:{days}" for uid in user_ids}
+        cached = await cache_manager.get_json_many(list(cache_keys.values()))
+        trajectories: Dict[str, List[float]] = {
+            uid: scores for uid, scores in zip(user_ids, cached) if scores
+        }
+        missing = {uid for uid in user_ids if uid not in trajectories}
+        if not missing:
+            return trajectories
         
         try:
             query_api = db_manager.influxdb_client.query_api()
@@ -605,30 +666,36 @@ class GraphWalker:
             from(bucket: "{settings.INFLUXDB_BUCKET}")
               |> range(start: -{days}d)
               |> filter(fn: (r) => r["_measurement"] == "trust_update")
-              |> filter(fn: (r) => r["user_id"] == "{user_id}")
+              |> filter(fn: (r) => contains(value: r["user_id"], set: {json.dumps(sorted(missing))}))
               |> filter(fn: (r) => r["bot_name"] == "{bot_name}")
               |> filter(fn: (r) => r["_field"] == "trust_score")
+              |> group(columns: ["user_id"])
               |> sort(columns: ["_time"], desc: false)
             '''
             
-            tables = query_api.query(flux_query)
+            tables = await asyncio.to_thread(query_api.query, flux_query)
             
-            scores = []
+            fetched: Dict[str, List[float]] = {}
             for table in tables:
                 for record in table.records:
                     value = record.get_value()
-                    if isinstance(value, (int, float)):
-                        scores.append(float(value))
+                    record_user = record.values.get("user_id")
+                    if record_user in missing and isinstance(value, (int, float)):
+                        fetched.setdefault(record_user, []).append(float(value))
             
             # Cache for 5 minutes
-            if scores:
-                await cache_manager.set_json(cache_key, scores, ttl=300)
+            if fetched:
+                await asyncio.gather(*(
+                    cache_manager.set_json(cache_keys[uid], scores, ttl=300)
+                    for uid, scores in fetched.items()
+                ))
             
-            return scores
+            trajectories.update(fetched)
+            return trajectories
             
         except Exception as e:
             logger.debug(f"Trust trajectory query failed (non-critical): {e}")
-            return []
+            return trajectories
 
     async def multi_character_walk(
         self,
@@ -5,8 +5,12 @@ import uvicorn
 from loguru import logger
 from src_v2.config.settings import settings
 from src_v2.core.database import db_manager
+from src_v2.core.cache import cache_manager
+from src_v2.core.quota import quota_manager
+from src_v2.agents.llm_factory import close_llm_clients
 from src_v2.core.character import character_manager
 from src_v2.memory.manager import memory_manager
+from src_v2.memory.embeddings import EmbeddingService
 from src_v2.knowledge.manager import knowledge_manager
 from src_v2.universe.manager import universe_manager
 from src_v2.discord.bot import bot
@@ -41,9 +45,11 @@ async def main():
         # Initialize components
         logger.info("Initializing database connections...")
         await db_manager.connect_all()
+        await cache_manager.start_invalidation_listener()
         
         logger.info("Initializing memory system...")
         await memory_manager.initialize()
+        await memory_manager.ingestion_queue.recover()
 
         logger.info("Initializing knowledge graph...")
         await knowledge_manager.initialize()
@@ -56,7 +62,16 @@ async def main():
         character_manager.load_character(settings.DISCORD_BOT_NAME, raise_on_error=True)
         
         # Register cleanup tasks
-        shutdown_handler.add_cleanup_task(db_manager.disconnect_all)
+        # Drain pending memory writes before the connections they need are closed
+        async def _shutdown_storage():
+            await memory_manager.ingestion_queue.stop()
+            EmbeddingService.shutdown_process_pools()
+            await quota_manager.stop()
+            await close_llm_clients()
+            await cache_manager.stop_invalidation_listener()
+            await db_manager.disconnect_all()
+
+        shutdown_handler.add_cleanup_task(_shutdown_storage)
         
         # Start API Server
         api_task = None
@@ -32,7 +32,7 @@ from src_v2.config.settings import settings
 from src_v2.safety.content_review import content_safety_checker
 from src_v2.utils.name_resolver import get_name_resolver
 from src_v2.core.provenance import ProvenanceCollector
-from src_v2.utils.time_utils import get_configured_timezone
+from src_v2.utils.time_utils import get_configured_timezone, to_epoch_seconds
 
 
 class DiaryEntry(BaseModel):
@@ -703,6 +703,7 @@ class DiaryManager:
                     "emotional_highlights": entry.emotional_highlights,
                     "provenance": provenance or [],
                     "timestamp": entry_date.isoformat(),
+                    "timestamp_epoch": to_epoch_seconds(entry_date),
                     "visibility": "private",  # Character's private diary
                     # ADR-014: Author tracking - diaries are bot-authored
                     "author_id": self.bot_name,
@@ -29,7 +29,7 @@ import uuid
 from loguru import logger
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
-from src_v2.utils.time_utils import get_configured_timezone
+from src_v2.utils.time_utils import get_configured_timezone, to_epoch_seconds
 
 from src_v2.utils.name_resolver import get_name_resolver
 from qdrant_client.models import PointStruct, Filter, FieldCondition, MatchValue
@@ -791,6 +791,7 @@ Create a surreal dream echoing these experiences.""")
                     "memory_echoes": dream.memory_echoes,
                     "provenance": provenance or [],
                     "timestamp": now.isoformat(),
+                    "timestamp_epoch": to_epoch_seconds(now),
                     "date": now.strftime("%Y-%m-%d"),
                     # ADR-014: Author tracking - dreams are bot-authored
                     "author_id": self.bot_name,
@@ -0,0 +1,296 @@
+"""
+Process-pool embedding backend.
+
+Runs FastEmbed inference in a fixed set of worker processes, each with its
+own preloaded model, so ONNX inference and tokenization neither hold the
+event loop's GIL nor serialize behind a single per-process model lock.
+
+Texts are sent to the workers as task arguments; the float32 vectors come
+back through a shared-memory block split into fixed-size slots, so only a
+row count crosses the result pipe.
+"""
+
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+from collections import deque
+from multiprocessing import shared_memory
+from loguru import logger
+import asyncio
+import atexit
+import multiprocessing
+import os
+import threading
+
+import numpy as np
+
+
+ModelFactory = Callable[[str, Optional[int]], Any]
+
+
+def load_text_embedding(model_name: str, threads: Optional[int] = None) -> Any:
+    """Loads a FastEmbed TextEmbedding, honouring FASTEMBED_CACHE_PATH."""
+    from fastembed import TextEmbedding
+
+    kwargs: Dict[str, Any] = {"model_name": model_name}
+    cache_dir = os.environ.get("FASTEMBED_CACHE_PATH")
+    if cache_dir:
+        logger.info(f"Using FastEmbed cache: {cache_dir}")
+        kwargs["cache_dir"] = cache_dir
+    if threads:
+        kwargs["threads"] = threads
+    return TextEmbedding(**kwargs)
+
+
+# --- Worker process state (one model and one shared-memory attachment per process) ---
+
+_worker_model: Any = None
+_worker_segments: Dict[str, shared_memory.SharedMemory] = {}
+
+
+def _init_worker(model_factory: ModelFactory, model_name: str, threads: Optional[int]) -> None:
+    global _worker_model
+    _worker_model = model_factory(model_name, threads)
+    # Run one inference so the first real request doesn't pay for session warm-up
+    list(_worker_model.embed(["warmup"]))
+
+
+def _worker_dimension() -> int:
+    return len(next(iter(_worker_model.embed(["dimension probe"]))))
+
+
+def _worker_embed(segment: str, offset: int, dimension: int, texts: List[str]) -> int:
+    shm = _worker_segments.get(segment)
+    if shm is None:
+        shm = shared_memory.SharedMemory(name=segment)
+        _worker_segments[segment] = shm
+
+    out = np.ndarray((len(texts), dimension), dtype=np.float32, buffer=shm.buf, offset=offset)
+    for row, vector in enumerate(_worker_model.embed(texts)):
+        out[row] = vector
+    del out
+    return len(texts)
+
+
+class _SlotPool:
+    """
+    Free shared-memory slots. Waiters park as futures on their own event loop
+    (no executor thread is held), and slots can be returned from any thread:
+    the pool's result-handler thread hands them back too.
+    """
+
+    def __init__(self, slots: Iterable[int] = ()):
+        self._lock = threading.Lock()
+        self._free: Deque[int] = deque(slots)
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._closed = False
+
+    def available(self) -> int:
+        with self._lock:
+            return len(self._free)
+
+    async def acquire(self) -> int:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("EmbeddingProcessPool is closed")
+            if self._free:
+                return self._free.popleft()
+            waiter = loop.create_future()
+            self._waiters.append((loop, waiter))
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            # Handed a slot just as the wait was cancelled; pass it on
+            if waiter.done() and not waiter.cancelled():
+                self.release(waiter.result())
+            raise
+
+    def release(self, slot: int) -> None:
+        """Returns a slot to the first live waiter, else to the free list."""
+        with self._lock:
+            while self._waiters:
+                loop, waiter = self._waiters.popleft()
+                if waiter.done():
+                    continue  # Cancelled while waiting
+                try:
+                    loop.call_soon_threadsafe(self._hand_over, waiter, slot)
+                    return
+                except RuntimeError:
+                    continue  # Its loop is closed
+            self._free.append(slot)
+
+    def _hand_over(self, waiter: asyncio.Future, slot: int) -> None:
+        # Runs on the waiter's loop; it may have been cancelled since release()
+        if waiter.done():
+            self.release(slot)
+        else:
+            waiter.set_result(slot)
+
+    def close(self) -> None:
+        """Fails every parked waiter; later acquires raise."""
+        with self._lock:
+            self._closed = True
+            waiters, self._waiters = self._waiters, deque()
+        error = RuntimeError("EmbeddingProcessPool is closed")
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(lambda w=waiter: w.done() or w.set_exception(error))
+            except RuntimeError:
+                pass
+
+
+class EmbeddingProcessPool:
+    """
+    A pool of embedding worker processes with shared-memory result transfer.
+
+    Usage:
+        pool = EmbeddingProcessPool("sentence-transformers/all-MiniLM-L6-v2", workers=2)
+        pool.start()  # blocking: spawns workers and loads a model in each
+        vector = await pool.embed_query_async("hello")
+        pool.close()
+
+    Each in-flight request holds one slot of `max_batch_size` rows; larger
+    document lists are split across slots and run on several workers at once.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        workers: int = 2,
+        max_batch_size: int = 32,
+        slots: Optional[int] = None,
+        threads_per_worker: Optional[int] = None,
+        timeout_s: float = 30.0,
+        model_factory: ModelFactory = load_text_embedding,
+    ):
+        self.model_name = model_name
+        self.workers = max(1, workers)
+        self.max_batch_size = max(1, max_batch_size)
+        self.slot_count = slots or self.workers * 4
+        self.threads_per_worker = threads_per_worker
+        self.timeout_s = timeout_s
+        self.model_factory = model_factory
+
+        self.dimension: Optional[int] = None
+        self._pool: Optional[Any] = None
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._free_slots = _SlotPool()
+        self._start_lock = threading.Lock()
+
+    @property
+    def started(self) -> bool:
+        return self._pool is not None
+
+    def start(self, startup_timeout_s: float = 120.0) -> None:
+        """Spawns the workers, waits for their models to load and allocates the result buffer."""
+        with self._start_lock:
+            if self._pool is not None:
+                return
+
+            logger.info(f"Starting {self.workers} embedding worker processes for {self.model_name}")
+            ctx = multiprocessing.get_context("spawn")
+            pool = ctx.Pool(
+                processes=self.workers,
+                initializer=_init_worker,
+                initargs=(self.model_factory, self.model_name, self.threads_per_worker),
+            )
+            try:
+                # One probe per worker; a probe only completes once that worker's model is loaded
+                probes = [pool.apply_async(_worker_dimension) for _ in range(self.workers)]
+                dimension = probes[0].get(timeout=startup_timeout_s)
+                for probe in probes[1:]:
+                    probe.get(timeout=startup_timeout_s)
+            except Exception:
+                pool.terminate()
+                pool.join()
+                raise
+
+            slot_bytes = self.max_batch_size * dimension * np.dtype(np.float32).itemsize
+            self._shm = shared_memory.SharedMemory(create=True, size=slot_bytes * self.slot_count)
+            self._free_slots = _SlotPool(range(self.slot_count))
+            self.dimension = dimension
+            self._pool = pool
+            atexit.register(self.close)
+            logger.info(f"Embedding worker pool ready (dimension={dimension}, slots={self.slot_count})")
+
+    def close(self) -> None:
+        """Terminates the workers and releases the shared-memory block."""
+        with self._start_lock:
+            pool, shm, free_slots = self._pool, self._shm, self._free_slots
+            self._pool, self._shm = None, None
+            self._free_slots = _SlotPool()
+        free_slots.close()
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+        atexit.unregister(self.close)
+
+    async def _embed_chunk(self, texts: List[str]) -> List[List[float]]:
+        if self._pool is None or self._shm is None or self.dimension is None:
+            raise RuntimeError("EmbeddingProcessPool is not started")
+
+        loop = asyncio.get_running_loop()
+        free_slots = self._free_slots
+        slot = await free_slots.acquire()
+        offset = slot * self.max_batch_size * self.dimension * np.dtype(np.float32).itemsize
+        future: asyncio.Future = loop.create_future()
+
+        def resolve(result: Any, error: Optional[BaseException]) -> None:
+            if future.done():
+                # The caller gave up; the worker has only now finished with the slot
+                free_slots.release(slot)
+            elif error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+        def notify(result: Any = None, error: Optional[BaseException] = None) -> None:
+            # Runs on the pool's result-handler thread
+            try:
+                loop.call_soon_threadsafe(resolve, result, error)
+            except RuntimeError:
+                free_slots.release(slot)  # Loop already closed
+
+        self._pool.apply_async(
+            _worker_embed,
+            (self._shm.name, offset, self.dimension, texts),
+            callback=notify,
+            error_callback=lambda e: notify(error=e),
+        )
+
+        try:
+            rows = await asyncio.wait_for(asyncio.shield(future), timeout=self.timeout_s)
+        except BaseException:
+            if not future.done():
+                future.cancel()  # The slot is returned when the worker reports back
+            elif not future.cancelled():
+                free_slots.release(slot)
+            raise
+
+        try:
+            view = np.ndarray((rows, self.dimension), dtype=np.float32, buffer=self._shm.buf, offset=offset)
+            vectors = view.tolist()
+            del view
+        finally:
+            free_slots.release(slot)
+        return vectors
+
+    async def embed_documents_async(self, texts: List[str]) -> List[List[float]]:
+        """Embeds texts on the worker pool, one slot-sized chunk per worker call."""
+        if not texts:
+            return []
+        size = self.max_batch_size
+        chunks = [texts[i:i + size] for i in range(0, len(texts), size)]
+        if len(chunks) == 1:
+            return await self._embed_chunk(chunks[0])
+
+        results = await asyncio.gather(*(self._embed_chunk(chunk) for chunk in chunks))
+        return [vector for chunk in results for vector in chunk]
+
+    async def embed_query_async(self, text: str) -> List[float]:
+        """Embed a single string query on the worker pool."""
+        if not text or not isinstance(text, str):
+            raise ValueError(f"embed_query requires a non-empty string, got: {type(text)}")
+        return (await self._embed_chunk([text]))[0]
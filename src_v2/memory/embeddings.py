@@ -1,21 +1,177 @@
-from typing import List
+from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from dataclasses import dataclass
 from fastembed import TextEmbedding
 from loguru import logger
+import asyncio
+import hashlib
 import threading
-import os
+
+from src_v2.config.settings import settings
+from src_v2.memory.embedding_pool import EmbeddingProcessPool, load_text_embedding
+
+
+def _cache_key(text: str) -> str:
+    """Hash of the whitespace-normalized text, used as the query cache key."""
+    normalized = " ".join(text.split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class EmbeddingStats:
+    """Counters for the query cache and micro-batcher (per model)."""
+    cache_hits: int = 0
+    cache_misses: int = 0
+    batches: int = 0
+    batched_texts: int = 0
+    max_batch_size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.cache_hits + self.cache_misses
+        return self.cache_hits / total if total else 0.0
+
+    @property
+    def avg_batch_size(self) -> float:
+        return self.batched_texts / self.batches if self.batches else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "hit_rate": round(self.hit_rate, 4),
+            "batches": self.batches,
+            "batched_texts": self.batched_texts,
+            "avg_batch_size": round(self.avg_batch_size, 2),
+            "max_batch_size": self.max_batch_size,
+        }
+
+
+class _QueryCache:
+    """Thread-safe bounded LRU of query embeddings, keyed by text hash."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: List[float]) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class _MicroBatcher:
+    """
+    Collects concurrent query embeddings on one event loop and runs them
+    through a single `embed` call.
+
+    A batch is flushed after `window_s` seconds or as soon as `max_size`
+    distinct texts are pending, whichever comes first. Identical texts that
+    arrive while a batch is open share one future.
+    """
+
+    def __init__(self, service: "EmbeddingService", loop: asyncio.AbstractEventLoop, window_s: float, max_size: int):
+        self._service = service
+        self.loop = loop
+        self._window_s = window_s
+        self._max_size = max_size
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._texts: Dict[str, str] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    def submit(self, key: str, text: str) -> asyncio.Future:
+        future = self._pending.get(key)
+        if future is not None:
+            return future
+
+        future = self.loop.create_future()
+        self._pending[key] = future
+        self._texts[key] = text
+
+        if len(self._pending) >= self._max_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = self.loop.call_later(self._window_s, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        pending, texts = self._pending, self._texts
+        self._pending, self._texts = {}, {}
+        if pending:
+            self.loop.create_task(self._run_batch(pending, texts))
+
+    async def _run_batch(self, pending: Dict[str, asyncio.Future], texts: Dict[str, str]) -> None:
+        keys = list(pending)
+        stats = self._service._stats_entry
+        stats.batches += 1
+        stats.batched_texts += len(keys)
+        stats.max_batch_size = max(stats.max_batch_size, len(keys))
+
+        try:
+            vectors = await self._service.embed_documents_async([texts[k] for k in keys])
+        except Exception as e:
+            logger.error(f"Batched embedding of {len(keys)} queries failed: {e}")
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        cache = self._service._query_cache_entry
+        for key, vector in zip(keys, vectors):
+            cache.put(key, vector)
+            future = pending[key]
+            if not future.done():
+                future.set_result(vector)
+
 
 class EmbeddingService:
     """
     Service for generating vector embeddings using FastEmbed.
     Defaults to 'sentence-transformers/all-MiniLM-L6-v2' (384 dimensions).
+
+    Query embeddings are served from a bounded LRU cache (EMBEDDING_CACHE_SIZE)
+    and cache misses from concurrent callers are micro-batched into a single
+    model call (EMBEDDING_BATCH_WINDOW_MS / EMBEDDING_BATCH_MAX_SIZE).
+    The model, cache, batcher and stats are shared per model name.
+
+    With EMBEDDING_BACKEND=process, async embeddings run on an
+    EmbeddingProcessPool instead of the default executor; the sync methods
+    keep using the in-process model.
     """
-    
+
     _model_cache: dict[str, tuple[TextEmbedding, threading.Lock]] = {}
     _cache_lock = threading.Lock()
+    _query_caches: dict[str, _QueryCache] = {}
+    _batchers: dict[str, _MicroBatcher] = {}
+    _stats: dict[str, EmbeddingStats] = {}
+    _process_pools: dict[str, Optional[EmbeddingProcessPool]] = {}
 
     def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
         self.model_name = model_name
-        
+
     @property
     def _model_entry(self) -> tuple[TextEmbedding, threading.Lock]:
         """Lazy loading of the model with thread-safe locking."""
@@ -24,39 +180,148 @@ class EmbeddingService:
                 # Double-checked locking pattern to ensure thread safety
                 if self.model_name not in self._model_cache:
                     logger.info(f"Loading embedding model: {self.model_name}")
-                    
-                    # Check for cache path env var
-                    cache_dir = os.environ.get("FASTEMBED_CACHE_PATH")
-                    kwargs = {"model_name": self.model_name}
-                    if cache_dir:
-                        logger.info(f"Using FastEmbed cache: {cache_dir}")
-                        kwargs["cache_dir"] = cache_dir
-                        
-                    model = TextEmbedding(**kwargs)
+                    model = load_text_embedding(self.model_name)
                     self._model_cache[self.model_name] = (model, threading.Lock())
                     logger.info("Embedding model loaded successfully.")
         return self._model_cache[self.model_name]
 
+    @property
+    def _query_cache_entry(self) -> _QueryCache:
+        cache = self._query_caches.get(self.model_name)
+        if cache is None:
+            with self._cache_lock:
+                cache = self._query_caches.setdefault(self.model_name, _QueryCache(settings.EMBEDDING_CACHE_SIZE))
+        return cache
+
+    @property
+    def _stats_entry(self) -> EmbeddingStats:
+        stats = self._stats.get(self.model_name)
+        if stats is None:
+            with self._cache_lock:
+                stats = self._stats.setdefault(self.model_name, EmbeddingStats())
+        return stats
+
+    def _get_batcher(self) -> _MicroBatcher:
+        """Returns the batcher bound to the running loop, replacing one left over from a closed loop."""
+        loop = asyncio.get_running_loop()
+        batcher = self._batchers.get(self.model_name)
+        if batcher is None or batcher.loop is not loop:
+            batcher = _MicroBatcher(
+                self,
+                loop,
+                window_s=settings.EMBEDDING_BATCH_WINDOW_MS / 1000.0,
+                max_size=settings.EMBEDDING_BATCH_MAX_SIZE
+            )
+            self._batchers[self.model_name] = batcher
+        return batcher
+
+    async def _get_process_pool(self) -> Optional[EmbeddingProcessPool]:
+        """
+        Returns the started worker pool for this model, or None for the thread backend.
+
+        A pool that fails to start is recorded as None so that every later call
+        falls back to the thread backend instead of retrying the spawn.
+        """
+        if settings.EMBEDDING_BACKEND != "process":
+            return None
+
+        with self._cache_lock:
+            if self.model_name in self._process_pools:
+                pool = self._process_pools[self.model_name]
+            else:
+                pool = EmbeddingProcessPool(
+                    self.model_name,
+                    workers=settings.EMBEDDING_PROCESS_WORKERS,
+                    max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+                    threads_per_worker=settings.EMBEDDING_PROCESS_THREADS,
+                    timeout_s=settings.EMBEDDING_PROCESS_TIMEOUT_SECONDS,
+                )
+                self._process_pools[self.model_name] = pool
+        if pool is None or pool.started:
+            return pool
+
+        try:
+            # start() is idempotent and locked, so concurrent first callers share one spawn
+            await asyncio.get_running_loop().run_in_executor(None, pool.start)
+        except Exception as e:
+            logger.error(f"Embedding worker pool failed to start, falling back to thread backend: {e}")
+            pool.close()
+            self._process_pools[self.model_name] = None
+            return None
+        return pool
+
+    @classmethod
+    def shutdown_process_pools(cls) -> None:
+        """Terminates every embedding worker pool (safe to call when none were started)."""
+        for pool in cls._process_pools.values():
+            if pool is not None:
+                pool.close()
+        cls._process_pools.clear()
+
     @property
     def model(self) -> TextEmbedding:
         """Returns the model instance (for backward compatibility/direct access if needed)."""
         return self._model_entry[0]
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache hit rate and batch-size counters for this model."""
+        stats = self._stats_entry.as_dict()
+        stats["cache_size"] = len(self._query_cache_entry)
+        return stats
+
+    def reset_stats(self) -> None:
+        self._stats[self.model_name] = EmbeddingStats()
+
+    def clear_cache(self) -> None:
+        self._query_cache_entry.clear()
+
     def embed_query(self, text: str) -> List[float]:
         """Embed a single string query."""
         if not text or not isinstance(text, str):
             raise ValueError(f"embed_query requires a non-empty string, got: {type(text)}")
+
+        key = _cache_key(text)
+        cache = self._query_cache_entry
+        cached = cache.get(key)
+        if cached is not None:
+            self._stats_entry.cache_hits += 1
+            return list(cached)
+        self._stats_entry.cache_misses += 1
+
         model, lock = self._model_entry
         with lock:
             # list(model.embed([text])) returns a generator of numpy arrays
             embeddings = list(model.embed([text]))
-            return embeddings[0].tolist()
+            vector = embeddings[0].tolist()
+        cache.put(key, vector)
+        return list(vector)
 
     async def embed_query_async(self, text: str) -> List[float]:
-        """Embed a single string query asynchronously."""
-        import asyncio
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self.embed_query, text)
+        """
+        Embed a single string query asynchronously.
+
+        Cache hits return immediately. Misses are queued on the micro-batcher
+        so that concurrent callers share one model invocation.
+        """
+        if not text or not isinstance(text, str):
+            raise ValueError(f"embed_query requires a non-empty string, got: {type(text)}")
+
+        key = _cache_key(text)
+        cached = self._query_cache_entry.get(key)
+        if cached is not None:
+            self._stats_entry.cache_hits += 1
+            return list(cached)
+        self._stats_entry.cache_misses += 1
+
+        if settings.EMBEDDING_BATCH_MAX_SIZE <= 1:
+            vector = (await self.embed_documents_async([text]))[0]
+            self._query_cache_entry.put(key, vector)
+            return list(vector)
+
+        future = self._get_batcher().submit(key, text)
+        # Shield so that one cancelled caller doesn't cancel a future other callers share
+        vector = await asyncio.shield(future)
+        return list(vector)
 
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """Embed a list of documents."""
@@ -64,3 +329,13 @@ class EmbeddingService:
         with lock:
             embeddings = list(model.embed(texts))
             return [e.tolist() for e in embeddings]
+
+    async def embed_documents_async(self, texts: List[str]) -> List[List[float]]:
+        """Embed a list of documents off the event loop (worker pool or default executor)."""
+        if not texts:
+            return []
+        pool = await self._get_process_pool()
+        if pool is not None:
+            return await pool.embed_documents_async(texts)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.embed_documents, texts)
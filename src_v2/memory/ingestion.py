@@ -0,0 +1,292 @@
+"""
+Write-behind ingestion queue for chat memories.
+
+MemoryManager.add_message commits the Postgres row on the reply path and hands
+the expensive part (chunk embedding, Qdrant upsert, Neo4j memory nodes) to this
+queue. A small pool of consumers drains it in the background.
+
+Guarantees:
+- Backpressure: the queue is bounded; when it is full, enqueue() waits.
+- Durability: every job is written to a Redis hash journal before it is queued
+  and removed only after it succeeds, so a crash or restart replays it
+  (see recover()). Jobs that exhaust their retries move to a dead-letter list.
+- Ownership: each queue instance (one per process) journals under its own key
+  and heartbeats in a shared owners hash. recover() only replays journals
+  whose owner stopped heartbeating, claiming each one with SET NX first, so a
+  restarting bot never replays jobs a live worker process still has in flight.
+- Read-your-writes: jobs stay visible through pending_for() until their vector
+  write has landed, so searches can merge them in.
+"""
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from src_v2.config.settings import settings
+from src_v2.core.cache import cache_manager
+from src_v2.memory.models import MemorySourceType
+
+
+class MemoryIngestionQueue:
+    def __init__(
+        self,
+        handler: Callable[..., Awaitable[Any]],
+        name: str,
+        max_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        retry_base_delay: float = 1.0
+    ):
+        """
+        Args:
+            handler: Coroutine that performs the vector/graph write, called with the job kwargs
+            name: Namespace for the journal keys (usually the Qdrant collection name)
+        """
+        self._handler = handler
+        self.name = name
+        self.owner = uuid.uuid4().hex[:12]
+        self.journal_key = f"memory_ingest:journal:{name}:{self.owner}"
+        self.owners_key = f"memory_ingest:owners:{name}"
+        self.dead_letter_key = f"memory_ingest:dead:{name}"
+        self.lease_seconds = settings.MEMORY_INGEST_LEASE_SECONDS
+        self.max_size = max_size if max_size is not None else settings.MEMORY_INGEST_QUEUE_MAX
+        self.concurrency = concurrency if concurrency is not None else settings.MEMORY_INGEST_CONCURRENCY
+        self.max_attempts = max_attempts if max_attempts is not None else settings.MEMORY_INGEST_MAX_ATTEMPTS
+        self.retry_base_delay = retry_base_delay
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._workers: List[asyncio.Task] = []
+        self._retry_tasks: set[asyncio.Task] = set()
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._registered = False
+        self._pending: Dict[str, Dict[str, Any]] = {}
+
+        self.stats = {"enqueued": 0, "completed": 0, "retried": 0, "dead_lettered": 0}
+
+    def _ensure_started(self) -> asyncio.Queue:
+        """Starts the consumers on the running loop (restarting them if the loop changed)."""
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.max_size)
+            self._workers = [
+                loop.create_task(self._worker(i)) for i in range(self.concurrency)
+            ]
+            self._stopping = asyncio.Event()
+            self._heartbeat_task = loop.create_task(self._heartbeat(self._stopping))
+        return self._queue
+
+    async def _beat(self) -> None:
+        await cache_manager.hset(self.owners_key, self.owner, str(time.time()))
+        self._registered = True
+
+    async def _heartbeat(self, stopping: asyncio.Event) -> None:
+        """Keeps this owner's journal marked as live until stop()."""
+        # Exits on the event rather than on cancel(): a cancel landing inside the
+        # Redis call can be swallowed by the client's error handling.
+        while not stopping.is_set():
+            await self._beat()
+            try:
+                await asyncio.wait_for(stopping.wait(), self.lease_seconds / 3)
+            except asyncio.TimeoutError:
+                pass
+
+    @staticmethod
+    def _serialize(job: Dict[str, Any]) -> str:
+        kwargs = dict(job["kwargs"])
+        if isinstance(kwargs.get("source_type"), MemorySourceType):
+            kwargs["source_type"] = kwargs["source_type"].value
+        return json.dumps({**job, "kwargs": kwargs}, default=str)
+
+    @staticmethod
+    def _deserialize(raw: str) -> Dict[str, Any]:
+        job = json.loads(raw)
+        source_type = job["kwargs"].get("source_type")
+        if source_type:
+            job["kwargs"]["source_type"] = MemorySourceType(source_type)
+        return job
+
+    async def enqueue(self, **kwargs) -> str:
+        """
+        Journals and queues a vector/graph write. Waits if the queue is full.
+
+        Returns:
+            The job ID
+        """
+        queue = self._ensure_started()
+        job = {
+            "id": str(uuid.uuid4()),
+            "kwargs": kwargs,
+            "attempts": 0,
+            "enqueued_at": time.time()
+        }
+        self._pending[job["id"]] = job
+        if not self._registered:
+            # A journal must never exist without its owner being discoverable
+            await self._beat()
+        await cache_manager.hset(self.journal_key, job["id"], self._serialize(job))
+
+        if queue.full():
+            logger.warning(f"Memory ingestion queue full ({self.max_size}), applying backpressure")
+        await queue.put(job)
+        self.stats["enqueued"] += 1
+        return job["id"]
+
+    def pending_for(self, user_id: str, collection_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Returns the kwargs of not-yet-written jobs for this user (and collection, if given)."""
+        results = []
+        for job in self._pending.values():
+            kwargs = job["kwargs"]
+            if str(kwargs.get("user_id")) != str(user_id):
+                continue
+            if collection_name and kwargs.get("collection_name") not in (None, collection_name):
+                continue
+            results.append({**kwargs, "job_id": job["id"], "enqueued_at": job["enqueued_at"]})
+        return results
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    async def _worker(self, index: int) -> None:
+        queue = self._queue
+        while True:
+            job = await queue.get()
+            try:
+                await self._process(job)
+            except Exception as e:
+                logger.error(f"Memory ingestion worker {index} crashed on job {job.get('id')}: {e}")
+            finally:
+                queue.task_done()
+
+    async def _process(self, job: Dict[str, Any]) -> None:
+        try:
+            await self._handler(**job["kwargs"])
+        except Exception as e:
+            job["attempts"] += 1
+            if job["attempts"] >= self.max_attempts:
+                logger.error(f"Memory ingestion job {job['id']} failed {job['attempts']} times, dead-lettering: {e}")
+                self._pending.pop(job["id"], None)
+                await cache_manager.rpush(self.dead_letter_key, self._serialize(job))
+                await cache_manager.hdel(self.journal_key, job["id"])
+                self.stats["dead_lettered"] += 1
+                return
+
+            delay = self.retry_base_delay * (2 ** (job["attempts"] - 1))
+            logger.warning(f"Memory ingestion job {job['id']} failed (attempt {job['attempts']}/{self.max_attempts}): {e}. Retrying in {delay:.1f}s")
+            await cache_manager.hset(self.journal_key, job["id"], self._serialize(job))
+            self.stats["retried"] += 1
+            task = asyncio.create_task(self._requeue_later(job, delay))
+            self._retry_tasks.add(task)
+            task.add_done_callback(self._retry_tasks.discard)
+            return
+
+        self._pending.pop(job["id"], None)
+        await cache_manager.hdel(self.journal_key, job["id"])
+        self.stats["completed"] += 1
+
+    async def _requeue_later(self, job: Dict[str, Any], delay: float) -> None:
+        await asyncio.sleep(delay)
+        await self._ensure_started().put(job)
+
+    async def _orphaned_journals(self) -> List[tuple]:
+        """(owner, journal key) of owners whose heartbeat is older than the lease."""
+        owners = await cache_manager.hgetall(self.owners_key)
+        now = time.time()
+        orphaned = [
+            (owner, f"memory_ingest:journal:{self.name}:{owner}")
+            for owner, beat in owners.items()
+            if owner != self.owner and now - float(beat) > self.lease_seconds
+        ]
+        # Journal written before journals were per owner
+        orphaned.append(("legacy", f"memory_ingest:journal:{self.name}"))
+        return orphaned
+
+    async def recover(self) -> int:
+        """
+        Re-queues jobs left by processes that stopped heartbeating (crashed or
+        shut down with writes pending). Each orphaned journal is claimed with
+        SET NX before it is replayed, so concurrent restarts never both take it,
+        and its entries move into this owner's journal.
+        Call once at startup, after the databases are connected.
+        """
+        recovered = 0
+        for owner, journal_key in await self._orphaned_journals():
+            journal = await cache_manager.hgetall(journal_key)
+            if not journal:
+                if owner != "legacy":
+                    await cache_manager.hdel(self.owners_key, owner)
+                continue
+            if not await cache_manager.set_nx(f"memory_ingest:claim:{self.name}:{owner}", self.owner, self.lease_seconds):
+                continue
+
+            for job_id, raw in journal.items():
+                if job_id in self._pending:
+                    continue
+                try:
+                    job = self._deserialize(raw)
+                except Exception as e:
+                    logger.error(f"Dropping unreadable memory ingestion journal entry {job_id}: {e}")
+                    continue
+                self._pending[job["id"]] = job
+                if not self._registered:
+                    await self._beat()
+                await cache_manager.hset(self.journal_key, job["id"], raw)
+                await self._ensure_started().put(job)
+                recovered += 1
+
+            await cache_manager.delete(journal_key)
+            if owner != "legacy":
+                await cache_manager.hdel(self.owners_key, owner)
+
+        if recovered:
+            logger.info(f"Recovered {recovered} memory ingestion jobs from orphaned journals")
+        return recovered
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until every queued job (including scheduled retries) has been processed.
+
+        Returns:
+            False if the timeout expired first
+        """
+        if self._queue is None:
+            return True
+
+        async def _wait():
+            while True:
+                await self._queue.join()
+                if not self._retry_tasks:
+                    return
+                await asyncio.gather(*self._retry_tasks, return_exceptions=True)
+
+        try:
+            await asyncio.wait_for(_wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Drains what it can within the timeout, then cancels the consumers. Leftovers stay journaled."""
+        if not await self.drain(timeout):
+            logger.warning(f"Memory ingestion queue stopped with {len(self._pending)} jobs pending (kept in journal)")
+        heartbeat = [self._heartbeat_task] if self._heartbeat_task else []
+        if self._stopping:
+            self._stopping.set()
+        for task in [*self._workers, *self._retry_tasks, *heartbeat]:
+            task.cancel()
+        await asyncio.gather(*self._workers, *self._retry_tasks, *heartbeat, return_exceptions=True)
+        self._workers = []
+        self._retry_tasks.clear()
+        self._heartbeat_task = None
+        if not self._pending:
+            # Nothing left to recover: forget this owner. Otherwise its heartbeat
+            # goes stale and the next process to start replays the leftovers.
+            await cache_manager.hdel(self.owners_key, self.owner)
+            self._registered = False
+        self._queue = None
+        self._loop = None
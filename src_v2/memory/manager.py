@@ -3,13 +3,16 @@ import uuid
 import datetime
 import asyncio
 import json
+import numpy as np
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 from loguru import logger
-from qdrant_client.models import VectorParams, Distance, PointStruct, Filter, FieldCondition, MatchValue, Range
+from qdrant_client.models import VectorParams, Distance, PointStruct, Filter, FieldCondition, MatchValue, MatchAny, Range, OrderBy, Direction, PayloadSchemaType, QueryRequest
 from src_v2.core.database import db_manager, retry_db_operation, require_db
+from src_v2.core.cache import cache_manager
 from src_v2.config.settings import settings
 from src_v2.memory.embeddings import EmbeddingService
-from src_v2.utils.time_utils import get_relative_time
+from src_v2.memory.ingestion import MemoryIngestionQueue
+from src_v2.utils.time_utils import get_relative_time, to_epoch_seconds
 from src_v2.memory.models import MemorySourceType
 from src_v2.memory import scoring
 from src_v2.utils.validation import smart_truncate
@@ -22,6 +25,17 @@ CHUNK_THRESHOLD = 1000  # Chunk messages longer than this (chars)
 CHUNK_SIZE = 500  # Target chunk size
 CHUNK_OVERLAP = 50  # Overlap between chunks for context continuity
 
+# Payload indexes created on memory collections.
+# timestamp_epoch (integer Unix seconds) backs range filters and order_by;
+# Qdrant requires a range-capable index on any order_by key.
+PAYLOAD_INDEXES = {
+    "timestamp_epoch": PayloadSchemaType.INTEGER,
+    "type": PayloadSchemaType.KEYWORD,
+    "user_id": PayloadSchemaType.KEYWORD,
+    # Summary meaningfulness: range filter and order_by for dream material
+    "meaningfulness_score": PayloadSchemaType.FLOAT,
+}
+
 
 def chunk_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> List[Tuple[str, int]]:
     """
@@ -73,10 +87,15 @@ def chunk_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVE
 
 
 class MemoryManager:
+    # Collections whose payload indexes have been ensured by this process
+    _indexed_collections: set[str] = set()
+
     def __init__(self, bot_name: Optional[str] = None):
         name = bot_name or settings.DISCORD_BOT_NAME
         self.collection_name = f"whisperengine_memory_{name}" if name else "whisperengine_memory_default"
         self.embedding_service = EmbeddingService()
+        # Write-behind queue for vector/graph writes from add_message
+        self.ingestion_queue = MemoryIngestionQueue(self._save_vector_memory, name=self.collection_name)
 
     async def initialize(self):
         """
@@ -125,9 +144,11 @@ class MemoryManager:
             else:
                 logger.info(f"Qdrant collection {self.collection_name} already exists.")
 
+            await self._ensure_payload_indexes(self.collection_name)
+
             # --- Initialize Shared Artifacts Collection (Phase E13) ---
             if settings.ENABLE_STIGMERGIC_DISCOVERY:
-                from src_v2.memory.shared_artifacts import SharedArtifactManager
+                from src_v2.memory.shared_artifacts import SharedArtifactManager, shared_artifact_manager
                 shared_collection = SharedArtifactManager.COLLECTION_NAME
                 shared_exists = any(c.name == shared_collection for c in collections)
                 
@@ -139,10 +160,31 @@ class MemoryManager:
                         vectors_config=vectors_config
                     )
                     logger.info("Shared Artifacts collection initialized.")
+
+                await shared_artifact_manager.ensure_payload_indexes()
                 
         except Exception as e:
             logger.error(f"Failed to initialize Qdrant: {e}")
 
+    async def _ensure_payload_indexes(self, collection_name: str) -> None:
+        """
+        Creates the PAYLOAD_INDEXES on a collection (idempotent, once per process).
+        Called at startup and lazily before order_by queries on other bots' collections.
+        """
+        if collection_name in self._indexed_collections or not db_manager.qdrant_client:
+            return
+        try:
+            for field_name, schema in PAYLOAD_INDEXES.items():
+                await db_manager.qdrant_client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=field_name,
+                    field_schema=schema
+                )
+            self._indexed_collections.add(collection_name)
+            logger.debug(f"Payload indexes ensured for {collection_name}")
+        except Exception as e:
+            logger.warning(f"Failed to create payload indexes for {collection_name}: {e}")
+
     @require_db("postgres")
     @retry_db_operation(max_retries=3)
     async def add_message(
@@ -185,6 +227,9 @@ class MemoryManager:
             session_id: Session identifier for grouping messages
 
         """
+        # Message time is fixed here so queued, retried and replayed vector writes keep it
+        timestamp = datetime.datetime.now().isoformat()
+
         # ADR-014: Derive author_id from role if not provided (backward compatibility)
         if author_id is None:
             if role in ("human", "user"):
@@ -200,11 +245,12 @@ class MemoryManager:
         
         try:
             async with db_manager.postgres_pool.acquire() as conn:
-                await conn.execute("""
+                inserted = await conn.fetchrow("""
                     INSERT INTO v2_chat_history 
                     (user_id, character_name, role, content, user_name, channel_id, message_id, author_id, author_is_bot, reply_to_msg_id, session_id, metadata)
                     VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
                     ON CONFLICT (message_id) DO NOTHING
+                    RETURNING role, content, user_id, user_name, timestamp, author_id, author_is_bot
                 """, 
                     str(user_id), 
                     character_name, 
@@ -220,10 +266,18 @@ class MemoryManager:
                     json.dumps(metadata) if metadata else '{}'
                 )
             
+            # Keep the recent-history windows current (skipped for duplicate message_ids).
+            # The pushed entry is the inserted row itself, shaped like a window seed.
+            if settings.ENABLE_HISTORY_WINDOW_CACHE and inserted is not None:
+                await self._push_history_windows(character_name, user_id, channel_id, dict(inserted))
+            
             # Also save to vector memory
             # Derive collection name from character_name to support cross-bot operations (e.g., gossip injection)
+            # The Postgres row above is the source of truth; the vector + graph writes are
+            # handed to the write-behind queue so they stay off the reply path.
             target_collection = f"whisperengine_memory_{character_name}" if character_name else self.collection_name
-            await self._save_vector_memory(
+            save_vector = self.ingestion_queue.enqueue if settings.ENABLE_MEMORY_WRITE_BEHIND else self._save_vector_memory
+            await save_vector(
                 user_id=user_id, 
                 role=role, 
                 content=content, 
@@ -239,7 +293,8 @@ class MemoryManager:
                 author_is_bot=author_is_bot,
                 author_name=author_name,
                 reply_to_msg_id=reply_to_msg_id,
-                session_id=session_id
+                session_id=session_id,
+                timestamp=timestamp
             )
             
         except Exception as e:
@@ -314,7 +369,8 @@ class MemoryManager:
         author_is_bot: bool = False,
         author_name: Optional[str] = None,
         reply_to_msg_id: Optional[str] = None,
-        session_id: Optional[str] = None
+        session_id: Optional[str] = None,
+        timestamp: Optional[str] = None
     ):
         """
         Embeds and saves a memory to Qdrant.
@@ -329,8 +385,13 @@ class MemoryManager:
         Content Cleaning: For human messages, we strip context markers (reply quotes,
         forwarded content) BEFORE embedding to prevent semantic pollution. The original
         content is still stored in the payload for display/context purposes.
+
+        timestamp is the message time (naive local ISO); it defaults to now for
+        writes that aren't tied to a message.
         """
         start_time = time.time()
+        timestamp_str = timestamp or datetime.datetime.now().isoformat()
+        timestamp_epoch = to_epoch_seconds(timestamp_str)
         
         try:
             # Determine source type if not provided
@@ -371,14 +432,13 @@ class MemoryManager:
                 
                 # Ensure we have a parent ID for grouping chunks (use message_id or generate new UUID)
                 chunk_group_id = str(message_id) if message_id else str(uuid.uuid4())
-                timestamp_str = datetime.datetime.now().isoformat()
+                
+                # Embed every chunk (already cleaned) in one model call off the event loop
+                embeddings = await self.embedding_service.embed_documents_async([c for c, _ in chunks])
                 
                 points_to_upsert = []
                 vector_ids = []  # Track IDs for graph nodes
-                for chunk_content, chunk_idx in chunks:
-                    # Generate embedding for this chunk (already cleaned)
-                    embedding = await self.embedding_service.embed_query_async(chunk_content)
-                    
+                for (chunk_content, chunk_idx), embedding in zip(chunks, embeddings):
                     # Generate vector ID upfront for dual-write (Phase 2.5.1)
                     vector_id = str(uuid.uuid4())
                     vector_ids.append((vector_id, chunk_content))
@@ -390,6 +450,7 @@ class MemoryManager:
                         "role": role,
                         "content": chunk_content,
                         "timestamp": timestamp_str,
+                        "timestamp_epoch": timestamp_epoch,
                         "channel_id": str(channel_id) if channel_id else None,
                         "message_id": str(message_id) if message_id else None,
                         "importance_score": importance_score,
@@ -431,21 +492,23 @@ class MemoryManager:
                 )
                 
                 # Phase 2.5.1: Dual-write to Neo4j for Graph Unification
-                # Create graph nodes for each chunk
+                # Create graph nodes for all chunks in one write
                 try:
                     from src_v2.knowledge.manager import knowledge_manager
-                    for vid, chunk_content in vector_ids:
-                        await knowledge_manager.add_memory_node(
-                            user_id=str(user_id),
-                            vector_id=vid,
-                            content=smart_truncate(chunk_content, 500),
-                            timestamp=timestamp_str,
-                            source_type=source_type.value,
-                            bot_name=settings.DISCORD_BOT_NAME,
+                    await knowledge_manager.add_memory_nodes([
+                        {
+                            "user_id": str(user_id),
+                            "vector_id": vid,
+                            "content": smart_truncate(chunk_content, 500),
+                            "timestamp": timestamp_str,
+                            "source_type": source_type.value,
+                            "bot_name": settings.DISCORD_BOT_NAME,
                             # ADR-014: Author tracking
-                            author_id=str(effective_author_id) if effective_author_id else None,
-                            author_is_bot=effective_author_is_bot
-                        )
+                            "author_id": str(effective_author_id) if effective_author_id else None,
+                            "author_is_bot": effective_author_is_bot
+                        }
+                        for vid, chunk_content in vector_ids
+                    ])
                 except Exception as e:
                     logger.warning(f"Failed to create memory graph nodes for chunks: {e}")
                 
@@ -456,7 +519,6 @@ class MemoryManager:
                 
                 # Generate vector ID upfront for dual-write (Phase 2.5.1)
                 vector_id = str(uuid.uuid4())
-                timestamp_str = datetime.datetime.now().isoformat()
                 
                 # Prepare payload - store CLEANED content for consistency with chunked path
                 # Postgres stores the full original content for history/display
@@ -466,6 +528,7 @@ class MemoryManager:
                     "role": role,
                     "content": embed_content,  # Use cleaned content for vector payload
                     "timestamp": timestamp_str,
+                    "timestamp_epoch": timestamp_epoch,
                     "channel_id": str(channel_id) if channel_id else None,
                     "message_id": str(message_id) if message_id else None,
                     "importance_score": importance_score,
@@ -556,6 +619,7 @@ class MemoryManager:
             # Generate embedding
             embedding = await self.embedding_service.embed_query_async(content)
             point_id = str(uuid.uuid4())
+            timestamp_str = datetime.datetime.now().isoformat()
             
             payload = {
                 "type": "summary",
@@ -567,7 +631,8 @@ class MemoryManager:
                 "meaningfulness_score": meaningfulness_score,
                 "emotions": emotions,
                 "topics": topics or [],
-                "timestamp": datetime.datetime.now().isoformat(),
+                "timestamp": timestamp_str,
+                "timestamp_epoch": to_epoch_seconds(timestamp_str),
                 # ADR-014: Summaries are authored by the bot
                 "author_id": settings.DISCORD_BOT_NAME,
                 "author_is_bot": True,
@@ -685,7 +750,8 @@ class MemoryManager:
         time_range: Optional[Dict[str, str]] = None,
         channel_id: Optional[str] = None,
         bot_id: Optional[str] = None,
-        exclude_bot_authors: bool = False
+        exclude_bot_authors: bool = False,
+        query_vector: Optional[List[float]] = None
     ) -> List[Dict[str, Any]]:
         """
         Searches for relevant episode memories in Qdrant with recency weighting.
@@ -712,6 +778,7 @@ class MemoryManager:
                     (user_id == user_id) OR (channel_id == channel_id AND user_id == bot_id)
             exclude_bot_authors: If True, exclude messages authored by bots (author_is_bot=True).
                     Useful when searching for what a USER said, not quoted bot content.
+            query_vector: Precomputed embedding of `query` (skips re-embedding when shared across searches)
         """
         start_time = time.time()
         
@@ -742,71 +809,24 @@ class MemoryManager:
 
         try:
             logger.debug(f"Searching memories for user {user_id} with query: {query}")
-            embedding = await self.embedding_service.embed_query_async(query)
-            
-            # Build Filter
-            if channel_id and bot_id:
-                # Dual Stream Logic: Personal Memories OR Shared Bot Memories
-                query_filter = Filter(
-                    should=[
-                        # Stream 1: Personal Memories (User's history everywhere)
-                        Filter(must=[
-                            FieldCondition(key="user_id", match=MatchValue(value=str(user_id)))
-                        ]),
-                        # Stream 2: Shared Reality (Bot's autonomous posts in this channel)
-                        Filter(must=[
-                            FieldCondition(key="channel_id", match=MatchValue(value=str(channel_id))),
-                            FieldCondition(key="user_id", match=MatchValue(value=str(bot_id)))
-                        ])
-                    ]
-                )
-                # Add bot exclusion to both streams if requested
-                if exclude_bot_authors:
-                    query_filter = Filter(
-                        should=[
-                            Filter(must=[
-                                FieldCondition(key="user_id", match=MatchValue(value=str(user_id))),
-                                FieldCondition(key="author_is_bot", match=MatchValue(value=False))
-                            ]),
-                            Filter(must=[
-                                FieldCondition(key="channel_id", match=MatchValue(value=str(channel_id))),
-                                FieldCondition(key="user_id", match=MatchValue(value=str(bot_id))),
-                                FieldCondition(key="author_is_bot", match=MatchValue(value=False))
-                            ])
-                        ]
-                    )
-            else:
-                # Classic Logic: Strict filtering
-                must_conditions = [
-                    FieldCondition(key="user_id", match=MatchValue(value=str(user_id)))
-                ]
-                
-                # Exclude bot-authored content if requested
-                if exclude_bot_authors:
-                    must_conditions.append(
-                        FieldCondition(key="author_is_bot", match=MatchValue(value=False))
-                    )
-                
-                # If channel_id provided without bot_id, strictly filter by channel (Legacy/Specific use)
-                if channel_id:
-                    must_conditions.append(
-                        FieldCondition(key="channel_id", match=MatchValue(value=str(channel_id)))
-                    )
-                
-                # NOTE: Qdrant DatetimeRange filtering doesn't work reliably with ISO string timestamps.
-                # We use post-filtering instead (see below). But we fetch more results to compensate.
-                # The time_range filtering happens after the vector search.
-                if time_range:
-                    logger.debug(f"Time range requested: {time_range['start']} to {time_range['end']} (will post-filter)")
-                
-                query_filter = Filter(must=must_conditions)
+            embedding = query_vector if query_vector is not None else await self.embedding_service.embed_query_async(query)
             
-            # Fetch more for re-ranking
-            # If time_range is specified, fetch MANY more since we'll post-filter by date
+            # Time window as a Qdrant range on the numeric timestamp_epoch field.
+            # Points written before timestamp_epoch existed need scripts/backfill_timestamp_epoch.py.
+            time_condition = None
             if time_range:
-                fetch_limit = max(limit * 20, 200)  # Aggressive fetch for date-filtered queries
-            else:
-                fetch_limit = max(limit * 3, 15)
+                try:
+                    time_condition = self._epoch_range_condition(time_range)
+                except (ValueError, TypeError) as e:
+                    logger.warning(f"Invalid time_range format, skipping filter: {e}")
+            
+            query_filter = self._build_memory_filter(
+                user_id, time_condition,
+                channel_id=channel_id, bot_id=bot_id, exclude_bot_authors=exclude_bot_authors
+            )
+            
+            # Fetch more for re-ranking (the time window is filtered server-side, so no over-fetch needed)
+            fetch_limit = max(limit * 3, 15)
             
             search_result = await db_manager.qdrant_client.query_points(
                 collection_name=target_collection,
@@ -815,304 +835,505 @@ class MemoryManager:
                 limit=fetch_limit
             )
             
-            logger.info(f"Found {len(search_result.points)} memory results for re-ranking (fetch_limit={fetch_limit})")
-            
-            # === WEIGHTED SCORING FOR EPISODES ===
-            results = []
-            
-            for hit in search_result.points:
-                semantic_score = hit.score
-                payload = hit.payload or {}
-                
-                # 1. Temporal Weight (Decay)
-                # Use centralized scoring logic for consistent decay rates
-                temporal_weight = scoring.calculate_temporal_weight(payload)
-                
-                # 2. Source Weight (Trust)
-                # Prefer direct human interaction over gossip/dreams
-                source_type = payload.get("source_type")
-                # Fallback to role if source_type missing (legacy data)
-                if not source_type:
-                    role = payload.get("role")
-                    if role == "human": source_type = "human_direct"
-                    elif role == "ai": source_type = "inference"
-                
-                source_weight = scoring.SOURCE_WEIGHTS.get(source_type, scoring.DEFAULT_SOURCE_WEIGHT)
-                
-                # 3. Importance Weight
-                # 1-10 → 0.5-1.0 (default 3 -> 0.65)
-                raw_importance = payload.get("importance_score", 3)
-                importance_multiplier = 0.5 + (raw_importance / 20.0)
-
-                # Final Score Calculation
-                # Semantic * Temporal * Source * Importance
-                weighted_score = semantic_score * temporal_weight * source_weight * importance_multiplier
-                
-                results.append({
-                    "id": hit.id,
-                    "content": payload.get("content"),
-                    "role": payload.get("role"),
-                    "source_type": source_type,
-                    "score": weighted_score,
-                    "semantic_score": semantic_score,
-                    "temporal_weight": round(temporal_weight, 3),
-                    "source_weight": round(source_weight, 3),
-                    "importance_multiplier": round(importance_multiplier, 3),
-                    "timestamp": payload.get("timestamp"),
-                    "relative_time": get_relative_time(payload.get("timestamp")) if payload.get("timestamp") else "unknown time",
-                    "user_name": payload.get("user_name"),
-                    "channel_id": payload.get("channel_id"),
-                    "message_id": payload.get("message_id"),
-                    # ADR-014: Author tracking
-                    "author_id": payload.get("author_id"),
-                    "author_is_bot": payload.get("author_is_bot", False),
-                    "author_name": payload.get("author_name"),
-                    "reply_to_msg_id": payload.get("reply_to_msg_id"),
-                    # Chunk metadata for hydration
-                    "is_chunk": payload.get("is_chunk", False),
-                    "chunk_index": payload.get("chunk_index"),
-                    "chunk_total": payload.get("chunk_total"),
-                    "original_length": payload.get("original_length"),
-                    "parent_message_id": payload.get("parent_message_id")
-                })
-            
-            # Re-rank by weighted score
-            results.sort(key=lambda x: x["score"], reverse=True)
-            
-            # Deduplicate by parent_message_id (keep highest scoring chunk)
-            deduplicated = []
-            seen_parents = set()
-            
-            for res in results:
-                # Use parent_message_id for chunks, or message_id for regular messages
-                # If neither exists (legacy), use ID
-                unique_key = res.get("parent_message_id") or res.get("message_id") or res["id"]
-                
-                if unique_key not in seen_parents:
-                    deduplicated.append(res)
-                    seen_parents.add(unique_key)
+            return await self._finalize_memory_hits(
+                search_result.points, embedding, user_id, limit, target_collection,
+                time_condition=time_condition, fetch_limit=fetch_limit, start_time=start_time,
+                channel_id=channel_id, bot_id=bot_id, exclude_bot_authors=exclude_bot_authors
+            )
             
-            # Log deduplication stats
-            if len(results) > len(deduplicated):
-                logger.debug(f"Deduplicated {len(results) - len(deduplicated)} chunk duplicates from {len(results)} results")
+        except Exception as e:
+            logger.error(f"Failed to search memories: {e}")
+            return []
+
+    async def search_memories_batch(
+        self,
+        query: str,
+        user_limits: List[Tuple[str, int]],
+        collection_name: Optional[str] = None,
+        time_range: Optional[Dict[str, str]] = None,
+        query_vector: Optional[List[float]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        search_memories() for several user_ids sharing one query (e.g. the current
+        user and "__broadcast__"): one embedding and one Qdrant query_batch_points call.
+        
+        Args:
+            user_limits: (user_id, limit) pairs; results come back in the same order
+            query_vector: Precomputed embedding of `query`
+        """
+        if not user_limits:
+            return []
+        
+        # Date-bounded queries go Postgres-first per user, so keep those on the single path
+        if time_range and time_range.get("start") and time_range.get("end"):
+            if query_vector is None:
+                query_vector = await self.embedding_service.embed_query_async(query)
+            return list(await asyncio.gather(*(
+                self.search_memories(query, uid, limit=limit, collection_name=collection_name,
+                                     time_range=time_range, query_vector=query_vector)
+                for uid, limit in user_limits
+            )))
+        
+        start_time = time.time()
+        if not db_manager.qdrant_client:
+            logger.warning("Qdrant client not available for search_memories_batch")
+            return [[] for _ in user_limits]
+        
+        target_collection = collection_name or self.collection_name
+        
+        try:
+            embedding = query_vector if query_vector is not None else await self.embedding_service.embed_query_async(query)
             
-            # Apply temporal filtering if time_range specified (SPEC-E32)
+            time_condition = None
             if time_range:
                 try:
-                    start_date = datetime.datetime.fromisoformat(time_range.get("start", "1970-01-01"))
-                    end_date = datetime.datetime.fromisoformat(time_range.get("end", "2099-12-31"))
-                    # Make end_date inclusive (end of day)
-                    end_date = end_date.replace(hour=23, minute=59, second=59)
-                    
-                    pre_filter_count = len(deduplicated)
-                    filtered = []
-                    for res in deduplicated:
-                        ts_str = res.get("timestamp")
-                        if ts_str:
-                            try:
-                                ts = datetime.datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
-                                # Normalize to naive for comparison
-                                if ts.tzinfo:
-                                    ts = ts.replace(tzinfo=None)
-                                if start_date <= ts <= end_date:
-                                    filtered.append(res)
-                            except (ValueError, TypeError):
-                                # Can't parse timestamp, include anyway
-                                filtered.append(res)
-                        else:
-                            # No timestamp, include anyway
-                            filtered.append(res)
-                    
-                    deduplicated = filtered
-                    logger.info(f"Time filter ({time_range['start']} to {time_range['end']}): {pre_filter_count} → {len(deduplicated)} results")
-                    
-                    # Fallback: If date filter yielded 0 results, use scroll to find *anything* from that date
-                    # (no semantic matching needed, just grab whatever exists in that time window)
-                    if len(deduplicated) == 0:
-                        logger.info(f"No results from date filter. Attempting fallback with scroll (no semantic matching).")
-                        
-                        # Scroll for user's memories (no timestamp filter in Qdrant since that doesn't work with ISO strings)
-                        scroll_filter = Filter(
-                            must=[
-                                FieldCondition(key="user_id", match=MatchValue(value=str(user_id)))
-                            ]
-                        )
-                        
-                        # Use scroll to get memories (we'll filter by date in Python)
-                        try:
-                            scroll_result = await db_manager.qdrant_client.scroll(
-                                collection_name=target_collection,
-                                scroll_filter=scroll_filter,
-                                limit=100,  # Fetch more for date filtering
-                                with_payload=True
-                            )
-                            
-                            fallback_points = scroll_result[0] if scroll_result else []
-                            logger.info(f"Fallback scroll found {len(fallback_points)} total results (before date filter)")
-                            
-                            # Filter by date in Python
-                            date_matched = []
-                            for point in fallback_points:
-                                payload = point.payload or {}
-                                ts_str = payload.get("timestamp")
-                                if ts_str:
-                                    try:
-                                        ts = datetime.datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
-                                        if ts.tzinfo:
-                                            ts = ts.replace(tzinfo=None)
-                                        if start_date <= ts <= end_date:
-                                            date_matched.append(point)
-                                    except (ValueError, TypeError):
-                                        pass
-                            
-                            logger.info(f"Fallback scroll date match: {len(fallback_points)} → {len(date_matched)} results")
-                            
-                            # Convert to same format as vector search results
-                            fallback_results = []
-                            for point in date_matched:
-                                payload = point.payload or {}
-                                # Use neutral score since we didn't do semantic search
-                                temporal_weight = scoring.calculate_temporal_weight(payload)
-                                source_type = payload.get("source_type")
-                                if not source_type:
-                                    role = payload.get("role")
-                                    if role == "human": source_type = "human_direct"
-                                    elif role == "ai": source_type = "inference"
-                                source_weight = scoring.SOURCE_WEIGHTS.get(source_type, scoring.DEFAULT_SOURCE_WEIGHT)
-                                raw_importance = payload.get("importance_score", 3)
-                                importance_multiplier = 0.5 + (raw_importance / 20.0)
-                                # Use a neutral semantic score for scroll results
-                                weighted_score = 0.5 * temporal_weight * source_weight * importance_multiplier
-                                
-                                fallback_results.append({
-                                    "id": point.id,
-                                    "content": payload.get("content"),
-                                    "role": payload.get("role"),
-                                    "source_type": source_type,
-                                    "score": weighted_score,
-                                    "semantic_score": 0.5,  # Neutral
-                                    "temporal_weight": round(temporal_weight, 3),
-                                    "source_weight": round(source_weight, 3),
-                                    "importance_multiplier": round(importance_multiplier, 3),
-                                    "timestamp": payload.get("timestamp"),
-                                    "relative_time": get_relative_time(payload.get("timestamp")) if payload.get("timestamp") else "unknown time",
-                                    "user_name": payload.get("user_name"),
-                                    "channel_id": payload.get("channel_id"),
-                                    "message_id": payload.get("message_id"),
-                                    "author_id": payload.get("author_id"),
-                                    "author_is_bot": payload.get("author_is_bot", False),
-                                    "author_name": payload.get("author_name"),
-                                    "reply_to_msg_id": payload.get("reply_to_msg_id"),
-                                    "is_chunk": payload.get("is_chunk", False),
-                                    "chunk_index": payload.get("chunk_index"),
-                                    "chunk_total": payload.get("chunk_total"),
-                                    "original_length": payload.get("original_length"),
-                                    "parent_message_id": payload.get("parent_message_id")
-                                })
-                            
-                            # Deduplicate
-                            fallback_deduplicated = []
-                            seen_parents = set()
-                            for res in fallback_results:
-                                unique_key = res.get("parent_message_id") or res.get("message_id") or res["id"]
-                                if unique_key not in seen_parents:
-                                    fallback_deduplicated.append(res)
-                                    seen_parents.add(unique_key)
-                            
-                            fallback_deduplicated.sort(key=lambda x: x["score"], reverse=True)
-                            deduplicated = fallback_deduplicated[:limit]  # Respect original limit
-                            logger.info(f"Fallback final: {len(deduplicated)} results after dedup and limit")
-                            
-                        except Exception as e:
-                            logger.warning(f"Fallback scroll failed: {e}")
-                        
+                    time_condition = self._epoch_range_condition(time_range)
                 except (ValueError, TypeError) as e:
                     logger.warning(f"Invalid time_range format, skipping filter: {e}")
             
-            # Log metrics
-            if db_manager.influxdb_write_api:
-                try:
-                    duration_ms = (time.time() - start_time) * 1000
-                    point = Point("memory_latency") \
-                        .tag("user_id", user_id) \
-                        .tag("operation", "read") \
-                        .field("duration_ms", duration_ms) \
-                        .field("result_count", len(deduplicated)) \
-                        .time(datetime.datetime.utcnow())
-                    
-                    db_manager.influxdb_write_api.write(
-                        bucket=settings.INFLUXDB_BUCKET,
-                        org=settings.INFLUXDB_ORG,
-                        record=point
+            fetch_limits = [max(limit * 3, 15) for _, limit in user_limits]
+            responses = await db_manager.qdrant_client.query_batch_points(
+                collection_name=target_collection,
+                requests=[
+                    QueryRequest(
+                        query=embedding,
+                        filter=self._build_memory_filter(uid, time_condition),
+                        limit=fetch_limit,
+                        with_payload=True
                     )
-                except Exception as e:
-                    logger.error(f"Failed to log memory search metrics: {e}")
+                    for (uid, _), fetch_limit in zip(user_limits, fetch_limits)
+                ]
+            )
+        except Exception as e:
+            logger.error(f"Failed to batch search memories: {e}")
+            return [[] for _ in user_limits]
+        
+        results = await asyncio.gather(*(
+            self._finalize_memory_hits(
+                response.points, embedding, uid, limit, target_collection,
+                time_condition=time_condition, fetch_limit=fetch_limit, start_time=start_time
+            )
+            for response, (uid, limit), fetch_limit in zip(responses, user_limits, fetch_limits)
+        ), return_exceptions=True)
+        
+        batched = []
+        for (uid, _), result in zip(user_limits, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to search memories for {uid}: {result}")
+                batched.append([])
+            else:
+                batched.append(result)
+        return batched
 
-            # Phase 2.5.1: Vector-First Traversal (Graph Enrichment)
-            # Enrich results with graph neighborhood (linked memories, facts)
-            final_results = deduplicated[:limit]
+    @staticmethod
+    def _build_memory_filter(
+        user_id: str,
+        time_condition: Optional[FieldCondition] = None,
+        channel_id: Optional[str] = None,
+        bot_id: Optional[str] = None,
+        exclude_bot_authors: bool = False
+    ) -> Filter:
+        """Qdrant filter for search_memories (classic per-user or Dual Stream)."""
+        if channel_id and bot_id:
+            # Dual Stream Logic: Personal Memories OR Shared Bot Memories
+            query_filter = Filter(
+                should=[
+                    # Stream 1: Personal Memories (User's history everywhere)
+                    Filter(must=[
+                        FieldCondition(key="user_id", match=MatchValue(value=str(user_id)))
+                    ]),
+                    # Stream 2: Shared Reality (Bot's autonomous posts in this channel)
+                    Filter(must=[
+                        FieldCondition(key="channel_id", match=MatchValue(value=str(channel_id))),
+                        FieldCondition(key="user_id", match=MatchValue(value=str(bot_id)))
+                    ])
+                ]
+            )
+            # Add bot exclusion to both streams if requested
+            if exclude_bot_authors:
+                query_filter = Filter(
+                    should=[
+                        Filter(must=[
+                            FieldCondition(key="user_id", match=MatchValue(value=str(user_id))),
+                            FieldCondition(key="author_is_bot", match=MatchValue(value=False))
+                        ]),
+                        Filter(must=[
+                            FieldCondition(key="channel_id", match=MatchValue(value=str(channel_id))),
+                            FieldCondition(key="user_id", match=MatchValue(value=str(bot_id))),
+                            FieldCondition(key="author_is_bot", match=MatchValue(value=False))
+                        ])
+                    ]
+                )
+            if time_condition:
+                query_filter.must = [time_condition]
+        else:
+            # Classic Logic: Strict filtering
+            must_conditions = [
+                FieldCondition(key="user_id", match=MatchValue(value=str(user_id)))
+            ]
+            
+            # Exclude bot-authored content if requested
+            if exclude_bot_authors:
+                must_conditions.append(
+                    FieldCondition(key="author_is_bot", match=MatchValue(value=False))
+                )
+            
+            # If channel_id provided without bot_id, strictly filter by channel (Legacy/Specific use)
+            if channel_id:
+                must_conditions.append(
+                    FieldCondition(key="channel_id", match=MatchValue(value=str(channel_id)))
+                )
+            
+            if time_condition:
+                must_conditions.append(time_condition)
+            
+            query_filter = Filter(must=must_conditions)
+        
+        return query_filter
 
-            # Hydrate chunks with full content (Postgres -> Qdrant fallback)
+    async def _finalize_memory_hits(
+        self,
+        points: List[Any],
+        embedding: List[float],
+        user_id: str,
+        limit: int,
+        target_collection: str,
+        time_condition: Optional[FieldCondition] = None,
+        fetch_limit: int = 15,
+        start_time: Optional[float] = None,
+        channel_id: Optional[str] = None,
+        bot_id: Optional[str] = None,
+        exclude_bot_authors: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Shared tail of search_memories: weighting, pending writes, dedup,
+        time-window fallback, metrics, chunk hydration and graph enrichment.
+        """
+        start_time = start_time or time.time()
+        logger.info(f"Found {len(points)} memory results for re-ranking (fetch_limit={fetch_limit})")
+        
+        # === WEIGHTED SCORING FOR EPISODES ===
+        # Temporal decay for all candidates in one vectorized pass
+        payloads = [hit.payload or {} for hit in points]
+        temporal_weights = scoring.temporal_weights_for(payloads)
+        results = [
+            self._format_memory_hit(hit.id, payload, hit.score, temporal_weight)
+            for hit, payload, temporal_weight in zip(points, payloads, temporal_weights)
+        ]
+        
+        # Read-your-writes: include messages still waiting in the write-behind queue
+        # (they are "now", so only when the time window reaches the present)
+        now_epoch = to_epoch_seconds(datetime.datetime.now())
+        if not time_condition or time_condition.range.gte <= now_epoch <= time_condition.range.lte:
+            results.extend(await self._search_pending(
+                embedding, user_id, target_collection,
+                channel_id=channel_id, bot_id=bot_id, exclude_bot_authors=exclude_bot_authors
+            ))
+        
+        # Re-rank by weighted score
+        results.sort(key=lambda x: x["score"], reverse=True)
+        
+        deduplicated = self._dedupe_by_parent(results)
+        
+        # Log deduplication stats
+        if len(results) > len(deduplicated):
+            logger.debug(f"Deduplicated {len(results) - len(deduplicated)} chunk duplicates from {len(results)} results")
+        
+        # Fallback: nothing semantically matched inside the window, so return the most
+        # recent memories from that window instead (no semantic matching, neutral score)
+        if time_condition and not deduplicated:
+            logger.info("No semantic results in time window. Falling back to most recent memories in window.")
             try:
-                hydration_tasks = []
-                indices_to_hydrate = []
-                
-                for i, res in enumerate(final_results):
-                    if res.get("is_chunk"):
-                        # Use parent_message_id (the group ID) to find the full message
-                        lookup_id = res.get("parent_message_id") or res.get("message_id")
-                        if lookup_id:
-                            hydration_tasks.append(self.get_full_message_by_discord_id(lookup_id, collection_name=target_collection))
-                            indices_to_hydrate.append(i)
-                
-                if hydration_tasks:
-                    hydrated_contents = await asyncio.gather(*hydration_tasks, return_exceptions=True)
-                    
-                    for idx, content in zip(indices_to_hydrate, hydrated_contents):
-                        if content and isinstance(content, str):
-                            final_results[idx]["original_chunk_content"] = final_results[idx].get("content")
-                            # Cap hydrated content to prevent context bloat (2000 chars ~ 500 tokens)
-                            final_results[idx]["content"] = smart_truncate(content, 2000)
-                            final_results[idx]["is_hydrated"] = True
-                            logger.debug(f"Hydrated chunk {final_results[idx]['id']} with full content ({len(content)} -> {len(final_results[idx]['content'])} chars)")
+                await self._ensure_payload_indexes(target_collection)
+                fallback_points, _ = await db_manager.qdrant_client.scroll(
+                    collection_name=target_collection,
+                    scroll_filter=Filter(must=[
+                        FieldCondition(key="user_id", match=MatchValue(value=str(user_id))),
+                        time_condition
+                    ]),
+                    order_by=OrderBy(key="timestamp_epoch", direction=Direction.DESC),
+                    limit=fetch_limit,  # Headroom for chunk duplicates
+                    with_payload=True
+                )
+                fallback_payloads = [point.payload or {} for point in fallback_points]
+                fallback_results = [
+                    self._format_memory_hit(point.id, payload, 0.5, temporal_weight)
+                    for point, payload, temporal_weight in zip(
+                        fallback_points, fallback_payloads, scoring.temporal_weights_for(fallback_payloads)
+                    )
+                ]
+                fallback_results.sort(key=lambda x: x["score"], reverse=True)
+                deduplicated = self._dedupe_by_parent(fallback_results)[:limit]
+                logger.info(f"Fallback final: {len(deduplicated)} results after dedup and limit")
             except Exception as e:
-                logger.warning(f"Failed to hydrate chunks: {e}")
-
+                logger.warning(f"Fallback scroll failed: {e}")
+        
+        # Log metrics
+        if db_manager.influxdb_write_api:
             try:
-                from src_v2.knowledge.manager import knowledge_manager
-                vector_ids = [r["id"] for r in final_results]
-                if vector_ids:
-                    neighborhood = await knowledge_manager.get_memory_neighborhood(vector_ids)
-                    
-                    # Map neighborhood back to results
-                    # neighborhood is list of dicts with 'memory_id'
-                    graph_map = {}
-                    for n in neighborhood:
-                        mid = n["memory_id"]
-                        if mid not in graph_map:
-                            graph_map[mid] = []
-                        
-                        # Format the graph connection
-                        if n.get("entity"):
-                            # Fact connection
-                            graph_map[mid].append(f"Related Fact: {n['entity']} ({n['predicate']})")
-                        elif n.get("linked_memory_content"):
-                            # Memory connection
-                            graph_map[mid].append(f"Linked Memory: {n['linked_memory_content']} ({n['predicate']})")
-                    
-                    # Attach to results
-                    for res in final_results:
-                        if res["id"] in graph_map:
-                            res["graph_context"] = graph_map[res["id"]]
+                duration_ms = (time.time() - start_time) * 1000
+                point = Point("memory_latency") \
+                    .tag("user_id", user_id) \
+                    .tag("operation", "read") \
+                    .field("duration_ms", duration_ms) \
+                    .field("result_count", len(deduplicated)) \
+                    .time(datetime.datetime.utcnow())
+                
+                db_manager.influxdb_write_api.write(
+                    bucket=settings.INFLUXDB_BUCKET,
+                    org=settings.INFLUXDB_ORG,
+                    record=point
+                )
             except Exception as e:
-                logger.warning(f"Failed to enrich memories with graph context: {e}")
+                logger.error(f"Failed to log memory search metrics: {e}")
 
-            return final_results
-            
+        # Phase 2.5.1: Vector-First Traversal (Graph Enrichment)
+        # Enrich results with graph neighborhood (linked memories, facts)
+        final_results = deduplicated[:limit]
+
+        # Hydrate chunks with full content (Postgres -> Qdrant fallback)
+        try:
+            hydration_tasks = []
+            indices_to_hydrate = []
+            
+            for i, res in enumerate(final_results):
+                if res.get("is_chunk"):
+                    # Use parent_message_id (the group ID) to find the full message
+                    lookup_id = res.get("parent_message_id") or res.get("message_id")
+                    if lookup_id:
+                        hydration_tasks.append(self.get_full_message_by_discord_id(lookup_id, collection_name=target_collection))
+                        indices_to_hydrate.append(i)
+            
+            if hydration_tasks:
+                hydrated_contents = await asyncio.gather(*hydration_tasks, return_exceptions=True)
+                
+                for idx, content in zip(indices_to_hydrate, hydrated_contents):
+                    if content and isinstance(content, str):
+                        final_results[idx]["original_chunk_content"] = final_results[idx].get("content")
+                        # Cap hydrated content to prevent context bloat (2000 chars ~ 500 tokens)
+                        final_results[idx]["content"] = smart_truncate(content, 2000)
+                        final_results[idx]["is_hydrated"] = True
+                        logger.debug(f"Hydrated chunk {final_results[idx]['id']} with full content ({len(content)} -> {len(final_results[idx]['content'])} chars)")
         except Exception as e:
-            logger.error(f"Failed to search memories: {e}")
+            logger.warning(f"Failed to hydrate chunks: {e}")
+
+        try:
+            from src_v2.knowledge.manager import knowledge_manager
+            vector_ids = [r["id"] for r in final_results]
+            if vector_ids:
+                neighborhood = await knowledge_manager.get_memory_neighborhood(vector_ids)
+                
+                # Map neighborhood back to results
+                # neighborhood is list of dicts with 'memory_id'
+                graph_map = {}
+                for n in neighborhood:
+                    mid = n["memory_id"]
+                    if mid not in graph_map:
+                        graph_map[mid] = []
+                    
+                    # Format the graph connection
+                    if n.get("entity"):
+                        # Fact connection
+                        graph_map[mid].append(f"Related Fact: {n['entity']} ({n['predicate']})")
+                    elif n.get("linked_memory_content"):
+                        # Memory connection
+                        graph_map[mid].append(f"Linked Memory: {n['linked_memory_content']} ({n['predicate']})")
+                
+                # Attach to results
+                for res in final_results:
+                    if res["id"] in graph_map:
+                        res["graph_context"] = graph_map[res["id"]]
+        except Exception as e:
+            logger.warning(f"Failed to enrich memories with graph context: {e}")
+
+        return final_results
+
+    @staticmethod
+    def _epoch_range_condition(time_range: Dict[str, str]) -> FieldCondition:
+        """Converts {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"} (end inclusive) into a timestamp_epoch range."""
+        start_date = datetime.datetime.fromisoformat(time_range.get("start", "1970-01-01"))
+        end_date = datetime.datetime.fromisoformat(time_range.get("end", "2099-12-31"))
+        # Make end_date inclusive (end of day)
+        end_date = end_date.replace(hour=23, minute=59, second=59)
+        return FieldCondition(
+            key="timestamp_epoch",
+            range=Range(gte=to_epoch_seconds(start_date), lte=to_epoch_seconds(end_date))
+        )
+
+    @staticmethod
+    def _since_hours_condition(hours: float) -> FieldCondition:
+        """timestamp_epoch range covering the last N hours (same clock as the writers' naive timestamps)."""
+        threshold = datetime.datetime.now() - datetime.timedelta(hours=hours)
+        return FieldCondition(key="timestamp_epoch", range=Range(gte=to_epoch_seconds(threshold)))
+
+    @staticmethod
+    def _format_memory_hit(
+        point_id: Any,
+        payload: Dict[str, Any],
+        semantic_score: float,
+        temporal_weight: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Builds a search_memories result from a Qdrant payload.
+        
+        Weighted score = Semantic × Temporal × Source × Importance
+        """
+        # 1. Temporal Weight (Decay)
+        # Use centralized scoring logic for consistent decay rates
+        if temporal_weight is None:
+            temporal_weight = scoring.calculate_temporal_weight(payload)
+        
+        # 2. Source Weight (Trust)
+        # Prefer direct human interaction over gossip/dreams
+        source_type = payload.get("source_type")
+        # Fallback to role if source_type missing (legacy data)
+        if not source_type:
+            role = payload.get("role")
+            if role == "human": source_type = "human_direct"
+            elif role == "ai": source_type = "inference"
+        
+        source_weight = scoring.SOURCE_WEIGHTS.get(source_type, scoring.DEFAULT_SOURCE_WEIGHT)
+        
+        # 3. Importance Weight
+        # 1-10 → 0.5-1.0 (default 3 -> 0.65)
+        raw_importance = payload.get("importance_score", 3)
+        importance_multiplier = 0.5 + (raw_importance / 20.0)
+
+        # Final Score Calculation
+        weighted_score = semantic_score * temporal_weight * source_weight * importance_multiplier
+        
+        return {
+            "id": point_id,
+            "content": payload.get("content"),
+            "role": payload.get("role"),
+            "source_type": source_type,
+            "score": weighted_score,
+            "semantic_score": semantic_score,
+            "temporal_weight": round(temporal_weight, 3),
+            "source_weight": round(source_weight, 3),
+            "importance_multiplier": round(importance_multiplier, 3),
+            "timestamp": payload.get("timestamp"),
+            "relative_time": get_relative_time(payload.get("timestamp")) if payload.get("timestamp") else "unknown time",
+            "user_name": payload.get("user_name"),
+            "channel_id": payload.get("channel_id"),
+            "message_id": payload.get("message_id"),
+            # ADR-014: Author tracking
+            "author_id": payload.get("author_id"),
+            "author_is_bot": payload.get("author_is_bot", False),
+            "author_name": payload.get("author_name"),
+            "reply_to_msg_id": payload.get("reply_to_msg_id"),
+            # Chunk metadata for hydration
+            "is_chunk": payload.get("is_chunk", False),
+            "chunk_index": payload.get("chunk_index"),
+            "chunk_total": payload.get("chunk_total"),
+            "original_length": payload.get("original_length"),
+            "parent_message_id": payload.get("parent_message_id")
+        }
+
+    @staticmethod
+    def _dedupe_by_parent(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Keeps the first (highest scoring) result per parent message."""
+        deduplicated = []
+        seen_parents = set()
+        for res in results:
+            # Use parent_message_id for chunks, or message_id for regular messages
+            # If neither exists (legacy), use ID
+            unique_key = res.get("parent_message_id") or res.get("message_id") or res["id"]
+            if unique_key not in seen_parents:
+                deduplicated.append(res)
+                seen_parents.add(unique_key)
+        return deduplicated
+
+    async def _search_pending(
+        self,
+        query_embedding: List[float],
+        user_id: str,
+        collection_name: str,
+        channel_id: Optional[str] = None,
+        bot_id: Optional[str] = None,
+        exclude_bot_authors: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Scores messages that are still in the write-behind queue against the query
+        embedding, using the same filters and weighting as search_memories.
+        All candidates are embedded concurrently, so the embedding micro-batcher
+        folds them into one model call. The vectors are only cached for repeat
+        searches: the consumer chunks long messages and embeds them itself.
+        """
+        candidates = self.ingestion_queue.pending_for(user_id, collection_name)
+        if channel_id and bot_id:
+            candidates += [
+                p for p in self.ingestion_queue.pending_for(bot_id, collection_name)
+                if str(p.get("channel_id")) == str(channel_id)
+            ]
+        elif channel_id:
+            candidates = [p for p in candidates if str(p.get("channel_id")) == str(channel_id)]
+        if exclude_bot_authors:
+            candidates = [p for p in candidates if not p.get("author_is_bot", False)]
+        if not candidates:
             return []
 
+        embeddable = []
+        for pending in candidates:
+            embed_content = pending.get("content") or ""
+            if pending.get("role") in ("human", "user") and not pending.get("author_is_bot", False):
+                embed_content = strip_context_markers(embed_content)
+            if embed_content:
+                embeddable.append((pending, embed_content))
+        vectors = await asyncio.gather(
+            *(self.embedding_service.embed_query_async(text) for _, text in embeddable),
+            return_exceptions=True
+        )
+
+        query_vec = np.asarray(query_embedding, dtype=np.float32)
+        query_norm = float(np.linalg.norm(query_vec)) or 1.0
+        results = []
+        for (pending, embed_content), vec in zip(embeddable, vectors):
+            content = pending.get("content") or ""
+            role = pending.get("role")
+            if isinstance(vec, Exception):
+                logger.warning(f"Failed to embed pending memory {pending['job_id']}: {vec}")
+                continue
+            vec = np.asarray(vec, dtype=np.float32)
+            semantic_score = float(np.dot(query_vec, vec) / (query_norm * (float(np.linalg.norm(vec)) or 1.0)))
+
+            source_type = pending.get("source_type")
+            if source_type is None:
+                source_type = "human_direct" if role in ("human", "user") else "inference"
+            elif isinstance(source_type, MemorySourceType):
+                source_type = source_type.value
+            source_weight = scoring.SOURCE_WEIGHTS.get(source_type, scoring.DEFAULT_SOURCE_WEIGHT)
+            importance_multiplier = 0.5 + (pending.get("importance_score", 3) / 20.0)
+            timestamp = pending.get("timestamp") or datetime.datetime.fromtimestamp(pending["enqueued_at"]).isoformat()
+
+            results.append({
+                "id": pending["job_id"],
+                "content": embed_content,
+                "role": role,
+                "source_type": source_type,
+                "score": semantic_score * source_weight * importance_multiplier,
+                "semantic_score": semantic_score,
+                "temporal_weight": 1.0,
+                "source_weight": round(source_weight, 3),
+                "importance_multiplier": round(importance_multiplier, 3),
+                "timestamp": timestamp,
+                "relative_time": get_relative_time(timestamp),
+                "user_name": pending.get("user_name"),
+                "channel_id": str(pending["channel_id"]) if pending.get("channel_id") else None,
+                "message_id": str(pending["message_id"]) if pending.get("message_id") else None,
+                "author_id": str(pending["author_id"]) if pending.get("author_id") else None,
+                "author_is_bot": pending.get("author_is_bot", False),
+                "author_name": pending.get("author_name"),
+                "reply_to_msg_id": str(pending["reply_to_msg_id"]) if pending.get("reply_to_msg_id") else None,
+                "is_chunk": False,
+                "chunk_index": None,
+                "chunk_total": None,
+                "original_length": len(content),
+                "parent_message_id": None,
+                "is_pending": True
+            })
+        return results
+
     async def get_recent_memories(
         self,
         limit: int = 10,
@@ -1129,13 +1350,19 @@ class MemoryManager:
         target_collection = collection_name or self.collection_name
         
         try:
-            # Use scroll to fetch recent points
-            # Note: Qdrant scroll order is undefined without order_by, but usually insertion order for UUIDs is random.
-            # However, we fetch a larger batch and sort in Python by timestamp.
+            # Qdrant orders by the indexed timestamp_epoch field and applies the type exclusion
+            await self._ensure_payload_indexes(target_collection)
+            scroll_filter = None
+            if exclude_types:
+                scroll_filter = Filter(must_not=[
+                    FieldCondition(key="type", match=MatchAny(any=list(exclude_types)))
+                ])
             
             result, _ = await db_manager.qdrant_client.scroll(
                 collection_name=target_collection,
-                limit=limit * 5, # Fetch more to ensure we get recent ones after sort
+                scroll_filter=scroll_filter,
+                order_by=OrderBy(key="timestamp_epoch", direction=Direction.DESC),
+                limit=limit,
                 with_payload=True,
                 with_vectors=False
             )
@@ -1143,9 +1370,6 @@ class MemoryManager:
             memories = []
             for point in result:
                 payload = point.payload or {}
-                if exclude_types and payload.get("type") in exclude_types:
-                    continue
-                    
                 memories.append({
                     "id": point.id,
                     "content": payload.get("content"),
@@ -1153,11 +1377,8 @@ class MemoryManager:
                     "type": payload.get("type"),
                     "source_type": payload.get("source_type")
                 })
-                
-            # Sort by timestamp desc
-            memories.sort(key=lambda x: x.get("timestamp", "") or "", reverse=True)
             
-            return memories[:limit]
+            return memories
             
         except Exception as e:
             logger.error(f"Failed to get recent memories: {e}")
@@ -1301,7 +1522,7 @@ class MemoryManager:
             logger.error(f"Advanced memory search failed: {e}")
             return []
 
-    async def search_summaries(self, query: str, user_id: str, limit: int = 3, start_timestamp: Optional[float] = None, collection_name: Optional[str] = None, channel_id: Optional[str] = None, bot_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    async def search_summaries(self, query: str, user_id: str, limit: int = 3, start_timestamp: Optional[float] = None, collection_name: Optional[str] = None, channel_id: Optional[str] = None, bot_id: Optional[str] = None, query_vector: Optional[List[float]] = None) -> List[Dict[str, Any]]:
         """
         Searches for relevant summaries in Qdrant with weighted scoring.
         
@@ -1314,6 +1535,7 @@ class MemoryManager:
             channel_id: Optional channel filter.
             bot_id: Optional bot ID. If provided with channel_id, enables "Dual Stream" retrieval:
                     (user_id == user_id) OR (channel_id == channel_id AND user_id == bot_id)
+            query_vector: Precomputed embedding of `query`
         """
         if not db_manager.qdrant_client:
             logger.warning("Qdrant client not available for search_summaries")
@@ -1323,7 +1545,7 @@ class MemoryManager:
 
         try:
             logger.debug(f"Searching summaries for user {user_id} with query: {query}")
-            embedding = await self.embedding_service.embed_query_async(query)
+            embedding = query_vector if query_vector is not None else await self.embedding_service.embed_query_async(query)
             
             # Build Filter
             # Base: Type must be summary
@@ -1445,6 +1667,9 @@ class MemoryManager:
                         WHERE user_id = $1 AND character_name = $2
                     """, str(user_id), character_name)
                 logger.info(f"Cleared Postgres history for user {user_id} and character {character_name}")
+                # Channel windows may hold this user's turns too; they reseed on next read
+                await cache_manager.delete_window(self._history_window_key(character_name, user_id))
+                await cache_manager.delete_pattern(f"history:{character_name}:channel:*")
             except Exception as e:
                 logger.error(f"Failed to clear Postgres history: {e}")
 
@@ -1467,131 +1692,191 @@ class MemoryManager:
             except Exception as e:
                 logger.error(f"Failed to clear Qdrant memory: {e}")
 
+    @staticmethod
+    def _history_window_key(character_name: str, user_id: str, channel_id: Optional[str] = None) -> str:
+        """Redis window mirroring one get_recent_history() query (group channel or DM partner)."""
+        if channel_id:
+            return f"history:{character_name}:channel:{channel_id}"
+        return f"history:{character_name}:user:{user_id}"
+
+    @staticmethod
+    def _history_window_value(row: Dict[str, Any]) -> str:
+        """
+        Serializes a v2_chat_history row for a window. Seeds and pushes must produce
+        identical strings for the same row so push_window can drop a duplicate.
+        """
+        if isinstance(row.get("timestamp"), datetime.datetime):
+            row = {**row, "timestamp": row["timestamp"].isoformat()}
+        return json.dumps(row)
+
+    async def _push_history_windows(self, character_name: str, user_id: str, channel_id: Optional[str], row: Dict[str, Any]) -> None:
+        """Prepends a freshly inserted turn to the user window and, if any, the channel window."""
+        value = self._history_window_value(row)
+        keys = [self._history_window_key(character_name, user_id)]
+        if channel_id:
+            keys.append(self._history_window_key(character_name, user_id, channel_id))
+        await asyncio.gather(*(
+            cache_manager.push_window(key, value, settings.HISTORY_WINDOW_SIZE, settings.HISTORY_WINDOW_TTL_SECONDS)
+            for key in keys
+        ))
+
+    async def _fetch_recent_rows(self, user_id: str, character_name: str, limit: int, channel_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Newest-first v2_chat_history rows; both shapes are served by (…, character_name, timestamp DESC) indexes."""
+        async with db_manager.postgres_pool.acquire() as conn:
+            if channel_id:
+                # Fetch by channel_id (Group Context) - ADR-014: Include author fields
+                rows = await conn.fetch("""
+                    SELECT role, content, user_id, user_name, timestamp,
+                           author_id, author_is_bot
+                    FROM v2_chat_history 
+                    WHERE channel_id = $1 AND character_name = $2
+                    ORDER BY timestamp DESC
+                    LIMIT $3
+                """, str(channel_id), character_name, limit)
+            else:
+                # Fetch by user_id (DM Context) - ADR-014: Include author fields
+                rows = await conn.fetch("""
+                    SELECT role, content, user_id, user_name, timestamp,
+                           author_id, author_is_bot
+                    FROM v2_chat_history 
+                    WHERE user_id = $1 AND character_name = $2
+                    ORDER BY timestamp DESC
+                    LIMIT $3
+                """, str(user_id), character_name, limit)
+        return [dict(row) for row in rows]
+
+    async def _get_recent_rows(self, user_id: str, character_name: str, limit: int, channel_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Newest-first recent turns, from the Redis window when it is seeded and
+        large enough; otherwise from Postgres (seeding the window on the way).
+        """
+        if not settings.ENABLE_HISTORY_WINDOW_CACHE or limit > settings.HISTORY_WINDOW_SIZE:
+            return await self._fetch_recent_rows(user_id, character_name, limit, channel_id)
+
+        key = self._history_window_key(character_name, user_id, channel_id)
+        cached = await cache_manager.get_window(key, limit)
+        if cached is not None:
+            return [json.loads(value) for value in cached]
+
+        async def load_window() -> List[str]:
+            rows = await self._fetch_recent_rows(user_id, character_name, settings.HISTORY_WINDOW_SIZE, channel_id)
+            return [self._history_window_value(row) for row in rows]
+
+        values = await cache_manager.load_window(
+            key, load_window, settings.HISTORY_WINDOW_SIZE, settings.HISTORY_WINDOW_TTL_SECONDS
+        )
+        return [json.loads(value) for value in values[:limit]]
+
     async def get_recent_history(self, user_id: str, character_name: str, limit: int = 10, channel_id: Optional[str] = None) -> List[BaseMessage]:
         """
         Retrieves the recent chat history for a user and character.
         If channel_id is provided, retrieves history for that channel (group chat context).
+        The common case is served from the Redis window kept current by add_message.
         """
         if not db_manager.postgres_pool:
             return []
 
-        messages = []
         try:
-            async with db_manager.postgres_pool.acquire() as conn:
+            rows = await self._get_recent_rows(user_id, character_name, limit, channel_id)
+        except Exception as e:
+            logger.error(f"Failed to retrieve history: {e}")
+            return []
+
+        return self._build_history_messages(rows, character_name, channel_id)
+
+    def _build_history_messages(self, rows: List[Dict[str, Any]], character_name: str, channel_id: Optional[str] = None) -> List[BaseMessage]:
+        """Turns newest-first history rows into messages (or one transcript block for group channels)."""
+        messages = []
+        # Rows are newest-first; reverse to get chronological order
+        for row in reversed(rows):
+            # Calculate relative time for context
+            timestamp = row['timestamp']
+            rel_time = get_relative_time(timestamp)
+            
+            if row['role'] == 'human':
+                content = row['content']
+                
+                # Truncate extremely long messages to prevent context window explosion
+                # (e.g. when users upload large files which get stored in history)
+                if len(content) > 4000:
+                    # Middle truncation is better: preserves start (context) and end (instruction/conclusion)
+                    content = smart_truncate(content, max_length=4000)
+                
+                # ADR-014: Use author_id for attribution in group contexts
+                # Show name if it's another user in the channel
+                author_id = row.get('author_id')
+                author_is_bot = row.get('author_is_bot', False)
+                
                 if channel_id:
-                    # Fetch by channel_id (Group Context) - ADR-014: Include author fields
-                    rows = await conn.fetch("""
-                        SELECT role, content, user_id, user_name, timestamp,
-                               author_id, author_is_bot
-                        FROM v2_chat_history 
-                        WHERE channel_id = $1 AND character_name = $2
-                        ORDER BY timestamp DESC
-                        LIMIT $3
-                    """, str(channel_id), character_name, limit)
-                else:
-                    # Fetch by user_id (DM Context) - ADR-014: Include author fields
-                    rows = await conn.fetch("""
-                        SELECT role, content, user_id, user_name, timestamp,
-                               author_id, author_is_bot
-                        FROM v2_chat_history 
-                        WHERE user_id = $1 AND character_name = $2
-                        ORDER BY timestamp DESC
-                        LIMIT $3
-                    """, str(user_id), character_name, limit)
+                    # In group contexts, ALWAYS show who said what for clarity
+                    # This creates a clear script-like format:
+                    # [Mark]: Hi
+                    # [Jake (bot)]: Hello
+                    if author_id:
+                        display_name = row['user_name'] or f"User {author_id}"
+                        bot_tag = " (bot)" if author_is_bot else ""
+                        content = f"[{display_name}{bot_tag}]: {content}"
+                    else:
+                        # Legacy fallback
+                        display_name = row['user_name'] or f"User {row['user_id']}"
+                        content = f"[{display_name}]: {content}"
                 
-                # Reverse to get chronological order
-                for row in reversed(rows):
-                    # Calculate relative time for context
-                    timestamp = row['timestamp']
-                    rel_time = get_relative_time(timestamp)
+                # Add timestamp context (suffix to avoid LLM echoing)
+                content = f"{content} ({rel_time})"
                     
-                    if row['role'] == 'human':
-                        content = row['content']
-                        
-                        # Truncate extremely long messages to prevent context window explosion
-                        # (e.g. when users upload large files which get stored in history)
-                        if len(content) > 4000:
-                            # Middle truncation is better: preserves start (context) and end (instruction/conclusion)
-                            content = smart_truncate(content, max_length=4000)
-                        
-                        # ADR-014: Use author_id for attribution in group contexts
-                        # Show name if it's another user in the channel
-                        author_id = row.get('author_id')
-                        author_is_bot = row.get('author_is_bot', False)
-                        
-                        if channel_id:
-                            # In group contexts, ALWAYS show who said what for clarity
-                            # This creates a clear script-like format:
-                            # [Mark]: Hi
-                            # [Jake (bot)]: Hello
-                            if author_id:
-                                display_name = row['user_name'] or f"User {author_id}"
-                                bot_tag = " (bot)" if author_is_bot else ""
-                                content = f"[{display_name}{bot_tag}]: {content}"
-                            else:
-                                # Legacy fallback
-                                display_name = row['user_name'] or f"User {row['user_id']}"
-                                content = f"[{display_name}]: {content}"
-                        
-                        # Add timestamp context (suffix to avoid LLM echoing)
-                        content = f"{content} ({rel_time})"
-                            
-                        messages.append(HumanMessage(content=content))
-                    elif row['role'] == 'ai':
-                        # ADR-014: Multi-party handling
-                        # Check if this is ME or ANOTHER BOT
-                        # In group contexts, other bots should be treated as external inputs (HumanMessage)
-                        # to avoid identity confusion.
-                        
-                        is_me = True
-                        if channel_id and row.get('user_name'):
-                            # Check if the message author matches the current character
-                            # character_name is usually lowercase (e.g. 'elena'), user_name might be 'Elena'
-                            if row['user_name'].lower() != character_name.lower():
-                                is_me = False
-                        
-                        content = row['content']
-                        
-                        if not is_me and channel_id:
-                            # It's another bot in a group channel
-                            # Treat as HumanMessage with explicit attribution
-                            display_name = row['user_name']
-                            content = f"[{display_name} (bot)]: {content} ({rel_time})"
-                            messages.append(HumanMessage(content=content))
-                        else:
-                            # It's me (or DM), keep as AIMessage
-                            # Add timestamp context
-                            content = f"{content} ({rel_time})"
-                            messages.append(AIMessage(content=content))
-            
-            # [REDESIGN] Group Chat Transcript Mode
-            # If we are in a channel (group context), collapse the history into a single "Transcript" block.
-            # This prevents the LLM from confusing other users' messages with the current speaker.
-            if channel_id and messages:
-                transcript_lines = []
-                transcript_lines.append("📜 **CHANNEL TRANSCRIPT (Recent History)**")
-                transcript_lines.append("(This is context. These messages were sent by various people.)\n")
+                messages.append(HumanMessage(content=content))
+            elif row['role'] == 'ai':
+                # ADR-014: Multi-party handling
+                # Check if this is ME or ANOTHER BOT
+                # In group contexts, other bots should be treated as external inputs (HumanMessage)
+                # to avoid identity confusion.
                 
-                for msg in messages:
-                    # Extract content (remove the HumanMessage/AIMessage wrapper for the script)
-                    line = str(msg.content)
-                    
-                    # If it was an AIMessage (me), ensure it's labeled if not already
-                    # Note: AIMessages already have timestamps, just need to add the name prefix
-                    if isinstance(msg, AIMessage) and not line.startswith("["):
-                        # Insert character name at start, preserving the timestamp at end
-                        line = f"[{character_name}]: {line}"
-                        
-                    transcript_lines.append(line)
+                is_me = True
+                if channel_id and row.get('user_name'):
+                    # Check if the message author matches the current character
+                    # character_name is usually lowercase (e.g. 'elena'), user_name might be 'Elena'
+                    if row['user_name'].lower() != character_name.lower():
+                        is_me = False
                 
-                transcript_lines.append("\n(End of transcript. Reply to the *current* user message below.)")
+                content = row['content']
                 
-                # Return as a SINGLE context message
-                return [HumanMessage(content="\n".join(transcript_lines))]
-                        
-        except Exception as e:
-            logger.error(f"Failed to retrieve history: {e}")
-            
+                if not is_me and channel_id:
+                    # It's another bot in a group channel
+                    # Treat as HumanMessage with explicit attribution
+                    display_name = row['user_name']
+                    content = f"[{display_name} (bot)]: {content} ({rel_time})"
+                    messages.append(HumanMessage(content=content))
+                else:
+                    # It's me (or DM), keep as AIMessage
+                    # Add timestamp context
+                    content = f"{content} ({rel_time})"
+                    messages.append(AIMessage(content=content))
+    
+        # [REDESIGN] Group Chat Transcript Mode
+        # If we are in a channel (group context), collapse the history into a single "Transcript" block.
+        # This prevents the LLM from confusing other users' messages with the current speaker.
+        if channel_id and messages:
+            transcript_lines = []
+            transcript_lines.append("📜 **CHANNEL TRANSCRIPT (Recent History)**")
+            transcript_lines.append("(This is context. These messages were sent by various people.)\n")
+        
+            for msg in messages:
+                # Extract content (remove the HumanMessage/AIMessage wrapper for the script)
+                line = str(msg.content)
+            
+                # If it was an AIMessage (me), ensure it's labeled if not already
+                # Note: AIMessages already have timestamps, just need to add the name prefix
+                if isinstance(msg, AIMessage) and not line.startswith("["):
+                    # Insert character name at start, preserving the timestamp at end
+                    line = f"[{character_name}]: {line}"
+                
+                transcript_lines.append(line)
+        
+            transcript_lines.append("\n(End of transcript. Reply to the *current* user message below.)")
+        
+            # Return as a SINGLE context message
+            return [HumanMessage(content="\n".join(transcript_lines))]
+
         return messages
 
     async def get_recent_activity_count(self, character_name: str, channel_id: str, minutes: int = 10) -> int:
@@ -1677,9 +1962,10 @@ class MemoryManager:
             logger.error(f"Failed to count messages: {e}")
             return 0
 
-    async def search_reasoning_traces(self, query: str, user_id: str, limit: int = 3, collection_name: Optional[str] = None) -> List[Dict[str, Any]]:
+    async def search_reasoning_traces(self, query: str, user_id: str, limit: int = 3, collection_name: Optional[str] = None, query_vector: Optional[List[float]] = None) -> List[Dict[str, Any]]:
         """
         Searches for reasoning traces relevant to the query.
+        Pass query_vector to reuse an embedding of `query` computed elsewhere this turn.
         """
         if not db_manager.qdrant_client:
             return []
@@ -1687,9 +1973,10 @@ class MemoryManager:
         collection = collection_name or self.collection_name
         
         try:
-            # Generate embedding for the query
+            # Generate embedding for the query unless the caller already has it
             # Use async wrapper to avoid blocking the event loop
-            query_vector = await self.embedding_service.embed_query_async(query)
+            if query_vector is None:
+                query_vector = await self.embedding_service.embed_query_async(query)
             
             # Filter for reasoning traces for this user
             search_filter = Filter(
@@ -1740,45 +2027,38 @@ class MemoryManager:
         collection = collection_name or self.collection_name
         
         try:
-            # Calculate threshold timestamp
-            threshold = datetime.datetime.now() - datetime.timedelta(hours=hours)
-            threshold_iso = threshold.isoformat()
-            
-            # Scroll through all summaries (no embedding query, just filter)
+            # Time window and ordering are applied by Qdrant on timestamp_epoch
+            await self._ensure_payload_indexes(collection)
             results = await db_manager.qdrant_client.scroll(
                 collection_name=collection,
                 scroll_filter=Filter(
                     must=[
-                        FieldCondition(key="type", match=MatchValue(value="summary"))
+                        FieldCondition(key="type", match=MatchValue(value="summary")),
+                        self._since_hours_condition(hours)
                     ]
                 ),
-                limit=limit * 2,  # Fetch extra for date filtering
+                order_by=OrderBy(key="timestamp_epoch", direction=Direction.DESC),
+                limit=limit,
                 with_payload=True,
                 with_vectors=False
             )
             
-            # Filter by timestamp (Qdrant doesn't support date range in scroll easily)
             summaries = []
             for point in results[0]:
                 payload = point.payload
                 if payload:
-                    ts = payload.get("timestamp", "")
-                    if ts >= threshold_iso:
-                        summaries.append({
-                            "user_id": payload.get("user_id"),
-                            "user_name": payload.get("user_name"),  # Include for diary provenance
-                            "content": payload.get("content", ""),
-                            "emotions": payload.get("emotions", []),
-                            "topics": payload.get("topics", []),
-                            "meaningfulness_score": payload.get("meaningfulness_score", 3),
-                            "timestamp": ts
-                        })
-            
-            # Sort by timestamp descending
-            summaries.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
+                    summaries.append({
+                        "user_id": payload.get("user_id"),
+                        "user_name": payload.get("user_name"),  # Include for diary provenance
+                        "content": payload.get("content", ""),
+                        "emotions": payload.get("emotions", []),
+                        "topics": payload.get("topics", []),
+                        "meaningfulness_score": payload.get("meaningfulness_score", 3),
+                        "timestamp": payload.get("timestamp", "")
+                    })
             
             logger.debug(f"Found {len(summaries)} summaries in last {hours} hours")
-            return summaries[:limit]
+            return summaries
             
         except Exception as e:
             logger.error(f"Failed to get recent summaries: {e}")
@@ -1812,21 +2092,23 @@ class MemoryManager:
         collection = collection_name or self.collection_name
         
         try:
-            # Calculate threshold timestamp (datetime is imported at top of file)
-            threshold = datetime.datetime.now() - datetime.timedelta(hours=hours)
-            threshold_iso = threshold.isoformat()
-            
-            # Get summaries (which have meaningfulness_score)
-            # Note: timestamp is stored as ISO string, so we filter by type first
-            # then manually filter by timestamp (Range only works with numeric fields)
+            # Summaries store meaningfulness_score on a 1-5 scale (older points on 0-1);
+            # the threshold, time window and ranking are all applied by Qdrant
+            await self._ensure_payload_indexes(collection)
             results = await db_manager.qdrant_client.scroll(
                 collection_name=collection,
                 scroll_filter=Filter(
                     must=[
                         FieldCondition(key="type", match=MatchValue(value="summary")),
+                        self._since_hours_condition(hours),
+                        Filter(should=[
+                            FieldCondition(key="meaningfulness_score", range=Range(gt=1, gte=min_meaningfulness * 5)),
+                            FieldCondition(key="meaningfulness_score", range=Range(gte=min_meaningfulness, lte=1)),
+                        ]),
                     ]
                 ),
-                limit=limit * 10,  # Fetch extra for time-based filtering
+                order_by=OrderBy(key="meaningfulness_score", direction=Direction.DESC),
+                limit=limit,
                 with_payload=True,
                 with_vectors=False
             )
@@ -1836,68 +2118,18 @@ class MemoryManager:
                 payload = point.payload
                 if not payload:
                     continue
-                
-                ts = payload.get("timestamp", "")
-                if ts < threshold_iso:
-                    continue
-                
-                # Check meaningfulness score
-                meaningfulness = payload.get("meaningfulness_score", 0.5)
-                if isinstance(meaningfulness, (int, float)) and meaningfulness >= min_meaningfulness:
-                    memories.append({
-                        "id": str(point.id),  # Qdrant point ID for graph traversal
-                        "content": payload.get("content", ""),
-                        "summary": payload.get("summary", payload.get("content", "")),
-                        "emotions": payload.get("emotions", []),
-                        "topics": payload.get("topics", []),
-                        "meaningfulness_score": meaningfulness,
-                        "user_id": payload.get("user_id"),
-                        "user_name": payload.get("user_name"),  # Include for dream provenance
-                        "timestamp": ts
-                    })
-            
-            # Also check summaries if we don't have enough memories
-            if len(memories) < limit:
-                summary_results = await db_manager.qdrant_client.scroll(
-                    collection_name=collection,
-                    scroll_filter=Filter(
-                        must=[
-                            FieldCondition(key="type", match=MatchValue(value="summary")),
-                        ]
-                    ),
-                    limit=limit * 5,  # Fetch extra for time-based filtering
-                    with_payload=True,
-                    with_vectors=False
-                )
-                
-                for point in summary_results[0]:
-                    payload = point.payload
-                    if not payload:
-                        continue
-                    
-                    ts = payload.get("timestamp", "")
-                    if ts < threshold_iso:
-                        continue
-                    
-                    # Normalize meaningfulness score (summaries use 1-5 scale)
-                    raw_score = payload.get("meaningfulness_score", 3)
-                    if isinstance(raw_score, (int, float)):
-                        if raw_score > 1:  # Probably 1-5 scale
-                            meaningfulness = raw_score / 5.0
-                        else:
-                            meaningfulness = raw_score
-                        
-                        if meaningfulness >= min_meaningfulness:
-                            memories.append({
-                                "id": str(point.id),  # Qdrant point ID for graph traversal
-                                "content": payload.get("content", ""),
-                                "summary": payload.get("content", ""),
-                                "emotions": payload.get("emotions", []),
-                                "topics": payload.get("topics", []),
-                                "meaningfulness_score": meaningfulness,
-                                "user_id": payload.get("user_id"),
-                                "timestamp": ts
-                            })
+                raw_score = payload["meaningfulness_score"]
+                memories.append({
+                    "id": str(point.id),  # Qdrant point ID for graph traversal
+                    "content": payload.get("content", ""),
+                    "summary": payload.get("summary", payload.get("content", "")),
+                    "emotions": payload.get("emotions", []),
+                    "topics": payload.get("topics", []),
+                    "meaningfulness_score": raw_score / 5.0 if raw_score > 1 else raw_score,
+                    "user_id": payload.get("user_id"),
+                    "user_name": payload.get("user_name"),  # Include for dream provenance
+                    "timestamp": payload.get("timestamp", "")
+                })
             
             # Sort by meaningfulness (descending) and then timestamp
             memories.sort(key=lambda x: (x.get("meaningfulness_score", 0), x.get("timestamp", "")), reverse=True)
@@ -1941,16 +2173,16 @@ class MemoryManager:
                 FieldCondition(key="type", match=MatchValue(value=memory_type))
             ]
             
-            # Calculate threshold if hours specified
-            threshold_iso = None
+            # Time window is a Range on timestamp_epoch, newest first
             if hours:
-                threshold = datetime.datetime.now() - datetime.timedelta(hours=hours)
-                threshold_iso = threshold.isoformat()
+                await self._ensure_payload_indexes(collection)
+                must_conditions.append(self._since_hours_condition(hours))
             
             results = await db_manager.qdrant_client.scroll(
                 collection_name=collection,
                 scroll_filter=Filter(must=must_conditions),
-                limit=limit * 3 if hours else limit,  # Fetch extra if filtering by time
+                order_by=OrderBy(key="timestamp_epoch", direction=Direction.DESC) if hours else None,
+                limit=limit,
                 with_payload=True,
                 with_vectors=False
             )
@@ -1961,12 +2193,6 @@ class MemoryManager:
                 if not payload:
                     continue
                 
-                # Filter by time if specified
-                if threshold_iso:
-                    ts = payload.get("timestamp", payload.get("created_at", ""))
-                    if ts and ts < threshold_iso:
-                        continue
-                
                 memories.append({
                     "content": payload.get("content", ""),
                     "metadata": payload,
@@ -1974,9 +2200,6 @@ class MemoryManager:
                     "created_at": payload.get("timestamp", payload.get("created_at", "")),
                     "type": memory_type
                 })
-                
-                if len(memories) >= limit:
-                    break
             
             logger.debug(f"Found {len(memories)} memories of type '{memory_type}'")
             return memories
@@ -2087,32 +2310,22 @@ class MemoryManager:
             must_conditions = [
                 FieldCondition(key="type", match=MatchValue(value="summary"))
             ]
+            if hours:
+                must_conditions.append(self._since_hours_condition(hours))
             
             search_result = await db_manager.qdrant_client.query_points(
                 collection_name=collection,
                 query=embedding,
                 query_filter=Filter(must=must_conditions),
-                limit=limit * 2  # Fetch extra for filtering
+                limit=limit
             )
             
-            # Calculate threshold if hours specified
-            threshold_iso = None
-            if hours:
-                threshold = datetime.datetime.now() - datetime.timedelta(hours=hours)
-                threshold_iso = threshold.isoformat()
-            
             summaries = []
             for point in search_result.points:
                 payload = point.payload
                 if not payload:
                     continue
                 
-                # Filter by time if specified
-                if threshold_iso:
-                    ts = payload.get("timestamp", payload.get("created_at", ""))
-                    if ts and ts < threshold_iso:
-                        continue
-                
                 summaries.append({
                     "content": payload.get("content", ""),
                     "user_id": payload.get("user_id"),
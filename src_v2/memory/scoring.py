@@ -7,8 +7,13 @@ old gossip-derived content, while preserving cross-bot mythology.
 
 Philosophy: Observe first, constrain only what's proven problematic.
 """
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src_v2.utils.time_utils import to_epoch_seconds
 
 
 # ============================================================================
@@ -84,29 +89,14 @@ def calculate_temporal_weight(
     Returns:
         Weight between 0.0 and 1.0
     """
-    # Get creation time
-    created_at_raw = memory.get("created_at") or memory.get("timestamp")
-    if not created_at_raw:
-        return 1.0  # No timestamp, assume recent
-    
-    # Parse timestamp
-    if isinstance(created_at_raw, str):
-        try:
-            created_at = datetime.fromisoformat(created_at_raw.replace("Z", "+00:00"))
-        except ValueError:
-            return 1.0
-    elif isinstance(created_at_raw, datetime):
-        created_at = created_at_raw
-    else:
-        return 1.0
-    
-    # Ensure timezone aware
-    if created_at.tzinfo is None:
-        created_at = created_at.replace(tzinfo=timezone.utc)
+    # Creation time (same convention as the batch path)
+    created_epoch = _memory_epoch(memory)
+    if np.isnan(created_epoch):
+        return 1.0  # No usable timestamp, assume recent
     
     # Calculate age in days
     ref_time = reference_time or datetime.now(timezone.utc)
-    age_days = (ref_time - created_at).total_seconds() / 86400
+    age_days = (ref_time.timestamp() - created_epoch) / 86400
     
     if age_days <= 0:
         return 1.0
@@ -232,6 +222,204 @@ def rerank_memories(
     return scored
 
 
+# ============================================================================
+# Batch (Vectorized) Scoring
+# ============================================================================
+# Same math as calculate_temporal_weight / calculate_source_weight /
+# calculate_composite_score, computed over NumPy arrays in one pass.
+# Types are passed as integer codes into lookup tables; code 0 = unknown type.
+
+MEMORY_TYPE_CODES = {name: i + 1 for i, name in enumerate(DECAY_RATES)}
+SOURCE_TYPE_CODES = {name: i + 1 for i, name in enumerate(SOURCE_WEIGHTS)}
+
+_DECAY_TABLE = np.array([DEFAULT_DECAY_RATE, *DECAY_RATES.values()], dtype=np.float64)
+_SOURCE_WEIGHT_TABLE = np.array([DEFAULT_SOURCE_WEIGHT, *SOURCE_WEIGHTS.values()], dtype=np.float64)
+
+_SECONDS_PER_DAY = 86400.0
+
+
+@dataclass
+class MemoryArrays:
+    """Column arrays for a batch of memories (see encode_memories)."""
+    scores: np.ndarray          # Semantic similarity
+    epochs: np.ndarray          # Creation time, Unix seconds (NaN = unknown, treated as recent)
+    type_codes: np.ndarray      # MEMORY_TYPE_CODES (drives decay rate)
+    source_codes: np.ndarray    # SOURCE_TYPE_CODES (drives source weight)
+    meaningfulness: np.ndarray  # 1-5 scale, 3 = neutral
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+
+def _memory_epoch(memory: Dict[str, Any]) -> float:
+    """Creation time in Unix seconds, preferring the stored timestamp_epoch over parsing ISO strings."""
+    created_at_raw = memory.get("created_at")
+    if not created_at_raw:
+        epoch = memory.get("timestamp_epoch")
+        if isinstance(epoch, (int, float)) and not isinstance(epoch, bool):
+            return float(epoch)
+        created_at_raw = memory.get("timestamp")
+    # Naive ISO strings are local time, as the writers stamp them (see to_epoch_seconds)
+    epoch = to_epoch_seconds(created_at_raw) if isinstance(created_at_raw, (str, datetime)) else None
+    return float(epoch) if epoch is not None else np.nan
+
+
+def _memory_meaningfulness(memory: Dict[str, Any]) -> float:
+    meaningfulness = memory.get("meaningfulness") or memory.get("meaningfulness_score") or 3
+    if isinstance(meaningfulness, str):
+        try:
+            meaningfulness = int(meaningfulness)
+        except ValueError:
+            meaningfulness = 3
+    if not isinstance(meaningfulness, (int, float)):
+        return 3.0
+    return float(meaningfulness)
+
+
+def encode_memories(
+    memories: Sequence[Dict[str, Any]],
+    score_field: str = "score",
+    default_score: float = 0.5
+) -> MemoryArrays:
+    """
+    Extract the scoring columns from memory dicts (one pass, no scoring math).
+    
+    Args:
+        memories: Memory dicts or Qdrant payloads
+        score_field: Field name containing semantic similarity score
+        default_score: Score used when the field is missing
+        
+    Returns:
+        MemoryArrays ready for batch_temporal_weights / batch_composite_scores
+    """
+    n = len(memories)
+    scores = np.empty(n, dtype=np.float64)
+    epochs = np.empty(n, dtype=np.float64)
+    type_codes = np.empty(n, dtype=np.int64)
+    source_codes = np.empty(n, dtype=np.int64)
+    meaningfulness = np.empty(n, dtype=np.float64)
+
+    for i, mem in enumerate(memories):
+        scores[i] = mem.get(score_field, default_score)
+        epochs[i] = _memory_epoch(mem)
+        type_codes[i] = MEMORY_TYPE_CODES.get(mem.get("type", "conversation"), 0)
+        source_type = mem.get("source_type") or mem.get("source") or mem.get("type") or "conversation"
+        source_codes[i] = SOURCE_TYPE_CODES.get(source_type, 0)
+        meaningfulness[i] = _memory_meaningfulness(mem)
+
+    return MemoryArrays(scores, epochs, type_codes, source_codes, meaningfulness)
+
+
+def batch_temporal_weights(
+    epochs: np.ndarray,
+    type_codes: np.ndarray,
+    meaningfulness: np.ndarray,
+    reference_time: Optional[datetime] = None
+) -> np.ndarray:
+    """
+    Vectorized calculate_temporal_weight.
+    
+    Args:
+        epochs: Creation times in Unix seconds (NaN = unknown, weight 1.0)
+        type_codes: MEMORY_TYPE_CODES per memory
+        meaningfulness: Meaningfulness per memory (1-5, centered at 3)
+        reference_time: Time to calculate age from (default: now)
+        
+    Returns:
+        Weights between 0.0 and 1.0
+    """
+    ref_time = reference_time or datetime.now(timezone.utc)
+    age_days = (ref_time.timestamp() - np.asarray(epochs, dtype=np.float64)) / _SECONDS_PER_DAY
+
+    adjusted_decay = _DECAY_TABLE[type_codes] + 0.01 * (np.asarray(meaningfulness, dtype=np.float64) - 3)
+    np.clip(adjusted_decay, 0.85, 0.99, out=adjusted_decay)
+
+    # NaN ages (no timestamp) and future timestamps count as fresh
+    fresh = ~(age_days > 0)
+    weights = np.power(adjusted_decay, np.where(fresh, 0.0, age_days))
+    weights[fresh] = 1.0
+    return np.clip(weights, 0.0, 1.0, out=weights)
+
+
+def batch_composite_scores(
+    arrays: MemoryArrays,
+    weights: Optional[Dict[str, float]] = None,
+    reference_time: Optional[datetime] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized calculate_composite_score.
+    
+    Returns:
+        (composite, temporal, source) arrays
+    """
+    w = weights or {
+        "semantic": 0.5,
+        "temporal": 0.3,
+        "source": 0.2,
+    }
+
+    temporal = batch_temporal_weights(arrays.epochs, arrays.type_codes, arrays.meaningfulness, reference_time)
+    source = _SOURCE_WEIGHT_TABLE[arrays.source_codes]
+
+    composite = (
+        arrays.scores * w.get("semantic", 0.5) +
+        temporal * w.get("temporal", 0.3) +
+        source * w.get("source", 0.2)
+    )
+    return np.clip(composite, 0.0, 1.0), temporal, source
+
+
+def temporal_weights_for(
+    memories: Sequence[Dict[str, Any]],
+    reference_time: Optional[datetime] = None
+) -> List[float]:
+    """calculate_temporal_weight for a list of memories/payloads in one pass."""
+    if not memories:
+        return []
+    arrays = encode_memories(memories)
+    return batch_temporal_weights(
+        arrays.epochs, arrays.type_codes, arrays.meaningfulness, reference_time
+    ).tolist()
+
+
+def rerank_memories_batch(
+    memories: list,
+    score_field: str = "score",
+    weights: Optional[Dict[str, float]] = None,
+    reference_time: Optional[datetime] = None
+) -> list:
+    """
+    Vectorized rerank_memories: same output fields and ordering, one NumPy pass.
+    
+    Args:
+        memories: List of memory dicts with semantic scores
+        score_field: Field name containing semantic similarity score
+        weights: Optional custom weights
+        reference_time: Time to calculate age from (default: now)
+        
+    Returns:
+        Memories sorted by composite score (descending)
+    """
+    if not memories:
+        return []
+
+    arrays = encode_memories(memories, score_field)
+    composite, temporal, source = batch_composite_scores(arrays, weights, reference_time)
+
+    # Stable descending sort, matching list.sort(reverse=True) on ties
+    order = np.argsort(-composite, kind="stable")
+    composite_list, temporal_list, source_list = composite.tolist(), temporal.tolist(), source.tolist()
+    return [
+        {
+            **memories[i],
+            "composite_score": composite_list[i],
+            "temporal_weight": temporal_list[i],
+            "source_weight": source_list[i],
+        }
+        for i in order.tolist()
+    ]
+
+
 # ============================================================================
 # Metrics Helpers
 # ============================================================================
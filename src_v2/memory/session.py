@@ -1,6 +1,9 @@
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta, timezone
 from loguru import logger
+import time
+from src_v2.config.settings import settings
+from src_v2.core.cache import cache_manager
 from src_v2.core.database import db_manager
 
 class SessionManager:
@@ -8,6 +11,12 @@ class SessionManager:
     Manages conversation sessions.
     A session is a continuous period of conversation.
     Sessions are closed after a period of inactivity (e.g., 30 minutes).
+
+    The active session per (user, character) is cached in Redis with its
+    last-activity time, so the per-message lookup is one GET and one SET.
+    The `updated_at` column is written at most once per
+    SESSION_ACTIVITY_PERSIST_SECONDS; readers that need exact staleness
+    (get_stale_sessions, the timeout path) merge in the cached time first.
     """
     
     SESSION_TIMEOUT_MINUTES = 30
@@ -15,6 +24,29 @@ class SessionManager:
     def __init__(self):
         logger.info("SessionManager initialized")
 
+    @staticmethod
+    def _session_cache_key(user_id: str, character_name: str) -> str:
+        return f"session:active:{character_name}:{user_id}"
+
+    @property
+    def _session_cache_ttl(self) -> int:
+        # Outlive the timeout so a stale session is still recognised (and processed) from the cache
+        return self.SESSION_TIMEOUT_MINUTES * 60 * 2
+
+    async def _cache_session(self, user_id: str, character_name: str, session_id: str, last_activity: float, persisted_at: float) -> None:
+        await cache_manager.set_json(
+            self._session_cache_key(user_id, character_name),
+            {"id": session_id, "last_activity": last_activity, "persisted_at": persisted_at},
+            ttl=self._session_cache_ttl
+        )
+
+    async def _touch_session(self, user_id: str, character_name: str, session_id: str, now: float, persisted_at: float) -> None:
+        """Records activity in the cache; writes updated_at only once the persist interval has passed."""
+        if now - persisted_at >= settings.SESSION_ACTIVITY_PERSIST_SECONDS:
+            await self.update_session_activity(session_id)
+            persisted_at = now
+        await self._cache_session(user_id, character_name, session_id, now, persisted_at)
+
     async def get_active_session(self, user_id: str, character_name: str) -> str:
         """
         Retrieves the active session ID for a user/character pair.
@@ -29,6 +61,24 @@ class SessionManager:
             return "00000000-0000-0000-0000-000000000000" # Dummy UUID
 
         try:
+            now_ts = time.time()
+            timeout_seconds = self.SESSION_TIMEOUT_MINUTES * 60
+
+            # 0. Cached active session (no Postgres round-trip on the common path)
+            cached = await cache_manager.get_json(self._session_cache_key(user_id, character_name))
+            if cached:
+                session_id = cached["id"]
+                if now_ts - cached["last_activity"] > timeout_seconds:
+                    logger.info(f"Session {session_id} timed out. Closing and creating new one.")
+                    if cached["persisted_at"] < cached["last_activity"]:
+                        # Message range for post-processing is bounded by updated_at
+                        await self._persist_session_activity({session_id: cached["last_activity"]})
+                    await self._process_stale_session(session_id, user_id, character_name)
+                    return await self.create_session(user_id, character_name)
+
+                await self._touch_session(user_id, character_name, session_id, now_ts, cached["persisted_at"])
+                return session_id
+
             async with db_manager.postgres_pool.acquire() as conn:
                 # 1. Find currently active session
                 row = await conn.fetchrow("""
@@ -54,8 +104,8 @@ class SessionManager:
                         await self._process_stale_session(session_id, user_id, character_name)
                         return await self.create_session(user_id, character_name)
                     else:
-                        # Update activity timestamp
-                        await self.update_session_activity(session_id)
+                        # Update activity timestamp and cache the session
+                        await self._touch_session(user_id, character_name, session_id, now_ts, persisted_at=0)
                         return session_id
                 else:
                     # No active session, create new
@@ -86,6 +136,8 @@ class SessionManager:
                 """, user_id, character_name)
                 
                 logger.info(f"Created new session {session_id} for {user_id} with {character_name}")
+                now = time.time()
+                await self._cache_session(user_id, character_name, str(session_id), now, now)
                 return str(session_id)
         except Exception as e:
             logger.error(f"Failed to create session: {e}")
@@ -100,12 +152,20 @@ class SessionManager:
             async with db_manager.postgres_pool.acquire() as conn:
                 # Ensure session_id is a string (asyncpg expects str for UUID columns)
                 session_id_str = str(session_id)
-                await conn.execute("""
+                row = await conn.fetchrow("""
                     UPDATE v2_conversation_sessions
                     SET is_active = FALSE, end_time = NOW()
                     WHERE id = $1
+                    RETURNING user_id, character_name
                 """, session_id_str)
                 logger.debug(f"Closed session {session_id}")
+
+            if row:
+                # Drop the cached entry unless it already points at a newer session
+                key = self._session_cache_key(row['user_id'], row['character_name'])
+                cached = await cache_manager.get_json(key)
+                if cached and cached.get("id") == session_id_str:
+                    await cache_manager.delete(key)
         except Exception as e:
             logger.error(f"Failed to close session: {e}")
 
@@ -169,6 +229,25 @@ class SessionManager:
         except Exception as e:
             logger.error(f"Failed to update session activity: {e}")
 
+    async def _persist_session_activity(self, activity: Dict[str, float]) -> None:
+        """Writes cached last-activity times (session_id -> epoch seconds) to updated_at in one statement."""
+        if not db_manager.postgres_pool or not activity:
+            return
+
+        try:
+            async with db_manager.postgres_pool.acquire() as conn:
+                await conn.execute("""
+                    UPDATE v2_conversation_sessions AS s
+                    SET updated_at = GREATEST(s.updated_at, v.ts)
+                    FROM unnest($1::text[], $2::timestamptz[]) AS v(id, ts)
+                    WHERE s.id = v.id
+                """,
+                    list(activity.keys()),
+                    [datetime.fromtimestamp(ts, tz=timezone.utc) for ts in activity.values()]
+                )
+        except Exception as e:
+            logger.error(f"Failed to persist session activity: {e}")
+
     async def get_session_start_time(self, session_id: str) -> Optional[datetime]:
         """Retrieves the start time of a session."""
         if not db_manager.postgres_pool:
@@ -190,6 +269,10 @@ class SessionManager:
     async def get_stale_sessions(self, timeout_minutes: int = 30) -> List[Dict[str, Any]]:
         """
         Finds active sessions that have been inactive for longer than timeout_minutes.
+
+        updated_at can lag behind the cached last activity by up to
+        SESSION_ACTIVITY_PERSIST_SECONDS, so candidates are checked against the
+        cache and any newer activity is written back before deciding.
         """
         if not db_manager.postgres_pool:
             return []
@@ -205,8 +288,31 @@ class SessionManager:
                     FROM v2_conversation_sessions 
                     WHERE is_active = TRUE AND updated_at < $1
                 """, cutoff)
-                
-                return [dict(row) for row in rows]
+
+            sessions = [dict(row) for row in rows]
+            if not sessions:
+                return []
+
+            cached = await cache_manager.get_json_many([
+                self._session_cache_key(s['user_id'], s['character_name']) for s in sessions
+            ])
+            stale = []
+            newer_activity: Dict[str, float] = {}
+            for session, entry in zip(sessions, cached):
+                if entry and entry.get("id") == str(session['id']):
+                    last_activity = datetime.fromtimestamp(entry["last_activity"], tz=timezone.utc)
+                    updated_at = session['updated_at']
+                    if updated_at.tzinfo is None:
+                        updated_at = updated_at.replace(tzinfo=timezone.utc)
+                    if last_activity > updated_at:
+                        newer_activity[str(session['id'])] = entry["last_activity"]
+                        session['updated_at'] = last_activity
+                    if last_activity >= cutoff:
+                        continue
+                stale.append(session)
+
+            await self._persist_session_activity(newer_activity)
+            return stale
         except Exception as e:
             logger.error(f"Failed to get stale sessions: {e}")
             return []
@@ -1,18 +1,49 @@
 from typing import List, Dict, Any, Optional
+import asyncio
 import uuid
 from datetime import datetime, timezone, timedelta
 from loguru import logger
-from qdrant_client.models import PointStruct, Filter, FieldCondition, MatchValue, MatchAny, Range
+from qdrant_client.models import PointStruct, Filter, FieldCondition, MatchValue, MatchAny, Range, OrderBy, Direction, PayloadSchemaType
 
 from src_v2.core.database import db_manager
 from src_v2.memory.embeddings import EmbeddingService
+from src_v2.memory.manager import MemoryManager, memory_manager
 from src_v2.config.settings import settings
+from src_v2.utils.time_utils import to_epoch_seconds
+
+# Payload indexes created on the shared collection. Gossip retrieval filters on
+# the keyword fields and orders by timestamp_epoch (integer Unix seconds, the
+# same field memory collections use), which Qdrant needs a range index for.
+SHARED_PAYLOAD_INDEXES = {
+    "timestamp_epoch": PayloadSchemaType.INTEGER,
+    "type": PayloadSchemaType.KEYWORD,
+    "eligible_recipients": PayloadSchemaType.KEYWORD,
+    "source_bot": PayloadSchemaType.KEYWORD,
+}
+
 
 class SharedArtifactManager:
     COLLECTION_NAME = "whisperengine_shared_artifacts"
     
     def __init__(self):
         self.embedding_service = EmbeddingService()
+        self._indexes_ensured = False
+
+    async def ensure_payload_indexes(self) -> None:
+        """Creates SHARED_PAYLOAD_INDEXES on the shared collection (idempotent, once per process)."""
+        if self._indexes_ensured or not db_manager.qdrant_client:
+            return
+        try:
+            for field_name, schema in SHARED_PAYLOAD_INDEXES.items():
+                await db_manager.qdrant_client.create_payload_index(
+                    collection_name=self.COLLECTION_NAME,
+                    field_name=field_name,
+                    field_schema=schema
+                )
+            self._indexes_ensured = True
+            logger.debug(f"Payload indexes ensured for {self.COLLECTION_NAME}")
+        except Exception as e:
+            logger.warning(f"Failed to create payload indexes for {self.COLLECTION_NAME}: {e}")
 
     async def store_artifact(
         self,
@@ -31,6 +62,7 @@ class SharedArtifactManager:
         try:
             embedding = await self.embedding_service.embed_query_async(content)
             point_id = str(uuid.uuid4())
+            now = datetime.now(timezone.utc)
             
             payload = {
                 "type": artifact_type,
@@ -38,7 +70,8 @@ class SharedArtifactManager:
                 "source_bot": source_bot,
                 "user_id": user_id,
                 "confidence": confidence,
-                "created_at": datetime.now(timezone.utc).isoformat(),
+                "created_at": now.isoformat(),
+                "timestamp_epoch": to_epoch_seconds(now),
                 # ADR-014: Author tracking - shared artifacts are bot-authored
                 "author_id": source_bot,
                 "author_is_bot": True,
@@ -126,7 +159,7 @@ class SharedArtifactManager:
             logger.error(f"Failed to discover shared artifacts: {e}")
             return []
 
-    async def get_gossip_for_bot(self, bot_name: str, hours: int) -> List[Dict[str, Any]]:
+    async def get_gossip_for_bot(self, bot_name: str, hours: int, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Get gossip relevant to a specific bot from both shared and private sources.
         
@@ -138,89 +171,107 @@ class SharedArtifactManager:
            
         2. Cross-Bot Chat (Per-Bot Collection):
            - Must be type="gossip" AND is_cross_bot=True
+        
+        Both sources are queried concurrently. Qdrant applies the time window
+        (a Range on timestamp_epoch) and returns the newest points first, so
+        each source yields its `limit` most recent items within the window.
+        Points written before timestamp_epoch existed need
+        scripts/backfill_timestamp_epoch.py.
            
         Args:
             bot_name: The bot requesting gossip
             hours: Look back window in hours
+            limit: Maximum items per source
             
         Returns:
-            List of gossip items
+            List of gossip items, universe gossip first, each source newest first
         """
-        gossip = []
-        threshold = datetime.now(timezone.utc) - timedelta(hours=hours)
-        threshold_iso = threshold.isoformat()
-        
         if not db_manager.qdrant_client:
             return []
-            
-        # 1. Query Shared Artifacts (Universe Gossip)
+        
+        shared, crossbot = await asyncio.gather(
+            self._get_universe_gossip(bot_name, hours, limit),
+            self._get_crossbot_gossip(bot_name, hours, limit)
+        )
+        return shared + crossbot
+
+    async def _get_universe_gossip(self, bot_name: str, hours: int, limit: int) -> List[Dict[str, Any]]:
+        """Gossip other bots shared with this one, from the shared collection."""
         try:
-            shared_results = await db_manager.qdrant_client.scroll(
+            await self.ensure_payload_indexes()
+            threshold = to_epoch_seconds(datetime.now(timezone.utc) - timedelta(hours=hours))
+            
+            points, _ = await db_manager.qdrant_client.scroll(
                 collection_name=self.COLLECTION_NAME,
                 scroll_filter=Filter(
                     must=[
                         FieldCondition(key="type", match=MatchValue(value="gossip")),
                         # PRIVACY CHECK: Only show if this bot was eligible to receive it
-                        FieldCondition(key="eligible_recipients", match=MatchValue(value=bot_name))
+                        FieldCondition(key="eligible_recipients", match=MatchValue(value=bot_name)),
+                        FieldCondition(key="timestamp_epoch", range=Range(gte=threshold))
                     ],
                     must_not=[
                         # Don't show own gossip
                         FieldCondition(key="source_bot", match=MatchValue(value=bot_name))
                     ]
                 ),
-                limit=10,
+                order_by=OrderBy(key="timestamp_epoch", direction=Direction.DESC),
+                limit=limit,
                 with_payload=True,
                 with_vectors=False
             )
             
-            for point in shared_results[0]:
-                if point.payload:
-                    ts = point.payload.get("created_at", "")
-                    if ts >= threshold_iso:
-                        gossip.append({
-                            "source_bot": point.payload.get("source_bot", "another character"),
-                            "content": point.payload.get("content", ""),
-                            "topic": point.payload.get("topic", ""),
-                            "is_cross_bot": False,
-                            "source": "universe"
-                        })
+            return [
+                {
+                    "source_bot": point.payload.get("source_bot", "another character"),
+                    "content": point.payload.get("content", ""),
+                    "topic": point.payload.get("topic", ""),
+                    "is_cross_bot": False,
+                    "source": "universe"
+                }
+                for point in points if point.payload
+            ]
         except Exception as e:
             logger.warning(f"Failed to fetch shared gossip for {bot_name}: {e}")
+            return []
 
-        # 2. Query Per-Bot Collection (Cross-Bot Chat)
+    async def _get_crossbot_gossip(self, bot_name: str, hours: int, limit: int) -> List[Dict[str, Any]]:
+        """Gossip heard directly in cross-bot chats, from the bot's own memory collection."""
         try:
             # Per-bot collection name convention
             bot_collection = f"whisperengine_memory_{bot_name}"
+            await memory_manager._ensure_payload_indexes(bot_collection)
             
-            crossbot_results = await db_manager.qdrant_client.scroll(
+            points, _ = await db_manager.qdrant_client.scroll(
                 collection_name=bot_collection,
                 scroll_filter=Filter(
                     must=[
                         FieldCondition(key="type", match=MatchValue(value="gossip")),
-                        FieldCondition(key="is_cross_bot", match=MatchValue(value=True))
+                        FieldCondition(key="is_cross_bot", match=MatchValue(value=True)),
+                        # Memory writers stamp naive timestamps; use their clock
+                        MemoryManager._since_hours_condition(hours)
                     ]
                 ),
-                limit=10,
+                order_by=OrderBy(key="timestamp_epoch", direction=Direction.DESC),
+                limit=limit,
                 with_payload=True,
                 with_vectors=False
             )
             
-            for point in crossbot_results[0]:
-                if point.payload:
-                    ts = point.payload.get("timestamp", "")
-                    if ts >= threshold_iso:
-                        gossip.append({
-                            "source_bot": point.payload.get("source_bot", "another character"),
-                            "content": point.payload.get("content", ""),
-                            "topic": point.payload.get("topic", ""),
-                            "is_cross_bot": True,
-                            "source": "direct_chat"
-                        })
+            return [
+                {
+                    "source_bot": point.payload.get("source_bot", "another character"),
+                    "content": point.payload.get("content", ""),
+                    "topic": point.payload.get("topic", ""),
+                    "is_cross_bot": True,
+                    "source": "direct_chat"
+                }
+                for point in points if point.payload
+            ]
         except Exception as e:
             # It's okay if collection doesn't exist yet
             logger.debug(f"Failed to fetch cross-bot gossip for {bot_name}: {e}")
-            
-        return gossip
+            return []
 
 # Global singleton
 shared_artifact_manager = SharedArtifactManager()
@@ -72,6 +72,7 @@ class GenerateImageTool(BaseTool):
         raise NotImplementedError("Use _arun instead")
 
     async def _arun(self, prompt: str, image_type: str = "other", aspect_ratio: str = "portrait") -> str:
+        reserved = False
         try:
             # 0. Trust Gate - Check if user has sufficient trust level
             min_trust = settings.IMAGE_GEN_MIN_TRUST
@@ -82,9 +83,9 @@ class GenerateImageTool(BaseTool):
                     logger.info(f"Image generation blocked for user {self.user_id}: trust {current_trust} < {min_trust}")
                     return f"I'd love to create images for you, but we need to get to know each other a bit better first! (Trust: {current_trust}/{min_trust})"
             
-            # 0.5 Quota Check
-            has_quota = await quota_manager.check_quota(self.user_id, 'image')
-            if not has_quota:
+            # 0.5 Quota Check (takes the unit now so concurrent requests can't overshoot)
+            reserved = await quota_manager.reserve(self.user_id, 'image', self.character_name)
+            if not reserved:
                 logger.info(f"Image generation blocked for user {self.user_id}: Daily quota exceeded")
                 return f"You've reached your daily image generation limit ({settings.DAILY_IMAGE_QUOTA}). Please try again tomorrow!"
 
@@ -187,6 +188,8 @@ class GenerateImageTool(BaseTool):
             )
             
             if not image_result:
+                reserved = False
+                await quota_manager.release(self.user_id, 'image', self.character_name)
                 return "Failed to generate image. Please try again."
                 
             # 5. Save Session
@@ -207,11 +210,10 @@ class GenerateImageTool(BaseTool):
                 url=image_result.url
             )
             
-            # 7. Increment Quota
-            await quota_manager.increment_usage(self.user_id, 'image')
-            
             return f"I've created that image for you! It's attached below."
                 
         except Exception as e:
             logger.error(f"Error in GenerateImageTool: {e}")
+            if reserved:
+                await quota_manager.release(self.user_id, 'image', self.character_name)
             return f"Error generating image: {e}"
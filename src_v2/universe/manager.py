@@ -1,8 +1,11 @@
+import asyncio
 from typing import Optional, List
 from datetime import datetime
 from loguru import logger
+from src_v2.config.settings import settings
 from src_v2.core.database import db_manager, retry_db_operation, require_db
 from src_v2.core.cache import CacheManager
+from src_v2.universe.observations import ObservationBuffer
 
 
 class UniverseManager:
@@ -19,6 +22,9 @@ class UniverseManager:
     def __init__(self):
         self._embedding_service = None
         self._cache = CacheManager()
+        self._observations = ObservationBuffer()
+        self._observation_flush_task: Optional[asyncio.Task] = None
+        self._observation_stats = {"observed": 0, "flushed": 0, "dropped": 0, "batches": 0}
         
     @property
     def embedding_service(self):
@@ -164,6 +170,10 @@ class UniverseManager:
         - Updates user last_seen timestamps
         - Tracks message hour for peak activity learning
         
+        Observations are aggregated in memory and written by flush_observations
+        every UNIVERSE_OBSERVATION_FLUSH_SECONDS, or as soon as the buffer holds
+        UNIVERSE_OBSERVATION_MAX_KEYS distinct counters.
+        
         Args:
             guild_id: Discord server ID
             channel_id: Channel ID where message was sent
@@ -178,65 +188,30 @@ class UniverseManager:
             return
             
         try:
-            # Run observations in parallel (non-blocking)
-            import asyncio
-            await asyncio.gather(
-                self._update_user_activity(user_id, guild_id, channel_id, user_display_name),
-                self._extract_and_link_topics(guild_id, message_content),
-                self._record_user_interactions(user_id, mentioned_user_ids, reply_to_user_id, guild_id),
-                self._track_activity_hour(guild_id),
-                return_exceptions=True  # Don't fail on individual errors
-            )
-        except Exception as e:
-            # Log but don't raise - observation is non-critical
-            logger.debug(f"Universe observation error (non-fatal): {e}")
+            # Combine mentions and reply target, minus self-interactions
+            interacted_with = {str(uid) for uid in mentioned_user_ids}
+            if reply_to_user_id:
+                interacted_with.add(str(reply_to_user_id))
+            interacted_with.discard(str(user_id))
 
-    @retry_db_operation()
-    @require_db("neo4j")
-    async def _update_user_activity(
-        self, 
-        user_id: str, 
-        guild_id: str, 
-        channel_id: str,
-        display_name: Optional[str] = None
-    ) -> None:
-        """Update user's last seen timestamp and activity on planet/channel."""
-        query = """
-        MERGE (u:User {id: $user_id})
-        SET u.last_seen_at = datetime()
-        """
-        
-        if display_name:
-            query += "SET u.display_name = $display_name "
-            
-        query += """
-        WITH u
-        MATCH (p:Planet {id: $guild_id})
-        MERGE (u)-[r:ON_PLANET]->(p)
-        SET r.last_seen = datetime(), r.message_count = COALESCE(r.message_count, 0) + 1
-        WITH u, p
-        MATCH (c:Channel {id: $channel_id})
-        MERGE (u)-[a:ACTIVE_IN]->(c)
-        SET a.last_seen = datetime(), a.message_count = COALESCE(a.message_count, 0) + 1
-        """
-        async with db_manager.neo4j_driver.session() as session:
-            await session.run(
-                query, 
-                user_id=str(user_id), 
-                guild_id=str(guild_id), 
+            self._observations.add(
+                guild_id=str(guild_id),
                 channel_id=str(channel_id),
-                display_name=display_name
+                user_id=str(user_id),
+                topics=self._extract_topics(message_content),
+                targets=sorted(interacted_with),
+                hour=datetime.now().hour,
+                display_name=user_display_name,
             )
+            self._observation_stats["observed"] += 1
 
-    async def _extract_and_link_topics(self, guild_id: str, message_content: str) -> None:
-        """Extract topics from message and link them to the planet."""
-        # Extract meaningful topics (simple keyword extraction)
-        topics = self._extract_topics(message_content)
-        if not topics:
-            return
-            
-        # Link topics to planet
-        await self._link_topics_to_planet(guild_id, topics)
+            if self._observations.size >= settings.UNIVERSE_OBSERVATION_MAX_KEYS:
+                await self.flush_observations()
+            elif self._observation_flush_task is None or self._observation_flush_task.done():
+                self._observation_flush_task = asyncio.create_task(self._flush_observations_later())
+        except Exception as e:
+            # Log but don't raise - observation is non-critical
+            logger.debug(f"Universe observation error (non-fatal): {e}")
 
     def _extract_topics(self, message_content: str) -> List[str]:
         """
@@ -294,80 +269,102 @@ class UniverseManager:
                     
         return unique_topics
 
-    @retry_db_operation()
-    @require_db("neo4j")
-    async def _link_topics_to_planet(self, guild_id: str, topics: List[str]) -> None:
-        """Create or update Topic nodes and link them to the planet."""
-        if not topics: return
-        
-        query = """
-        MATCH (p:Planet {id: $guild_id})
-        UNWIND $topics as topic_name
-        MERGE (t:Topic {name: topic_name})
-        ON CREATE SET t.mention_count = 1, t.first_seen = datetime()
-        ON MATCH SET t.mention_count = t.mention_count + 1
-        MERGE (p)-[r:HAS_TOPIC]->(t)
-        ON CREATE SET r.count = 1, r.first_seen = datetime()
-        ON MATCH SET r.count = r.count + 1
-        SET r.last_seen = datetime()
+    async def _flush_observations_later(self) -> None:
+        await asyncio.sleep(settings.UNIVERSE_OBSERVATION_FLUSH_SECONDS)
+        # Cleared first so observations made during the flush schedule the next one
+        self._observation_flush_task = None
+        await self.flush_observations()
+
+    async def flush_observations(self) -> int:
         """
-        async with db_manager.neo4j_driver.session() as session:
-            await session.run(query, guild_id=str(guild_id), topics=topics)
+        Writes buffered observations to the graph in one transaction and the
+        hour counters to Redis in one pipeline per planet. Returns the number
+        of messages flushed. A batch that still fails after retries is dropped
+        (and counted) so the buffer stays bounded while Neo4j is down.
+        """
+        batch, self._observations = self._observations, ObservationBuffer()
+        if not batch:
+            return 0
+
+        try:
+            await self._write_observations(batch)
+            self._observation_stats["flushed"] += batch.messages
+            self._observation_stats["batches"] += 1
+        except Exception as e:
+            self._observation_stats["dropped"] += batch.messages
+            logger.warning(f"Dropped {batch.messages} universe observations: {e}")
+
+        for guild_id, hours in batch.hour_counts().items():
+            # Expire after 30 days without activity (recalculate monthly)
+            await self._cache.hincrby_many(
+                f"universe:planet:{guild_id}:activity_hours", hours, ttl=60 * 60 * 24 * 30
+            )
+        return batch.messages
+
+    async def stop(self) -> None:
+        """Cancels the scheduled flush and writes buffered observations now."""
+        task, self._observation_flush_task = self._observation_flush_task, None
+        if task is not None and not task.done():
+            task.cancel()
+        await self.flush_observations()
+
+    def get_observation_stats(self) -> dict:
+        return {**self._observation_stats, "pending": self._observations.messages,
+                "pending_keys": self._observations.size}
 
     @retry_db_operation()
     @require_db("neo4j")
-    async def _record_user_interactions(
-        self, 
-        author_id: str, 
-        mentioned_user_ids: List[str], 
-        reply_to_user_id: Optional[str],
-        guild_id: str
-    ) -> None:
-        """Record user-to-user interactions (mentions and replies)."""
-        # Combine mentions and reply target
-        interacted_with = set(mentioned_user_ids)
-        if reply_to_user_id:
-            interacted_with.add(reply_to_user_id)
-        
-        # Remove self-interactions
-        interacted_with.discard(author_id)
-        
-        if not interacted_with:
-            return
-            
-        query = """
-        MATCH (author:User {id: $author_id})
-        MATCH (p:Planet {id: $guild_id})
-        UNWIND $target_ids as target_id
-        MATCH (target:User {id: target_id})
-        MERGE (author)-[r:INTERACTS_WITH]->(target)
-        ON CREATE SET r.count = 1, r.first_seen = datetime(), r.planets = [$guild_id]
-        ON MATCH SET r.count = r.count + 1, r.last_seen = datetime(),
-                     r.planets = CASE WHEN $guild_id IN r.planets THEN r.planets ELSE r.planets + $guild_id END
-        """
+    async def _write_observations(self, batch: ObservationBuffer) -> None:
         async with db_manager.neo4j_driver.session() as session:
-            await session.run(
-                query, 
-                author_id=str(author_id), 
-                target_ids=[str(uid) for uid in interacted_with],
-                guild_id=str(guild_id)
+            await session.execute_write(
+                self._write_observations_tx,
+                batch.activity_rows(),
+                batch.topic_rows(),
+                batch.interaction_rows(),
             )
 
-    @retry_db_operation()
-    @require_db("redis")
-    async def _track_activity_hour(self, guild_id: str) -> None:
-        """Track the current hour for peak activity learning."""
-        # Use Redis to track hourly activity counts
-        current_hour = datetime.now().hour
-        key = f"universe:planet:{guild_id}:activity_hours"
-        
-        try:
-            # Increment the count for this hour
-            await self._cache.hincrby(key, str(current_hour), 1)
-            # Set expiry to 30 days (recalculate monthly)
-            await self._cache.expire(key, 60 * 60 * 24 * 30)
-        except Exception as e:
-            logger.debug(f"Failed to track activity hour: {e}")
+    @staticmethod
+    async def _write_observations_tx(tx, activity: List[dict], topics: List[dict], interactions: List[dict]) -> None:
+        # Users first, so interactions below can match authors seen in this batch
+        await tx.run("""
+        UNWIND $rows AS row
+        MERGE (u:User {id: row.user_id})
+        SET u.last_seen_at = datetime(),
+            u.display_name = COALESCE(row.display_name, u.display_name)
+        WITH u, row
+        MATCH (p:Planet {id: row.guild_id})
+        MERGE (u)-[r:ON_PLANET]->(p)
+        SET r.last_seen = datetime(), r.message_count = COALESCE(r.message_count, 0) + row.count
+        WITH u, row
+        MATCH (c:Channel {id: row.channel_id})
+        MERGE (u)-[a:ACTIVE_IN]->(c)
+        SET a.last_seen = datetime(), a.message_count = COALESCE(a.message_count, 0) + row.count
+        """, rows=activity)
+
+        if topics:
+            await tx.run("""
+            UNWIND $rows AS row
+            MATCH (p:Planet {id: row.guild_id})
+            MERGE (t:Topic {name: row.topic})
+            ON CREATE SET t.mention_count = row.count, t.first_seen = datetime()
+            ON MATCH SET t.mention_count = t.mention_count + row.count
+            MERGE (p)-[r:HAS_TOPIC]->(t)
+            ON CREATE SET r.count = row.count, r.first_seen = datetime()
+            ON MATCH SET r.count = r.count + row.count
+            SET r.last_seen = datetime()
+            """, rows=topics)
+
+        if interactions:
+            await tx.run("""
+            UNWIND $rows AS row
+            MATCH (author:User {id: row.author_id})
+            MATCH (p:Planet {id: row.guild_id})
+            MATCH (target:User {id: row.target_id})
+            MERGE (author)-[r:INTERACTS_WITH]->(target)
+            ON CREATE SET r.count = row.count, r.first_seen = datetime(), r.planets = [row.guild_id]
+            ON MATCH SET r.count = r.count + row.count, r.last_seen = datetime(),
+                         r.planets = CASE WHEN row.guild_id IN r.planets THEN r.planets ELSE r.planets + row.guild_id END
+            """, rows=interactions)
 
     @require_db("redis", default_return=[])
     async def get_planet_peak_hours(self, guild_id: str) -> List[int]:
@@ -0,0 +1,75 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass
+class ObservationBuffer:
+    """
+    In-memory aggregate of universe observations between graph flushes.
+
+    Each observed message bumps counters keyed by (user, planet, channel),
+    (planet, topic), (author, target, planet) and (planet, hour), so a busy
+    channel costs one row per distinct key per flush instead of one set of
+    graph writes per message.
+    """
+    activity: Dict[Tuple[str, str, str], int] = field(default_factory=lambda: defaultdict(int))
+    display_names: Dict[str, str] = field(default_factory=dict)
+    topics: Dict[Tuple[str, str], int] = field(default_factory=lambda: defaultdict(int))
+    interactions: Dict[Tuple[str, str, str], int] = field(default_factory=lambda: defaultdict(int))
+    hours: Dict[Tuple[str, int], int] = field(default_factory=lambda: defaultdict(int))
+    messages: int = 0
+
+    def add(
+        self,
+        guild_id: str,
+        channel_id: str,
+        user_id: str,
+        topics: List[str],
+        targets: List[str],
+        hour: int,
+        display_name: Optional[str] = None,
+    ) -> None:
+        self.messages += 1
+        self.activity[(user_id, guild_id, channel_id)] += 1
+        if display_name:
+            self.display_names[user_id] = display_name
+        for topic in topics:
+            self.topics[(guild_id, topic)] += 1
+        for target_id in targets:
+            self.interactions[(user_id, target_id, guild_id)] += 1
+        self.hours[(guild_id, hour)] += 1
+
+    @property
+    def size(self) -> int:
+        """Number of distinct counter keys held (what bounds memory use)."""
+        return len(self.activity) + len(self.topics) + len(self.interactions) + len(self.hours)
+
+    def __bool__(self) -> bool:
+        return self.messages > 0
+
+    def activity_rows(self) -> List[dict]:
+        return [
+            {"user_id": user_id, "guild_id": guild_id, "channel_id": channel_id,
+             "display_name": self.display_names.get(user_id), "count": count}
+            for (user_id, guild_id, channel_id), count in self.activity.items()
+        ]
+
+    def topic_rows(self) -> List[dict]:
+        return [
+            {"guild_id": guild_id, "topic": topic, "count": count}
+            for (guild_id, topic), count in self.topics.items()
+        ]
+
+    def interaction_rows(self) -> List[dict]:
+        return [
+            {"author_id": author_id, "target_id": target_id, "guild_id": guild_id, "count": count}
+            for (author_id, target_id, guild_id), count in self.interactions.items()
+        ]
+
+    def hour_counts(self) -> Dict[str, Dict[str, int]]:
+        """Hour counts grouped by planet, as hash field increments."""
+        by_planet: Dict[str, Dict[str, int]] = defaultdict(dict)
+        for (guild_id, hour), count in self.hours.items():
+            by_planet[guild_id][str(hour)] = count
+        return by_planet
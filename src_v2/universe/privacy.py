@@ -1,14 +1,28 @@
 from typing import Dict, Any, Optional
 from loguru import logger
+from src_v2.core.cache import cache_manager
 from src_v2.core.database import db_manager, retry_db_operation
+from src_v2.config.settings import settings
 
 class PrivacyManager:
     """
     Manages user privacy settings for the Emergent Universe.
     Controls what data is shared across bots and planets.
+
+    Settings are read on the message path (knowledge queries, universe context,
+    gossip), so they are cached (L1 + Redis) for PRIVACY_CACHE_TTL_SECONDS.
+    update_settings() replaces the cached copy and peers drop their L1 copy
+    via the cache invalidation channel; invalidate() drops it outright.
     """
-    
-    @retry_db_operation()
+
+    def __init__(self):
+        # invalidate() deletes without l1=True; peers must still drop their L1 copy
+        cache_manager.register_l1_prefix("privacy:")
+
+    @staticmethod
+    def _cache_key(user_id: str) -> str:
+        return f"privacy:{user_id}"
+
     async def get_settings(self, user_id: str) -> Dict[str, Any]:
         """
         Get privacy settings for a user. Returns defaults if not found.
@@ -17,6 +31,20 @@ class PrivacyManager:
             logger.warning("PostgreSQL not available. Returning default privacy settings.")
             return self._get_defaults()
 
+        settings_data = await cache_manager.get_or_load(
+            self._cache_key(str(user_id)),
+            lambda: self._load_settings(user_id),
+            ttl=settings.PRIVACY_CACHE_TTL_SECONDS
+        )
+        # Callers may mutate the result; never hand out the L1 copy
+        return dict(settings_data)
+
+    async def invalidate(self, user_id: str) -> None:
+        """Drops the cached settings for a user (e.g. after an out-of-band update)."""
+        await cache_manager.delete(self._cache_key(str(user_id)))
+
+    @retry_db_operation()
+    async def _load_settings(self, user_id: str) -> Dict[str, Any]:
         query = """
             SELECT share_with_other_bots, share_across_planets, allow_bot_introductions, invisible_mode
             FROM v2_user_privacy_settings
@@ -63,7 +91,13 @@ class PrivacyManager:
             row = await conn.fetchrow(query, str(user_id), *updates.values())
             if row:
                 logger.info(f"Updated privacy settings for user {user_id}: {updates}")
-                return dict(row)
+                new_settings = dict(row)
+                await cache_manager.set_json(
+                    self._cache_key(str(user_id)), new_settings,
+                    ttl=settings.PRIVACY_CACHE_TTL_SECONDS, l1=True
+                )
+                return new_settings
+            await self.invalidate(user_id)
             raise RuntimeError(f"Failed to update settings for user {user_id}")
 
     async def _create_default_settings(self, user_id: str) -> Dict[str, Any]:
@@ -80,7 +114,7 @@ class PrivacyManager:
             if row:
                 return dict(row)
             # If insert failed (race condition), fetch again
-            return await self.get_settings(user_id)
+            return await self._load_settings(user_id)
 
     def _get_defaults(self) -> Dict[str, Any]:
         return {
@@ -58,8 +58,8 @@ class BotRegistry:
         try:
             bots = {}
             pattern = f"{self.redis_prefix}*"
-            # keys() can be slow in massive DBs but fine for <100 bots
-            keys = await db_manager.redis_client.keys(pattern)
+            # SCAN rather than KEYS so a large keyspace never blocks Redis
+            keys = [key async for key in db_manager.redis_client.scan_iter(match=pattern, count=500)]
             
             if not keys:
                 return {}
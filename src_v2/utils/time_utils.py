@@ -1,6 +1,6 @@
 """Utility functions for time and date formatting."""
 import datetime
-from typing import Union
+from typing import Optional, Union
 from zoneinfo import ZoneInfo
 from loguru import logger
 from src_v2.config.settings import settings
@@ -40,6 +40,32 @@ def get_formatted_timestamp(dt: datetime.datetime = None, format_str: str = "%I:
     return local_dt.strftime(format_str)
 
 
+def to_epoch_seconds(timestamp: Union[str, datetime.datetime, None]) -> Optional[int]:
+    """
+    Converts an ISO string or datetime into integer Unix seconds.
+    
+    Naive values are read as local time, the clock memory writers stamp them with
+    (datetime.now()), so this equals dt.timestamp() for every input.
+    Used for the numeric `timestamp_epoch` payload field that Qdrant can range-filter and order by.
+    
+    Returns:
+        Epoch seconds, or None if the value is missing or unparseable
+    """
+    if not timestamp:
+        return None
+    if isinstance(timestamp, str):
+        try:
+            dt = datetime.datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    elif isinstance(timestamp, datetime.datetime):
+        dt = timestamp
+    else:
+        return None
+    
+    return int(dt.timestamp())
+
+
 def get_relative_time(timestamp: Union[str, datetime.datetime]) -> str:
     """
     Converts an absolute timestamp into a human-readable relative time string.
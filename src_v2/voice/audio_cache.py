@@ -0,0 +1,141 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+
+def normalize_text(text: str) -> str:
+    """NFC-normalized text with whitespace collapsed (the cache identity of a phrase)."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class AudioCache:
+    """
+    Content-addressed on-disk cache of synthesized speech.
+
+    Clips are stored as <root>/<ab>/<sha256>.mp3, keyed by (voice_id, model_id,
+    normalized text), so a character's greetings and catch-phrases are only
+    synthesized once. Total size is capped at `max_bytes`; the least recently
+    used clips (by file mtime, refreshed on every hit) are evicted first.
+    Only texts up to `max_text_chars` are cached - long replies rarely repeat.
+    """
+
+    def __init__(self, root: str, max_bytes: int, max_text_chars: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_text_chars = max_text_chars
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._index: "OrderedDict[str, int]" = OrderedDict()  # key -> size, oldest first
+        self._total_bytes = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(voice_id: str, model_id: str, text: str) -> str:
+        identity = "\x1f".join((voice_id, model_id, normalize_text(text)))
+        return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+    def cacheable(self, text: str) -> bool:
+        return self.max_bytes > 0 and 0 < len(normalize_text(text)) <= self.max_text_chars
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.mp3"
+
+    def _load_index(self) -> None:
+        """Rebuilds the LRU order from disk once per process (files survive restarts)."""
+        if self._loaded:
+            return
+        self._loaded = True
+        entries = []
+        if self.root.exists():
+            for path in self.root.glob("*/*.mp3"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._total_bytes > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            self.stats["evictions"] += 1
+            try:
+                self._path(key).unlink()
+            except FileNotFoundError:
+                pass
+
+    def _drop(self, key: str) -> None:
+        size = self._index.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _read(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            self._load_index()
+            if key not in self._index:
+                self.stats["misses"] += 1
+                return None
+            path = self._path(key)
+            try:
+                data = path.read_bytes()
+                os.utime(path)
+            except FileNotFoundError:
+                # Evicted by another process sharing the directory
+                self._drop(key)
+                self.stats["misses"] += 1
+                return None
+            self._index.move_to_end(key)
+            self.stats["hits"] += 1
+            return data
+
+    def _write(self, key: str, data: bytes) -> None:
+        with self._lock:
+            self._load_index()
+            path = self._path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename so readers never see a partial clip
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_name, path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+            self._drop(key)
+            self._index[key] = len(data)
+            self._total_bytes += len(data)
+            self.stats["stores"] += 1
+            self._evict()
+
+    async def get(self, voice_id: str, model_id: str, text: str) -> Optional[bytes]:
+        if not self.cacheable(text):
+            return None
+        try:
+            return await asyncio.to_thread(self._read, self.key(voice_id, model_id, text))
+        except OSError as e:
+            logger.warning(f"Audio cache read failed: {e}")
+            return None
+
+    async def put(self, voice_id: str, model_id: str, text: str, data: bytes) -> None:
+        if not data or not self.cacheable(text) or len(data) > self.max_bytes:
+            return
+        try:
+            await asyncio.to_thread(self._write, self.key(voice_id, model_id, text), data)
+        except OSError as e:
+            logger.warning(f"Audio cache write failed: {e}")
+
+    def get_stats(self) -> dict:
+        return {**self.stats, "entries": len(self._index), "bytes": self._total_bytes}
@@ -1,38 +1,131 @@
 import discord
 import asyncio
+import queue
 import subprocess
+import threading
+from typing import List, Optional
 from loguru import logger
+from src_v2.config.settings import settings
 from src_v2.voice.service import voice_service
 
+FFMPEG_COMMAND = ['ffmpeg', '-i', 'pipe:0', '-f', 's16le', '-ar', '48000', '-ac', '2', 'pipe:1', '-loglevel', 'quiet']
+FRAME_SIZE = 3840  # 20 ms of 48 kHz 16-bit stereo PCM, what discord.py reads per packet
+
+
 class StreamingFFmpegSource(discord.AudioSource):
-    def __init__(self, source_stream):
+    """
+    Plays an async stream of encoded audio through FFmpeg.
+
+    The event loop never touches FFmpeg's pipes: the feeding task hands chunks
+    to a writer thread through a bounded queue (waiting in a worker thread only
+    when the queue is full), and a reader thread cuts FFmpeg's output into
+    20 ms frames. read() holds back the first frame until `prebuffer_frames`
+    frames are decoded (or the stream ends), so playback starts smoothly
+    instead of underrunning on the first packets.
+    """
+
+    def __init__(self, source_stream, prebuffer_frames: Optional[int] = None, command: Optional[List[str]] = None):
         self.source_stream = source_stream
+        self.prebuffer_frames = max(1, prebuffer_frames or settings.VOICE_PREBUFFER_FRAMES)
         self.process = subprocess.Popen(
-            ['ffmpeg', '-i', 'pipe:0', '-f', 's16le', '-ar', '48000', '-ac', '2', 'pipe:1', '-loglevel', 'quiet'],
+            command or FFMPEG_COMMAND,
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.DEVNULL
         )
+        self._closed = threading.Event()
+        self._prebuffered = threading.Event()
+        self._started = False
+        self._chunks: queue.Queue = queue.Queue(maxsize=settings.VOICE_FEED_QUEUE_CHUNKS)
+        self._frames: queue.Queue = queue.Queue(maxsize=max(self.prebuffer_frames, 50))
+
+        self._writer = threading.Thread(target=self._write_stdin, name="ffmpeg-writer", daemon=True)
+        self._reader = threading.Thread(target=self._read_stdout, name="ffmpeg-reader", daemon=True)
+        self._writer.start()
+        self._reader.start()
         self._feeding_task = asyncio.create_task(self.feed_ffmpeg())
 
     async def feed_ffmpeg(self):
         try:
             async for chunk in self.source_stream:
-                if self.process.stdin:
-                    self.process.stdin.write(chunk)
-                    self.process.stdin.flush()
-            if self.process.stdin:
-                self.process.stdin.close()
+                if self._closed.is_set():
+                    break
+                await self._enqueue(chunk)
         except Exception as e:
             logger.error(f"Error feeding ffmpeg: {e}")
+        finally:
+            # Tells the writer to close FFmpeg's stdin once the queue drains
+            if not self._closed.is_set():
+                await self._enqueue(None)
+
+    async def _enqueue(self, chunk: Optional[bytes]) -> None:
+        try:
+            self._chunks.put_nowait(chunk)
+        except queue.Full:
+            await asyncio.to_thread(self._put_blocking, self._chunks, chunk)
+
+    def _put_blocking(self, target: queue.Queue, item) -> None:
+        while not self._closed.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _write_stdin(self):
+        stdin = self.process.stdin
+        try:
+            while not self._closed.is_set():
+                try:
+                    chunk = self._chunks.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if chunk is None:
+                    break
+                stdin.write(chunk)
+                stdin.flush()
+        except (OSError, ValueError) as e:
+            if not self._closed.is_set():
+                logger.error(f"Error writing to ffmpeg: {e}")
+        finally:
+            try:
+                stdin.close()
+            except OSError:
+                pass
+
+    def _read_stdout(self):
+        stdout = self.process.stdout
+        try:
+            while not self._closed.is_set():
+                frame = stdout.read(FRAME_SIZE)
+                if len(frame) != FRAME_SIZE:
+                    break
+                self._put_blocking(self._frames, frame)
+                if self._frames.qsize() >= self.prebuffer_frames:
+                    self._prebuffered.set()
+        except (OSError, ValueError):
+            pass
+        finally:
+            self._prebuffered.set()
+            try:
+                self._frames.put_nowait(b"")  # end of stream
+            except queue.Full:
+                self._put_blocking(self._frames, b"")
 
     def read(self):
-        ret = self.process.stdout.read(3840)
-        if len(ret) != 3840:
+        # Called by discord.py's player thread every 20 ms
+        if not self._started:
+            self._prebuffered.wait(timeout=settings.VOICE_FRAME_TIMEOUT_SECONDS)
+            self._started = True
+        try:
+            return self._frames.get(timeout=settings.VOICE_FRAME_TIMEOUT_SECONDS)
+        except queue.Empty:
+            logger.warning("Voice stream stalled; ending playback.")
             return b""
-        return ret
 
     def cleanup(self):
+        self._closed.set()
+        self._prebuffered.set()
         if self.process:
             self.process.kill()
         if self._feeding_task:
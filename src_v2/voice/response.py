@@ -20,15 +20,6 @@ class VoiceResponseManager:
         if not settings.ENABLE_VOICE_RESPONSES:
             return False
             
-        # Check Quota
-        if user_id:
-            has_quota = await quota_manager.check_quota(user_id, 'audio')
-            if not has_quota:
-                usage = await quota_manager.get_usage(user_id, 'audio')
-                limit = settings.DAILY_AUDIO_QUOTA
-                logger.info(f"Voice response blocked for user {user_id}: Daily quota exceeded")
-                raise QuotaExceededError('audio', limit, usage)
-
         # Resolve Voice ID
         voice_id = None
         if character.voice_config and character.voice_config.voice_id:
@@ -41,6 +32,14 @@ class VoiceResponseManager:
         if not voice_id:
             logger.warning(f"Voice response requested for {character.name} but no voice_id found (checked character config and global settings).")
             return False
+
+        # Check Quota (takes the unit now; released again if generation fails)
+        if user_id:
+            if not await quota_manager.reserve(user_id, 'audio', character.name):
+                usage = await quota_manager.get_usage(user_id, 'audio', character.name)
+                limit = settings.DAILY_AUDIO_QUOTA
+                logger.info(f"Voice response blocked for user {user_id}: Daily quota exceeded")
+                raise QuotaExceededError('audio', limit, usage)
             
         # Truncate text if too long
         if len(text) > settings.VOICE_RESPONSE_MAX_LENGTH:
@@ -54,6 +53,8 @@ class VoiceResponseManager:
             
             if not audio_bytes:
                 logger.error("Voice generation returned None")
+                if user_id:
+                    await quota_manager.release(user_id, 'audio', character.name)
                 return False
                 
             # Store in Artifact Registry
@@ -67,14 +68,13 @@ class VoiceResponseManager:
                 voice_id=voice_id
             )
             
-            # Increment Quota
-            await quota_manager.increment_usage(user_id, 'audio')
-            
             logger.info(f"Voice generated and stored for user {user_id}")
             return True
             
         except Exception as e:
             logger.error(f"Error generating voice response: {e}")
+            if user_id:
+                await quota_manager.release(user_id, 'audio', character.name)
             return False
 
 # Global instance
@@ -5,9 +5,16 @@ from elevenlabs.client import ElevenLabs, AsyncElevenLabs
 from elevenlabs import Voice, VoiceSettings
 
 from src_v2.config.settings import settings
+from src_v2.voice.audio_cache import AudioCache
 
 class TTSManager:
     def __init__(self):
+        self.audio_cache = AudioCache(
+            settings.TTS_CACHE_DIR,
+            max_bytes=settings.TTS_CACHE_MAX_BYTES,
+            max_text_chars=settings.TTS_CACHE_MAX_TEXT_CHARS
+        )
+
         # Check if voice is enabled first
         if not settings.ENABLE_VOICE_RESPONSES:
             self.client = None
@@ -22,37 +29,60 @@ class TTSManager:
             self.client = AsyncElevenLabs(api_key=self.api_key)
             logger.info("TTSManager initialized with ElevenLabs")
 
-    async def generate_speech(self, text: str, voice_id: Optional[str] = None) -> Optional[bytes]:
+    async def stream_speech(self, text: str, voice_id: Optional[str] = None) -> AsyncGenerator[bytes, None]:
         """
-        Generates speech from text using ElevenLabs.
-        Returns the audio bytes.
+        Yields speech audio chunks as ElevenLabs produces them.
+        Phrases found in the audio cache are served from disk in one chunk;
+        short phrases synthesized here are added to it. Raises on API errors.
         """
-        if not self.client:
-            logger.warning("TTS requested but ElevenLabs client is not initialized.")
-            return None
-
         target_voice_id = voice_id or settings.ELEVENLABS_VOICE_ID
         if not target_voice_id:
             logger.error("No voice_id provided for TTS.")
-            return None
+            return
+
+        model_id = settings.ELEVENLABS_MODEL_ID
+        cached = await self.audio_cache.get(target_voice_id, model_id, text)
+        if cached is not None:
+            logger.info(f"Serving cached speech for text: '{text[:30]}...' with voice {target_voice_id}")
+            yield cached
+            return
 
+        if not self.client:
+            logger.warning("TTS requested but ElevenLabs client is not initialized.")
+            return
+
+        logger.info(f"Generating speech for text: '{text[:30]}...' with voice {target_voice_id}")
+        
+        # Use text_to_speech.convert
+        # Note: convert returns an AsyncIterator, so we don't await the call itself
+        audio_stream = self.client.text_to_speech.convert(
+            text=text,
+            voice_id=target_voice_id,
+            model_id=model_id
+        )
+        
+        # Chunks go straight through; a copy is kept only for phrases we cache
+        buffer = bytearray() if self.audio_cache.cacheable(text) else None
+        async for chunk in audio_stream:
+            if buffer is not None:
+                buffer += chunk
+            yield chunk
+
+        if buffer:
+            await self.audio_cache.put(target_voice_id, model_id, text, bytes(buffer))
+
+    async def generate_speech(self, text: str, voice_id: Optional[str] = None) -> Optional[bytes]:
+        """
+        Generates speech from text using ElevenLabs (or the audio cache).
+        Returns the audio bytes.
+        """
         try:
-            logger.info(f"Generating speech for text: '{text[:30]}...' with voice {target_voice_id}")
-            
-            # Use text_to_speech.convert
-            # Note: convert returns an AsyncIterator, so we don't await the call itself
-            audio_stream = self.client.text_to_speech.convert(
-                text=text,
-                voice_id=target_voice_id,
-                model_id=settings.ELEVENLABS_MODEL_ID
-            )
-            
-            # Collect all chunks into a single bytes object
-            audio_data = b""
-            async for chunk in audio_stream:
+            # bytearray appends are amortized O(1); bytes += would copy the clip per chunk
+            audio_data = bytearray()
+            async for chunk in self.stream_speech(text, voice_id=voice_id):
                 audio_data += chunk
                 
-            return audio_data
+            return bytes(audio_data) if audio_data else None
 
         except Exception as e:
             logger.error(f"Failed to generate speech: {e}")
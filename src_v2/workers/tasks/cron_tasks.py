@@ -465,6 +465,23 @@ async def run_nightly_goal_strategist(ctx: Dict[str, Any]) -> Dict[str, Any]:
         }
 
 
+async def run_feedback_reconciliation(ctx: Dict[str, Any]) -> Dict[str, Any]:  # noqa: ARG001
+    """
+    Hourly cron job that rebuilds the rolling reaction aggregates (used for mood
+    and feedback-preference context) from InfluxDB, the system of record.
+    """
+    if not settings.ENABLE_FEEDBACK_RECONCILIATION:
+        return {"success": False, "reason": "disabled"}
+    
+    try:
+        from src_v2.evolution.feedback import feedback_analyzer
+        stats = await feedback_analyzer.reconcile_from_influx()
+        return {"success": True, "stats": stats}
+    except Exception as e:
+        logger.error(f"Feedback reconciliation failed: {e}")
+        return {"success": False, "error": str(e)}
+
+
 async def run_session_timeout_processing(ctx: Dict[str, Any]) -> Dict[str, Any]:  # noqa: ARG001
     """
     Cron job that runs every 5 minutes to find stale sessions, close them,
@@ -26,6 +26,7 @@ from arq import cron
 
 from src_v2.workers.task_queue import TaskQueue
 from src_v2.core.database import db_manager
+from src_v2.core.cache import cache_manager
 from src_v2.config.settings import settings
 from src_v2.workers.strategist import run_goal_strategist
 
@@ -59,7 +60,8 @@ from src_v2.workers.tasks.cron_tasks import (
     run_nightly_goal_strategist,
     run_weekly_drift_observation,
     run_weekly_graph_pruning,
-    run_session_timeout_processing
+    run_session_timeout_processing,
+    run_feedback_reconciliation
 )
 
 
@@ -76,6 +78,7 @@ async def startup(ctx: Dict[str, Any]) -> None:
     
     # Initialize database connections
     await db_manager.connect_all()
+    await cache_manager.start_invalidation_listener()
     
     ctx["db_connected"] = True
     logger.info("Worker ready to process jobs")
@@ -85,13 +88,17 @@ async def shutdown(ctx: Dict[str, Any]) -> None:
     """Called when worker shuts down."""
     logger.info("Worker shutting down...")
     
-    # Close database connections (use individual close methods)
-    if db_manager.postgres_pool:
-        await db_manager.postgres_pool.close()
-    if db_manager.qdrant_client:
-        await db_manager.qdrant_client.close()
-    if db_manager.neo4j_driver:
-        await db_manager.neo4j_driver.close()
+    # Flush write-behind memory writes while connections are still open
+    from src_v2.memory.manager import memory_manager
+    await memory_manager.ingestion_queue.stop()
+    from src_v2.universe.manager import universe_manager
+    await universe_manager.stop()
+    from src_v2.agents.llm_factory import close_llm_clients
+    await close_llm_clients()
+    await cache_manager.stop_invalidation_listener()
+    
+    # Close database connections; this also flushes and stops the metrics sink
+    await db_manager.disconnect_all()
     
     logger.info("Worker shutdown complete")
 
@@ -178,6 +185,13 @@ class WorkerSettings:
             minute=0,
             run_at_startup=False
         ),
+        # Feedback aggregate reconciliation from InfluxDB - runs hourly
+        cron(
+            run_feedback_reconciliation,
+            hour=None,
+            minute=15,
+            run_at_startup=True
+        ),
         # Session timeout processing - runs every 5 minutes (Phase S6)
         cron(
             run_session_timeout_processing,
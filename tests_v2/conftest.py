@@ -0,0 +1,17 @@
+"""
+Shared fixtures for tests_v2.
+"""
+
+import pytest
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """In-memory Redis installed as db_manager.redis_client, so cache_manager uses it."""
+    # Imported here so suites that never touch Redis don't need fakeredis
+    import fakeredis.aioredis
+    from src_v2.core.database import db_manager
+
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(db_manager, "redis_client", client)
+    return client
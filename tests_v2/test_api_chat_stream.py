@@ -0,0 +1,141 @@
+"""
+Tests for the /api/chat/stream SSE endpoint: the real AgentEngine stream path
+with a fake LLM in place of the Supergraph, driven through the ASGI app so the
+arrival time of every body chunk is observable.
+"""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src_v2.api.app import app
+from src_v2.api.routes import character_manager
+from src_v2.config.settings import settings
+
+TOKENS = ["Hello", " there", ",", " friend", "!"] * 4
+
+
+class FakeLLM:
+    """Yields tokens with a delay, reporting a status update first like the reflective graph."""
+
+    def __init__(self, delay: float = 0.05, fail_after: int = None):
+        self.delay = delay
+        self.fail_after = fail_after
+
+    async def run_stream(self, user_input, callback=None, **kwargs):
+        if callback:
+            await callback("🔍 Searching memories...")
+        for i, token in enumerate(TOKENS):
+            if self.fail_after is not None and i == self.fail_after:
+                raise RuntimeError("provider hung up")
+            await asyncio.sleep(self.delay)
+            yield token
+
+
+async def call_asgi(path: str, payload: dict):
+    """POSTs to the app and returns [(seconds since start, body bytes)] for each body message."""
+    body = json.dumps(payload).encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0", "spec_version": "2.4"}, "http_version": "1.1",
+        "method": "POST", "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "headers": [(b"content-type", b"application/json")],
+        "client": ("test", 1), "server": ("test", 80),
+    }
+    received = False
+    chunks, start = [], time.monotonic()
+    status = {}
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.Event().wait()  # Client stays connected
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status["code"] = message["status"]
+            status["headers"] = dict(message["headers"])
+        elif message["type"] == "http.response.body" and message.get("body"):
+            chunks.append((time.monotonic() - start, message["body"]))
+
+    await app(scope, receive, send)
+    return status, chunks
+
+
+def parse_events(chunks) -> list:
+    events = []
+    for at, raw in chunks:
+        for block in raw.decode().strip().split("\n\n"):
+            lines = dict(line.split(": ", 1) for line in block.split("\n"))
+            events.append((at, lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.fixture
+def stream_env(monkeypatch):
+    monkeypatch.setattr(settings, "DISCORD_BOT_NAME", "TestBot")
+    character = SimpleNamespace(name="TestBot", thinking_indicators=None)
+    add_message = AsyncMock()
+    with patch.object(character_manager, "get_character", return_value=character), \
+         patch("src_v2.api.routes._prepare_chat_context", AsyncMock(return_value=("session-1", [], {}, "Alice"))), \
+         patch("src_v2.api.routes.memory_manager.add_message", add_message):
+        yield add_message
+
+
+@pytest.mark.performance
+async def test_first_token_arrives_before_generation_completes(stream_env):
+    with patch("src_v2.agents.engine.master_graph_agent", FakeLLM(delay=0.05)):
+        status, chunks = await call_asgi("/api/chat/stream", {"user_id": "u1", "message": "Hi!"})
+
+    assert status["code"] == 200
+    assert status["headers"][b"content-type"].startswith(b"text/event-stream")
+    events = parse_events(chunks)
+    tokens = [(at, data["text"]) for at, kind, data in events if kind == "token"]
+    first_token_at, last_event_at = tokens[0][0], events[-1][0]
+    print(f"\nfirst token after {first_token_at * 1000:.0f} ms, stream complete after {last_event_at * 1000:.0f} ms")
+
+    assert [kind for _, kind, _ in events][0] == "status"
+    assert "".join(text for _, text in tokens) == "".join(TOKENS)
+    # 20 tokens x 50 ms: the first one must not wait for the other 19
+    assert first_token_at < last_event_at / 4
+
+    kind, metadata = events[-1][1], events[-1][2]
+    assert kind == "metadata"
+    assert metadata["success"] is True and metadata["bot_name"] == "TestBot"
+    assert metadata["response_length"] == len("".join(TOKENS))
+    assert metadata["first_token_ms"] < metadata["processing_time_ms"]
+
+
+async def test_memory_is_written_after_the_stream(stream_env):
+    with patch("src_v2.agents.engine.master_graph_agent", FakeLLM(delay=0.001)):
+        await call_asgi("/api/chat/stream", {"user_id": "u1", "message": "Hi!"})
+
+    calls = [call.kwargs for call in stream_env.await_args_list]
+    assert [(c["role"], c["content"]) for c in calls] == [("human", "Hi!"), ("ai", "".join(TOKENS))]
+    assert all(c["session_id"] == "session-1" and c["channel_id"] == "api_chat" for c in calls)
+
+
+async def test_generation_error_ends_stream_with_error_event(stream_env):
+    with patch("src_v2.agents.engine.master_graph_agent", FakeLLM(delay=0.001, fail_after=3)):
+        status, chunks = await call_asgi("/api/chat/stream", {"user_id": "u1", "message": "Hi!"})
+
+    events = parse_events(chunks)
+    assert status["code"] == 200
+    assert events[-1][1:] == ("error", {"detail": "provider hung up"})
+    assert "metadata" not in [kind for _, kind, _ in events]
+    # The user's message is kept, the partial response is not
+    assert [call.kwargs["role"] for call in stream_env.await_args_list] == ["human"]
+
+
+async def test_missing_bot_name_is_rejected_before_streaming(monkeypatch):
+    monkeypatch.setattr(settings, "DISCORD_BOT_NAME", None)
+
+    status, chunks = await call_asgi("/api/chat/stream", {"user_id": "u1", "message": "Hi!"})
+
+    assert status["code"] == 500
+    assert b"Bot name not configured" in chunks[0][1]
@@ -0,0 +1,211 @@
+"""
+Parity tests for the vectorized memory reranker in scoring.py.
+
+The batch functions must reproduce calculate_temporal_weight,
+calculate_source_weight, calculate_composite_score and rerank_memories.
+"""
+
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from src_v2.memory import scoring
+from src_v2.utils.time_utils import to_epoch_seconds
+
+REFERENCE_TIME = datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+TYPES = [*scoring.DECAY_RATES, "unknown_type", None]
+SOURCES = [*scoring.SOURCE_WEIGHTS, "mystery_source", None]
+MEANINGFULNESS = [1, 2, 3, 4, 5, 0.8, "4", "high", None]
+
+
+def _random_memory(rng: random.Random, index: int) -> dict:
+    created = REFERENCE_TIME - timedelta(days=rng.uniform(-2, 400))
+    memory = {"id": index, "score": rng.random()}
+
+    kind = rng.randrange(6)
+    if kind == 0:
+        memory["timestamp"] = created.replace(tzinfo=None).isoformat()
+    elif kind == 1:
+        memory["created_at"] = created.isoformat().replace("+00:00", "Z")
+    elif kind == 2:
+        memory["timestamp"] = created
+    elif kind == 3:
+        memory["timestamp"] = "not a timestamp"
+    elif kind == 4:
+        # Payloads written since timestamp_epoch existed
+        memory["timestamp"] = created.isoformat()
+        memory["timestamp_epoch"] = created.timestamp()
+    # kind 5: no timestamp at all
+
+    memory_type = rng.choice(TYPES)
+    if memory_type is not None:
+        memory["type"] = memory_type
+    source = rng.choice(SOURCES)
+    if source is not None:
+        memory["source_type"] = source
+    meaningfulness = rng.choice(MEANINGFULNESS)
+    if meaningfulness is not None:
+        memory[rng.choice(["meaningfulness", "meaningfulness_score"])] = meaningfulness
+    return memory
+
+
+@pytest.fixture
+def memories():
+    rng = random.Random(1234)
+    return [_random_memory(rng, i) for i in range(500)]
+
+
+def test_temporal_weights_match_scalar(memories):
+    arrays = scoring.encode_memories(memories)
+    batch = scoring.batch_temporal_weights(
+        arrays.epochs, arrays.type_codes, arrays.meaningfulness, REFERENCE_TIME
+    )
+    scalar = [scoring.calculate_temporal_weight(m, REFERENCE_TIME) for m in memories]
+
+    np.testing.assert_allclose(batch, scalar, rtol=1e-9, atol=1e-12)
+
+
+def test_composite_scores_match_scalar(memories, monkeypatch):
+    # calculate_composite_score always measures age from "now"; pin it
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return REFERENCE_TIME
+
+    monkeypatch.setattr(scoring, "datetime", FrozenDatetime)
+    weights = {"semantic": 0.6, "temporal": 0.25, "source": 0.15}
+
+    arrays = scoring.encode_memories(memories)
+    composite, _, source = scoring.batch_composite_scores(arrays, weights, REFERENCE_TIME)
+
+    np.testing.assert_allclose(source, [scoring.calculate_source_weight(m) for m in memories])
+    np.testing.assert_allclose(
+        composite,
+        [scoring.calculate_composite_score(m, m["score"], weights) for m in memories],
+        rtol=1e-9,
+        atol=1e-12,
+    )
+
+
+def test_rerank_batch_matches_rerank_memories(memories, monkeypatch):
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return REFERENCE_TIME
+
+    monkeypatch.setattr(scoring, "datetime", FrozenDatetime)
+
+    scalar = scoring.rerank_memories(memories)
+    batch = scoring.rerank_memories_batch(memories)
+
+    assert [m["id"] for m in batch] == [m["id"] for m in scalar]
+    for b, s in zip(batch, scalar):
+        assert b["composite_score"] == pytest.approx(s["composite_score"], rel=1e-9)
+        assert b["temporal_weight"] == pytest.approx(s["temporal_weight"], rel=1e-9)
+        assert b["source_weight"] == s["source_weight"]
+
+
+def test_stored_epoch_is_used_without_parsing():
+    created = REFERENCE_TIME - timedelta(days=10)
+    # The ISO string is deliberately wrong: timestamp_epoch wins when present
+    memory = {"timestamp": "garbage", "timestamp_epoch": to_epoch_seconds(created), "type": "dream"}
+
+    (weight,) = scoring.temporal_weights_for([memory], REFERENCE_TIME)
+
+    assert weight == pytest.approx(0.90 ** 10)
+
+
+@pytest.fixture(params=["America/Los_Angeles", "Asia/Kolkata"])
+def local_tz(request, monkeypatch):
+    """Runs the test on a host clock that isn't UTC."""
+    monkeypatch.setenv("TZ", request.param)
+    time.tzset()
+    yield request.param
+    monkeypatch.undo()
+    time.tzset()
+
+
+def _written_memory(created: datetime, rng: random.Random, index: int) -> dict:
+    """A payload as the writers store it: naive local ISO timestamp plus its epoch."""
+    timestamp = created.astimezone().replace(tzinfo=None).isoformat()
+    memory = {
+        "id": index,
+        "score": rng.random(),
+        "timestamp": timestamp,
+        "timestamp_epoch": to_epoch_seconds(timestamp),
+        "type": rng.choice(list(scoring.DECAY_RATES)),
+        "meaningfulness_score": rng.randint(1, 5),
+    }
+    if index % 3 == 0:
+        # Summaries and diaries also carry a naive created_at
+        memory["created_at"] = timestamp
+    return memory
+
+
+def test_written_payloads_match_on_non_utc_host(local_tz):
+    rng = random.Random(42)
+    memories = [
+        _written_memory(REFERENCE_TIME - timedelta(days=rng.uniform(0.01, 400)), rng, i)
+        for i in range(300)
+    ]
+
+    arrays = scoring.encode_memories(memories)
+    batch = scoring.batch_temporal_weights(
+        arrays.epochs, arrays.type_codes, arrays.meaningfulness, REFERENCE_TIME
+    )
+    scalar = [scoring.calculate_temporal_weight(m, REFERENCE_TIME) for m in memories]
+    np.testing.assert_allclose(batch, scalar, rtol=1e-9, atol=1e-12)
+
+    # Points written before timestamp_epoch existed resolve to the same time
+    legacy = [{k: v for k, v in m.items() if k != "timestamp_epoch"} for m in memories]
+    np.testing.assert_allclose(scoring.temporal_weights_for(legacy, REFERENCE_TIME), batch, rtol=1e-9)
+
+
+def test_written_payload_age_on_non_utc_host(local_tz):
+    memory = _written_memory(REFERENCE_TIME - timedelta(days=10), random.Random(0), 1)
+    memory["type"], memory["meaningfulness_score"] = "dream", 3
+
+    assert scoring.calculate_temporal_weight(memory, REFERENCE_TIME) == pytest.approx(0.90 ** 10)
+    assert scoring.temporal_weights_for([memory], REFERENCE_TIME)[0] == pytest.approx(0.90 ** 10)
+
+
+def test_empty_inputs():
+    assert scoring.rerank_memories_batch([]) == []
+    assert scoring.temporal_weights_for([]) == []
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("size", [200, 500, 1000, 2000])
+def test_batch_rerank_benchmark(size):
+    rng = random.Random(size)
+    memories = []
+    for i in range(size):
+        created = REFERENCE_TIME - timedelta(days=rng.uniform(0, 365))
+        memories.append({
+            "id": i,
+            "score": rng.random(),
+            "timestamp": created.isoformat(),
+            "timestamp_epoch": to_epoch_seconds(created),
+            "type": rng.choice(list(scoring.DECAY_RATES)),
+            "source_type": rng.choice(list(scoring.SOURCE_WEIGHTS)),
+            "meaningfulness_score": rng.randint(1, 5),
+        })
+
+    def best_of(fn, repeats=5):
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    scalar_s = best_of(lambda: scoring.rerank_memories(memories))
+    batch_s = best_of(lambda: scoring.rerank_memories_batch(memories, reference_time=REFERENCE_TIME))
+
+    print(f"\n{size:>5} candidates: scalar {scalar_s * 1000:.2f}ms, batch {batch_s * 1000:.2f}ms "
+          f"({scalar_s / batch_s:.1f}x)")
+    assert batch_s < scalar_s
@@ -0,0 +1,124 @@
+"""
+Tests for the recent-broadcasts sorted set in BroadcastManager: records are
+stored inline as members, so storing is one pipelined round-trip and reading
+any number of posts is one ZREVRANGEBYSCORE (fakeredis with a round-trip counter).
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from redis.asyncio.client import Pipeline
+
+from src_v2.broadcast.manager import RECENT_BROADCASTS_KEY, BroadcastManager, PostType
+from src_v2.config.settings import settings
+
+BOTS = ["elena", "marcus", "ryan", "gabriel"]
+
+
+class RoundTrips:
+    """Counts commands sent on their own plus pipelines (one round-trip each)."""
+
+    def __init__(self, client, monkeypatch):
+        self.count = 0
+        execute_command = client.execute_command
+        execute_pipeline = Pipeline.execute
+
+        async def counted_command(*args, **kwargs):
+            self.count += 1
+            return await execute_command(*args, **kwargs)
+
+        async def counted_pipeline(pipe, *args, **kwargs):
+            self.count += 1
+            return await execute_pipeline(pipe, *args, **kwargs)
+
+        monkeypatch.setattr(client, "execute_command", counted_command)
+        monkeypatch.setattr(Pipeline, "execute", counted_pipeline)
+
+
+def fake_message(message_id: int):
+    return SimpleNamespace(id=message_id, channel=SimpleNamespace(id=42))
+
+
+async def post_many(manager: BroadcastManager, count: int) -> None:
+    for i in range(count):
+        await manager._store_broadcast(fake_message(1000 + i), PostType.MUSING, BOTS[i % len(BOTS)], f"thought {i}")
+
+
+async def test_store_is_one_round_trip(fake_redis, monkeypatch):
+    manager = BroadcastManager()
+    trips = RoundTrips(fake_redis, monkeypatch)
+
+    await manager._store_broadcast(fake_message(1), PostType.DREAM, "elena", "I dreamt of tides", [{"source": "memory"}])
+
+    assert trips.count == 1
+    assert await fake_redis.zcard(settings.REDIS_KEY_PREFIX + RECENT_BROADCASTS_KEY) == 1
+    assert 0 < await fake_redis.ttl(settings.REDIS_KEY_PREFIX + RECENT_BROADCASTS_KEY) <= 86400
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("limit", [5, 50])
+async def test_reading_costs_constant_round_trips(fake_redis, monkeypatch, limit):
+    manager = BroadcastManager()
+    await post_many(manager, 80)
+    trips = RoundTrips(fake_redis, monkeypatch)
+
+    posts = await manager.get_recent_broadcasts(limit=limit)
+
+    assert trips.count == 1
+    assert len(posts) == limit
+    assert posts[0].content == "thought 79"
+    assert all(a.timestamp >= b.timestamp for a, b in zip(posts, posts[1:]))
+
+
+async def test_exclude_and_post_fields(fake_redis):
+    manager = BroadcastManager()
+    await manager._store_broadcast(fake_message(7), PostType.DREAM, "elena", "tides", [{"source": "memory"}])
+    await post_many(manager, 8)
+
+    posts = await manager.get_recent_broadcasts(exclude_character="elena", limit=20)
+    assert len(posts) == 6
+    assert {p.character_name for p in posts} == {"marcus", "ryan", "gabriel"}
+
+    dream = (await manager.get_recent_broadcasts(limit=20))[-1]
+    assert (dream.message_id, dream.channel_id, dream.post_type) == ("7", "42", PostType.DREAM)
+    assert dream.provenance == [{"source": "memory"}]
+
+
+async def test_old_entries_are_trimmed_and_filtered_by_hours(fake_redis):
+    manager = BroadcastManager()
+    zset = settings.REDIS_KEY_PREFIX + RECENT_BROADCASTS_KEY
+    now = datetime.now(timezone.utc)
+    for hours_ago in (30, 5):
+        record = {"message_id": str(hours_ago), "channel_id": "42", "character_name": "ryan",
+                  "post_type": "diary", "content": f"{hours_ago}h ago",
+                  "timestamp": (now - timedelta(hours=hours_ago)).isoformat(), "provenance": []}
+        await fake_redis.zadd(zset, {json.dumps(record): (now - timedelta(hours=hours_ago)).timestamp()})
+
+    await manager._store_broadcast(fake_message(1), PostType.MUSING, "elena", "just now")
+
+    assert await fake_redis.zcard(zset) == 2
+    assert [p.content for p in await manager.get_recent_broadcasts(hours=1)] == ["just now"]
+
+
+async def test_legacy_key_members_are_read_in_one_batch(fake_redis, monkeypatch):
+    manager = BroadcastManager()
+    zset = settings.REDIS_KEY_PREFIX + RECENT_BROADCASTS_KEY
+    now = datetime.now(timezone.utc)
+    for i in range(10):
+        key = f"broadcast:marcus:{i}"
+        record = {"message_id": str(i), "channel_id": "42", "character_name": "marcus",
+                  "post_type": "observation", "content": f"legacy {i}",
+                  "timestamp": (now - timedelta(minutes=30 - i)).isoformat()}
+        await fake_redis.set(settings.REDIS_KEY_PREFIX + key, json.dumps(record))
+        # Some older writers stored the prefixed key as the member
+        member = settings.REDIS_KEY_PREFIX + key if i % 2 else key
+        await fake_redis.zadd(zset, {member: (now - timedelta(minutes=30 - i)).timestamp()})
+    await manager._store_broadcast(fake_message(99), PostType.MUSING, "elena", "new style")
+    trips = RoundTrips(fake_redis, monkeypatch)
+
+    posts = await manager.get_recent_broadcasts(limit=11)
+
+    assert trips.count == 2
+    assert [p.content for p in posts] == ["new style"] + [f"legacy {i}" for i in range(9, -1, -1)]
@@ -0,0 +1,255 @@
+"""
+Tests for CacheManager's L1 tier, single-flight loads, tag / SCAN invalidation
+and cross-process L1 invalidation over pub/sub (against fakeredis).
+"""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+
+from src_v2.core import cache as cache_module
+from src_v2.core.cache import CacheManager, _L1Cache
+from src_v2.core.database import db_manager
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def fake_redis(server, monkeypatch):
+    client = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+    monkeypatch.setattr(db_manager, "redis_client", client)
+    return client
+
+
+@pytest.fixture
+def cache(fake_redis):
+    return CacheManager()
+
+
+async def test_l1_hit_skips_redis(cache, fake_redis):
+    await cache.set_json("profile:u1", {"name": "Mark"}, l1=True)
+
+    with patch.object(fake_redis, "get", wraps=fake_redis.get) as redis_get:
+        assert await cache.get_json("profile:u1", l1=True) == {"name": "Mark"}
+        assert await cache.get_json("profile:u1", l1=True) == {"name": "Mark"}
+
+    redis_get.assert_not_called()
+    # Callers get a fresh copy each time; mutating it can't poison the L1 entry
+    first = await cache.get_json("profile:u1", l1=True)
+    first["name"] = "changed"
+    assert await cache.get_json("profile:u1", l1=True) == {"name": "Mark"}
+
+
+async def test_l1_populated_from_redis_and_invalidated_by_local_writes(cache, fake_redis):
+    await fake_redis.set("whisper:k", "v1")
+
+    assert await cache.get("k", l1=True) == "v1"
+    await fake_redis.set("whisper:k", "changed-behind-our-back")
+    assert await cache.get("k", l1=True) == "v1"
+
+    await cache.set("k", "v2")
+    assert await cache.get("k", l1=True) == "v2"
+
+    await cache.delete("k")
+    assert await cache.get("k", l1=True) is None
+
+
+def test_l1_ttl_and_lru_eviction(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    l1 = _L1Cache(max_entries=2, ttl=10)
+
+    l1.set("a", "1")
+    l1.set("b", "2")
+    assert l1.get("a") == "1"   # a is now most recently used
+    l1.set("c", "3")            # evicts b
+    assert l1.get("b") is None
+    assert l1.get("a") == "1" and l1.get("c") == "3"
+    assert l1.evictions == 1
+
+    l1.set("short", "x", ttl=2)
+    now[0] += 3
+    assert l1.get("short") is None
+    now[0] += 8
+    assert l1.get("a") is None
+
+
+async def test_get_or_load_single_flight(cache, fake_redis):
+    calls = 0
+    release = asyncio.Event()
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return ["Luna", "Seattle"]
+
+    waiters = [asyncio.create_task(cache.get_or_load("entities:u1", loader, ttl=60)) for _ in range(20)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert calls == 1
+    assert all(r == ["Luna", "Seattle"] for r in results)
+    assert cache.get_stats()["singleflight_joins"] == 19
+    assert await fake_redis.get("whisper:entities:u1") == '["Luna", "Seattle"]'
+    assert 0 < await fake_redis.ttl("whisper:entities:u1") <= 60
+
+    # Later calls are served from L1 without the loader
+    assert await cache.get_or_load("entities:u1", loader) == ["Luna", "Seattle"]
+    assert calls == 1
+
+
+async def test_get_or_load_propagates_errors_and_retries(cache):
+    attempts = 0
+
+    async def flaky():
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("neo4j down")
+        return {"ok": True}
+
+    results = await asyncio.gather(
+        cache.get_or_load("flaky", flaky), cache.get_or_load("flaky", flaky), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert attempts == 1
+
+    assert await cache.get_or_load("flaky", flaky) == {"ok": True}
+
+
+async def test_get_or_load_prefers_redis_over_loader(cache, fake_redis):
+    await fake_redis.set("whisper:bots", '["elena"]')
+
+    async def loader():
+        raise AssertionError("loader should not run on a Redis hit")
+
+    assert await cache.get_or_load("bots", loader) == ["elena"]
+
+
+async def test_tag_invalidation(cache, fake_redis):
+    await cache.set("knowledge:common_ground:elena:u1", "a", tags=["user:u1"], l1=True)
+    await cache.set("knowledge:common_ground:marcus:u1", "b", tags=["user:u1"])
+    await cache.set_json("knowledge:user_entities:u1", ["Luna"], tags=["user:u1"], l1=True)
+    await cache.set("knowledge:common_ground:elena:u2", "c", tags=["user:u2"])
+
+    assert await cache.invalidate_tags("user:u1") == 3
+
+    assert await cache.get("knowledge:common_ground:elena:u1", l1=True) is None
+    assert await cache.get_json("knowledge:user_entities:u1", l1=True) is None
+    assert await fake_redis.exists("whisper:tag:user:u1") == 0
+    assert await cache.get("knowledge:common_ground:elena:u2") == "c"
+    assert await cache.invalidate_tags("user:u1") == 0
+
+
+async def test_delete_pattern_uses_scan(cache, fake_redis):
+    for i in range(1200):
+        await fake_redis.set(f"whisper:session:{i}", "x")
+    await fake_redis.set("whisper:other", "keep")
+    await cache.set("session:7", "x", l1=True)
+
+    with patch.object(fake_redis, "keys", side_effect=AssertionError("KEYS must not be used")):
+        deleted = await cache.delete_pattern("session:*")
+        assert await cache.keys("*") == ["whisper:other"]
+
+    assert deleted == 1200
+    assert await cache.get("session:7", l1=True) is None
+
+
+async def test_attention_lookups_are_prefixed(cache):
+    await cache.set_attention("elena", "user", "u1")
+    await cache.set_attention("marcus", "topic", "astronomy")
+
+    assert (await cache.get_all_attention("elena"))["user"]["target"] == "u1"
+    others = await cache.get_other_characters_attention("elena")
+    assert list(others) == ["marcus"]
+    assert others["marcus"]["topic"]["target"] == "astronomy"
+
+
+async def test_pubsub_invalidates_peer_l1(server, fake_redis):
+    # Two "processes" sharing one Redis server
+    writer = CacheManager()
+    reader = CacheManager()
+
+    await writer.set("knowledge:common_ground:elena:u1", "old", tags=["user:u1"])
+    assert await reader.get("knowledge:common_ground:elena:u1", l1=True) == "old"
+    assert await reader.start_invalidation_listener()
+    try:
+        await writer.set("knowledge:common_ground:elena:u1", "new", tags=["user:u1"])
+        await _wait_for(lambda: reader.get_stats()["l1_entries"] == 0)
+        assert await reader.get("knowledge:common_ground:elena:u1", l1=True) == "new"
+
+        await writer.invalidate_tags("user:u1")
+        await _wait_for(lambda: reader.get_stats()["l1_entries"] == 0)
+        assert await reader.get("knowledge:common_ground:elena:u1", l1=True) is None
+
+        await reader.set("attention:elena:user", "x", l1=True)
+        await writer.delete_pattern("attention:*")
+        await _wait_for(lambda: reader.get_stats()["l1_entries"] == 0)
+    finally:
+        await reader.stop_invalidation_listener()
+
+    assert not reader.get_stats()["listener_running"]
+
+
+async def test_only_l1_keys_publish_invalidations(cache, fake_redis):
+    pubsub = fake_redis.pubsub(ignore_subscribe_messages=True)
+    await pubsub.subscribe(cache._invalidation_channel)
+    cache.register_l1_prefix("privacy:")
+
+    # Hot-path writes to keys nobody reads through L1
+    await cache.set("session:active:u1:elena", "x")
+    await cache.setex("lock:u1", 10, "1")
+    await cache.set_json_many({"quota:chat:u1:2025-01-01": 1})
+    await cache.set_json_versioned("relationship:u1:elena", {"version": 2})
+    await cache.delete("session:active:u1:elena")
+    # Keys a peer may hold in L1
+    await cache.set("knowledge:common_ground:elena:u1", "a", tags=["user:u1"])
+    await cache.set_json("system:known_bot_names", ["elena"], l1=True)
+    await cache.delete("privacy:u1")
+
+    published = []
+    for _ in range(20):
+        message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=0.05)
+        if message:
+            published.extend(json.loads(message["data"])["keys"])
+    await pubsub.aclose()
+
+    assert published == [
+        "whisper:knowledge:common_ground:elena:u1",
+        "whisper:system:known_bot_names",
+        "whisper:privacy:u1",
+    ]
+
+
+async def test_no_redis_is_fail_safe(monkeypatch):
+    monkeypatch.setattr(db_manager, "redis_client", None)
+    cache = CacheManager()
+
+    assert await cache.set("k", "v") is False
+    assert await cache.get("k", l1=True) is None
+    assert await cache.delete_pattern("k*") == 0
+    assert await cache.invalidate_tags("t") == 0
+    assert await cache.start_invalidation_listener() is False
+
+    async def loader():
+        return {"fresh": 1}
+
+    assert await cache.get_or_load("k", loader) == {"fresh": 1}
+
+
+async def _wait_for(condition, timeout: float = 2.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        if loop.time() > deadline:
+            pytest.fail("condition not met before timeout")
+        await asyncio.sleep(0.01)
@@ -0,0 +1,203 @@
+"""
+Tests for the two-layer classification cache in ComplexityClassifier (exact
+Redis entries plus semantic nearest neighbour over the query embedding),
+against fakeredis and a counting fake router LLM, with a replayed chat log.
+"""
+
+import hashlib
+import random
+import re
+import time
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src_v2.agents.classification_cache import classification_cache
+from src_v2.agents.classifier import ClassificationOutput, ComplexityClassifier
+from src_v2.config.settings import settings
+from src_v2.core.database import db_manager
+
+
+class FakeRouter:
+    """Stands in for the router LLM; classifies by a keyword and counts calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def with_structured_output(self, schema):
+        return self
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        text = messages[-1].content.split("User Input:")[-1]
+        complexity = "COMPLEX_LOW" if "remember" in text.lower() else "SIMPLE"
+        intents = ["image_refine"] if "darker" in text.lower() else []
+        return ClassificationOutput(complexity=complexity, intents=intents)
+
+
+def embed(text: str) -> list:
+    """Bag-of-words hashing embedding: same words in any case/punctuation -> same vector."""
+    vector = np.zeros(64)
+    for word in re.findall(r"[a-z]+", text.lower()):
+        vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % 64] += 1
+    return vector.tolist()
+
+
+@pytest.fixture
+def classifier(fake_redis, monkeypatch):
+    monkeypatch.setattr(db_manager, "influxdb_write_api", None)
+    monkeypatch.setattr(settings, "ENABLE_CLASSIFICATION_CACHE", True)
+    monkeypatch.setattr(settings, "ENABLE_IMAGE_GENERATION", False)
+    monkeypatch.setattr(settings, "CLASSIFICATION_CACHE_SIMILARITY", 0.95)
+    classification_cache.clear()
+    router = FakeRouter()
+    with patch("src_v2.agents.classifier.create_llm", return_value=router), \
+         patch("src_v2.agents.classifier.memory_manager.search_reasoning_traces", AsyncMock(return_value=[])) as traces:
+        classifier = ComplexityClassifier()
+        classifier.router, classifier.traces = router, traces
+        yield classifier
+    classification_cache.clear()
+
+
+async def test_exact_hit_skips_trace_search_and_router(classifier):
+    first = await classifier.classify("Good morning!", user_id="u1", bot_name="elena")
+    second = await classifier.classify("good   morning", user_id="u1", bot_name="elena")
+
+    assert first["complexity"] == second["complexity"] == "SIMPLE"
+    assert second["cache"] == "exact"
+    assert classifier.router.calls == 1
+    assert classifier.traces.await_count == 1
+
+
+async def test_trace_decisions_are_not_cached(classifier):
+    classifier.traces.return_value = [{"score": 0.9, "metadata": {"complexity": "COMPLEX_HIGH"}}]
+    for _ in range(2):
+        result = await classifier.classify("plan my week", user_id="u1", bot_name="elena")
+        assert result == {"complexity": "COMPLEX_HIGH", "intents": []}
+
+    # Each call consulted the trace; nothing was stored to shadow it
+    assert classifier.traces.await_count == 2
+    assert classification_cache.get_stats()["stores"] == 0
+
+
+async def test_semantic_hit_uses_query_vector(classifier):
+    await classifier.classify("do you remember my dog", user_id="u1", bot_name="elena",
+                              query_vector=embed("do you remember my dog"))
+
+    result = await classifier.classify("Remember my dog, do you?", user_id="u1", bot_name="elena",
+                                       query_vector=embed("Remember my dog, do you?"))
+
+    assert result["cache"] == "semantic" and result["cache_similarity"] >= 0.95
+    assert result["complexity"] == "COMPLEX_LOW"
+    assert classifier.router.calls == 1
+
+
+async def test_namespaces_and_context_are_separate(classifier):
+    await classifier.classify("haha nice one", user_id="u1", bot_name="elena", query_vector=embed("haha nice one"))
+
+    # Another bot, another user, and the same user mid-conversation classify afresh
+    await classifier.classify("haha nice one", user_id="u1", bot_name="marcus", query_vector=embed("haha nice one"))
+    await classifier.classify("haha nice one", user_id="u2", bot_name="elena", query_vector=embed("haha nice one"))
+    history = [HumanMessage(content="tell me a joke"), AIMessage(content="why did the chicken...")]
+    await classifier.classify("haha nice one", history, user_id="u1", bot_name="elena", query_vector=embed("haha nice one"))
+    assert classifier.router.calls == 4
+
+    # The signature is coarse: any later turn of the same user's conversation hits
+    later = history + [HumanMessage(content="tell me a riddle"), AIMessage(content="what has keys...")]
+    result = await classifier.classify("haha nice one", later, user_id="u1", bot_name="elena", query_vector=embed("haha nice one"))
+    assert result["cache"] == "exact"
+    assert classifier.router.calls == 4
+
+
+async def test_history_dependent_decisions_are_not_cached(classifier):
+    history = [HumanMessage(content="draw a castle"), AIMessage(content="[image]")]
+    for _ in range(2):
+        result = await classifier.classify("make it darker", history, user_id="u1", bot_name="elena")
+        assert result["intents"] == ["image_refine"] and "cache" not in result
+    assert classifier.router.calls == 2
+
+    # Document follow-ups depend on the uploaded content
+    docs = [HumanMessage(content="[Attached Files: report.pdf] what do you think?"), AIMessage(content="It covers...")]
+    await classifier.classify("and the second part?", docs, user_id="u1", bot_name="elena")
+    await classifier.classify("and the second part?", docs, user_id="u1", bot_name="elena")
+    assert classifier.router.calls == 4
+
+
+async def test_repeated_message_in_growing_conversation_is_reclassified(classifier):
+    history = []
+    for _ in range(5):
+        result = await classifier.classify("yes", list(history), user_id="u1", bot_name="elena")
+        assert "cache" not in result
+        history += [HumanMessage(content="yes"), AIMessage(content="ok!")]
+
+    assert classifier.router.calls == 5
+
+
+async def test_long_messages_and_query_extractions_are_not_reused_semantically(classifier):
+    long_text = "I had a long day " * 30
+    await classifier.classify(long_text, user_id="u1", bot_name="elena")
+    await classifier.classify(long_text, user_id="u1", bot_name="elena")
+    assert classifier.router.calls == 2
+
+    await classification_cache.put("elena", "what did we talk about yesterday", classification_cache.context_signature("u1", False),
+                                   {"complexity": "COMPLEX_LOW", "intents": [], "query": {"time_range": {"start": "x"}}},
+                                   embed("what did we talk about yesterday"))
+    result = await classifier.classify("yesterday, what did we talk about?", user_id="u1", bot_name="elena",
+                                       query_vector=embed("yesterday, what did we talk about?"))
+    assert "cache" not in result
+
+
+async def test_entries_expire(classifier, monkeypatch):
+    monkeypatch.setattr(settings, "CLASSIFICATION_CACHE_TTL_SECONDS", 60)
+    await classifier.classify("thanks a lot", user_id="u1", bot_name="elena", query_vector=embed("thanks a lot"))
+
+    with patch("src_v2.agents.classification_cache.time.time", return_value=time.time() + 120):
+        await classification_cache.get("elena", "lot thanks a", classification_cache.context_signature("u1", False), embed("thanks a lot"))
+
+    assert classification_cache.get_stats()["semantic_entries"]["elena"] == 0
+
+
+def replay_log(messages: int, seed: int = 11):
+    """A channel's user messages: reactions and greetings repeat, questions mostly don't."""
+    rng = random.Random(seed)
+    chatter = ["lol", "LOL", "haha", "good morning!", "Good morning", "gm", "thanks!", "thank you",
+               "ok", "nice", "same", "omg yes", "wait what", "hi elena", "Hi Elena!"]
+    questions = [f"do you remember what I said about {topic}?" for topic in
+                 ("my sister", "the trip", "my job", "the concert", "my cat", "the book")]
+    nouns = ["space", "music", "food", "code", "rain", "coffee", "trains", "poetry", "chess", "gardens",
+             "robots", "oceans", "movies", "jazz", "maps", "clouds", "tea", "bikes", "stars", "books"]
+    log = []
+    for _ in range(messages):
+        roll = rng.random()
+        if roll < 0.6:
+            log.append(rng.choice(chatter))
+        elif roll < 0.8:
+            log.append(rng.choice(questions))
+        else:
+            log.append(f"been thinking about {rng.choice(nouns)} and {rng.choice(nouns)} {rng.choice(nouns)}")
+    return log
+
+
+@pytest.mark.performance
+async def test_replayed_chat_hit_rate_and_router_calls_saved(classifier):
+    log = replay_log(400)
+    conversations = {}
+
+    # Each user's messages arrive with that conversation's history, bot replies
+    # included, exactly as the live classifier receives them
+    for i, text in enumerate(log):
+        history = conversations.setdefault(f"u{i % 7}", [])
+        await classifier.classify(text, list(history), user_id=f"u{i % 7}", bot_name="elena", query_vector=embed(text))
+        history += [HumanMessage(content=text), AIMessage(content=f"reply {i}")]
+
+    stats = classification_cache.get_stats()
+    bypassed = len(log) - stats["exact_hits"] - stats["semantic_hits"] - stats["misses"]
+    print(f"\nhit rate {stats['hit_rate']:.1%} (exact {stats['exact_hits']}, semantic {stats['semantic_hits']}), "
+          f"{bypassed} bypassed, router calls {classifier.router.calls} for {len(log)} messages, "
+          f"saved {stats['router_calls_saved']}")
+
+    assert classifier.router.calls + stats["router_calls_saved"] == len(log)
+    assert stats["semantic_hits"] > 0
+    assert stats["hit_rate"] > 0.45
@@ -0,0 +1,137 @@
+"""
+Tests for the query-embedding LRU cache and micro-batcher in EmbeddingService.
+
+Uses a fake FastEmbed model so no ONNX weights are loaded.
+"""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from src_v2.config.settings import settings
+from src_v2.memory.embeddings import EmbeddingService, _QueryCache
+
+FAKE_MODEL = "test/fake-embedding-model"
+
+
+class FakeTextEmbedding:
+    """Records every embed() call; vectors encode the text length."""
+
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, texts):
+        texts = list(texts)
+        self.calls.append(texts)
+        for text in texts:
+            yield np.array([float(len(text)), 1.0, 0.0], dtype=np.float32)
+
+
+@pytest.fixture
+def fake_service(monkeypatch):
+    monkeypatch.setattr(settings, "EMBEDDING_CACHE_SIZE", 64)
+    monkeypatch.setattr(settings, "EMBEDDING_BATCH_WINDOW_MS", 5.0)
+    monkeypatch.setattr(settings, "EMBEDDING_BATCH_MAX_SIZE", 32)
+
+    model = FakeTextEmbedding()
+    EmbeddingService._model_cache[FAKE_MODEL] = (model, threading.Lock())
+    EmbeddingService._query_caches.pop(FAKE_MODEL, None)
+    EmbeddingService._batchers.pop(FAKE_MODEL, None)
+    EmbeddingService._stats.pop(FAKE_MODEL, None)
+
+    yield EmbeddingService(model_name=FAKE_MODEL), model
+
+    for registry in (
+        EmbeddingService._model_cache,
+        EmbeddingService._query_caches,
+        EmbeddingService._batchers,
+        EmbeddingService._stats,
+    ):
+        registry.pop(FAKE_MODEL, None)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_queries_are_micro_batched(fake_service):
+    service, model = fake_service
+    texts = [f"query number {i}" for i in range(50)]
+
+    vectors = await asyncio.gather(*(service.embed_query_async(t) for t in texts))
+
+    assert [v[0] for v in vectors] == [float(len(t)) for t in texts]
+    # 50 distinct texts with max batch size 32 -> 2 model calls instead of 50
+    assert len(model.calls) == 2
+    assert sorted(len(c) for c in model.calls) == [18, 32]
+
+    stats = service.get_stats()
+    assert stats["batches"] == 2
+    assert stats["max_batch_size"] == 32
+    assert stats["cache_misses"] == 50
+
+
+@pytest.mark.asyncio
+async def test_repeated_query_is_served_from_cache(fake_service):
+    service, model = fake_service
+
+    first = await service.embed_query_async("hello   there")
+    second = await service.embed_query_async("  hello there ")  # same after normalization
+
+    assert first == second
+    assert len(model.calls) == 1
+    stats = service.get_stats()
+    assert stats["cache_hits"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_queries_share_one_slot(fake_service):
+    service, model = fake_service
+
+    await asyncio.gather(*(service.embed_query_async("same text") for _ in range(10)))
+
+    assert model.calls == [["same text"]]
+
+
+@pytest.mark.asyncio
+async def test_sync_and_async_paths_share_cache(fake_service):
+    service, model = fake_service
+
+    service.embed_query("shared")
+    await service.embed_query_async("shared")
+
+    assert len(model.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_failure_propagates_to_all_waiters(fake_service):
+    service, model = fake_service
+
+    def broken_embed(texts):
+        raise RuntimeError("onnx exploded")
+
+    model.embed = broken_embed
+    results = await asyncio.gather(
+        service.embed_query_async("a"), service.embed_query_async("b"), return_exceptions=True
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_empty_query_rejected(fake_service):
+    service, _ = fake_service
+    with pytest.raises(ValueError):
+        await service.embed_query_async("")
+
+
+def test_lru_evicts_least_recently_used():
+    cache = _QueryCache(max_size=2)
+    cache.put("a", [1.0])
+    cache.put("b", [2.0])
+    cache.get("a")
+    cache.put("c", [3.0])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == [1.0]
+    assert cache.get("c") == [3.0]
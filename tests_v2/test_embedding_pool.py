@@ -0,0 +1,215 @@
+"""
+Tests for the process-pool embedding backend (EmbeddingProcessPool) and its
+use from EmbeddingService when EMBEDDING_BACKEND=process.
+
+Workers load a fake model through `model_factory`, so no ONNX weights are needed.
+"""
+
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src_v2.config.settings import settings
+from src_v2.memory.embedding_pool import EmbeddingProcessPool
+from src_v2.memory.embeddings import EmbeddingService
+
+FAKE_MODEL = "test/fake-pool-model"
+
+
+class FakeTextEmbedding:
+    """Vectors encode the text length; 'explode' raises; `work` burns CPU per text."""
+
+    def __init__(self, work: int = 0):
+        self.work = work
+
+    def embed(self, texts):
+        for text in texts:
+            if text == "explode":
+                raise RuntimeError("onnx exploded")
+            total = 0
+            for i in range(self.work):
+                total += i * i
+            yield np.array([float(len(text)), 1.0, 0.0], dtype=np.float32)
+
+
+def fake_factory(model_name, threads):
+    return FakeTextEmbedding()
+
+
+def busy_factory(model_name, threads):
+    return FakeTextEmbedding(work=200_000)
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = EmbeddingProcessPool(FAKE_MODEL, workers=2, max_batch_size=4, slots=4, model_factory=fake_factory)
+    pool.start()
+    yield pool
+    pool.close()
+
+
+async def test_vectors_come_back_through_shared_memory(pool):
+    assert pool.dimension == 3
+
+    vector = await pool.embed_query_async("hello")
+    vectors = await pool.embed_documents_async([f"doc {'x' * i}" for i in range(10)])
+
+    assert vector == [5.0, 1.0, 0.0]
+    # 10 texts with 4-row slots -> split into 3 chunks, reassembled in order
+    assert [v[0] for v in vectors] == [float(4 + i) for i in range(10)]
+    assert all(isinstance(v[0], float) for v in vectors)
+
+
+async def test_concurrent_requests_beyond_slot_count(pool):
+    texts = [f"query {'y' * i}" for i in range(20)]
+
+    vectors = await asyncio.gather(*(pool.embed_query_async(t) for t in texts))
+
+    assert [v[0] for v in vectors] == [float(len(t)) for t in texts]
+    assert pool._free_slots.available() == pool.slot_count
+
+
+async def test_worker_error_propagates_and_frees_slot(pool):
+    with pytest.raises(RuntimeError, match="onnx exploded"):
+        await pool.embed_documents_async(["fine", "explode"])
+
+    assert pool._free_slots.available() == pool.slot_count
+    assert await pool.embed_query_async("still works") == [11.0, 1.0, 0.0]
+
+
+async def test_cancelled_slot_wait_does_not_leak_a_slot(pool):
+    held = [await pool._free_slots.acquire() for _ in range(pool.slot_count)]
+    waiting = asyncio.create_task(pool.embed_query_async("never sent"))
+    await asyncio.sleep(0.05)
+
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    for slot in held:
+        pool._free_slots.release(slot)
+
+    assert pool._free_slots.available() == pool.slot_count
+    assert await pool.embed_query_async("still works") == [11.0, 1.0, 0.0]
+
+
+async def test_slot_waits_do_not_hold_executor_threads(pool):
+    held = [await pool._free_slots.acquire() for _ in range(pool.slot_count)]
+    threads = threading.active_count()
+    waiting = [asyncio.create_task(pool.embed_query_async(f"q{i}")) for i in range(64)]
+    await asyncio.sleep(0.05)
+
+    assert threading.active_count() == threads
+    # The default executor stays free for everything else on the loop
+    loop = asyncio.get_running_loop()
+    assert await asyncio.wait_for(loop.run_in_executor(None, lambda: "ran"), timeout=1) == "ran"
+
+    for slot in held:
+        pool._free_slots.release(slot)
+    vectors = await asyncio.gather(*waiting)
+    assert [v[0] for v in vectors] == [float(len(f"q{i}")) for i in range(64)]
+    assert pool._free_slots.available() == pool.slot_count
+
+
+async def test_close_fails_requests_waiting_for_a_slot():
+    pool = EmbeddingProcessPool(FAKE_MODEL, workers=1, slots=1, model_factory=fake_factory)
+    pool.start()
+    await pool._free_slots.acquire()  # Held until close
+    waiting = asyncio.create_task(pool.embed_query_async("never sent"))
+    await asyncio.sleep(0.05)
+
+    pool.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        await asyncio.wait_for(waiting, timeout=1)
+
+
+async def test_unstarted_pool_rejects_calls():
+    with pytest.raises(RuntimeError):
+        await EmbeddingProcessPool(FAKE_MODEL, model_factory=fake_factory).embed_query_async("hi")
+
+
+@pytest.fixture
+def process_backend(monkeypatch, pool):
+    monkeypatch.setattr(settings, "EMBEDDING_BACKEND", "process")
+    monkeypatch.setattr(settings, "EMBEDDING_CACHE_SIZE", 64)
+    monkeypatch.setattr(settings, "EMBEDDING_BATCH_WINDOW_MS", 5.0)
+    monkeypatch.setattr(settings, "EMBEDDING_BATCH_MAX_SIZE", 4)
+    EmbeddingService._process_pools[FAKE_MODEL] = pool
+    yield EmbeddingService(model_name=FAKE_MODEL)
+    for registry in (
+        EmbeddingService._process_pools,
+        EmbeddingService._query_caches,
+        EmbeddingService._batchers,
+        EmbeddingService._stats,
+    ):
+        registry.pop(FAKE_MODEL, None)
+
+
+async def test_service_routes_async_embeddings_to_pool(process_backend):
+    service = process_backend
+
+    vectors = await asyncio.gather(*(service.embed_query_async(f"q{'z' * i}") for i in range(6)))
+    documents = await service.embed_documents_async(["a", "bb"])
+
+    assert [v[0] for v in vectors] == [float(1 + i) for i in range(6)]
+    assert documents == [[1.0, 1.0, 0.0], [2.0, 1.0, 0.0]]
+    # Never touched the in-process model
+    assert FAKE_MODEL not in EmbeddingService._model_cache
+    assert service.get_stats()["cache_misses"] == 6
+
+
+async def test_failed_pool_start_falls_back_to_thread_backend(monkeypatch):
+    monkeypatch.setattr(settings, "EMBEDDING_BACKEND", "process")
+    model_name = "test/missing-model"
+    EmbeddingService._model_cache[model_name] = (FakeTextEmbedding(), threading.Lock())
+    monkeypatch.setattr(EmbeddingProcessPool, "start", lambda self: (_ for _ in ()).throw(OSError("no spawn")))
+    try:
+        service = EmbeddingService(model_name=model_name)
+        assert await service.embed_documents_async(["abc"]) == [[3.0, 1.0, 0.0]]
+        assert EmbeddingService._process_pools[model_name] is None
+    finally:
+        EmbeddingService._model_cache.pop(model_name, None)
+        EmbeddingService._process_pools.pop(model_name, None)
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+@pytest.mark.performance
+async def test_embedding_backend_latency_benchmark(monkeypatch):
+    """p50/p99 per-request latency, thread backend vs process pool, at 1/8/32 concurrent requests."""
+    monkeypatch.setattr(settings, "EMBEDDING_CACHE_SIZE", 0)
+    monkeypatch.setattr(settings, "EMBEDDING_BATCH_WINDOW_MS", 5.0)
+    monkeypatch.setattr(settings, "EMBEDDING_BATCH_MAX_SIZE", 8)
+    model_name = "test/busy-model"
+    EmbeddingService._model_cache[model_name] = (busy_factory(model_name, None), threading.Lock())
+    pool = EmbeddingProcessPool(model_name, workers=2, max_batch_size=8, model_factory=busy_factory)
+    pool.start()
+    EmbeddingService._process_pools[model_name] = pool
+    service = EmbeddingService(model_name=model_name)
+
+    async def timed(text):
+        start = time.perf_counter()
+        await service.embed_query_async(text)
+        return time.perf_counter() - start
+
+    try:
+        for backend in ("thread", "process"):
+            monkeypatch.setattr(settings, "EMBEDDING_BACKEND", backend)
+            for concurrency in (1, 8, 32):
+                samples = []
+                for round_ in range(5):
+                    texts = [f"{backend} {concurrency} {round_} {i}" for i in range(concurrency)]
+                    samples += await asyncio.gather(*(timed(t) for t in texts))
+                print(f"\n{backend:>7} x{concurrency:<2}: p50 {_percentile(samples, 50) * 1000:.1f}ms "
+                      f"p99 {_percentile(samples, 99) * 1000:.1f}ms")
+                assert len(samples) == 5 * concurrency
+    finally:
+        pool.close()
+        for registry in (EmbeddingService._model_cache, EmbeddingService._process_pools,
+                         EmbeddingService._query_caches, EmbeddingService._batchers, EmbeddingService._stats):
+            registry.pop(model_name, None)
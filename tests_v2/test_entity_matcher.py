@@ -0,0 +1,114 @@
+"""
+Tests for the Aho-Corasick entity matcher used by ambient graph retrieval (E30).
+"""
+
+import random
+import re
+import string
+import time
+
+import pytest
+
+from src_v2.knowledge.entity_matcher import EntityMatcher, EntityMatcherCache
+
+
+def test_finds_entities_case_insensitively_in_order():
+    matcher = EntityMatcher({"Luna", "Seattle", "marine biology"})
+
+    assert matcher.find("Moving to SEATTLE to study Marine Biology with luna") == [
+        "Seattle", "marine biology", "Luna"
+    ]
+
+
+def test_respects_word_boundaries():
+    matcher = EntityMatcher({"Art", "cat", "C++"})
+
+    assert matcher.find("What a party! My category is concatenation.") == []
+    assert matcher.find("I love art, my cat and C++.") == ["Art", "cat", "C++"]
+
+
+def test_overlapping_and_nested_entities():
+    matcher = EntityMatcher({"Maya", "sister Maya", "New York", "York"})
+
+    assert matcher.find("my sister Maya lives in New York") == ["sister Maya", "Maya", "New York", "York"]
+
+
+def test_duplicates_reported_once_and_blank_entities_ignored():
+    matcher = EntityMatcher({"Luna", "", "   "})
+
+    assert len(matcher) == 1
+    assert matcher.find("Luna, Luna, LUNA") == ["Luna"]
+    assert EntityMatcher(set()).find("anything") == []
+
+
+def test_matches_word_bounded_regex_reference():
+    rng = random.Random(7)
+    vocabulary = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 6))) for _ in range(300)]
+    entities = {" ".join(rng.sample(vocabulary, rng.randint(1, 2))) for _ in range(400)}
+    matcher = EntityMatcher(entities)
+
+    for _ in range(50):
+        message = " ".join(rng.choices(vocabulary, k=40))
+        expected = {e for e in entities if re.search(rf"\b{re.escape(e)}\b", message, re.IGNORECASE)}
+        assert set(matcher.find(message)) == expected
+
+
+def test_cache_reuses_matcher_until_entities_change():
+    cache = EntityMatcherCache(max_users=2)
+
+    first = cache.get("u1", {"Luna"})
+    assert cache.get("u1", ["Luna"]) is first
+
+    rebuilt = cache.get("u1", {"Luna", "Seattle"})
+    assert rebuilt is not first
+    assert rebuilt.find("seattle") == ["Seattle"]
+
+    cache.invalidate("u1")
+    assert cache.get("u1", {"Luna", "Seattle"}) is not rebuilt
+
+
+def test_cache_is_bounded():
+    cache = EntityMatcherCache(max_users=2)
+    for user in ("u1", "u2", "u3"):
+        cache.get(user, {user})
+
+    assert len(cache) == 2
+
+
+@pytest.mark.performance
+def test_entity_matcher_benchmark():
+    rng = random.Random(5000)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(4000)]
+    entities = set()
+    while len(entities) < 5000:
+        entities.add(" ".join(rng.sample(words, rng.randint(1, 3))).title())
+    messages = [" ".join(rng.choices(words, k=60)) for _ in range(200)]
+
+    start = time.perf_counter()
+    matcher = EntityMatcher(entities)
+    build_s = time.perf_counter() - start
+
+    def substring_scan():
+        for message in messages:
+            lowered = message.lower()
+            [e for e in entities if e.lower() in lowered]
+
+    def automaton_scan():
+        for message in messages:
+            matcher.find(message)
+
+    def best_of(fn, repeats=3):
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    scan_s = best_of(substring_scan) / len(messages)
+    automaton_s = best_of(automaton_scan) / len(messages)
+
+    print(f"\n{len(entities)} entities: build {build_s * 1000:.1f}ms, "
+          f"substring {scan_s * 1e6:.0f}us/msg, automaton {automaton_s * 1e6:.0f}us/msg "
+          f"({scan_s / automaton_s:.1f}x)")
+    assert automaton_s < scan_s
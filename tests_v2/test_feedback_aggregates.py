@@ -0,0 +1,171 @@
+"""
+Tests for the rolling reaction aggregates behind FeedbackAnalyzer.get_current_mood
+and analyze_user_feedback_patterns (Redis-backed, no InfluxDB on the read path).
+"""
+
+import time
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src_v2.core.database import db_manager
+from src_v2.evolution.feedback import FeedbackAnalyzer
+
+
+@pytest.fixture(autouse=True)
+def no_influx_writes(monkeypatch):
+    monkeypatch.setattr(db_manager, "influxdb_write_api", None)
+
+
+@pytest.fixture
+def analyzer():
+    return FeedbackAnalyzer()
+
+
+async def react(analyzer, user_id, reaction, action="add", message_length=100, bot_name="elena", message_id="m1"):
+    await analyzer.record_reaction(
+        user_id=user_id, bot_name=bot_name, message_id=message_id,
+        reaction=reaction, action=action, message_length=message_length
+    )
+
+
+async def test_mood_served_without_influx_query(fake_redis, analyzer):
+    influx = MagicMock()
+    with patch.object(db_manager, "influxdb_client", influx):
+        for i in range(5):
+            await react(analyzer, "u1", "❤️", message_id=f"m{i}")
+
+        assert await analyzer.get_current_mood("u1") == "Excited (User is very engaged)"
+        assert await analyzer.get_current_mood("someone_else") == "Neutral"
+
+    influx.query_api.assert_not_called()
+
+
+async def test_mood_turns_annoyed_and_removal_is_undone(fake_redis, analyzer):
+    await react(analyzer, "u1", "👍")
+    assert await analyzer.get_current_mood("u1") == "Happy"
+
+    await react(analyzer, "u1", "👎", message_id="m2")
+    await react(analyzer, "u1", "😠", message_id="m3")
+    assert await analyzer.get_current_mood("u1") == "Annoyed (User has been reacting negatively)"
+
+    await react(analyzer, "u1", "👎", action="remove", message_id="m2")
+    await react(analyzer, "u1", "😠", action="remove", message_id="m3")
+    assert await analyzer.get_current_mood("u1") == "Happy"
+
+
+async def test_removal_undoes_the_bucket_of_the_add(fake_redis, analyzer):
+    earlier = time.time() - 1200
+    with patch("src_v2.evolution.feedback.time.time", return_value=earlier):
+        await react(analyzer, "u1", "👎", message_id="m2")
+
+    await react(analyzer, "u1", "👎", action="remove", message_id="m2")
+    # A removal without a known add (e.g. from before a Redis flush) is left to reconciliation
+    await react(analyzer, "u1", "👍", action="remove", message_id="m3")
+
+    for bucket_time in (earlier, time.time()):
+        key = analyzer._aggregate_key("user", "u1", "5m", int(bucket_time) // 300)
+        assert all(int(v) == 0 for v in (await fake_redis.hgetall(f"whisper:{key}")).values())
+    counts = await analyzer.get_reaction_aggregate("user", "u1", 3600, granularity="5m")
+    assert counts == dict.fromkeys(counts, 0)
+
+
+async def test_feedback_patterns_from_daily_aggregates(fake_redis, analyzer):
+    for i in range(4):
+        await react(analyzer, "u1", "👎", message_length=900, message_id=f"long{i}")
+    await react(analyzer, "u1", "👍", message_length=900, message_id="long_ok")
+    for i in range(3):
+        await react(analyzer, "u1", "❤️", message_length=120, message_id=f"short{i}")
+
+    insights = await analyzer.analyze_user_feedback_patterns("u1")
+
+    assert insights["total_reactions"] == 8
+    assert insights["positive_ratio"] == pytest.approx(4 / 8)
+    assert insights["verbosity_preference"] == "concise"
+    assert insights["recommendations"] == [
+        "User prefers shorter responses",
+        "User appreciates concise communication",
+    ]
+
+
+async def test_bot_scope_aggregates_across_users(fake_redis, analyzer):
+    await react(analyzer, "u1", "👍", bot_name="elena")
+    await react(analyzer, "u2", "👎", bot_name="elena")
+    await react(analyzer, "u3", "👍", bot_name="marcus")
+
+    counts = await analyzer.get_reaction_aggregate("bot", "elena", 30 * 86400)
+
+    assert counts["positive"] == 1
+    assert counts["negative"] == 1
+
+
+async def test_window_excludes_old_buckets(fake_redis, analyzer):
+    now = time.time()
+    # Write a negative reaction into a 5-minute bucket from 90 minutes ago
+    old_key = analyzer._aggregate_key("user", "u1", "5m", int(now - 5400) // 300)
+    await fake_redis.hset(f"whisper:{old_key}", mapping={"negative": 3})
+
+    assert await analyzer.get_current_mood("u1") == "Neutral"
+    assert len(analyzer._window_keys("user", "u1", "5m", 3600, now)) == 13
+
+
+def influx_with(*records):
+    table = MagicMock()
+    table.records = list(records)
+    influx = MagicMock()
+    influx.query_api.return_value.query.return_value = [table]
+    return influx
+
+
+def influx_record(action, reaction, message_id, at, length=50):
+    rec = MagicMock()
+    rec.values = {
+        "user_id": "u1", "bot_name": "elena", "message_id": message_id,
+        "action": action, "reaction": reaction, "message_length": length,
+    }
+    rec.get_time.return_value = datetime.fromtimestamp(at, timezone.utc)
+    return rec
+
+
+async def test_reconcile_rebuilds_settled_buckets_from_influx(fake_redis, analyzer):
+    earlier = time.time() - 1200
+    # Drifted counters in a closed bucket
+    drifted = analyzer._aggregate_key("user", "u1", "5m", int(earlier) // 300)
+    await fake_redis.hset(f"whisper:{drifted}", mapping={"negative": 2, "short": 2})
+
+    influx = influx_with(
+        influx_record("add", "👍", "a", earlier),
+        influx_record("add", "❤️", "b", earlier),
+        influx_record("add", "👎", "c", earlier),
+        influx_record("remove", "👎", "c", earlier),
+    )
+    with patch.object(db_manager, "influxdb_client", influx):
+        stats = await analyzer.reconcile_from_influx()
+
+    assert stats["users"] == 1 and stats["bots"] == 1
+    counts = await analyzer.get_reaction_aggregate("user", "u1", 3600, granularity="5m")
+    assert counts["positive"] == 2
+    assert counts["negative"] == 0
+    assert await analyzer.get_current_mood("u1") == "Happy"
+
+
+async def test_reconcile_keeps_open_bucket_counters(fake_redis, analyzer):
+    # Recorded live, not yet visible in InfluxDB (still buffered or after the query)
+    await react(analyzer, "u1", "👎", message_id="m1")
+    await react(analyzer, "u1", "👎", message_id="m2")
+
+    influx = influx_with(influx_record("add", "👍", "a", time.time() - 1200))
+    with patch.object(db_manager, "influxdb_client", influx):
+        await analyzer.reconcile_from_influx()
+
+    counts = await analyzer.get_reaction_aggregate("user", "u1", 3600, granularity="5m")
+    assert counts["positive"] == 1
+    assert counts["negative"] == 2
+
+
+async def test_no_redis_degrades_to_neutral(monkeypatch, analyzer):
+    monkeypatch.setattr(db_manager, "redis_client", None)
+    assert await analyzer.get_current_mood("u1") == "Neutral"
+    insights = await analyzer.analyze_user_feedback_patterns("u1")
+    assert insights["recommendations"] == []
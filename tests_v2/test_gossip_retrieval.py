@@ -0,0 +1,153 @@
+"""
+Tests for SharedArtifactManager.get_gossip_for_bot against an in-memory Qdrant:
+the time window and newest-first ordering are applied by the scroll itself
+(timestamp_epoch), privacy filters still hold, and both sources are queried
+concurrently.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+import src_v2.memory.manager as memory_module
+import src_v2.memory.shared_artifacts as shared_module
+from src_v2.memory.manager import MemoryManager
+from src_v2.memory.shared_artifacts import SharedArtifactManager
+from src_v2.utils.time_utils import to_epoch_seconds
+
+BOT_COLLECTION = "whisperengine_memory_elena"
+
+
+class TrackingClient:
+    """Delegates to the real client and records how many scrolls overlap."""
+
+    def __init__(self, client):
+        self._client = client
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.indexed = []
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    async def scroll(self, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.05)
+            return await self._client.scroll(**kwargs)
+        finally:
+            self.in_flight -= 1
+
+    async def create_payload_index(self, collection_name, field_name, field_schema, **kwargs):
+        self.indexed.append((collection_name, field_name))
+        return await self._client.create_payload_index(
+            collection_name=collection_name, field_name=field_name, field_schema=field_schema, **kwargs
+        )
+
+
+@pytest.fixture
+async def qdrant(monkeypatch):
+    client = AsyncQdrantClient(location=":memory:")
+    for name in (SharedArtifactManager.COLLECTION_NAME, BOT_COLLECTION):
+        await client.create_collection(name, vectors_config=VectorParams(size=4, distance=Distance.COSINE))
+    tracking = TrackingClient(client)
+    fake_db = SimpleNamespace(qdrant_client=tracking)
+    monkeypatch.setattr(shared_module, "db_manager", fake_db)
+    monkeypatch.setattr(memory_module, "db_manager", fake_db)
+    monkeypatch.setattr(MemoryManager, "_indexed_collections", set())
+    yield tracking
+    await client.close()
+
+
+@pytest.fixture
+def manager():
+    manager = SharedArtifactManager.__new__(SharedArtifactManager)
+    manager._indexes_ensured = False
+    return manager
+
+
+async def add_points(client, collection: str, payloads: list) -> None:
+    await client.upsert(collection, points=[
+        PointStruct(id=str(uuid.uuid4()), vector=[0.1, 0.2, 0.3, 0.4], payload=payload) for payload in payloads
+    ])
+
+
+def universe_gossip(minutes_ago: int, source_bot: str = "marcus", recipients=("elena", "ryan")) -> dict:
+    created = datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)
+    return {"type": "gossip", "content": f"{source_bot} {minutes_ago}m ago", "source_bot": source_bot,
+            "eligible_recipients": list(recipients), "topic": "weather",
+            "created_at": created.isoformat(), "timestamp_epoch": to_epoch_seconds(created)}
+
+
+def crossbot_gossip(minutes_ago: int) -> dict:
+    # Memory writers stamp naive local-clock timestamps
+    ts = datetime.now() - timedelta(minutes=minutes_ago)
+    return {"type": "gossip", "is_cross_bot": True, "content": f"heard {minutes_ago}m ago", "source_bot": "dotty",
+            "timestamp": ts.isoformat(), "timestamp_epoch": to_epoch_seconds(ts)}
+
+
+async def test_returns_newest_gossip_within_window(qdrant, manager):
+    # 40 eligible items spread over 4 hours, inserted oldest-last so insertion order is no help
+    await add_points(qdrant, SharedArtifactManager.COLLECTION_NAME, [universe_gossip(m) for m in range(5, 245, 6)])
+
+    gossip = await manager.get_gossip_for_bot("elena", hours=2, limit=10)
+
+    assert [g["content"] for g in gossip] == [f"marcus {m}m ago" for m in range(5, 65, 6)]
+    assert all(g["source"] == "universe" and not g["is_cross_bot"] for g in gossip)
+
+
+async def test_privacy_and_self_filters(qdrant, manager):
+    await add_points(qdrant, SharedArtifactManager.COLLECTION_NAME, [
+        universe_gossip(5, source_bot="elena"),
+        universe_gossip(6, recipients=("ryan",)),
+        universe_gossip(7),
+        {**universe_gossip(8), "type": "epiphany"},
+    ])
+
+    gossip = await manager.get_gossip_for_bot("elena", hours=1)
+
+    assert [g["content"] for g in gossip] == ["marcus 7m ago"]
+
+
+async def test_combines_sources_concurrently(qdrant, manager):
+    await add_points(qdrant, SharedArtifactManager.COLLECTION_NAME, [universe_gossip(m) for m in (10, 200)])
+    await add_points(qdrant, BOT_COLLECTION, [crossbot_gossip(m) for m in (3, 30, 300)]
+                     + [{**crossbot_gossip(4), "is_cross_bot": False}])
+
+    gossip = await manager.get_gossip_for_bot("elena", hours=2)
+
+    assert [(g["source"], g["content"]) for g in gossip] == [
+        ("universe", "marcus 10m ago"),
+        ("direct_chat", "heard 3m ago"),
+        ("direct_chat", "heard 30m ago"),
+    ]
+    assert qdrant.max_in_flight == 2
+
+
+async def test_indexes_created_once_and_missing_bot_collection_tolerated(qdrant, manager):
+    await add_points(qdrant, SharedArtifactManager.COLLECTION_NAME, [universe_gossip(5, recipients=("ryan",))])
+
+    await manager.get_gossip_for_bot("ryan", hours=1)
+    gossip = await manager.get_gossip_for_bot("ryan", hours=1)
+
+    assert [g["content"] for g in gossip] == ["marcus 5m ago"]
+    shared_fields = [f for c, f in qdrant.indexed if c == SharedArtifactManager.COLLECTION_NAME]
+    assert sorted(shared_fields) == ["eligible_recipients", "source_bot", "timestamp_epoch", "type"]
+
+
+async def test_store_artifact_writes_timestamp_epoch(qdrant, manager):
+    async def embed(text):
+        return [0.1, 0.2, 0.3, 0.4]
+    manager.embedding_service = SimpleNamespace(embed_query_async=embed)
+
+    await manager.store_artifact("gossip", "the lighthouse is back on", "marcus",
+                                 metadata={"eligible_recipients": ["elena"]})
+    gossip = await manager.get_gossip_for_bot("elena", hours=1)
+
+    assert [g["content"] for g in gossip] == ["the lighthouse is back on"]
@@ -0,0 +1,238 @@
+"""
+Tests for GraphWalker frontier expansion and batched trust trajectories.
+
+A seeded in-memory stand-in for Neo4j answers EXPAND_FRONTIER_QUERY the way
+the labelled lookups would, and counts round-trips so explore() can be
+checked (and benchmarked) without a database.
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src_v2.core.cache import cache_manager
+from src_v2.core.database import db_manager
+from src_v2.knowledge.walker import (
+    EXPAND_FRONTIER_QUERY,
+    ID_KEYED_LABELS,
+    NAME_KEYED_LABELS,
+    GraphWalker,
+)
+
+
+class SeededGraph:
+    """Undirected adjacency over (label, key) nodes, keyed like the real schema."""
+
+    def __init__(self):
+        self.nodes = {}
+        self.adjacency = {}
+
+    def add_node(self, label, key, **props):
+        field = "id" if label in ID_KEYED_LABELS else "name"
+        self.nodes[key] = (label, {field: key, **props})
+        self.adjacency.setdefault(key, [])
+
+    def add_edge(self, a, b, edge_type="RELATED", **props):
+        self.adjacency[a].append((b, edge_type, props))
+        self.adjacency[b].append((a, edge_type, props))
+
+
+class FakeResult:
+    def __init__(self, records):
+        self._records = records
+
+    async def data(self):
+        return self._records
+
+
+class FakeSession:
+    def __init__(self, driver):
+        self._driver = driver
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def run(self, query, frontier, visited, limit):
+        self._driver.queries.append(query)
+        if self._driver.latency:
+            await asyncio.sleep(self._driver.latency)
+
+        graph = self._driver.graph
+        visited = set(visited)
+        records = []
+        for source_key in dict.fromkeys(frontier):
+            if source_key not in graph.nodes:
+                continue
+            for neighbor_key, edge_type, edge_props in graph.adjacency[source_key]:
+                if neighbor_key in visited:
+                    continue
+                label, props = graph.nodes[neighbor_key]
+                records.append({
+                    "source_id": source_key,
+                    "neighbor_label": label,
+                    "neighbor_id": neighbor_key,
+                    "neighbor_name": props.get("name"),
+                    "edge_type": edge_type,
+                    "edge_props": edge_props,
+                    "neighbor_props": props,
+                })
+        return FakeResult(records[:limit])
+
+
+class FakeDriver:
+    def __init__(self, graph, latency=0.0):
+        self.graph = graph
+        self.latency = latency
+        self.queries = []
+
+    def session(self, **kwargs):
+        return FakeSession(self)
+
+
+class FakeRecord:
+    def __init__(self, user_id, value):
+        self.values = {"user_id": user_id}
+        self._value = value
+
+    def get_value(self):
+        return self._value
+
+
+class FakeTable:
+    def __init__(self, records):
+        self.records = records
+
+
+def seeded_graph(users: int = 20, topics: int = 10) -> SeededGraph:
+    graph = SeededGraph()
+    graph.add_node("User", "seed_user", mention_count=5)
+    for t in range(topics):
+        graph.add_node("Topic", f"topic_{t}", mention_count=8)
+        graph.add_edge("seed_user", f"topic_{t}", "DISCUSSED", count=3)
+    for u in range(users):
+        graph.add_node("User", f"user_{u}", trust_score=40)
+        graph.add_edge(f"topic_{u % topics}", f"user_{u}", "DISCUSSED", count=2)
+    return graph
+
+
+@pytest.fixture
+def influx():
+    client = MagicMock()
+    query_api = client.query_api.return_value
+
+    def answer(flux_query):
+        return [FakeTable([FakeRecord(f"user_{u}", 40.0 + i) for i in range(6)]) for u in range(20)]
+
+    query_api.query.side_effect = answer
+    return client
+
+
+@pytest.fixture
+def walker_env(influx):
+    driver = FakeDriver(seeded_graph())
+    with patch.object(db_manager, "neo4j_driver", driver), \
+         patch.object(db_manager, "influxdb_client", influx), \
+         patch.object(cache_manager, "get_json_many", AsyncMock(side_effect=lambda keys: [None] * len(keys))), \
+         patch.object(cache_manager, "set_json", AsyncMock(return_value=True)):
+        yield driver, influx
+
+
+def test_expand_query_uses_labelled_lookups():
+    for label in ID_KEYED_LABELS:
+        assert f"(source:{label} {{id: frontier_id}})" in EXPAND_FRONTIER_QUERY
+    for label in NAME_KEYED_LABELS:
+        assert f"(source:{label} {{name: frontier_id}})" in EXPAND_FRONTIER_QUERY
+    assert "Subject" in ID_KEYED_LABELS
+    assert "(source {" not in EXPAND_FRONTIER_QUERY
+    assert "UNWIND $frontier" in EXPAND_FRONTIER_QUERY
+
+
+def test_expand_query_falls_back_only_for_unresolved_ids():
+    fallback = EXPAND_FRONTIER_QUERY.index("MATCH (source) WHERE")
+    guard = EXPAND_FRONTIER_QUERY.index("WHERE size(resolved) = 0")
+    assert guard < fallback
+    assert EXPAND_FRONTIER_QUERY.count("MATCH (source) WHERE") == 1
+
+
+async def test_explore_issues_one_query_per_hop(walker_env):
+    driver, _ = walker_env
+
+    result = await GraphWalker().explore(
+        seed_ids=["seed_user"], bot_name="elena", max_depth=2, max_nodes=100, min_score=0.0
+    )
+
+    assert result.walk_stats["depth"] == 2
+    assert len(driver.queries) == 2
+    assert {f"user_{u}" for u in range(20)} <= {n.id for n in result.nodes if n.label == "User"}
+
+
+async def test_trust_trajectories_fetched_in_one_query_per_hop(walker_env):
+    _, influx = walker_env
+    walker = GraphWalker()
+
+    with patch.object(walker, "get_trust_trajectory", AsyncMock()) as single:
+        await walker.explore(
+            seed_ids=["seed_user"], bot_name="elena", max_depth=2, max_nodes=100, min_score=0.0
+        )
+
+    single.assert_not_called()
+    # Depth 1 finds topics only; depth 2 finds all 20 users in one Flux query
+    assert influx.query_api.return_value.query.call_count == 1
+    flux_query = influx.query_api.return_value.query.call_args.args[0]
+    assert "contains(value: r[\"user_id\"]" in flux_query
+    assert "\"user_19\"" in flux_query
+
+
+async def test_get_trust_trajectories_skips_cached_users(influx):
+    cached = {"trust_trajectory:elena:user_0:30": [10.0, 20.0]}
+
+    with patch.object(db_manager, "influxdb_client", influx), \
+         patch.object(cache_manager, "get_json_many", AsyncMock(side_effect=lambda keys: [cached.get(k) for k in keys])), \
+         patch.object(cache_manager, "set_json", AsyncMock(return_value=True)) as set_json:
+        trajectories = await GraphWalker().get_trust_trajectories(["user_0", "user_1", "user_1"], "elena")
+
+    assert trajectories["user_0"] == [10.0, 20.0]
+    assert trajectories["user_1"] == [40.0, 41.0, 42.0, 43.0, 44.0, 45.0]
+    flux_query = influx.query_api.return_value.query.call_args.args[0]
+    assert "\"user_0\"" not in flux_query
+    assert set_json.await_count >= 1
+
+
+async def test_get_trust_trajectories_without_influx():
+    with patch.object(db_manager, "influxdb_client", None):
+        assert await GraphWalker().get_trust_trajectories(["user_0"], "elena") == {}
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("users", [20, 60])
+async def test_explore_depth_two_benchmark(users, influx):
+    topics = 10
+    driver = FakeDriver(seeded_graph(users=users, topics=topics), latency=0.002)
+    influx_latency = 0.002
+
+    def slow_query(flux_query):
+        time.sleep(influx_latency)
+        return [FakeTable([FakeRecord(f"user_{u}", 40.0 + i) for i in range(6)]) for u in range(users)]
+
+    influx.query_api.return_value.query.side_effect = slow_query
+
+    with patch.object(db_manager, "neo4j_driver", driver), \
+         patch.object(db_manager, "influxdb_client", influx), \
+         patch.object(cache_manager, "get_json_many", AsyncMock(side_effect=lambda keys: [None] * len(keys))), \
+         patch.object(cache_manager, "set_json", AsyncMock(return_value=True)):
+        start = time.perf_counter()
+        result = await GraphWalker().explore(
+            seed_ids=["seed_user"], bot_name="elena", max_depth=2, max_nodes=100, min_score=0.0
+        )
+        elapsed = time.perf_counter() - start
+
+    influx_calls = influx.query_api.return_value.query.call_count
+    print(f"\n{users:>3} users: {len(result.nodes)} nodes in {elapsed * 1000:.1f}ms, "
+          f"{len(driver.queries)} Neo4j queries, {influx_calls} trust queries")
+    assert len(driver.queries) == 2
+    assert influx_calls == 1
@@ -0,0 +1,200 @@
+"""
+Tests for the batched UNWIND writes in KnowledgeManager (save_facts, add_memory_nodes)
+and the MemoryManager chunk path that routes through them.
+
+A recording fake Neo4j driver counts sessions, transactions and statements
+so the number of round-trips can be asserted without a database.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src_v2.core.cache import cache_manager
+from src_v2.core.database import db_manager
+from src_v2.knowledge.extractor import Fact
+from src_v2.knowledge.manager import KnowledgeManager, knowledge_manager
+from src_v2.memory.manager import CHUNK_THRESHOLD, MemoryManager, chunk_text
+
+
+class RecordingTx:
+    def __init__(self, driver):
+        self._driver = driver
+
+    async def run(self, query, **params):
+        self._driver.statements.append((query, params))
+        return MagicMock()
+
+
+class RecordingSession:
+    def __init__(self, driver):
+        self._driver = driver
+
+    async def __aenter__(self):
+        self._driver.sessions += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def run(self, query, **params):
+        # Auto-commit statement: one transaction, one round-trip
+        self._driver.transactions += 1
+        self._driver.statements.append((query, params))
+        return MagicMock()
+
+    async def execute_write(self, work, *args):
+        self._driver.transactions += 1
+        return await work(RecordingTx(self._driver), *args)
+
+
+class RecordingDriver:
+    def __init__(self):
+        self.sessions = 0
+        self.transactions = 0
+        self.statements = []
+
+    def session(self, **kwargs):
+        return RecordingSession(self)
+
+
+@pytest.fixture
+def driver():
+    driver = RecordingDriver()
+    with patch.object(db_manager, "neo4j_driver", driver), \
+         patch.object(db_manager, "postgres_pool", None), \
+         patch.object(cache_manager, "invalidate_tags", AsyncMock()), \
+         patch.object(knowledge_manager, "_get_known_bot_names", AsyncMock(return_value=set())):
+        yield driver
+
+
+def fact(predicate: str, obj: str, confidence: float = 0.9) -> Fact:
+    return Fact(subject="User", predicate=predicate, object=obj, confidence=confidence)
+
+
+async def test_save_facts_uses_one_transaction_for_any_batch_size(driver):
+    facts = [fact("OWNS", f"Guitar {i}") for i in range(25)]
+
+    await knowledge_manager.save_facts("u1", facts, bot_name="elena")
+
+    assert driver.sessions == 1
+    assert driver.transactions == 1
+    # No single-value/antonym predicates -> just the UNWIND merge
+    assert len(driver.statements) == 1
+    query, params = driver.statements[0]
+    assert "UNWIND $rows AS row" in query
+    assert [r["object_name"] for r in params["rows"]] == [f"Guitar {i}" for i in range(25)]
+
+
+async def test_save_facts_batches_conflict_deletes(driver):
+    facts = [
+        fact("LIVES_IN", "Paris"),
+        fact("LIKES", "Pizza"),
+        fact("OWNS", "Bike"),
+        fact("LIVES_IN", "Berlin"),   # replaces Paris
+        fact("HATES", "Pizza"),       # replaces LIKES Pizza
+    ]
+
+    await knowledge_manager.save_facts("u1", facts, bot_name="elena")
+
+    assert driver.transactions == 1
+    assert len(driver.statements) == 2
+    (delete_query, delete_params), (merge_query, merge_params) = driver.statements
+    assert "UNWIND $deletions AS d" in delete_query
+    assert delete_params["deletions"] == [
+        {"predicates": ["LIVES_IN"], "object_name": None},
+        {"predicates": ["HATES", "DISLIKES"], "object_name": "Pizza"},
+        {"predicates": ["LIVES_IN"], "object_name": None},
+        {"predicates": ["LIKES", "LOVES"], "object_name": "Pizza"},
+    ]
+    # Same end state as merging one at a time: overridden facts are not written
+    assert [(r["predicate"], r["object_name"]) for r in merge_params["rows"]] == [
+        ("OWNS", "Bike"), ("LIVES_IN", "Berlin"), ("HATES", "Pizza")
+    ]
+
+
+async def test_self_reflection_targets_character(driver):
+    await knowledge_manager.save_facts("u1", [fact("LOVES", "Astronomy")], bot_name="elena", is_self_reflection=True)
+
+    merge_query, params = driver.statements[-1]
+    assert "MERGE (s:Character {name: $bot_name})" in merge_query
+    assert params["bot_name"] == "elena"
+
+
+async def test_add_memory_nodes_single_statement(driver):
+    nodes = [
+        {"user_id": "u1", "vector_id": f"v{i}", "content": "x" * 80, "timestamp": "t", "source_type": "human_direct",
+         "bot_name": "elena", "author_id": "u1", "author_is_bot": False}
+        for i in range(10)
+    ]
+
+    await knowledge_manager.add_memory_nodes(nodes)
+
+    assert driver.sessions == 1
+    assert len(driver.statements) == 1
+    rows = driver.statements[0][1]["rows"]
+    assert len(rows) == 10
+    assert rows[0]["name"] == "x" * 50 + "..."
+
+
+async def test_add_memory_node_delegates_to_batch(driver):
+    await knowledge_manager.add_memory_node("u1", "v1", "short", "t", "inference", bot_name="elena", author_id="elena", author_is_bot=True)
+
+    (query, params), = driver.statements
+    assert "UNWIND $rows AS row" in query
+    assert params["rows"][0]["name"] == "short"
+    assert params["rows"][0]["author_is_bot"] is True
+
+
+def batch_embedding_service() -> MagicMock:
+    service = MagicMock()
+    service.embed_documents_async = AsyncMock(side_effect=lambda texts: [[0.1, 0.2] for _ in texts])
+    service.embed_query_async = AsyncMock(return_value=[0.1, 0.2])
+    return service
+
+
+async def test_chunked_message_writes_graph_nodes_in_one_round_trip(driver):
+    manager = MemoryManager(bot_name="batch_test")
+    manager.embedding_service = batch_embedding_service()
+    content = "The quick brown fox jumps over the lazy dog. " * ((CHUNK_THRESHOLD * 3) // 45)
+    expected_chunks = len(chunk_text(content))
+    assert expected_chunks > 1
+
+    qdrant = AsyncMock()
+    with patch.object(db_manager, "qdrant_client", qdrant), patch.object(db_manager, "influxdb_write_api", None):
+        await manager._save_vector_memory(user_id="u1", role="human", content=content, message_id="m1")
+
+    assert qdrant.upsert.await_count == 1
+    assert driver.sessions == 1
+    assert len(driver.statements) == 1
+    assert len(driver.statements[0][1]["rows"]) == expected_chunks
+
+
+async def test_20kb_document_round_trips(driver):
+    manager = MemoryManager(bot_name="batch_test")
+    manager.embedding_service = batch_embedding_service()
+    content = ("Paragraph about the lighthouse keeper and the storm. " * 400)[:20_000]
+    chunks = chunk_text(content)
+    assert len(chunks) > 30
+
+    qdrant = AsyncMock()
+    with patch.object(db_manager, "qdrant_client", qdrant), patch.object(db_manager, "influxdb_write_api", None):
+        await manager._save_vector_memory(user_id="u1", role="ai", content=content, message_id="doc-1")
+
+    # One embedding call, one Qdrant upsert and one Neo4j statement for every chunk
+    assert manager.embedding_service.embed_documents_async.await_count == 1
+    assert manager.embedding_service.embed_documents_async.await_args.args[0] == [c for c, _ in chunks]
+    manager.embedding_service.embed_query_async.assert_not_awaited()
+    assert qdrant.upsert.await_count == 1
+    points = qdrant.upsert.await_args.kwargs["points"]
+    assert [p.payload["chunk_index"] for p in points] == [i for _, i in chunks]
+    assert driver.sessions == 1
+    assert len(driver.statements) == 1
+    assert len(driver.statements[0][1]["rows"]) == len(chunks)
+
+
+def test_overrides_rules():
+    assert KnowledgeManager._overrides(fact("LIVES_IN", "Berlin"), fact("LIVES_IN", "Paris"))
+    assert KnowledgeManager._overrides(fact("HATES", "Pizza"), fact("LOVES", "Pizza"))
+    assert not KnowledgeManager._overrides(fact("HATES", "Pizza"), fact("LOVES", "Pasta"))
+    assert not KnowledgeManager._overrides(fact("OWNS", "Bike"), fact("OWNS", "Car"))
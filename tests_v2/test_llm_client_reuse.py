@@ -0,0 +1,116 @@
+"""
+Tests for LLM client reuse in create_llm: identical configurations share one
+ChatOpenAI instance and every model pointed at an endpoint shares one pooled
+HTTP client, checked against a local OpenAI-compatible stub that counts TCP
+connections.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from src_v2.agents import llm_factory
+from src_v2.agents.llm_factory import close_llm_clients, create_llm
+from src_v2.config.settings import settings
+
+
+class OpenAIStub:
+    """Minimal HTTP/1.1 keep-alive server answering /chat/completions."""
+
+    def __init__(self):
+        self.connections = 0
+        self.requests = []
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/v1"
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                request = json.loads(await reader.readexactly(int(headers.get("content-length", 0))))
+                self.requests.append(request)
+
+                body = json.dumps({
+                    "id": f"chatcmpl-{len(self.requests)}",
+                    "object": "chat.completion",
+                    "created": 0,
+                    "model": request["model"],
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": "ok"}}],
+                    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+                }).encode()
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                             + f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+                await writer.drain()
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.fixture
+async def stub(monkeypatch):
+    async with OpenAIStub() as stub:
+        monkeypatch.setattr(settings, "LLM_PROVIDER", "openai")
+        monkeypatch.setattr(settings, "LLM_BASE_URL", stub.url)
+        monkeypatch.setattr(settings, "LLM_MODEL_NAME", "test-model")
+        monkeypatch.setattr(settings, "LLM_REASONING_ENABLED", False)
+        # Modules imported by earlier tests build their models at import time
+        await close_llm_clients()
+        yield stub
+        await close_llm_clients()
+
+
+async def test_hundred_calls_reuse_one_connection(stub):
+    for i in range(100):
+        # Callers build their model per turn, at a few different temperatures
+        llm = create_llm(temperature=(0.2, 0.7)[i % 2], mode="main")
+        assert (await llm.ainvoke("hello")).content == "ok"
+
+    print(f"\n{len(stub.requests)} requests over {stub.connections} TCP connection(s)")
+    assert len(stub.requests) == 100
+    assert stub.connections == 1
+    assert len(llm_factory._llm_cache) == 2
+    assert len(llm_factory._http_clients) == 1
+
+
+async def test_identical_configurations_share_an_instance(stub):
+    assert create_llm(temperature=0.3, mode="main") is create_llm(temperature=0.3, mode="main")
+    assert create_llm(temperature=0.3, mode="main") is not create_llm(temperature=0.4, mode="main")
+
+    limited = create_llm(temperature=0.3, mode="main", max_tokens=64)
+    assert limited is not create_llm(temperature=0.3, mode="main")
+    await limited.ainvoke("hello")
+    request = stub.requests[-1]
+    assert request.get("max_tokens", request.get("max_completion_tokens")) == 64
+
+
+async def test_close_releases_clients(stub):
+    llm = create_llm(mode="main")
+    await llm.ainvoke("hello")
+
+    await close_llm_clients()
+
+    assert llm_factory._http_clients == {} and llm_factory._llm_cache == {}
+    assert (await create_llm(mode="main").ainvoke("hello")).content == "ok"
+    assert stub.connections == 2
@@ -0,0 +1,357 @@
+"""
+Tests for the write-behind memory ingestion queue (MemoryIngestionQueue)
+and its integration with MemoryManager.add_message / search_memories.
+"""
+
+import asyncio
+import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src_v2.core.cache import cache_manager
+from src_v2.core.database import db_manager
+from src_v2.memory.ingestion import MemoryIngestionQueue
+from src_v2.memory.manager import MemoryManager
+from src_v2.memory.models import MemorySourceType
+from src_v2.utils.time_utils import to_epoch_seconds
+
+
+def make_queue(handler, **kwargs):
+    kwargs.setdefault("max_size", 10)
+    kwargs.setdefault("concurrency", 2)
+    kwargs.setdefault("max_attempts", 3)
+    kwargs.setdefault("retry_base_delay", 0.01)
+    return MemoryIngestionQueue(handler, name="test_collection", **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_enqueue_returns_before_write_completes(fake_redis):
+    release = asyncio.Event()
+    written = []
+
+    async def slow_handler(**kwargs):
+        await release.wait()
+        written.append(kwargs["content"])
+
+    queue = make_queue(slow_handler)
+    await asyncio.wait_for(queue.enqueue(user_id="u1", content="hello"), timeout=0.5)
+
+    assert written == []
+    assert queue.pending_count() == 1
+    assert len(await cache_manager.hgetall(queue.journal_key)) == 1
+
+    release.set()
+    assert await queue.drain(timeout=1)
+    assert written == ["hello"]
+    assert queue.pending_count() == 0
+    assert await cache_manager.hgetall(queue.journal_key) == {}
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded(fake_redis):
+    in_flight = 0
+    peak = 0
+
+    async def handler(**kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    queue = make_queue(handler, concurrency=3, max_size=50)
+    for i in range(12):
+        await queue.enqueue(user_id="u1", content=f"m{i}")
+    await queue.drain(timeout=2)
+
+    assert peak == 3
+    assert queue.stats["completed"] == 12
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_applies_backpressure(fake_redis):
+    release = asyncio.Event()
+
+    async def handler(**kwargs):
+        await release.wait()
+
+    queue = make_queue(handler, concurrency=1, max_size=1)
+    await queue.enqueue(user_id="u1", content="a")  # taken by the worker
+    await asyncio.sleep(0)
+    await queue.enqueue(user_id="u1", content="b")  # fills the queue
+
+    blocked = asyncio.create_task(queue.enqueue(user_id="u1", content="c"))
+    await asyncio.sleep(0.05)
+    assert not blocked.done()
+
+    release.set()
+    await asyncio.wait_for(blocked, timeout=1)
+    await queue.drain(timeout=1)
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_retried_then_succeeds(fake_redis):
+    calls = 0
+
+    async def flaky_handler(**kwargs):
+        nonlocal calls
+        calls += 1
+        if calls < 3:
+            raise RuntimeError("qdrant unavailable")
+
+    queue = make_queue(flaky_handler)
+    await queue.enqueue(user_id="u1", content="retry me")
+    assert await queue.drain(timeout=2)
+
+    assert calls == 3
+    assert queue.stats["retried"] == 2
+    assert queue.stats["completed"] == 1
+    assert await cache_manager.hgetall(queue.journal_key) == {}
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_exhausted_job_is_dead_lettered(fake_redis):
+    async def broken_handler(**kwargs):
+        raise RuntimeError("permanent failure")
+
+    queue = make_queue(broken_handler, max_attempts=2)
+    await queue.enqueue(user_id="u1", content="poison", source_type=MemorySourceType.HUMAN_DIRECT)
+    assert await queue.drain(timeout=2)
+
+    assert queue.stats["dead_lettered"] == 1
+    assert queue.pending_count() == 0
+    assert await cache_manager.hgetall(queue.journal_key) == {}
+    assert await cache_manager.llen(queue.dead_letter_key) == 1
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_recover_replays_journal_from_previous_process(fake_redis):
+    async def never_runs(**kwargs):
+        await asyncio.Event().wait()
+
+    crashed = make_queue(never_runs)
+    await crashed.enqueue(user_id="u1", content="survives restart", source_type=MemorySourceType.HUMAN_DIRECT)
+    await crashed.stop(timeout=0.05)
+    # The crashed process stopped heartbeating long ago
+    await cache_manager.hset(crashed.owners_key, crashed.owner, "0")
+
+    replayed = []
+
+    async def handler(**kwargs):
+        replayed.append(kwargs)
+
+    restarted = make_queue(handler)
+    assert await restarted.recover() == 1
+    await restarted.drain(timeout=1)
+
+    assert replayed[0]["content"] == "survives restart"
+    assert replayed[0]["source_type"] is MemorySourceType.HUMAN_DIRECT
+    assert await cache_manager.hgetall(restarted.journal_key) == {}
+    assert await cache_manager.hgetall(crashed.journal_key) == {}
+    assert crashed.owner not in await cache_manager.hgetall(restarted.owners_key)
+    await restarted.stop()
+
+
+@pytest.mark.asyncio
+async def test_recover_leaves_live_process_journal_alone(fake_redis):
+    release = asyncio.Event()
+
+    async def slow_handler(**kwargs):
+        await release.wait()
+
+    worker = make_queue(slow_handler)
+    await worker.enqueue(user_id="u1", content="still in flight")
+
+    replayed = []
+
+    async def handler(**kwargs):
+        replayed.append(kwargs)
+
+    bot = make_queue(handler)
+    assert await bot.recover() == 0
+    assert len(await cache_manager.hgetall(worker.journal_key)) == 1
+
+    release.set()
+    assert await worker.drain(timeout=1)
+    assert replayed == []
+    await worker.stop()
+    await bot.stop()
+
+
+@pytest.mark.asyncio
+async def test_orphaned_journal_is_claimed_by_one_process(fake_redis):
+    async def never_runs(**kwargs):
+        await asyncio.Event().wait()
+
+    crashed = make_queue(never_runs)
+    for i in range(3):
+        await crashed.enqueue(user_id="u1", content=f"m{i}")
+    await crashed.stop(timeout=0.05)
+    await cache_manager.hset(crashed.owners_key, crashed.owner, "0")
+
+    first, second = make_queue(AsyncMock()), make_queue(AsyncMock())
+    recovered = await asyncio.gather(first.recover(), second.recover())
+
+    assert sorted(recovered) == [0, 3]
+    await first.drain(timeout=1)
+    await second.drain(timeout=1)
+    await first.stop()
+    await second.stop()
+
+
+@pytest.mark.asyncio
+async def test_recover_migrates_legacy_shared_journal(fake_redis):
+    async def never_runs(**kwargs):
+        await asyncio.Event().wait()
+
+    crashed = make_queue(never_runs)
+    await crashed.enqueue(user_id="u1", content="from before the upgrade")
+    legacy_key = "memory_ingest:journal:test_collection"
+    for job_id, raw in (await cache_manager.hgetall(crashed.journal_key)).items():
+        await cache_manager.hset(legacy_key, job_id, raw)
+    await cache_manager.delete(crashed.journal_key)
+    await cache_manager.hdel(crashed.owners_key, crashed.owner)
+    await crashed.stop(timeout=0.05)
+
+    handler = AsyncMock()
+    restarted = make_queue(handler)
+    assert await restarted.recover() == 1
+    await restarted.drain(timeout=1)
+
+    assert handler.await_args.kwargs["content"] == "from before the upgrade"
+    assert await cache_manager.hgetall(legacy_key) == {}
+    await restarted.stop()
+
+
+@pytest.mark.asyncio
+async def test_add_message_defers_vector_write_and_search_sees_pending(fake_redis):
+    manager = MemoryManager(bot_name="ingest_test")
+    release = asyncio.Event()
+    vector_writes = []
+
+    async def slow_vector_write(**kwargs):
+        await release.wait()
+        vector_writes.append(kwargs)
+
+    manager.ingestion_queue = make_queue(slow_vector_write)
+
+    vectors = {"I adopted a kitten named Miso": [1.0, 0.0], "what pet do I have": [0.9, 0.1]}
+    manager.embedding_service = MagicMock()
+    manager.embedding_service.embed_query_async = AsyncMock(side_effect=lambda text: vectors[text])
+
+    conn = AsyncMock()
+    conn.fetchrow.return_value = {"role": "human", "content": "I adopted a kitten named Miso", "user_id": "u1",
+                                  "user_name": "User", "timestamp": None, "author_id": "u1", "author_is_bot": False}
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+    pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    qdrant = AsyncMock()
+    qdrant.query_points.return_value = MagicMock(points=[])
+
+    with patch.object(db_manager, "postgres_pool", pool), patch.object(db_manager, "qdrant_client", qdrant):
+        await asyncio.wait_for(manager.add_message(
+            user_id="u1",
+            character_name="ingest_test",
+            role="human",
+            content="I adopted a kitten named Miso",
+            message_id="m-1"
+        ), timeout=0.5)
+
+        # Postgres row is written inline, vector write is still queued
+        conn.fetchrow.assert_awaited_once()
+        assert vector_writes == []
+
+        results = await manager.search_memories("what pet do I have", user_id="u1")
+        assert [r["content"] for r in results] == ["I adopted a kitten named Miso"]
+        assert results[0]["is_pending"] is True
+        assert results[0]["semantic_score"] > 0.9
+
+        # Other users don't see it
+        assert await manager.search_memories("what pet do I have", user_id="u2") == []
+
+    release.set()
+    await manager.ingestion_queue.drain(timeout=1)
+    assert vector_writes[0]["collection_name"] == "whisperengine_memory_ingest_test"
+    await manager.ingestion_queue.stop()
+
+
+class SentAt(datetime.datetime):
+    """datetime.now() frozen at the time the message was sent."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 3, 1, 12, 30, 0)
+
+
+@pytest.mark.asyncio
+async def test_replayed_job_keeps_the_message_time(fake_redis):
+    async def never_runs(**kwargs):
+        await asyncio.Event().wait()
+
+    manager = MemoryManager(bot_name="ingest_test")
+    manager.ingestion_queue = make_queue(never_runs)
+    manager.embedding_service = MagicMock()
+    manager.embedding_service.embed_query_async = AsyncMock(return_value=[1.0, 0.0])
+
+    conn = AsyncMock()
+    conn.fetchrow.return_value = None  # no window push
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+    pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+    with patch.object(db_manager, "postgres_pool", pool), patch("src_v2.memory.manager.datetime.datetime", SentAt):
+        await manager.add_message(user_id="u1", character_name="ingest_test", role="human",
+                                  content="sent before the crash", message_id="m-1")
+    await manager.ingestion_queue.stop(timeout=0.05)
+    crashed = manager.ingestion_queue
+    await cache_manager.hset(crashed.owners_key, crashed.owner, "0")
+
+    # Replayed after the restart, well after the message was sent
+    qdrant = AsyncMock()
+    restarted = make_queue(manager._save_vector_memory)
+    with patch.object(db_manager, "qdrant_client", qdrant), \
+         patch("src_v2.knowledge.manager.knowledge_manager.add_memory_node", AsyncMock()):
+        assert await restarted.recover() == 1
+        assert await restarted.drain(timeout=1)
+
+    payload = qdrant.upsert.await_args.kwargs["points"][0].payload
+    assert payload["timestamp"] == SentAt.now().isoformat()
+    assert payload["timestamp_epoch"] == to_epoch_seconds(SentAt.now())
+    await restarted.stop()
+
+
+@pytest.mark.asyncio
+async def test_search_pending_embeds_candidates_concurrently(fake_redis):
+    manager = MemoryManager(bot_name="ingest_test")
+    manager.ingestion_queue = make_queue(AsyncMock())
+    in_flight = 0
+    peak = 0
+
+    async def embed(text):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if text == "unembeddable":
+            raise RuntimeError("model unavailable")
+        return [1.0, 0.0]
+
+    manager.embedding_service = MagicMock()
+    manager.embedding_service.embed_query_async = embed
+    for content in ["first", "second", "unembeddable", "third"]:
+        manager.ingestion_queue._pending[content] = {
+            "id": content, "enqueued_at": 0.0,
+            "kwargs": {"user_id": "u1", "role": "human", "content": content}
+        }
+
+    results = await manager._search_pending([1.0, 0.0], "u1", "whisperengine_memory_ingest_test")
+
+    assert peak == 4
+    assert [r["content"] for r in results] == ["first", "second", "third"]
@@ -0,0 +1,175 @@
+"""
+Tests for numeric timestamp_epoch storage and the Qdrant-side time-range
+filtering / ordering in MemoryManager, plus the backfill script.
+
+Runs against Qdrant's in-process local mode (no server needed).
+"""
+
+import datetime
+import importlib.util
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from src_v2.core.database import db_manager
+from src_v2.memory.manager import MemoryManager
+from src_v2.utils.time_utils import to_epoch_seconds
+
+COLLECTION = "whisperengine_memory_epoch_test"
+
+
+def _load_backfill_script():
+    path = Path(__file__).parent.parent / "scripts" / "backfill_timestamp_epoch.py"
+    spec = importlib.util.spec_from_file_location("backfill_timestamp_epoch", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _point(point_id: int, hours_ago: float, with_epoch: bool = True, **payload) -> PointStruct:
+    ts = datetime.datetime.now() - datetime.timedelta(hours=hours_ago)
+    payload = {"user_id": "u1", "content": f"memory {point_id}", "timestamp": ts.isoformat(), **payload}
+    if with_epoch:
+        payload["timestamp_epoch"] = to_epoch_seconds(ts)
+    return PointStruct(id=point_id, vector=[1.0, 0.0], payload=payload)
+
+
+@pytest.fixture
+async def qdrant():
+    client = AsyncQdrantClient(location=":memory:")
+    await client.create_collection(COLLECTION, vectors_config=VectorParams(size=2, distance=Distance.COSINE))
+    with patch.object(db_manager, "qdrant_client", client):
+        yield client
+    await client.close()
+
+
+@pytest.fixture
+def manager():
+    manager = MemoryManager(bot_name="epoch_test")
+    manager.embedding_service = MagicMock()
+    manager.embedding_service.embed_query_async = AsyncMock(return_value=[1.0, 0.0])
+    return manager
+
+
+def test_to_epoch_seconds_reads_naive_as_local_time():
+    naive = datetime.datetime(2025, 6, 1, 12, 30)
+    assert to_epoch_seconds(naive) == to_epoch_seconds(naive.isoformat()) == int(naive.timestamp())
+    assert to_epoch_seconds("1970-01-02T01:00:00+01:00") == 86400
+    assert to_epoch_seconds("1970-01-02T00:00:00Z") == 86400
+    assert to_epoch_seconds(datetime.datetime(1970, 1, 2, tzinfo=datetime.timezone.utc)) == 86400
+    assert to_epoch_seconds("not a date") is None
+    assert to_epoch_seconds(None) is None
+
+
+async def test_get_summaries_since_is_filtered_and_ordered_in_qdrant(qdrant, manager):
+    await qdrant.upsert(COLLECTION, [
+        _point(1, 30, type="summary"),
+        _point(2, 2, type="summary"),
+        _point(3, 10, type="summary"),
+        _point(4, 1, type="conversation"),
+        _point(5, 5, type="summary"),
+    ])
+
+    with patch.object(qdrant, "scroll", wraps=qdrant.scroll) as scroll:
+        summaries = await manager.get_summaries_since(hours=24, limit=2)
+
+    assert [s["content"] for s in summaries] == ["memory 2", "memory 5"]
+    kwargs = scroll.call_args.kwargs
+    assert kwargs["limit"] == 2
+    assert kwargs["order_by"].key == "timestamp_epoch"
+
+
+async def test_high_meaningfulness_memories_are_filtered_in_qdrant(qdrant, manager):
+    await qdrant.upsert(COLLECTION, [
+        _point(1, 2, type="summary", meaningfulness_score=5),
+        _point(2, 3, type="summary", meaningfulness_score=2),
+        _point(3, 30, type="summary", meaningfulness_score=5),   # outside the window
+        _point(4, 1, type="summary", meaningfulness_score=4),
+        _point(5, 1, type="conversation", meaningfulness_score=5),
+        _point(6, 4, type="summary", meaningfulness_score=0.9),  # older 0-1 scale
+        _point(7, 4, type="summary", meaningfulness_score=0.3),
+        _point(8, 5, type="summary", meaningfulness_score=3),
+    ])
+
+    with patch.object(qdrant, "scroll", wraps=qdrant.scroll) as scroll:
+        memories = await manager.get_high_meaningfulness_memories(hours=24, limit=3, min_meaningfulness=0.6)
+
+    assert [(m["content"], m["meaningfulness_score"]) for m in memories] == [
+        ("memory 1", 1.0), ("memory 4", 0.8), ("memory 8", 0.6)
+    ]
+    # One scroll of exactly `limit`: the threshold and ranking run in Qdrant
+    assert scroll.call_count == 1
+    assert scroll.call_args.kwargs["limit"] == 3
+    assert scroll.call_args.kwargs["order_by"].key == "meaningfulness_score"
+
+    memories = await manager.get_high_meaningfulness_memories(hours=24, limit=10, min_meaningfulness=0.6)
+    assert sorted(m["content"] for m in memories) == ["memory 1", "memory 4", "memory 6", "memory 8"]
+
+
+async def test_get_recent_memories_orders_and_excludes_types(qdrant, manager):
+    await qdrant.upsert(COLLECTION, [
+        _point(1, 3, type="conversation"),
+        _point(2, 1, type="dream"),
+        _point(3, 2, type="conversation"),
+        _point(4, 4, type="conversation"),
+    ])
+
+    memories = await manager.get_recent_memories(limit=2, exclude_types=["dream"])
+
+    assert [m["id"] for m in memories] == [3, 1]
+
+
+async def test_search_memories_time_range_filters_in_qdrant(qdrant, manager):
+    today = datetime.datetime.now()
+    old = today - datetime.timedelta(days=40)
+    await qdrant.upsert(COLLECTION, [
+        _point(1, 1, role="human", message_id="m1"),
+        _point(2, 40 * 24, role="human", message_id="m2"),
+    ])
+
+    window = {"start": old.strftime("%Y-%m-%d"), "end": old.strftime("%Y-%m-%d")}
+    with patch.object(qdrant, "query_points", wraps=qdrant.query_points) as query_points:
+        results = await manager.search_memories("what happened", user_id="u1", limit=5, time_range=window)
+
+    assert [r["content"] for r in results] == ["memory 2"]
+    # No 20x over-fetch: the date window is part of the Qdrant filter
+    assert query_points.call_args.kwargs["limit"] == 15
+
+
+async def test_search_memories_falls_back_to_most_recent_in_window(qdrant, manager):
+    await qdrant.upsert(COLLECTION, [
+        _point(1, 1, role="human", message_id="m1"),
+        _point(2, 0.5, role="human", message_id="m2"),
+    ])
+    # Spans yesterday too, so the points stay in the window just after midnight
+    now = datetime.datetime.now()
+    window = {"start": (now - datetime.timedelta(days=1)).strftime("%Y-%m-%d"), "end": now.strftime("%Y-%m-%d")}
+
+    with patch.object(qdrant, "query_points", AsyncMock(return_value=MagicMock(points=[]))):
+        results = await manager.search_memories("what happened", user_id="u1", limit=1, time_range=window)
+
+    assert [r["content"] for r in results] == ["memory 2"]
+
+
+async def test_backfill_sets_epoch_only_where_missing(qdrant, manager):
+    backfill = _load_backfill_script()
+    await qdrant.upsert(COLLECTION, [
+        _point(1, 2, with_epoch=False, type="summary"),
+        _point(2, 1, type="summary"),
+        PointStruct(id=3, vector=[1.0, 0.0], payload={"type": "summary", "content": "no timestamp"}),
+    ])
+
+    dry = await backfill.backfill_collection(COLLECTION, dry_run=True)
+    assert dry == {"scanned": 2, "updated": 1, "skipped": 1, "errors": 0}
+    # Legacy point is invisible to epoch queries before the backfill
+    assert len(await manager.get_summaries_since(hours=24)) == 1
+
+    stats = await backfill.backfill_collection(COLLECTION)
+    assert stats["updated"] == 1
+
+    (point,) = await qdrant.retrieve(COLLECTION, ids=[1])
+    assert point.payload["timestamp_epoch"] == to_epoch_seconds(point.payload["timestamp"])
+    assert [s["content"] for s in await manager.get_summaries_since(hours=24)] == ["memory 2", "memory 1"]
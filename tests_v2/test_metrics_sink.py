@@ -0,0 +1,207 @@
+"""
+Tests for the buffered InfluxDB metrics sink, against a local HTTP stub that
+records /api/v2/write requests.
+"""
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock, patch
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from src_v2.core.database import db_manager
+from src_v2.core.metrics import MetricsSink
+
+
+class InfluxStub:
+    """Minimal HTTP/1.1 server answering every request with `status`."""
+
+    def __init__(self, status: int = 204):
+        self.status = status
+        self.requests = []
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                target = request_line.decode().split()[1]
+                self.requests.append({
+                    "path": urlparse(target).path,
+                    "params": {k: v[0] for k, v in parse_qs(urlparse(target).query).items()},
+                    "headers": headers,
+                    "lines": body.decode().splitlines(),
+                })
+                writer.write(f"HTTP/1.1 {self.status} X\r\nContent-Length: 0\r\n\r\n".encode())
+                await writer.drain()
+        finally:
+            writer.close()
+
+    @property
+    def lines(self) -> list:
+        return [line for request in self.requests for line in request["lines"]]
+
+
+async def wait_for(predicate, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+def line(i: int) -> str:
+    return f"memory_latency,operation=write duration_ms={i} {1_700_000_000_000_000_000 + i}"
+
+
+async def test_flushes_when_batch_is_full():
+    async with InfluxStub() as stub:
+        sink = MetricsSink(max_points=100, batch_size=5, flush_interval_s=60)
+        sink.configure(stub.url, token="secret", org="whisper")
+        sink.start()
+
+        for i in range(5):
+            sink.write(bucket="metrics", org="whisper", record=line(i))
+        await wait_for(lambda: len(stub.lines) == 5)
+        await sink.stop()
+
+    request = stub.requests[0]
+    assert request["path"] == "/api/v2/write"
+    assert request["params"] == {"bucket": "metrics", "org": "whisper", "precision": "ns"}
+    assert request["headers"]["authorization"] == "Token secret"
+    assert stub.lines == [line(i) for i in range(5)]
+    assert sink.get_stats()["flushed"] == 5
+
+
+async def test_flushes_on_interval_and_on_stop():
+    async with InfluxStub() as stub:
+        sink = MetricsSink(max_points=100, batch_size=1000, flush_interval_s=0.05)
+        sink.configure(stub.url, token=None, org="whisper")
+        sink.start()
+
+        sink.write(bucket="metrics", record=line(1))
+        await wait_for(lambda: len(stub.lines) == 1)
+
+        sink.write(bucket="metrics", record=line(2))
+        await sink.stop()
+
+    assert stub.lines == [line(1), line(2)]
+    # Missing org falls back to the configured default
+    assert stub.requests[0]["params"]["org"] == "whisper"
+    assert "authorization" not in stub.requests[0]["headers"]
+
+
+async def test_worker_shutdown_flushes_pending_points():
+    from src_v2.workers import worker
+
+    async with InfluxStub() as stub:
+        sink = MetricsSink(max_points=100, batch_size=1000, flush_interval_s=60)
+        sink.configure(stub.url, token=None, org="whisper")
+        sink.start()
+        sink.write(bucket="metrics", record=line(1))
+
+        with patch.multiple(db_manager, postgres_pool=None, qdrant_client=None, neo4j_driver=None,
+                            redis_client=None, influxdb_client=None, influxdb_write_api=sink), \
+             patch("src_v2.memory.manager.memory_manager.ingestion_queue.stop", AsyncMock()), \
+             patch("src_v2.universe.manager.universe_manager.stop", AsyncMock()), \
+             patch("src_v2.agents.llm_factory.close_llm_clients", AsyncMock()), \
+             patch.object(worker.cache_manager, "stop_invalidation_listener", AsyncMock()):
+            await worker.shutdown({})
+
+    assert stub.lines == [line(1)]
+
+
+async def test_drops_oldest_points_under_backpressure():
+    sink = MetricsSink(max_points=3, batch_size=100, flush_interval_s=60)
+
+    for i in range(5):
+        sink.write(bucket="metrics", record=line(i))
+
+    assert [entry[2] for entry in sink._buffer] == [line(2), line(3), line(4)]
+    assert sink.get_stats() == {"written": 5, "flushed": 0, "dropped": 2, "failed": 0, "batches": 0, "pending": 3}
+
+
+async def test_batches_are_capped_and_grouped_by_bucket():
+    async with InfluxStub() as stub:
+        sink = MetricsSink(max_points=100, batch_size=4, flush_interval_s=60)
+        sink.configure(stub.url, token=None, org="whisper")
+        for i in range(6):
+            sink.write(bucket="metrics" if i % 2 else "other", record=line(i))
+        sink.start()
+        await sink.stop()
+
+    assert all(len(r["lines"]) <= 4 for r in stub.requests)
+    assert sorted(stub.lines) == sorted(line(i) for i in range(6))
+    assert {r["params"]["bucket"] for r in stub.requests} == {"metrics", "other"}
+
+
+async def test_server_errors_are_counted_not_raised():
+    async with InfluxStub(status=500) as stub:
+        sink = MetricsSink(max_points=100, batch_size=2, flush_interval_s=60)
+        sink.configure(stub.url, token=None, org="whisper")
+        sink.start()
+
+        sink.write(bucket="metrics", record=[line(1), line(2)])
+        await wait_for(lambda: sink.stats["failed"] == 2)
+        await sink.stop()
+
+    assert sink.stats["flushed"] == 0
+    assert sink.pending == 0
+
+
+async def test_write_from_another_thread_wakes_flusher():
+    async with InfluxStub() as stub:
+        sink = MetricsSink(max_points=100, batch_size=3, flush_interval_s=60)
+        sink.configure(stub.url, token=None, org="whisper")
+        sink.start()
+
+        thread = threading.Thread(target=lambda: [sink.write(bucket="metrics", record=line(i)) for i in range(3)])
+        thread.start()
+        thread.join()
+        await wait_for(lambda: len(stub.lines) == 3)
+        await sink.stop()
+
+
+async def test_unreachable_server_does_not_block_writes():
+    sink = MetricsSink(max_points=10, batch_size=1, flush_interval_s=60, timeout_s=0.2)
+    sink.configure("http://127.0.0.1:9", token=None, org="whisper")
+    sink.start()
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for i in range(50):
+        sink.write(bucket="metrics", record=line(i))
+    assert loop.time() - start < 0.1
+
+    await sink.stop()
+    assert sink.stats["dropped"] + sink.stats["failed"] + sink.pending == 50
+
+
+def test_point_records_are_serialized():
+    influxdb_client = pytest.importorskip("influxdb_client")
+    sink = MetricsSink(max_points=10, batch_size=10, flush_interval_s=60)
+
+    sink.write(bucket="metrics", record=influxdb_client.Point("reaction").tag("bot", "elena").field("value", 1))
+
+    assert sink._buffer[0][2] == "reaction,bot=elena value=1i"
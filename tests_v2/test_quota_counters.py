@@ -0,0 +1,180 @@
+"""
+Tests for the Redis-backed daily quota counters (QuotaManager) and the cached
+privacy settings (PrivacyManager), against fakeredis and a mocked Postgres.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from src_v2.config.settings import settings
+from src_v2.core.cache import cache_manager
+from src_v2.core.database import db_manager
+from src_v2.core.quota import QuotaManager
+from src_v2.intelligence.timezone import UserTimeSettings
+from src_v2.universe.privacy import PrivacyManager
+
+
+@pytest.fixture(autouse=True)
+def empty_l1():
+    cache_manager.clear_l1()
+    yield
+    cache_manager.clear_l1()
+
+
+@pytest.fixture
+def postgres(monkeypatch):
+    monkeypatch.setattr(settings, "DAILY_IMAGE_QUOTA", 5)
+    monkeypatch.setattr(settings, "QUOTA_FLUSH_INTERVAL_SECONDS", 60.0)
+    conn = AsyncMock()
+    conn.fetchrow.return_value = None
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+    pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+    with patch.object(db_manager, "postgres_pool", pool), \
+         patch("src_v2.core.quota.timezone_manager.get_user_time_settings",
+               AsyncMock(return_value=UserTimeSettings(timezone="Asia/Tokyo"))):
+        yield conn
+
+
+async def test_concurrent_reservations_never_exceed_limit(fake_redis, postgres):
+    # Two managers stand in for two bot processes sharing Redis
+    managers = [QuotaManager(), QuotaManager()]
+
+    results = await asyncio.gather(*(
+        managers[i % 2].reserve("u1", "image", "elena") for i in range(40)
+    ))
+
+    assert results.count(True) == 5
+    assert await managers[0].get_usage("u1", "image", "elena") == 5
+    assert not await managers[1].check_quota("u1", "image", "elena")
+    for manager in managers:
+        await manager.stop()
+
+
+async def test_release_returns_a_unit(fake_redis, postgres):
+    manager = QuotaManager()
+    for _ in range(5):
+        assert await manager.reserve("u2", "image", "elena")
+    assert not await manager.reserve("u2", "image", "elena")
+
+    await manager.release("u2", "image", "elena")
+
+    assert await manager.reserve("u2", "image", "elena")
+    assert not await manager.reserve("u2", "image", "elena")
+    await manager.stop()
+
+
+async def test_counter_expires_at_users_local_midnight(fake_redis, postgres):
+    manager = QuotaManager()
+    await manager.increment_usage("u3", "audio", "elena")
+
+    now = datetime.now(ZoneInfo("Asia/Tokyo"))
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=ZoneInfo("Asia/Tokyo"))
+    key = cache_manager._key(f"quota:audio:u3:{now.date().isoformat()}")
+
+    assert await fake_redis.get(key) == "1"
+    assert abs(await fake_redis.expiretime(key) - midnight.timestamp()) <= 1
+    await manager.stop()
+
+
+async def test_counter_is_seeded_from_postgres(fake_redis, postgres):
+    postgres.fetchrow.return_value = {"image_count": 4, "audio_count": 2}
+    manager = QuotaManager()
+
+    assert await manager.reserve("u4", "image", "elena")
+    assert not await manager.reserve("u4", "image", "elena")
+    assert await manager.get_usage("u4", "audio", "elena") == 2
+    # One seed read for the day, however many checks follow
+    assert postgres.fetchrow.await_count == 1
+    await manager.stop()
+
+
+async def test_flush_writes_counts_in_one_statement(fake_redis, postgres):
+    manager = QuotaManager()
+    for user_id in ("a", "b", "c"):
+        await manager.reserve(user_id, "image", "elena")
+    await manager.increment_usage("a", "audio", "elena")
+
+    assert postgres.execute.await_count == 0  # nothing written on the request path
+    assert await manager.flush() == 3
+
+    query, user_ids, days, images, audios = postgres.execute.await_args.args
+    assert "unnest" in query and "GREATEST" not in query
+    assert sorted(zip(user_ids, images, audios)) == [("a", 1, 1), ("b", 1, 0), ("c", 1, 0)]
+    assert await manager.flush() == 0
+
+
+async def test_release_after_flush_lowers_the_stored_count(fake_redis, postgres):
+    manager = QuotaManager()
+    await manager.reserve("u6", "image", "elena")
+    await manager.reserve("u6", "image", "elena")
+    await manager.flush()
+
+    await manager.release("u6", "image", "elena")
+    assert await manager.flush() == 1
+
+    # Redis is the authority: its count replaces the stored one, down as well as up
+    _, user_ids, _, images, audios = postgres.execute.await_args.args
+    assert (user_ids, images, audios) == (["u6"], [1], [0])
+
+
+async def test_whitelisted_users_bypass_counters(fake_redis, postgres, monkeypatch):
+    monkeypatch.setattr(settings, "QUOTA_WHITELIST", "vip")
+    manager = QuotaManager()
+
+    assert all([await manager.reserve("vip", "image") for _ in range(10)])
+    assert await fake_redis.keys("*quota:image:vip*") == []
+
+
+async def test_redis_down_falls_back_to_postgres(postgres, monkeypatch):
+    monkeypatch.setattr(db_manager, "redis_client", None)
+    postgres.fetchrow.return_value = {"image_count": 5, "audio_count": 0}
+    manager = QuotaManager()
+
+    assert not await manager.reserve("u5", "image")
+    postgres.fetchrow.return_value = {"image_count": 1, "audio_count": 0}
+    assert await manager.reserve("u5", "image")
+    assert "INSERT INTO v2_user_daily_usage" in postgres.execute.await_args.args[0]
+
+
+@pytest.fixture
+def privacy_db():
+    conn = AsyncMock()
+    conn.fetchrow.return_value = {
+        "share_with_other_bots": False, "share_across_planets": True,
+        "allow_bot_introductions": False, "invisible_mode": False,
+    }
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+    pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+    with patch.object(db_manager, "postgres_pool", pool):
+        yield conn
+
+
+async def test_privacy_settings_are_cached(fake_redis, privacy_db):
+    manager = PrivacyManager()
+
+    for _ in range(5):
+        assert (await manager.get_settings("p1"))["share_with_other_bots"] is False
+
+    assert privacy_db.fetchrow.await_count == 1
+
+
+async def test_privacy_update_replaces_cached_settings(fake_redis, privacy_db):
+    manager = PrivacyManager()
+    await manager.get_settings("p2")
+
+    privacy_db.fetchrow.return_value = {**privacy_db.fetchrow.return_value, "invisible_mode": True}
+    await manager.update_settings("p2", invisible_mode=True)
+    reads = privacy_db.fetchrow.await_count
+
+    assert (await manager.get_settings("p2"))["invisible_mode"] is True
+    assert privacy_db.fetchrow.await_count == reads
+
+    await manager.invalidate("p2")
+    await manager.get_settings("p2")
+    assert privacy_db.fetchrow.await_count == reads + 1
@@ -0,0 +1,175 @@
+"""
+Tests for the Redis recent-history windows behind MemoryManager.get_recent_history
+(seeded from Postgres, kept current by add_message) and the CacheManager window
+primitives (against fakeredis).
+"""
+
+import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src_v2.config.settings import settings
+from src_v2.core.cache import cache_manager
+from src_v2.core.database import db_manager
+from src_v2.memory.manager import MemoryManager
+
+
+def db_row(i: int, role: str = "human", user_id: str = "u1") -> dict:
+    return {
+        "role": role,
+        "content": f"message {i}",
+        "user_id": user_id,
+        "user_name": "Mark",
+        "timestamp": datetime.datetime(2025, 12, 20, 12, 0) + datetime.timedelta(minutes=i),
+        "author_id": user_id,
+        "author_is_bot": False,
+    }
+
+
+def inserted_row(query, *args) -> dict:
+    """What INSERT ... RETURNING gives back for add_message's parameters."""
+    user_id, _, role, content, user_name, _, _, author_id, author_is_bot = args[:9]
+    return {
+        "role": role, "content": content, "user_id": user_id, "user_name": user_name,
+        "timestamp": datetime.datetime.now(datetime.timezone.utc),
+        "author_id": author_id, "author_is_bot": author_is_bot,
+    }
+
+
+@pytest.fixture
+def postgres():
+    # Newest-first, as returned by ORDER BY timestamp DESC
+    rows = [db_row(i) for i in reversed(range(5))]
+    conn = AsyncMock()
+    conn.fetch = AsyncMock(side_effect=lambda query, *args: rows[: args[-1]])
+    conn.fetchrow = AsyncMock(side_effect=inserted_row)
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+    pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+    with patch.object(db_manager, "postgres_pool", pool):
+        yield conn
+
+
+@pytest.fixture
+def manager():
+    manager = MemoryManager(bot_name="history_test")
+    manager._save_vector_memory = AsyncMock()
+    manager.ingestion_queue.enqueue = AsyncMock()
+    return manager
+
+
+def contents(messages) -> list:
+    return [m.content.split(" (")[0] for m in messages]
+
+
+async def test_second_read_skips_postgres(fake_redis, postgres, manager):
+    first = await manager.get_recent_history("u1", "elena", limit=3)
+    second = await manager.get_recent_history("u1", "elena", limit=3)
+
+    assert contents(first) == contents(second) == ["message 2", "message 3", "message 4"]
+    assert postgres.fetch.await_count == 1
+    # The window is seeded with a full HISTORY_WINDOW_SIZE read, not just `limit`
+    assert postgres.fetch.await_args.args[-1] == settings.HISTORY_WINDOW_SIZE
+
+
+async def test_add_message_updates_seeded_window(fake_redis, postgres, manager):
+    await manager.get_recent_history("u1", "elena", limit=3)
+
+    await manager.add_message("u1", "elena", "ai", "fresh reply", message_id="m-new")
+    history = await manager.get_recent_history("u1", "elena", limit=3)
+
+    assert contents(history) == ["message 3", "message 4", "fresh reply"]
+    assert postgres.fetch.await_count == 1
+
+
+async def test_unseeded_window_is_not_served(fake_redis, postgres, manager):
+    # Pushes alone (e.g. after a restart) don't make the window authoritative
+    await manager.add_message("u1", "elena", "human", "only pushed", message_id="m-1")
+
+    history = await manager.get_recent_history("u1", "elena", limit=3)
+
+    assert postgres.fetch.await_count == 1
+    assert contents(history) == ["message 2", "message 3", "message 4"]
+
+
+async def test_duplicate_message_is_not_pushed(fake_redis, postgres, manager):
+    await manager.get_recent_history("u1", "elena", limit=10)
+    postgres.fetchrow.side_effect = None
+    postgres.fetchrow.return_value = None  # ON CONFLICT DO NOTHING
+
+    await manager.add_message("u1", "elena", "human", "duplicate", message_id="m-dup")
+    history = await manager.get_recent_history("u1", "elena", limit=10)
+
+    assert "duplicate" not in contents(history)
+
+
+async def test_channel_and_user_windows_are_separate(fake_redis, postgres, manager):
+    await manager.get_recent_history("u1", "elena", limit=5, channel_id="c1")
+    await manager.get_recent_history("u1", "elena", limit=5)
+
+    await manager.add_message("u1", "elena", "human", "in channel", user_name="Mark", channel_id="c1", message_id="m-c1")
+    channel = await manager.get_recent_history("u1", "elena", limit=5, channel_id="c1")
+    dm = await manager.get_recent_history("u1", "elena", limit=5)
+
+    assert postgres.fetch.await_count == 2
+    assert "[Mark]: in channel" in channel[0].content
+    assert contents(dm)[-1] == "in channel"
+
+
+async def test_large_limit_goes_to_postgres(fake_redis, postgres, manager):
+    await manager.get_recent_history("u1", "elena", limit=settings.HISTORY_WINDOW_SIZE + 1)
+    await manager.get_recent_history("u1", "elena", limit=settings.HISTORY_WINDOW_SIZE + 1)
+
+    assert postgres.fetch.await_count == 2
+
+
+async def test_clear_memory_drops_windows(fake_redis, postgres, manager):
+    await manager.get_recent_history("u1", "elena", limit=3)
+    with patch.object(db_manager, "qdrant_client", None):
+        await manager.clear_memory("u1", "elena")
+
+    await manager.get_recent_history("u1", "elena", limit=3)
+    assert postgres.fetch.await_count == 2
+
+
+async def test_push_after_a_seed_that_read_the_row_is_not_duplicated(fake_redis, postgres, manager):
+    rows = [db_row(i) for i in reversed(range(5))]
+
+    async def add_then_seed(*args, **kwargs):
+        # The seed runs between the INSERT and add_message's push
+        row = inserted_row(*args)
+        rows.insert(0, row)
+        await manager.get_recent_history("u1", "elena", limit=10)
+        return row
+
+    postgres.fetch.side_effect = lambda query, *args: rows[: args[-1]]
+    postgres.fetchrow.side_effect = add_then_seed
+    await manager.add_message("u1", "elena", "ai", "fresh reply", message_id="m-new")
+    history = await manager.get_recent_history("u1", "elena", limit=10)
+
+    assert contents(history).count("fresh reply") == 1
+    assert postgres.fetch.await_count == 1
+
+
+async def test_load_window_skips_seed_when_pushed_concurrently(fake_redis):
+    async def loader():
+        # A writer lands between the Postgres read and the seed
+        await cache_manager.push_window("history:test", "newer", max_len=5, ttl=60)
+        return ["older"]
+
+    assert await cache_manager.load_window("history:test", loader, max_len=5, ttl=60) == ["older"]
+    assert await cache_manager.get_window("history:test", 5) is None
+
+    assert await cache_manager.load_window("history:test", AsyncMock(return_value=["a", "b"]), max_len=5, ttl=60) == ["a", "b"]
+    assert await cache_manager.get_window("history:test", 5) == ["a", "b"]
+
+
+async def test_window_is_capped(fake_redis):
+    await cache_manager.load_window("history:cap", AsyncMock(return_value=[]), max_len=3, ttl=60)
+    assert await cache_manager.get_window("history:cap", 3) == []
+
+    for i in range(5):
+        await cache_manager.push_window("history:cap", str(i), max_len=3, ttl=60)
+
+    assert await cache_manager.get_window("history:cap", 10) == ["4", "3", "2"]
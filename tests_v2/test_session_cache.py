@@ -0,0 +1,186 @@
+"""
+Tests for the Redis-cached active session in SessionManager: coalesced
+updated_at writes, cache-aware staleness in get_stale_sessions, and
+invalidation on close (against fakeredis and a mocked Postgres connection).
+"""
+
+import ast
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from pathlib import Path
+from uuid import UUID
+
+import pytest
+
+from src_v2.config.settings import settings
+from src_v2.core.cache import cache_manager
+from src_v2.core.database import db_manager
+from src_v2.memory.session import SessionManager
+
+MIGRATIONS = Path(__file__).resolve().parent.parent / "migrations_v2" / "versions"
+# SQLAlchemy column types -> the Postgres array casts that compare with them
+PG_CASTS = {"UUID": {"uuid"}, "String": {"text", "varchar"}, "Text": {"text", "varchar"}}
+
+SESSION_ID = "00000000-0000-0000-0000-000000000001"
+NEW_SESSION_ID = "00000000-0000-0000-0000-000000000002"
+# The Postgres path compares against the real clock, so the fake clock starts at "now"
+T0 = time.time()
+
+
+class Clock:
+    def __init__(self, now: float = T0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    clock = Clock()
+    with patch("src_v2.memory.session.time.time", clock):
+        yield clock
+
+
+@pytest.fixture
+def postgres(monkeypatch):
+    monkeypatch.setattr(settings, "SESSION_ACTIVITY_PERSIST_SECONDS", 60)
+    conn = AsyncMock()
+    state = {"updated_at": datetime.fromtimestamp(T0, tz=timezone.utc)}
+
+    async def fetchrow(query, *args):
+        if "RETURNING user_id" in query:
+            return {"user_id": "u1", "character_name": "elena"}
+        return {"id": UUID(SESSION_ID), "updated_at": state["updated_at"]}
+
+    conn.fetchrow = AsyncMock(side_effect=fetchrow)
+    conn.fetchval = AsyncMock(return_value=UUID(NEW_SESSION_ID))
+    conn.fetch = AsyncMock(return_value=[])
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+    pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+    with patch.object(db_manager, "postgres_pool", pool):
+        yield conn
+
+
+def activity_writes(conn) -> int:
+    return sum(1 for c in conn.execute.await_args_list if "SET updated_at = NOW()" in c.args[0])
+
+
+async def test_touches_are_coalesced(fake_redis, clock, postgres):
+    manager = SessionManager()
+
+    for i in range(20):
+        clock.now = T0 + i * 2  # 20 messages over 40s
+        assert await manager.get_active_session("u1", "elena") == SESSION_ID
+
+    # One lookup and one updated_at write for 20 messages
+    assert postgres.fetchrow.await_count == 1
+    assert activity_writes(postgres) == 1
+
+    clock.now = T0 + 61
+    await manager.get_active_session("u1", "elena")
+    assert activity_writes(postgres) == 2
+
+
+async def test_cache_survives_restart(fake_redis, clock, postgres):
+    await SessionManager().get_active_session("u1", "elena")
+
+    clock.now = T0 + 5
+    assert await SessionManager().get_active_session("u1", "elena") == SESSION_ID
+
+    assert postgres.fetchrow.await_count == 1
+    assert activity_writes(postgres) == 1
+
+
+async def test_cached_session_times_out(fake_redis, clock, postgres):
+    manager = SessionManager()
+    await manager.get_active_session("u1", "elena")
+    clock.now = T0 + 30  # Activity not yet persisted
+    await manager.get_active_session("u1", "elena")
+
+    clock.now = T0 + 30 + manager.SESSION_TIMEOUT_MINUTES * 60 + 1
+    with patch.object(manager, "_process_stale_session", AsyncMock()) as process:
+        assert await manager.get_active_session("u1", "elena") == NEW_SESSION_ID
+
+    process.assert_awaited_once_with(SESSION_ID, "u1", "elena")
+    # The unpersisted last activity is written before post-processing reads the message range
+    persisted = [c for c in postgres.execute.await_args_list if "unnest" in c.args[0]]
+    assert persisted[0].args[1] == [SESSION_ID]
+    assert persisted[0].args[2] == [datetime.fromtimestamp(T0 + 30, tz=timezone.utc)]
+
+    cached = await cache_manager.get_json(manager._session_cache_key("u1", "elena"))
+    assert cached["id"] == NEW_SESSION_ID
+
+
+async def test_stale_sessions_respect_cached_activity(fake_redis, postgres):
+    manager = SessionManager()
+    now = datetime.now(timezone.utc)
+    rows = [
+        {"id": UUID(SESSION_ID), "user_id": "u1", "character_name": "elena",
+         "start_time": now - timedelta(hours=2), "updated_at": now - timedelta(minutes=31)},
+        {"id": UUID(NEW_SESSION_ID), "user_id": "u2", "character_name": "elena",
+         "start_time": now - timedelta(hours=2), "updated_at": now - timedelta(minutes=45)},
+    ]
+    postgres.fetch.return_value = rows
+    # u1 was active 10s ago but updated_at hasn't been persisted yet
+    await manager._cache_session("u1", "elena", SESSION_ID, now.timestamp() - 10, now.timestamp() - 31 * 60)
+
+    stale = await manager.get_stale_sessions(timeout_minutes=30)
+
+    assert [s["id"] for s in stale] == [UUID(NEW_SESSION_ID)]
+    persisted = [c for c in postgres.execute.await_args_list if "unnest" in c.args[0]]
+    assert persisted[0].args[1] == [SESSION_ID]
+
+
+async def test_close_session_drops_cache_entry(fake_redis, clock, postgres):
+    manager = SessionManager()
+    await manager.get_active_session("u1", "elena")
+
+    await manager.close_session(SESSION_ID)
+
+    assert await cache_manager.get_json(manager._session_cache_key("u1", "elena")) is None
+    await manager.get_active_session("u1", "elena")
+    assert postgres.fetchrow.await_count == 3  # lookup, close, lookup
+
+
+async def test_close_keeps_newer_cached_session(fake_redis, clock, postgres):
+    manager = SessionManager()
+    await manager._cache_session("u1", "elena", NEW_SESSION_ID, T0, T0)
+
+    await manager.close_session(SESSION_ID)
+
+    cached = await cache_manager.get_json(manager._session_cache_key("u1", "elena"))
+    assert cached["id"] == NEW_SESSION_ID
+
+
+def session_id_column_type() -> str:
+    """Replays the upgrade() migrations in order to find v2_conversation_sessions.id's current type."""
+    column_type = None
+    for path in sorted(MIGRATIONS.glob("*.py")):
+        tree = ast.parse(path.read_text())
+        upgrade = next((n for n in tree.body if isinstance(n, ast.FunctionDef) and n.name == "upgrade"), None)
+        for call in ast.walk(upgrade) if upgrade else []:
+            if not isinstance(call, ast.Call):
+                continue
+            args = [a.value for a in call.args if isinstance(a, ast.Constant)]
+            if getattr(call.func, "attr", None) == "create_table" and args[:1] == ["v2_conversation_sessions"]:
+                for column in call.args[1:]:
+                    is_column = isinstance(column, ast.Call) and getattr(column.func, "attr", None) == "Column"
+                    if is_column and isinstance(column.args[0], ast.Constant) and column.args[0].value == "id":
+                        column_type = ast.unparse(column.args[1]).split("(")[0].split(".")[-1]
+            if getattr(call.func, "attr", None) == "alter_column" and args[:2] == ["v2_conversation_sessions", "id"]:
+                new_type = next(k.value for k in call.keywords if k.arg == "type_")
+                column_type = ast.unparse(new_type).split("(")[0].split(".")[-1]
+    return column_type
+
+
+async def test_persisted_ids_are_cast_to_the_column_type(fake_redis, postgres):
+    """The id array must compare with the migrated column; Postgres has no varchar = uuid."""
+    await SessionManager()._persist_session_activity({SESSION_ID: T0})
+
+    query = next(c.args[0] for c in postgres.execute.await_args_list if "unnest" in c.args[0])
+    id_cast = re.search(r"unnest\(\$1::(\w+)\[\]", query).group(1)
+    assert id_cast in PG_CASTS[session_id_column_type()]
@@ -0,0 +1,93 @@
+"""
+Tests for reusing one query embedding per turn: precomputed query_vector on the
+MemoryManager search methods, and search_memories_batch (user + broadcast in a
+single Qdrant query_batch_points call).
+
+Runs against Qdrant's in-process local mode (no server needed).
+"""
+
+import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from src_v2.core.database import db_manager
+from src_v2.memory.manager import MemoryManager
+from src_v2.utils.time_utils import to_epoch_seconds
+
+COLLECTION = "whisperengine_memory_vector_test"
+
+
+def _point(point_id: int, user_id: str, vector, hours_ago: float = 1, **payload) -> PointStruct:
+    ts = datetime.datetime.now() - datetime.timedelta(hours=hours_ago)
+    payload = {
+        "user_id": user_id,
+        "content": f"memory {point_id}",
+        "timestamp": ts.isoformat(),
+        "timestamp_epoch": to_epoch_seconds(ts),
+        **payload,
+    }
+    return PointStruct(id=point_id, vector=vector, payload=payload)
+
+
+@pytest.fixture
+async def qdrant():
+    client = AsyncQdrantClient(location=":memory:")
+    await client.create_collection(COLLECTION, vectors_config=VectorParams(size=2, distance=Distance.COSINE))
+    await client.upsert(COLLECTION, [
+        _point(1, "u1", [1.0, 0.0]),
+        _point(2, "u1", [0.6, 0.8], hours_ago=30),
+        _point(3, "u2", [1.0, 0.0]),
+        _point(4, "__broadcast__", [0.9, 0.1]),
+        _point(5, "__broadcast__", [0.0, 1.0]),
+        _point(6, "u1", [1.0, 0.0], type="reasoning_trace", metadata={"complexity": "COMPLEX_MID"}),
+    ])
+    with patch.object(db_manager, "qdrant_client", client):
+        yield client
+    await client.close()
+
+
+@pytest.fixture
+def manager():
+    manager = MemoryManager(bot_name="vector_test")
+    manager.embedding_service = MagicMock()
+    manager.embedding_service.embed_query_async = AsyncMock(return_value=[1.0, 0.0])
+    return manager
+
+
+async def test_batch_matches_individual_searches(qdrant, manager):
+    single_user = await manager.search_memories("hello", "u1", limit=5, collection_name=COLLECTION)
+    single_broadcast = await manager.search_memories("hello", "__broadcast__", limit=2, collection_name=COLLECTION)
+    manager.embedding_service.embed_query_async.reset_mock()
+
+    with patch.object(qdrant, "query_batch_points", wraps=qdrant.query_batch_points) as batch, \
+         patch.object(qdrant, "query_points", wraps=qdrant.query_points) as single:
+        user_memories, broadcast_memories = await manager.search_memories_batch(
+            "hello", [("u1", 5), ("__broadcast__", 2)], collection_name=COLLECTION
+        )
+
+    assert batch.await_count == 1
+    assert single.await_count == 0
+    assert manager.embedding_service.embed_query_async.await_count == 1
+    assert [m["id"] for m in user_memories] == [m["id"] for m in single_user]
+    assert [m["id"] for m in broadcast_memories] == [m["id"] for m in single_broadcast]
+    assert {m["id"] for m in broadcast_memories} == {4, 5}
+
+
+async def test_precomputed_vector_skips_embedding(qdrant, manager):
+    vector = [1.0, 0.0]
+
+    await manager.search_memories("hello", "u1", collection_name=COLLECTION, query_vector=vector)
+    await manager.search_memories_batch("hello", [("u1", 5)], collection_name=COLLECTION, query_vector=vector)
+    await manager.search_summaries("hello", "u1", collection_name=COLLECTION, query_vector=vector)
+    traces = await manager.search_reasoning_traces("hello", "u1", limit=1, collection_name=COLLECTION, query_vector=vector)
+
+    manager.embedding_service.embed_query_async.assert_not_awaited()
+    assert traces[0]["metadata"] == {"complexity": "COMPLEX_MID"}
+
+
+async def test_batch_without_qdrant_returns_empty_per_user(manager):
+    with patch.object(db_manager, "qdrant_client", None):
+        assert await manager.search_memories_batch("hello", [("u1", 5), ("__broadcast__", 2)]) == [[], []]
@@ -0,0 +1,203 @@
+"""
+Tests for the versioned relationship snapshot in TrustManager: in-place
+updates from update_trust, CAS protection against stale loaders, bulk
+pre-warming, and hit ratio / Postgres queries per message under a replayed
+channel log (fakeredis plus an in-memory v2_user_relationships table).
+"""
+
+import random
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src_v2.config.settings import settings
+from src_v2.core.cache import cache_manager
+from src_v2.core.database import db_manager
+from src_v2.evolution.trust import TrustManager
+
+CHARACTER = "elena"
+
+
+class FakeEvolution:
+    def get_special_user(self, user_id):
+        return None
+
+    def get_trust_override(self, user_id):
+        return None
+
+    def get_current_stage(self, trust):
+        return {"name": "Friend" if trust >= 20 else "Stranger"}
+
+    def get_active_traits(self, trust):
+        return [{"name": "warm"}] if trust >= 20 else []
+
+    def check_milestone(self, old_trust, new_trust):
+        return "We're friends now!" if old_trust < 20 <= new_trust else None
+
+
+class FakeRelationships:
+    """Emulates the v2_user_relationships queries TrustManager issues."""
+
+    def __init__(self, rows=None):
+        self.rows = {user_id: dict(row) for user_id, row in (rows or {}).items()}
+        self.queries = []
+
+    def _new_row(self, trust_score=0):
+        return {"trust_score": trust_score, "insights": "[]", "preferences": "{}",
+                "mood": None, "mood_intensity": None, "version": 0}
+
+    def _snapshot(self, user_id):
+        return dict(self.rows[user_id])
+
+    async def fetchrow(self, query, *args):
+        self.queries.append(query)
+        user_id = args[0]
+        if "WITH old AS" in query:
+            row = self.rows.get(user_id)
+            if row is None:
+                return None
+            new_trust = max(-100, min(100, row["trust_score"] + args[2]))
+            if new_trust == row["trust_score"]:
+                return None
+            old_trust = row["trust_score"]
+            row.update(trust_score=new_trust, version=row["version"] + 1)
+            return {"old_trust": old_trust, **row}
+        if query.lstrip().startswith("SELECT"):
+            return self._snapshot(user_id) if user_id in self.rows else None
+        if "jsonb_set" in query:
+            row = self.rows[user_id]
+            row.update(preferences={args[2][0]: args[3].strip('"')}, version=row["version"] + 1)
+            return dict(row)
+        raise AssertionError(f"unexpected fetchrow: {query}")
+
+    async def fetch(self, query, *args):
+        self.queries.append(query)
+        assert "ANY($1::text[])" in query
+        return [{"user_id": u, **self.rows[u]} for u in args[0] if u in self.rows]
+
+    async def execute(self, query, *args):
+        self.queries.append(query)
+        if "INSERT INTO v2_user_relationships" in query:
+            self.rows.setdefault(args[0], self._new_row())
+
+
+@pytest.fixture
+def table():
+    table = FakeRelationships({f"u{i}": {"trust_score": 10 + i, "insights": "[]", "preferences": "{}",
+                                         "mood": "happy", "mood_intensity": 0.7, "version": 3}
+                               for i in range(6)})
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__.return_value = table
+    pool.acquire.return_value.__aexit__.return_value = False
+    with patch.object(db_manager, "postgres_pool", pool), \
+         patch.object(db_manager, "influxdb_write_api", None), \
+         patch("src_v2.evolution.trust.get_evolution_manager", return_value=FakeEvolution()):
+        yield table
+
+
+async def test_update_trust_updates_snapshot_in_place(fake_redis, table):
+    manager = TrustManager()
+    await manager.get_relationship_level("u0", CHARACTER)
+
+    assert await manager.update_trust("u0", CHARACTER, 10) == "We're friends now!"
+    table.queries.clear()
+    relationship = await manager.get_relationship_level("u0", CHARACTER)
+
+    assert table.queries == []
+    assert relationship["trust_score"] == 20
+    assert relationship["level_label"] == "Friend"
+    assert relationship["unlocked_traits"] == ["warm"]
+    assert relationship["mood"] == "happy"
+    snapshot = await cache_manager.get_json(manager._snapshot_key("u0", CHARACTER))
+    assert snapshot["version"] == 4
+
+
+async def test_stale_loader_cannot_overwrite_newer_snapshot(fake_redis, table):
+    manager = TrustManager()
+    key = manager._snapshot_key("u1", CHARACTER)
+    stale = manager._snapshot_from_row(table.rows["u1"])
+
+    await manager.update_trust("u1", CHARACTER, 5)
+    # A loader that read the row before the update finishes afterwards
+    assert await cache_manager.set_json_many({key: stale}, nx=True) == 0
+    assert not await cache_manager.set_json_versioned(key, stale)
+
+    assert (await manager.get_relationship_level("u1", CHARACTER))["trust_score"] == 16
+
+
+async def test_new_user_row_is_created_and_cached(fake_redis, table):
+    manager = TrustManager()
+
+    assert await manager.update_trust("newcomer", CHARACTER, 1) is None
+    relationship = await manager.get_relationship_level("newcomer", CHARACTER)
+
+    assert relationship["trust_score"] == 1
+    assert table.rows["newcomer"]["version"] == 1
+
+
+async def test_trust_at_limit_skips_writes(fake_redis, table):
+    manager = TrustManager()
+    table.rows["u2"]["trust_score"] = 100
+    await manager.get_relationship_level("u2", CHARACTER)
+    table.queries.clear()
+
+    assert await manager.update_trust("u2", CHARACTER, 1) is None
+    assert len(table.queries) == 1  # the conditional UPDATE only
+
+
+async def test_preference_update_refreshes_snapshot(fake_redis, table):
+    manager = TrustManager()
+    await manager.update_preference("u3", CHARACTER, "nickname", "Sunny")
+    table.queries.clear()
+
+    relationship = await manager.get_relationship_level("u3", CHARACTER)
+
+    assert relationship["preferences"] == {"nickname": "Sunny"}
+    assert table.queries == []
+
+
+async def test_prewarm_loads_missing_snapshots_in_one_query(fake_redis, table):
+    manager = TrustManager()
+    await manager.get_relationship_level("u0", CHARACTER)
+    table.queries.clear()
+
+    warmed = await manager.prewarm_relationships(["u0", "u1", "u2", "u1", "ghost"], CHARACTER)
+
+    assert warmed == 2  # u0 was cached, ghost has no row
+    assert len(table.queries) == 1
+    assert await manager.prewarm_relationships(["u0", "u1", "u2"], CHARACTER) == 0
+    assert len(table.queries) == 1
+
+
+def replay_log(messages: int, seed: int = 7):
+    """A busy group channel: a few regulars, some lurkers and one newcomer."""
+    rng = random.Random(seed)
+    authors = ["u0"] * 6 + ["u1"] * 4 + ["u2"] * 3 + ["u3", "u4", "u5", "newcomer"]
+    return [rng.choice(authors) for _ in range(messages)]
+
+
+@pytest.mark.performance
+async def test_replayed_channel_hit_ratio_and_queries_per_message(fake_redis, table, monkeypatch):
+    """Per message: prompt context read + engagement +1, as in MessageHandler."""
+    monkeypatch.setattr(settings, "RELATIONSHIP_CACHE_TTL_SECONDS", 3600)
+    manager = TrustManager()
+    log = replay_log(500)
+
+    await manager.prewarm_relationships(set(log), CHARACTER)
+    for user_id in log:
+        await manager.get_relationship_level(user_id, CHARACTER)
+        await manager.update_trust(user_id, CHARACTER, 1)
+
+    stats = manager.get_stats()
+    queries_per_message = len(table.queries) / len(log)
+    print(f"\nhit ratio {stats['hit_ratio']:.3f}, {queries_per_message:.2f} PG queries/message "
+          f"({len(table.queries)} over {len(log)} messages)")
+
+    # Only the newcomer's first lookup misses. What's left per message is the trust
+    # UPDATE, plus one milestone write per user crossing the Friend threshold.
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] > 0.99
+    assert len(table.queries) == 1 + 2 + len(log) + len(set(log))
+    assert queries_per_message < 1.05
+    assert all(table.rows[u]["trust_score"] == min(100, 10 + i + log.count(u))
+               for i, u in enumerate(f"u{i}" for i in range(6)))
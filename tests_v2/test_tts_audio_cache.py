@@ -0,0 +1,118 @@
+"""
+Tests for TTSManager streaming and the on-disk phrase audio cache, against a
+local stub implementing the ElevenLabs client interface
+(client.text_to_speech.convert -> async iterator of bytes).
+"""
+
+import os
+
+import pytest
+
+from src_v2.config.settings import settings
+from src_v2.voice.audio_cache import AudioCache
+from src_v2.voice.tts import TTSManager
+
+
+class StubTextToSpeech:
+    def __init__(self, chunk_size: int = 1024):
+        self.chunk_size = chunk_size
+        self.calls = []
+        self.fail = False
+
+    def audio_for(self, text: str, voice_id: str) -> bytes:
+        return (f"{voice_id}:{text}|".encode() * 200)[:self.chunk_size * 50]
+
+    def convert(self, text: str, voice_id: str, model_id: str, **kwargs):
+        self.calls.append((text, voice_id, model_id))
+        audio = self.audio_for(text, voice_id)
+
+        async def stream():
+            for i in range(0, len(audio), self.chunk_size):
+                if self.fail and i:
+                    raise ConnectionError("stream dropped")
+                yield audio[i:i + self.chunk_size]
+        return stream()
+
+
+class StubElevenLabs:
+    def __init__(self):
+        self.text_to_speech = StubTextToSpeech()
+
+
+@pytest.fixture
+def tts(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ELEVENLABS_MODEL_ID", "eleven_test")
+    manager = TTSManager()
+    manager.client = StubElevenLabs()
+    manager.audio_cache = AudioCache(str(tmp_path), max_bytes=10 * 1024 * 1024, max_text_chars=200)
+    return manager
+
+
+async def test_repeated_phrase_is_served_from_cache(tts):
+    stub = tts.client.text_to_speech
+    first = await tts.generate_speech("Hey there, stranger!", voice_id="v1")
+    second = await tts.generate_speech("  Hey there,   stranger! ", voice_id="v1")
+
+    assert first == second == stub.audio_for("Hey there, stranger!", "v1")
+    assert len(stub.calls) == 1
+    assert tts.audio_cache.get_stats()["hits"] == 1
+
+
+async def test_cache_is_keyed_by_voice_and_model(tts, monkeypatch):
+    await tts.generate_speech("Good morning!", voice_id="v1")
+    await tts.generate_speech("Good morning!", voice_id="v2")
+    monkeypatch.setattr(settings, "ELEVENLABS_MODEL_ID", "eleven_other")
+    await tts.generate_speech("Good morning!", voice_id="v1")
+
+    assert len(tts.client.text_to_speech.calls) == 3
+
+
+async def test_stream_yields_chunks_as_they_arrive(tts):
+    chunks = [chunk async for chunk in tts.stream_speech("Once upon a time " * 20, voice_id="v1")]
+
+    assert len(chunks) == 50
+    assert all(len(chunk) == 1024 for chunk in chunks)
+
+
+async def test_long_replies_are_not_cached(tts):
+    text = "A much longer reply that goes on. " * 10
+    await tts.generate_speech(text, voice_id="v1")
+    await tts.generate_speech(text, voice_id="v1")
+
+    assert len(tts.client.text_to_speech.calls) == 2
+    assert tts.audio_cache.get_stats()["entries"] == 0
+
+
+async def test_failed_stream_returns_none_and_caches_nothing(tts):
+    tts.client.text_to_speech.fail = True
+
+    assert await tts.generate_speech("Hello!", voice_id="v1") is None
+    assert tts.audio_cache.get_stats()["entries"] == 0
+
+
+async def test_lru_eviction_and_persistence(tmp_path):
+    clip = 1000
+    cache = AudioCache(str(tmp_path), max_bytes=3 * clip, max_text_chars=200)
+    for phrase in ("one", "two", "three"):
+        await cache.put("v1", "m", phrase, bytes(clip))
+    # Touch "one" so "two" becomes least recently used
+    assert await cache.get("v1", "m", "one") is not None
+    await cache.put("v1", "m", "four", bytes(clip))
+
+    assert await cache.get("v1", "m", "two") is None
+    assert cache.get_stats()["evictions"] == 1
+    assert sum(len(files) for _, _, files in os.walk(tmp_path)) == 3
+
+    # A new process sees the same clips and limits
+    reopened = AudioCache(str(tmp_path), max_bytes=3 * clip, max_text_chars=200)
+    assert await reopened.get("v1", "m", "four") == bytes(clip)
+    assert reopened.get_stats()["bytes"] == 3 * clip
+
+
+async def test_large_clip_accumulates_linearly(tts):
+    tts.client.text_to_speech.chunk_size = 64
+    text = "x" * 150
+
+    audio = await tts.generate_speech(text, voice_id="v1")
+
+    assert audio == tts.client.text_to_speech.audio_for(text, "v1")
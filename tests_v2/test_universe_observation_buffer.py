@@ -0,0 +1,146 @@
+"""
+Tests for the buffered universe observations in UniverseManager: many observed
+messages become one Neo4j transaction with summed counters, the buffer is
+bounded, and stop() flushes what is pending (recording Neo4j driver + fakeredis).
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src_v2.config.settings import settings
+from src_v2.core.cache import cache_manager
+from src_v2.core.database import db_manager
+from src_v2.universe.manager import UniverseManager
+
+
+class RecordingTx:
+    def __init__(self, driver):
+        self._driver = driver
+
+    async def run(self, query, **params):
+        if self._driver.fail:
+            raise RuntimeError("neo4j unavailable")
+        self._driver.statements.append((query, params))
+        return MagicMock()
+
+
+class RecordingSession:
+    def __init__(self, driver):
+        self._driver = driver
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def run(self, query, **params):
+        self._driver.transactions += 1
+        self._driver.statements.append((query, params))
+        return MagicMock()
+
+    async def execute_write(self, work, *args):
+        self._driver.transactions += 1
+        return await work(RecordingTx(self._driver), *args)
+
+
+class RecordingDriver:
+    def __init__(self):
+        self.transactions = 0
+        self.statements = []
+        self.fail = False
+
+    def session(self, **kwargs):
+        return RecordingSession(self)
+
+    def rows(self, marker: str) -> list:
+        return [row for query, params in self.statements if marker in query for row in params["rows"]]
+
+
+@pytest.fixture
+def driver(fake_redis, monkeypatch):
+    monkeypatch.setattr(settings, "UNIVERSE_OBSERVATION_FLUSH_SECONDS", 60.0)
+    monkeypatch.setattr(settings, "UNIVERSE_OBSERVATION_MAX_KEYS", 5000)
+    driver = RecordingDriver()
+    with patch.object(db_manager, "neo4j_driver", driver):
+        yield driver
+
+
+async def observe(manager, user_id="u1", channel_id="c1", content="talking about guitars and synths",
+                  mentions=(), reply_to=None):
+    await manager.observe_message("g1", channel_id, user_id, content, list(mentions), reply_to, f"name-{user_id}")
+
+
+async def test_messages_are_aggregated_into_one_transaction(driver):
+    manager = UniverseManager()
+    for _ in range(10):
+        await observe(manager, "u1", mentions=["u2"])
+    for _ in range(5):
+        await observe(manager, "u2", channel_id="c2", reply_to="u1")
+
+    assert driver.transactions == 0  # nothing written per message
+    assert await manager.flush_observations() == 15
+    assert driver.transactions == 1
+
+    activity = {(r["user_id"], r["channel_id"]): r["count"] for r in driver.rows("ACTIVE_IN")}
+    assert activity == {("u1", "c1"): 10, ("u2", "c2"): 5}
+    assert {(r["topic"], r["count"]) for r in driver.rows("HAS_TOPIC")} == {("talking", 15), ("guitars", 15), ("synths", 15)}
+    interactions = {(r["author_id"], r["target_id"]): r["count"] for r in driver.rows("INTERACTS_WITH")}
+    assert interactions == {("u1", "u2"): 10, ("u2", "u1"): 5}
+
+    hours = await cache_manager.hgetall("universe:planet:g1:activity_hours")
+    assert sum(int(v) for v in hours.values()) == 15
+    assert await manager.flush_observations() == 0
+
+
+async def test_short_messages_and_self_mentions_are_ignored(driver):
+    manager = UniverseManager()
+    await observe(manager, content="hi all")
+    await observe(manager, "u1", mentions=["u1"], reply_to="u1")
+
+    await manager.flush_observations()
+
+    assert driver.rows("INTERACTS_WITH") == []
+    assert manager.get_observation_stats()["flushed"] == 1
+
+
+async def test_full_buffer_flushes_early(driver, monkeypatch):
+    monkeypatch.setattr(settings, "UNIVERSE_OBSERVATION_MAX_KEYS", 20)
+    manager = UniverseManager()
+
+    for i in range(20):
+        await observe(manager, f"u{i}")
+
+    # Each new user adds an activity key; three topics and the hour are shared,
+    # so the 16th user fills the buffer
+    assert driver.transactions == 1
+    assert manager.get_observation_stats()["pending_keys"] < 20
+    await manager.stop()
+    assert sum(r["count"] for r in driver.rows("ACTIVE_IN")) == 20
+
+
+async def test_stop_flushes_pending_observations(driver):
+    manager = UniverseManager()
+    await observe(manager)
+    assert manager._observation_flush_task is not None
+
+    await manager.stop()
+
+    assert driver.transactions == 1
+    assert manager._observation_flush_task is None
+    assert manager.get_observation_stats()["pending"] == 0
+
+
+async def test_failed_flush_drops_batch(driver):
+    manager = UniverseManager()
+    await observe(manager)
+    driver.fail = True
+
+    with patch("src_v2.core.database.asyncio.sleep", AsyncMock()):
+        await manager.stop()
+
+    stats = manager.get_observation_stats()
+    assert stats["dropped"] == 1 and stats["pending"] == 0
+    # Hour counters still reach Redis
+    assert await cache_manager.hgetall("universe:planet:g1:activity_hours")
@@ -0,0 +1,132 @@
+"""
+Tests for StreamingFFmpegSource feeding: a synthetic PCM generator is pushed
+through a deliberately slow stand-in for FFmpeg (a Python pass-through process)
+while a ticker measures how late the event loop runs its callbacks.
+"""
+
+import asyncio
+import math
+import struct
+import sys
+import threading
+import time
+
+import pytest
+
+from src_v2.config.settings import settings
+from src_v2.voice.player import FRAME_SIZE, StreamingFFmpegSource
+
+# Copies stdin to stdout in small reads with a pause, so its input pipe fills up
+SLOW_DECODER = [sys.executable, "-c", (
+    "import sys, time\n"
+    "while True:\n"
+    "    data = sys.stdin.buffer.read1(4096)\n"
+    "    if not data: break\n"
+    "    sys.stdout.buffer.write(data); sys.stdout.buffer.flush()\n"
+    "    time.sleep(0.02)\n"
+)]
+
+
+def pcm_frames(seconds: float) -> bytes:
+    """A 440 Hz stereo sine wave as 48 kHz s16le, a whole number of 20 ms frames."""
+    samples = int(48000 * seconds)
+    return b"".join(struct.pack("<hh", v, v) for v in
+                    (int(8000 * math.sin(2 * math.pi * 440 * i / 48000)) for i in range(samples)))
+
+
+async def synthetic_stream(data: bytes, chunk_size: int = 16384):
+    for i in range(0, len(data), chunk_size):
+        yield data[i:i + chunk_size]
+        await asyncio.sleep(0)
+
+
+class LoopLagMonitor:
+    """Schedules a 5 ms sleep over and over and records how late each wake-up is."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.max_lag = 0.0
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.max_lag = max(self.max_lag, loop.time() - start - self.interval)
+
+    def __enter__(self):
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    def __exit__(self, *exc):
+        self._task.cancel()
+
+
+def play(source: StreamingFFmpegSource, frames: list):
+    """What discord.py's player thread does: read() until an empty frame."""
+    while True:
+        frame = source.read()
+        if not frame:
+            return
+        frames.append(frame)
+
+
+@pytest.mark.performance
+async def test_feeding_a_slow_decoder_does_not_block_the_loop(monkeypatch):
+    monkeypatch.setattr(settings, "VOICE_FEED_QUEUE_CHUNKS", 4)
+    audio = pcm_frames(1.5)  # 288 KB, several times the OS pipe buffer
+    frames = []
+
+    with LoopLagMonitor() as monitor:
+        source = StreamingFFmpegSource(synthetic_stream(audio), prebuffer_frames=5, command=SLOW_DECODER)
+        player = threading.Thread(target=play, args=(source, frames))
+        player.start()
+        await asyncio.to_thread(player.join, 30)
+        await source._feeding_task
+    source.cleanup()
+
+    print(f"\nmax event loop lag while feeding {len(audio)} bytes: {monitor.max_lag * 1000:.1f} ms")
+    assert b"".join(frames) == audio
+    assert all(len(frame) == FRAME_SIZE for frame in frames)
+    # Writing to this pipe from the loop (the old feed_ffmpeg) stalls it for ~250 ms
+    assert monitor.max_lag < 0.04
+
+
+async def test_playback_waits_for_prebuffer():
+    audio = pcm_frames(1.0)
+    source = StreamingFFmpegSource(synthetic_stream(audio), prebuffer_frames=20, command=SLOW_DECODER)
+
+    first = await asyncio.to_thread(source.read)
+
+    assert len(first) == FRAME_SIZE
+    assert source._frames.qsize() >= 19
+    source.cleanup()
+
+
+async def test_short_stream_plays_without_filling_prebuffer():
+    audio = pcm_frames(0.06)  # three frames
+    source = StreamingFFmpegSource(synthetic_stream(audio), prebuffer_frames=50, command=SLOW_DECODER)
+    frames = []
+
+    await asyncio.to_thread(play, source, frames)
+
+    assert b"".join(frames) == audio
+    source.cleanup()
+
+
+async def test_cleanup_stops_feeding_mid_stream():
+    async def endless():
+        while True:
+            yield bytes(4096)
+            await asyncio.sleep(0)
+
+    source = StreamingFFmpegSource(endless(), prebuffer_frames=2, command=SLOW_DECODER)
+    await asyncio.to_thread(source.read)
+    start = time.monotonic()
+    source.cleanup()
+
+    with pytest.raises(asyncio.CancelledError):
+        await source._feeding_task
+    assert time.monotonic() - start < 1.0
+    assert source.process.wait(timeout=1) is not None